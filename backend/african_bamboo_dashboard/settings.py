@@ -223,6 +223,51 @@ AUTH_USER_MODEL = "v1_users.SystemUser"
 # running qcluster worker.
 Q_IS_SYNC = bool(TEST_ENV)
 
+# Named queues, each served by its own qcluster
+# (Q_CLUSTER_NAME=<queue> python manage.py qcluster)
+# so long syncs and exports cannot hold up Kobo
+# write-backs and notifications. Tasks not in
+# TASK_ROUTES go to the default "african_bamboo"
+# queue.
+TASK_QUEUES = {
+    "sync": {"workers": 1, "timeout": 1800},
+    "export": {"workers": 2, "timeout": 900},
+    "attachments": {"workers": 2, "timeout": 300},
+    "kobo-writeback": {"workers": 2, "timeout": 60},
+    "notify": {"workers": 1, "timeout": 120},
+}
+
+TASK_ROUTES = {
+    "api.v1.v1_odk.tasks.reresolve_submission_labels": "sync",
+    "api.v1.v1_odk.utils.farmer_sync.sync_farmers_for_form": "sync",
+    "api.v1.v1_odk.tasks.generate_export_file": "export",
+    "api.v1.v1_odk.tasks.download_submission_attachments": (
+        "attachments"
+    ),
+    "api.v1.v1_odk.tasks.sync_kobo_validation_status": (
+        "kobo-writeback"
+    ),
+    "api.v1.v1_odk.tasks.sync_kobo_submission_geometry": (
+        "kobo-writeback"
+    ),
+    "api.v1.v1_odk.tasks.sync_kobo_submission_data": (
+        "kobo-writeback"
+    ),
+    "api.v1.v1_odk.utils.kobo_outbox.flush_kobo_outbox": (
+        "kobo-writeback"
+    ),
+    "api.v1.v1_odk.utils.kobo_outbox.retry_failed_audits": (
+        "kobo-writeback"
+    ),
+    "api.v1.v1_odk.tasks.send_telegram_rejection_notification": (
+        "notify"
+    ),
+    "api.v1.v1_odk.tasks.dispatch_telegram_notifications": (
+        "notify"
+    ),
+    "utils.email_helper.send_email_by_user_id": "notify",
+}
+
 Q_CLUSTER = {
     "name": "african_bamboo",
     "workers": 2,
@@ -230,8 +275,72 @@ Q_CLUSTER = {
     "retry": 120,
     "orm": "default",
     "sync": Q_IS_SYNC,
+    # Let export tasks start their own
+    # process pool (EXPORT_WORKERS)
+    "daemonize_workers": False,
+    # A task is retried once it has been locked
+    # for "retry" seconds, so it must outlast the
+    # queue's timeout
+    "ALT_CLUSTERS": {
+        name: {**queue, "retry": queue["timeout"] * 2}
+        for name, queue in TASK_QUEUES.items()
+    },
 }
 
+# Plot exports are rendered in pk-range chunks
+# of EXPORT_CHUNK_SIZE plots on EXPORT_WORKERS
+# processes. 1 keeps everything in the task
+# process.
+EXPORT_WORKERS = int(
+    environ.get("EXPORT_WORKERS", 1 if TEST_ENV else 4)
+)
+EXPORT_CHUNK_SIZE = int(
+    environ.get("EXPORT_CHUNK_SIZE", 2000)
+)
+# Running jobs write processed/total counts to
+# Jobs.info at most every this many seconds
+JOB_PROGRESS_INTERVAL = float(
+    environ.get("JOB_PROGRESS_INTERVAL", 2)
+)
+
+# Kobo write-backs (validation statuses, field
+# and geometry edits) wait in KoboOutbox and are
+# flushed every minute in bulk calls of up to
+# KOBO_OUTBOX_BATCH_SIZE submissions. Failed calls
+# are retried after RETRY_BASE * 2^(attempt - 1)
+# seconds (at most RETRY_MAX).
+KOBO_OUTBOX_BATCH_SIZE = int(
+    environ.get("KOBO_OUTBOX_BATCH_SIZE", 100)
+)
+KOBO_OUTBOX_FLUSH_LIMIT = int(
+    environ.get("KOBO_OUTBOX_FLUSH_LIMIT", 2000)
+)
+KOBO_OUTBOX_MAX_ATTEMPTS = int(
+    environ.get("KOBO_OUTBOX_MAX_ATTEMPTS", 6)
+)
+KOBO_OUTBOX_RETRY_BASE = 60
+KOBO_OUTBOX_RETRY_MAX = 3600
+
+# Rejections still unsynced after that (or
+# pending for AUDIT_STALE_PENDING seconds without
+# an outbox row) are retried every 5 minutes by
+# retry_failed_audits, waiting
+# RETRY_BASE * 2^retry_count seconds (at most
+# RETRY_MAX) between attempts.
+AUDIT_RETRY_MAX_ATTEMPTS = int(
+    environ.get("AUDIT_RETRY_MAX_ATTEMPTS", 8)
+)
+AUDIT_RETRY_BASE = 300
+AUDIT_RETRY_MAX = 86400
+AUDIT_STALE_PENDING = 900
+
+# plots/download/ streams CSV/GeoJSON in the
+# response up to this many plots and queues an
+# export job above it
+EXPORT_STREAM_MAX_ROWS = int(
+    environ.get("EXPORT_STREAM_MAX_ROWS", 5000)
+)
+
 # In tests, bypass Mailjet so emails land in mail.outbox.
 if TEST_ENV:
     EMAIL_BACKEND = (
@@ -243,6 +352,24 @@ STORAGE_PATH = environ.get("STORAGE_PATH", "./storage")
 STORAGE_SECRET = environ.get(
     "STORAGE_SECRET", SECRET_KEY
 )
+# Internal nginx location serving
+# STORAGE_PATH/exports (e.g. "/internal/exports/").
+# When set, job downloads are handed to nginx
+# with X-Accel-Redirect; unset, Django streams
+# the file itself.
+EXPORT_ACCEL_REDIRECT_PREFIX = environ.get(
+    "EXPORT_ACCEL_REDIRECT_PREFIX", ""
+)
+
+# Seconds each process keeps SystemSetting
+# groups in memory. Saves through the ORM clear
+# the saving process's copy at once; 0 disables
+# the cache.
+SYSTEM_SETTINGS_CACHE_TTL = int(
+    environ.get(
+        "SYSTEM_SETTINGS_CACHE_TTL", 0 if TEST_ENV else 30
+    )
+)
 
 # Telegram notification settings
 # These are fallback defaults; DB settings
@@ -260,3 +387,31 @@ TELEGRAM_SUPERVISOR_GROUP_ID = environ.get(
 TELEGRAM_ENUMERATOR_GROUP_ID = environ.get(
     "TELEGRAM_ENUMERATOR_GROUP_ID", ""
 )
+
+# Rejection notifications are queued on the
+# audit and sent by dispatch_telegram_notifications,
+# which claims as many as one chat can receive
+# within the notify queue timeout at a time.
+# Telegram allows about 20 messages a minute in a
+# group; a 429 is retried in-task when its
+# retry_after is at most TELEGRAM_MAX_RETRY_WAIT
+# seconds, otherwise on the next run.
+TELEGRAM_CHAT_RATE_PER_MINUTE = int(
+    environ.get("TELEGRAM_CHAT_RATE_PER_MINUTE", 20)
+)
+TELEGRAM_CHAT_BURST = int(
+    environ.get("TELEGRAM_CHAT_BURST", 3)
+)
+TELEGRAM_MAX_RETRY_WAIT = int(
+    environ.get("TELEGRAM_MAX_RETRY_WAIT", 30)
+)
+# This many rejections waiting for a chat are
+# folded into digest messages
+TELEGRAM_DIGEST_THRESHOLD = int(
+    environ.get("TELEGRAM_DIGEST_THRESHOLD", 3)
+)
+# Seconds a notification may stay undelivered
+# before it is dropped
+TELEGRAM_QUEUE_MAX_AGE = int(
+    environ.get("TELEGRAM_QUEUE_MAX_AGE", 6 * 3600)
+)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class V1InitConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "api.v1.v1_init"
+
+    def ready(self):
+        from api.v1.v1_init import signals  # noqa: F401
@@ -1,43 +1,103 @@
+import threading
+import time
+
 from django.conf import settings
 
 from api.v1.v1_init.models import SystemSetting
 
 TELEGRAM_GROUP = "telegram"
 
-TELEGRAM_DEFAULTS = {
-    "enabled": lambda: settings.TELEGRAM_ENABLED,
-    "bot_token": lambda: settings.TELEGRAM_BOT_TOKEN,
-    "supervisor_group_id": (
-        lambda: settings.TELEGRAM_SUPERVISOR_GROUP_ID
-    ),
-    "enumerator_group_id": (
-        lambda: settings.TELEGRAM_ENUMERATOR_GROUP_ID
-    ),
-}
 
+def parse_bool(value):
+    return value.lower() in ("true", "1", "yes")
 
-def get_telegram_config():
-    """Read Telegram config from DB, falling back
-    to env-var defaults from settings.py."""
-    db_settings = {
-        s.key: s.value
-        for s in SystemSetting.objects.filter(
-            group=TELEGRAM_GROUP
+
+class SettingsGroup:
+    """Typed SystemSetting group.
+
+    `fields` maps each key to (parse, default):
+    stored values are converted with `parse`,
+    missing keys fall back to `default()` (env
+    settings from settings.py).
+
+    The stored values are memoized per process
+    for SYSTEM_SETTINGS_CACHE_TTL seconds. Saving
+    or deleting a SystemSetting clears this
+    process's copy (see signals.py); other
+    processes see the change within the TTL.
+    """
+
+    _cache = {}
+    _lock = threading.Lock()
+
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = fields
+
+    def _stored(self):
+        ttl = settings.SYSTEM_SETTINGS_CACHE_TTL
+        now = time.monotonic()
+        cached = self._cache.get(self.name)
+        if ttl and cached and cached[0] > now:
+            return cached[1]
+        stored = dict(
+            SystemSetting.objects.filter(
+                group=self.name
+            ).values_list("key", "value")
         )
-    }
-
-    config = {}
-    for key, default_fn in TELEGRAM_DEFAULTS.items():
-        if key in db_settings:
-            val = db_settings[key]
-            if key == "enabled":
-                val = val.lower() in (
-                    "true",
-                    "1",
-                    "yes",
+        if ttl:
+            with self._lock:
+                self._cache[self.name] = (
+                    now + ttl,
+                    stored,
                 )
-            config[key] = val
-        else:
-            config[key] = default_fn()
+        return stored
+
+    def get(self):
+        stored = self._stored()
+        config = {}
+        for key, (parse, default) in self.fields.items():
+            if key in stored:
+                config[key] = parse(stored[key])
+            else:
+                config[key] = default()
+        return config
+
+    @classmethod
+    def invalidate(cls, name=None):
+        """Drop the memoized values of one group,
+        or of all groups."""
+        with cls._lock:
+            if name is None:
+                cls._cache.clear()
+            else:
+                cls._cache.pop(name, None)
+
+
+TELEGRAM_SETTINGS = SettingsGroup(
+    TELEGRAM_GROUP,
+    {
+        "enabled": (
+            parse_bool,
+            lambda: settings.TELEGRAM_ENABLED,
+        ),
+        "bot_token": (
+            str,
+            lambda: settings.TELEGRAM_BOT_TOKEN,
+        ),
+        "supervisor_group_id": (
+            str,
+            lambda: settings.TELEGRAM_SUPERVISOR_GROUP_ID,
+        ),
+        "enumerator_group_id": (
+            str,
+            lambda: settings.TELEGRAM_ENUMERATOR_GROUP_ID,
+        ),
+    },
+)
 
-    return config
+
+def get_telegram_config():
+    """Read Telegram config from DB, falling back
+    to env-var defaults from settings.py."""
+    return TELEGRAM_SETTINGS.get()
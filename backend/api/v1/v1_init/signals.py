@@ -0,0 +1,14 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api.v1.v1_init.helpers import SettingsGroup
+from api.v1.v1_init.models import SystemSetting
+
+
+@receiver(post_save, sender=SystemSetting)
+@receiver(post_delete, sender=SystemSetting)
+def invalidate_settings_cache(sender, instance, **kwargs):
+    """Drop the cached group of a changed
+    setting. QuerySet.update() sends no signal:
+    call SettingsGroup.invalidate() after it."""
+    SettingsGroup.invalidate(instance.group)
@@ -0,0 +1,92 @@
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from api.v1.v1_init.helpers import (
+    TELEGRAM_GROUP,
+    SettingsGroup,
+    get_telegram_config,
+)
+from api.v1.v1_init.models import SystemSetting
+from api.v1.v1_init.tests.mixins import V1InitTestHelperMixin
+
+
+@override_settings(
+    USE_TZ=False,
+    TEST_ENV=True,
+    SYSTEM_SETTINGS_CACHE_TTL=60,
+    TELEGRAM_ENABLED=False,
+    TELEGRAM_BOT_TOKEN="env-token",
+)
+class SettingsCacheTest(V1InitTestHelperMixin, TestCase):
+    def setUp(self):
+        SettingsGroup.invalidate()
+        self.addCleanup(SettingsGroup.invalidate)
+
+    def test_memoized_within_ttl(self):
+        with self.assertNumQueries(1):
+            get_telegram_config()
+            get_telegram_config()
+        config = get_telegram_config()
+        self.assertFalse(config["enabled"])
+        self.assertEqual(config["bot_token"], "env-token")
+
+    def test_save_and_delete_invalidate(self):
+        get_telegram_config()
+        setting = SystemSetting.objects.create(
+            group=TELEGRAM_GROUP,
+            key="enabled",
+            value="True",
+        )
+        self.assertTrue(get_telegram_config()["enabled"])
+
+        setting.value = "false"
+        setting.save()
+        self.assertFalse(
+            get_telegram_config()["enabled"]
+        )
+
+        SystemSetting.objects.create(
+            group=TELEGRAM_GROUP,
+            key="bot_token",
+            value="db-token",
+        )
+        self.assertEqual(
+            get_telegram_config()["bot_token"], "db-token"
+        )
+        SystemSetting.objects.filter(
+            key="bot_token"
+        ).delete()
+        self.assertEqual(
+            get_telegram_config()["bot_token"],
+            "env-token",
+        )
+
+    def test_other_groups_kept(self):
+        get_telegram_config()
+        SystemSetting.objects.create(
+            group="other", key="x", value="1"
+        )
+        with self.assertNumQueries(0):
+            get_telegram_config()
+
+    def test_settings_endpoint_sees_update(self):
+        self.user = self.create_admin_user()
+        auth = self.login()
+        url = "/api/v1/settings/telegram/"
+        self.client.get(url, **auth)
+        resp = self.client.put(
+            url,
+            {"enabled": True, "bot_token": "new-token"},
+            content_type="application/json",
+            **auth,
+        )
+        self.assertEqual(resp.status_code, 200)
+        data = self.client.get(url, **auth).json()
+        self.assertTrue(data["enabled"])
+        self.assertEqual(data["bot_token"], "new-token")
+
+    @override_settings(SYSTEM_SETTINGS_CACHE_TTL=0)
+    def test_ttl_zero_disables_cache(self):
+        with self.assertNumQueries(2):
+            get_telegram_config()
+            get_telegram_config()
@@ -0,0 +1,84 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.test.utils import override_settings
+from django_q.brokers import get_broker
+
+from api.v1.v1_init.tests.mixins import V1InitTestHelperMixin
+from utils.task_queue import async_task, queue_for
+
+
+@override_settings(USE_TZ=False, TEST_ENV=True)
+class TaskQueuesTest(V1InitTestHelperMixin, TestCase):
+    URL = "/api/v1/admin/queues/"
+
+    def setUp(self):
+        self.user = self.create_admin_user()
+
+    @patch("utils.task_queue.q_async_task")
+    def test_tasks_routed_to_queues(self, mock_task):
+        async_task(
+            "api.v1.v1_odk.tasks.generate_export_file", 1
+        )
+        self.assertEqual(
+            mock_task.call_args.kwargs["cluster"], "export"
+        )
+        async_task(
+            "api.v1.v1_odk.tasks"
+            ".send_telegram_rejection_notification",
+            1,
+        )
+        self.assertEqual(
+            mock_task.call_args.kwargs["cluster"], "notify"
+        )
+        # Unrouted tasks use the default queue
+        self.assertEqual(
+            queue_for("some.other.task"), "african_bamboo"
+        )
+        async_task("some.other.task", cluster="sync")
+        self.assertEqual(
+            mock_task.call_args.kwargs["cluster"], "sync"
+        )
+
+    def test_queue_depth(self):
+        broker = get_broker("export")
+        broker.enqueue("task-1")
+        broker.enqueue("task-2")
+        # Taken by a worker
+        broker.dequeue()
+
+        auth = self.login()
+        resp = self.client.get(self.URL, **auth)
+        self.assertEqual(resp.status_code, 200)
+        queues = {
+            q["name"]: q for q in resp.json()["queues"]
+        }
+        self.assertEqual(
+            set(queues),
+            {
+                "african_bamboo",
+                "sync",
+                "export",
+                "attachments",
+                "kobo-writeback",
+                "notify",
+            },
+        )
+        export = queues["export"]
+        self.assertEqual(export["queued"], 1)
+        self.assertEqual(export["running"], 1)
+        self.assertEqual(export["timeout"], 900)
+        self.assertIsNotNone(export["oldest_seconds"])
+        self.assertEqual(queues["notify"]["queued"], 0)
+        self.assertIsNone(
+            queues["notify"]["oldest_seconds"]
+        )
+
+    def test_admin_only(self):
+        resp = self.client.get(self.URL)
+        self.assertEqual(resp.status_code, 401)
+        self.user.is_superuser = False
+        self.user.save()
+        auth = self.login()
+        resp = self.client.get(self.URL, **auth)
+        self.assertEqual(resp.status_code, 403)
@@ -18,4 +18,14 @@ urlpatterns = [
         views.telegram_groups,
         name="telegram_groups",
     ),
+    re_path(
+        r"^(?P<version>(v1))/admin/queues/$",
+        views.task_queues,
+        name="task_queues",
+    ),
+    re_path(
+        r"^(?P<version>(v1))/admin/kobo-sync/$",
+        views.kobo_sync_status,
+        name="kobo_sync_status",
+    ),
 ]
@@ -15,6 +15,9 @@ from api.v1.v1_init.models import SystemSetting
 from api.v1.v1_init.serializers import (
     TelegramSettingsSerializer,
 )
+from api.v1.v1_odk.utils.kobo_outbox import kobo_sync_stats
+from utils.custom_permissions import IsAdmin
+from utils.task_queue import queue_stats
 from utils.telegram_client import (
     TelegramClient,
     TelegramSendError,
@@ -101,3 +104,30 @@ def telegram_groups(request, version):
             status=status.HTTP_502_BAD_GATEWAY,
         )
     return Response(groups)
+
+
+@extend_schema(
+    description=(
+        "Depth of each task queue: tasks waiting, "
+        "tasks running and the age of the oldest "
+        "waiting task"
+    ),
+    tags=["Dev"],
+)
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsAdmin])
+def task_queues(request, version):
+    return Response({"queues": queue_stats()})
+
+
+@extend_schema(
+    description=(
+        "Backlog and last-hour throughput of Kobo "
+        "write-backs and rejection audit retries"
+    ),
+    tags=["Dev"],
+)
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsAdmin])
+def kobo_sync_status(request, version):
+    return Response(kobo_sync_stats())
@@ -2,11 +2,19 @@ class JobTypes:
     export_shapefile = 1
     export_geojson = 2
     export_xlsx = 3
+    export_geoparquet = 4
+    export_flatgeobuf = 5
+    export_csv = 6
+    export_kmz = 7
 
     FieldStr = {
         export_shapefile: "export_shapefile",
         export_geojson: "export_geojson",
         export_xlsx: "export_xlsx",
+        export_geoparquet: "export_geoparquet",
+        export_flatgeobuf: "export_flatgeobuf",
+        export_csv: "export_csv",
+        export_kmz: "export_kmz",
     }
 
 
@@ -15,10 +23,12 @@ class JobStatus:
     on_progress = 2
     failed = 3
     done = 4
+    cancelled = 5
 
     FieldStr = {
         pending: "pending",
         on_progress: "on_progress",
         failed: "failed",
         done: "done",
+        cancelled: "cancelled",
     }
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.28 on 2026-10-19 06:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("v1_jobs", "0003_add_columnar_export_types"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="jobs",
+            name="type",
+            field=models.IntegerField(
+                choices=[
+                    (1, "export_shapefile"),
+                    (2, "export_geojson"),
+                    (3, "export_xlsx"),
+                    (4, "export_geoparquet"),
+                    (5, "export_flatgeobuf"),
+                    (6, "export_csv"),
+                ]
+            ),
+        ),
+    ]
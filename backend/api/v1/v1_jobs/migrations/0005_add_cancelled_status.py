@@ -0,0 +1,27 @@
+# Generated by Django 4.2.28 on 2026-10-19 06:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("v1_jobs", "0004_add_csv_export_type"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="jobs",
+            name="status",
+            field=models.IntegerField(
+                choices=[
+                    (1, "pending"),
+                    (2, "on_progress"),
+                    (3, "failed"),
+                    (4, "done"),
+                    (5, "cancelled"),
+                ],
+                default=1,
+            ),
+        ),
+    ]
@@ -0,0 +1,76 @@
+import logging
+import time
+
+from django.conf import settings
+
+from api.v1.v1_jobs.constants import JobStatus
+from api.v1.v1_jobs.models import Jobs
+
+logger = logging.getLogger(__name__)
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job once it has
+    been cancelled, to unwind and clean up."""
+
+
+class JobProgress:
+    """Processed/total counts of a running job,
+    written to ``Jobs.info["progress"]`` at most
+    every JOB_PROGRESS_INTERVAL seconds.
+
+    ``advance`` also checks whether the job was
+    cancelled and raises JobCancelled if so, so
+    callers should invoke it between units of
+    work (e.g. export chunks).
+    """
+
+    def __init__(self, job):
+        self.job = job
+        self.total = 0
+        self.processed = 0
+        self.started_at = time.time()
+        self._saved_at = 0
+
+    def expect(self, count):
+        """Add ``count`` units to the total (an
+        export may run several row passes)."""
+        self.total += count
+        self._save()
+
+    def advance(self, count):
+        self.processed += count
+        if Jobs.objects.filter(
+            pk=self.job.pk,
+            status=JobStatus.cancelled,
+        ).exists():
+            logger.info(
+                "Job %s cancelled at %d/%d",
+                self.job.pk,
+                self.processed,
+                self.total,
+            )
+            raise JobCancelled(self.job.pk)
+        if (
+            time.time() - self._saved_at
+            >= settings.JOB_PROGRESS_INTERVAL
+            or self.processed >= self.total
+        ):
+            self._save()
+
+    def _save(self):
+        self._saved_at = time.time()
+        self.job.info = {
+            **(self.job.info or {}),
+            "progress": {
+                "processed": self.processed,
+                "total": self.total,
+                "started_at": self.started_at,
+                "updated_at": self._saved_at,
+            },
+        }
+        # Only info: status belongs to whoever
+        # cancels or finishes the job
+        Jobs.objects.filter(pk=self.job.pk).update(
+            info=self.job.info
+        )
@@ -1,3 +1,5 @@
+import time
+
 from rest_framework import serializers
 from drf_spectacular.utils import extend_schema_field
 
@@ -8,9 +10,19 @@ from api.v1.v1_jobs.constants import (
 from api.v1.v1_jobs.models import Jobs
 
 
+class JobProgressSerializer(serializers.Serializer):
+    processed = serializers.IntegerField()
+    total = serializers.IntegerField()
+    percent = serializers.FloatField()
+    eta_seconds = serializers.IntegerField(
+        allow_null=True
+    )
+
+
 class JobSerializer(serializers.ModelSerializer):
     type = serializers.SerializerMethodField()
     status = serializers.SerializerMethodField()
+    progress = serializers.SerializerMethodField()
 
     @extend_schema_field(serializers.CharField())
     def get_type(self, instance):
@@ -24,12 +36,50 @@ class JobSerializer(serializers.ModelSerializer):
             instance.status
         )
 
+    @extend_schema_field(
+        JobProgressSerializer(allow_null=True)
+    )
+    def get_progress(self, instance):
+        """Counts reported by the running job and
+        an ETA extrapolated from its rate so far.
+        """
+        if instance.status != JobStatus.on_progress:
+            return None
+        progress = (instance.info or {}).get(
+            "progress"
+        )
+        if not progress:
+            return None
+        processed = progress["processed"]
+        total = progress["total"]
+        elapsed = (
+            progress["updated_at"]
+            - progress["started_at"]
+        )
+        eta = None
+        if processed and elapsed > 0:
+            eta = (total - processed) * (
+                elapsed / processed
+            ) - (time.time() - progress["updated_at"])
+            eta = max(int(round(eta)), 0)
+        return {
+            "processed": processed,
+            "total": total,
+            "percent": (
+                round(processed * 100 / total, 1)
+                if total
+                else 0.0
+            ),
+            "eta_seconds": eta,
+        }
+
     class Meta:
         model = Jobs
         fields = [
             "id",
             "type",
             "status",
+            "progress",
             "created",
             "available",
         ]
@@ -1,6 +1,7 @@
 from django.urls import path
 
 from api.v1.v1_jobs.views import (
+    cancel_job,
     download_job_result,
     view_job,
 )
@@ -16,4 +17,9 @@ urlpatterns = [
         download_job_result,
         name="download_job_result",
     ),
+    path(
+        "<int:job_id>/cancel/",
+        cancel_job,
+        name="cancel_job",
+    ),
 ]
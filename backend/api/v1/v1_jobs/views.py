@@ -1,6 +1,8 @@
 import os
+from urllib.parse import quote
 
-from django.http import FileResponse
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
 from rest_framework.decorators import (
@@ -20,6 +22,7 @@ from api.v1.v1_jobs.models import Jobs
 from api.v1.v1_jobs.serializers import (
     JobSerializer,
 )
+from api.v1.v1_odk.export import EXPORT_FOLDER
 from utils import storage
 
 
@@ -44,6 +47,11 @@ def view_job(request, job_id):
 CONTENT_TYPES = {
     ".zip": "application/zip",
     ".geojson": "application/geo+json",
+    ".gz": "application/gzip",
+    ".parquet": "application/vnd.apache.parquet",
+    ".fgb": "application/flatgeobuf",
+    ".csv": "text/csv",
+    ".kmz": "application/vnd.google-earth.kmz",
     ".xlsx": (
         "application/vnd.openxmlformats-"
         "officedocument.spreadsheetml.sheet"
@@ -98,11 +106,69 @@ def download_job_result(request, job_id):
     )
     filename = os.path.basename(real_path)
 
-    response = FileResponse(
-        open(real_path, "rb"),
-        content_type=content_type,
+    accel_prefix = settings.EXPORT_ACCEL_REDIRECT_PREFIX
+    in_exports = os.path.dirname(real_path) == (
+        os.path.realpath(storage.get_path(EXPORT_FOLDER))
     )
+    if accel_prefix and in_exports:
+        # nginx serves the bytes (sendfile, Range);
+        # it keeps our Content-Type, -Disposition
+        # and Cache-Control headers
+        response = HttpResponse(
+            content_type=content_type
+        )
+        response["X-Accel-Redirect"] = (
+            accel_prefix.rstrip("/")
+            + "/"
+            + quote(filename)
+        )
+    else:
+        response = FileResponse(
+            open(real_path, "rb"),
+            content_type=content_type,
+        )
     response["Content-Disposition"] = (
         f'attachment; filename="{filename}"'
     )
+    # Export files never change once written
+    response["Cache-Control"] = (
+        "private, max-age=86400"
+    )
     return response
+
+
+@extend_schema(
+    description=(
+        "Cancel a pending or running job. A "
+        "running export stops after its current "
+        "chunk and removes its partial file."
+    ),
+    tags=["Jobs"],
+    request=None,
+    responses=JobSerializer,
+)
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def cancel_job(request, job_id):
+    job = get_object_or_404(
+        Jobs, pk=job_id, created_by=request.user
+    )
+    # Conditional update: the worker may finish
+    # the job concurrently
+    cancelled = Jobs.objects.filter(
+        pk=job.pk,
+        status__in=[
+            JobStatus.pending,
+            JobStatus.on_progress,
+        ],
+    ).update(status=JobStatus.cancelled)
+    if not cancelled:
+        return Response(
+            {"message": "Job is already finished"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    job.refresh_from_db()
+    return Response(
+        data=JobSerializer(job).data,
+        status=status.HTTP_200_OK,
+    )
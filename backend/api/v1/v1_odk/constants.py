@@ -18,8 +18,18 @@ class ApprovalStatusTypes:
 
 class SyncStatus:
     PENDING = "pending"
+    # Claimed by a flush, Kobo call in progress
+    SENDING = "sending"
     SYNCED = "synced"
     FAILED = "failed"
+    # Replaced by a later review before it was
+    # sent to Kobo
+    SUPERSEDED = "superseded"
+
+
+class KoboOutboxKind:
+    VALIDATION_STATUS = "validation_status"
+    DATA = "data"
 
 
 class RejectionCategory:
@@ -1,15 +1,23 @@
+import csv
+import gzip
+import hashlib
+import io
 import json
 import logging
 import os
 import re
 import tempfile
 import time
+from contextlib import closing
 from datetime import datetime, timezone
 from pathlib import Path
 from urllib.parse import quote
 from xml.sax.saxutils import escape as xml_escape
-from zipfile import ZipFile
+from zipfile import ZIP_DEFLATED, ZipFile
 
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pyogrio
 import shapefile
 from shapely import wkt as shapely_wkt
 from shapely.geometry import mapping
@@ -18,10 +26,14 @@ from shapely.geometry.polygon import orient
 from openpyxl import Workbook
 
 from django.conf import settings
+from django.db.models import IntegerField
+from django.db.models.functions import Cast
 from api.v1.v1_odk.models import (
+    Farmer,
     FieldMapping,
     FarmerFieldMapping,
     FormQuestion,
+    Plot,
 )
 from api.v1.v1_odk.serializers import (
     build_option_lookup,
@@ -30,9 +42,15 @@ from api.v1.v1_odk.serializers import (
 from api.v1.v1_odk.constants import (
     PREFIX_FARM_ID,
     PREFIX_SUBM_ID,
+    STATUS_MAP,
+)
+from api.v1.v1_odk.utils.export_chunks import (
+    map_ordered,
+    pk_ranges,
 )
 from api.v1.v1_users.models import SystemUser
 from utils import storage
+from utils.polygon import average_altitude
 
 logger = logging.getLogger(__name__)
 
@@ -71,6 +89,76 @@ SHP_FIELDS = [
 ]
 
 
+# CSV exports: untruncated shapefile attributes
+# plus the polygon as WKT
+CSV_HEADERS = [f[0] for f in SHP_FIELDS] + ["WKT"]
+
+
+def filtered_plots(form, filters):
+    """Plots of ``form`` matching the export
+    ``filters`` (as stored in Jobs.info)."""
+    qs = Plot.objects.filter(form=form)
+
+    status_param = filters.get("status")
+    if status_param == "flagged":
+        qs = qs.filter(flagged_for_review=True)
+    elif status_param == "pending":
+        qs = qs.filter(
+            submission__approval_status__isnull=True
+        )
+    elif status_param in STATUS_MAP:
+        qs = qs.filter(
+            submission__approval_status=(
+                STATUS_MAP[status_param]
+            )
+        )
+
+    search = filters.get("search")
+    if search:
+        qs = qs.filter(plot_name__icontains=search)
+
+    region = filters.get("region")
+    if region:
+        qs = qs.filter(region=region)
+    sub_region = filters.get("sub_region")
+    if sub_region:
+        qs = qs.filter(sub_region=sub_region)
+
+    start_date = filters.get("start_date")
+    if start_date:
+        qs = qs.filter(
+            submission__submission_time__gte=(
+                int(start_date)
+            )
+        )
+    end_date = filters.get("end_date")
+    if end_date:
+        qs = qs.filter(
+            submission__submission_time__lte=(
+                int(end_date)
+            )
+        )
+
+    # Dynamic raw_data filters, limited to the
+    # form's configured filter fields
+    dynamic = filters.get("dynamic_filters", {})
+    allowed = form.filter_fields or []
+    for field, val in dynamic.items():
+        if field in allowed:
+            qs = qs.filter(
+                **{f"submission__raw_data__{field}": val}
+            )
+    return qs
+
+
+def with_geometry(queryset):
+    """Only plots that have a polygon; spatial
+    formats skip the rest."""
+    return queryset.filter(
+        polygon_wkt__isnull=False
+    ).exclude(polygon_wkt="")
+
+
 def _epoch_ms_to_iso(epoch_ms):
     """Convert epoch milliseconds to ISO 8601."""
     if epoch_ms is None:
@@ -121,142 +209,146 @@ def _parse_wkt(wkt_string):
     return geom
 
 
-def _resolve_field_spec(
-    raw_data, field_spec, option_map, type_map
-):
-    """Resolve comma-separated field spec from
-    raw submission data.
+# Plot columns an attribute record is built
+# from, fetched with values_list
+PLOT_ROW_FIELDS = (
+    "uuid",
+    "plot_name",
+    "polygon_wkt",
+    "created_at",
+    "flagged_for_review",
+    "flagged_reason",
+    "farmer__uid",
+    "submission__kobo_id",
+    "submission__raw_data",
+    "submission__approval_status",
+    "submission__submission_time",
+    "submission__main_plot_submission__main_plot__uid",
+)
+ROW_UUID, ROW_NAME, ROW_WKT = 0, 1, 2
 
-    Mirrors PlotSerializer._resolve_plot_fields
-    but accepts pre-built lookup maps.
-    """
-    if not raw_data or not field_spec:
-        return None
-    fields = [
+
+def compile_field_spec(field_spec, option_map, type_map):
+    """(field, options, question type) of each
+    field of a comma-separated field spec."""
+    fields = (
         f.strip()
-        for f in field_spec.split(",")
-        if f.strip()
-    ]
-    parts = []
-    for field in fields:
-        raw_val = raw_data.get(field)
-        if raw_val is None:
-            continue
-        opts = option_map.get(field)
-        if opts:
-            resolved = resolve_value(
-                raw_val, opts, type_map.get(field)
-            )
-        else:
-            resolved = raw_val
-        val = str(resolved).strip()
-        if val:
-            parts.append(val)
-    return " - ".join(parts) if parts else None
+        for f in (field_spec or "").split(",")
+    )
+    return tuple(
+        (f, option_map.get(f), type_map.get(f))
+        for f in fields
+        if f
+    )
 
 
-def resolve_plot_attributes(
-    plot, option_map, type_map
-):
-    """Build attribute dict for a single plot.
+class PlotAttributeResolver:
+    """Shapefile-style attribute records of the
+    plots of one form.
 
-    Returns a dict keyed by shapefile-safe
-    field names (max 10 chars).
+    The option lookup and the enumerator, region
+    and sub-region field specs are compiled once;
+    ``record`` then maps a PLOT_ROW_FIELDS row
+    straight to its attributes. Holds only plain
+    data, so it can be pickled into export
+    workers.
     """
-    raw = {}
-    approval = None
-    submit_time = None
-
-    if plot.submission:
-        raw = plot.submission.raw_data or {}
-        approval = plot.submission.approval_status
-        submit_time = (
-            plot.submission.submission_time
-        )
-
-    form = plot.form
-    region_spec = form.region_field or "region"
-    sub_region_spec = (
-        form.sub_region_field or "sub_region"
-    )
 
-    flagged = plot.flagged_for_review
-    if flagged is True:
-        needs_recl = "Yes"
-    elif flagged is False:
-        needs_recl = "No"
-    else:
-        needs_recl = ""
-    plot_uid = ""
-    if (
-        plot.submission
-        and hasattr(
-            plot.submission,
-            "main_plot_submission",
+    def __init__(self, form):
+        option_map, type_map = build_option_lookup(
+            form
         )
-        and plot.submission.main_plot_submission
-    ):
-        plot_uid = (
-            plot.submission
-            .main_plot_submission
-            .main_plot
-            .uid
+        self.enumerator = compile_field_spec(
+            "enumerator_id", option_map, type_map
+        )
+        self.region = compile_field_spec(
+            form.region_field or "region",
+            option_map,
+            type_map,
+        )
+        self.sub_region = compile_field_spec(
+            form.sub_region_field or "sub_region",
+            option_map,
+            type_map,
         )
 
-    return {
-        "SUBMISSION_ID": (
-            f"{PREFIX_SUBM_ID}"
-            f"{plot.submission.kobo_id}"
-            if plot.submission
-            else ""
-        ),
-        "PLOT_ID": plot_uid,
-        "FARMER_ID": (
-            f"{PREFIX_FARM_ID}{plot.farmer.uid}"
-            if plot.farmer
-            else ""
-        ),
-        "ENUMERATOR": (
-            _resolve_field_spec(
-                raw,
-                "enumerator_id",
-                option_map,
-                type_map,
-            )
-            or ""
-        )[:254],
-        "REGION": (
-            _resolve_field_spec(
-                raw,
-                region_spec,
-                option_map,
-                type_map,
-            )
-            or ""
-        )[:254],
-        "SUB_REGION": (
-            _resolve_field_spec(
-                raw,
-                sub_region_spec,
-                option_map,
-                type_map,
-            )
-            or ""
-        )[:254],
-        "VAL_STATUS": APPROVAL_LABELS.get(
-            approval, "pending"
-        ),
-        "NEEDS_RECL": needs_recl,
-        "REJ_REASON": (
-            plot.flagged_reason or ""
-        )[:254],
-        "CREATED_AT": _epoch_ms_to_iso(
-            plot.created_at
-        ),
-        "SUBMIT_AT": _epoch_ms_to_iso(
-            submit_time
-        ),
-    }
+    @staticmethod
+    def resolve(raw_data, spec):
+        """Labels of the compiled ``spec`` in
+        ``raw_data``, non-empty values joined with
+        ' - ', or None."""
+        parts = []
+        for field, opts, q_type in spec:
+            raw_val = raw_data.get(field)
+            if raw_val is None:
+                continue
+            if opts:
+                raw_val = resolve_value(
+                    raw_val, opts, q_type
+                )
+            val = str(raw_val).strip()
+            if val:
+                parts.append(val)
+        return " - ".join(parts) if parts else None
+
+    def record(self, row, max_length=254):
+        """Attribute dict of a PLOT_ROW_FIELDS
+        row, keyed by shapefile-safe field names
+        (max 10 chars). Free-text values are cut
+        to ``max_length`` (the dBase limit); pass
+        None to keep them whole.
+        """
+        (
+            _,
+            _,
+            _,
+            created_at,
+            flagged,
+            reason,
+            farmer_uid,
+            kobo_id,
+            raw,
+            approval,
+            submit_time,
+            plot_uid,
+        ) = row
+        raw = raw or {}
+        if flagged is True:
+            needs_recl = "Yes"
+        elif flagged is False:
+            needs_recl = "No"
+        else:
+            needs_recl = ""
+        resolve = self.resolve
+        return {
+            "SUBMISSION_ID": (
+                f"{PREFIX_SUBM_ID}{kobo_id}"
+                if kobo_id is not None
+                else ""
+            ),
+            "PLOT_ID": plot_uid or "",
+            "FARMER_ID": (
+                f"{PREFIX_FARM_ID}{farmer_uid}"
+                if farmer_uid is not None
+                else ""
+            ),
+            "ENUMERATOR": (
+                resolve(raw, self.enumerator) or ""
+            )[:max_length],
+            "REGION": (
+                resolve(raw, self.region) or ""
+            )[:max_length],
+            "SUB_REGION": (
+                resolve(raw, self.sub_region) or ""
+            )[:max_length],
+            "VAL_STATUS": APPROVAL_LABELS.get(
+                approval, "pending"
+            ),
+            "NEEDS_RECL": needs_recl,
+            "REJ_REASON": (reason or "")[:max_length],
+            "CREATED_AT": _epoch_ms_to_iso(created_at),
+            "SUBMIT_AT": _epoch_ms_to_iso(submit_time),
+        }
 
 
 def _wkt_to_kml(wkt_string, name="Plot"):
@@ -265,6 +357,31 @@ def _wkt_to_kml(wkt_string, name="Plot"):
     Returns KML XML string or empty string on
     failure.
     """
+    placemarks = _kml_placemarks(wkt_string, name)
+    if not placemarks:
+        return ""
+    return (
+        KML_HEADER
+        + "<Document>"
+        f"<name>{xml_escape(str(name))}</name>"
+        + placemarks
+        + "</Document></kml>"
+    )
+
+
+KML_HEADER = (
+    '<?xml version="1.0" '
+    'encoding="UTF-8"?>'
+    '<kml xmlns='
+    '"http://www.opengis.net/kml/2.2">'
+)
+
+
+def _kml_placemarks(wkt_string, name, extended=""):
+    """KML Placemark elements (one per polygon)
+    of a WKT geometry, or "" when it is missing
+    or cannot be parsed. ``extended`` is inserted
+    as-is (e.g. ExtendedData)."""
     if not wkt_string:
         return ""
     try:
@@ -291,6 +408,7 @@ def _wkt_to_kml(wkt_string, name="Plot"):
             placemarks.append(
                 f"<Placemark>"
                 f"<name>{pm_name}</name>"
+                f"{extended}"
                 f"<Polygon>"
                 f"<outerBoundaryIs>"
                 f"<LinearRing>"
@@ -302,21 +420,19 @@ def _wkt_to_kml(wkt_string, name="Plot"):
                 f"</Polygon>"
                 f"</Placemark>"
             )
-
-        return (
-            '<?xml version="1.0" '
-            'encoding="UTF-8"?>'
-            '<kml xmlns='
-            '"http://www.opengis.net/kml/2.2">'
-            "<Document>"
-            f"<name>{safe_name}</name>"
-            + "".join(placemarks)
-            + "</Document></kml>"
-        )
+        return "".join(placemarks)
     except Exception:
         return ""
 
 
+def kml_version(wkt_string, name):
+    """Hash of the inputs of _wkt_to_kml, used as
+    the cache version and ETag of a plot's KML."""
+    return hashlib.sha1(
+        f"{wkt_string}\0{name}".encode()
+    ).hexdigest()
+
+
 def _wkt_to_pyshp_parts(wkt_string):
     """Convert WKT POLYGON/MULTIPOLYGON to pyshp
     parts.
@@ -365,20 +481,19 @@ def _wkt_to_pyshp_parts(wkt_string):
 
 
 def generate_shapefile(
-    queryset, form, filename
+    queryset, form, filename, progress=None
 ):
     """Generate a zipped Shapefile from a
     Plot queryset.
 
-    Files are written to a temp directory then
-    uploaded to persistent storage via
-    utils.storage.
+    Records are rendered in pk-range chunks by
+    _export_rows. Files are written to a temp
+    directory then uploaded to persistent storage
+    via utils.storage.
 
     Returns (stored_file_path, record_count).
     """
-    option_map, type_map = build_option_lookup(
-        form
-    )
+    ctx = {"resolver": PlotAttributeResolver(form)}
 
     with tempfile.TemporaryDirectory() as tmpdir:
         shp_path = os.path.join(
@@ -398,42 +513,11 @@ def generate_shapefile(
             w.field(name, ftype, size, decimal)
 
         count = 0
-        qs = queryset.select_related(
-            "submission__"
-            "main_plot_submission__"
-            "main_plot",
-            "farmer",
-            "form",
-        ).iterator()
-        for plot in qs:
-            parts = _wkt_to_pyshp_parts(
-                plot.polygon_wkt
-            )
-            if parts is None:
-                logger.warning(
-                    "Skipping plot %s: "
-                    "invalid geometry",
-                    plot.uuid,
-                )
-                continue
-
-            attrs = resolve_plot_attributes(
-                plot, option_map, type_map
-            )
+        for parts, record in _export_rows(
+            "shp", queryset, ctx, progress
+        ):
             w.poly(parts)
-            w.record(
-                attrs["SUBMISSION_ID"],
-                attrs["PLOT_ID"],
-                attrs["FARMER_ID"],
-                attrs["ENUMERATOR"],
-                attrs["REGION"],
-                attrs["SUB_REGION"],
-                attrs["VAL_STATUS"],
-                attrs["NEEDS_RECL"],
-                attrs["REJ_REASON"],
-                attrs["CREATED_AT"],
-                attrs["SUBMIT_AT"],
-            )
+            w.record(*record)
             count += 1
 
         w.close()
@@ -485,86 +569,352 @@ def generate_shapefile(
     return stored, count
 
 
+GEOJSON_CRS = {
+    "type": "name",
+    "properties": {
+        "name": "urn:ogc:def:crs:EPSG::4326"
+    },
+}
+
+
+def iter_geojson(features):
+    """Yield a FeatureCollection as text: the
+    header, each JSON-encoded feature as it is
+    produced, then the footer."""
+    header = json.dumps(
+        {"type": "FeatureCollection", "crs": GEOJSON_CRS}
+    )
+    # Open the object back up for "features"
+    yield header[:-1] + ', "features": ['
+    separator = ""
+    for feature in features:
+        yield separator + feature
+        separator = ","
+    yield "]}"
+
+
+def write_geojson(features, out):
+    """Stream a FeatureCollection into the text
+    file ``out``.
+
+    Returns the number of features written.
+    """
+    count = 0
+
+    def counted():
+        nonlocal count
+        for feature in features:
+            count += 1
+            yield feature
+
+    for part in iter_geojson(counted()):
+        out.write(part)
+    return count
+
+
+class _Echo:
+    """File-like object that hands back what is
+    written, for csv.writer in a generator."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows):
+    """Yield CSV_HEADERS and each row as CSV
+    text lines."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_HEADERS)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def generate_csv(
+    queryset, form, filename, progress=None
+):
+    """Generate a CSV file (attributes and WKT)
+    from a Plot queryset, streamed into storage.
+
+    Returns (stored_file_path, record_count).
+    """
+    ctx = {"resolver": PlotAttributeResolver(form)}
+    csv_name = f"{filename}.csv"
+    count = 0
+    with storage.open_write(
+        EXPORT_FOLDER, csv_name
+    ) as raw:
+        with io.TextIOWrapper(
+            raw, encoding="utf-8", newline=""
+        ) as out:
+            writer = csv.writer(out)
+            writer.writerow(CSV_HEADERS)
+            for row in _export_rows(
+                "csv", queryset, ctx, progress
+            ):
+                writer.writerow(row)
+                count += 1
+
+    stored = storage.relative_path(
+        EXPORT_FOLDER, csv_name
+    )
+    return stored, count
+
+
+def generate_kmz(
+    queryset, form, filename, progress=None
+):
+    """Generate a KMZ (zipped KML document) from a
+    Plot queryset, with one Folder per region.
+
+    Regions are rendered one after the other,
+    each in chunks by _export_rows, and streamed
+    into doc.kml inside the zip in storage.
+
+    Returns (stored_file_path, record_count).
+    """
+    ctx = {"resolver": PlotAttributeResolver(form)}
+    kmz_name = f"{filename}.kmz"
+    regions = (
+        queryset.order_by("region")
+        .values_list("region", flat=True)
+        .distinct()
+    )
+    count = 0
+    with storage.open_write(
+        EXPORT_FOLDER, kmz_name
+    ) as raw:
+        with ZipFile(raw, "w", ZIP_DEFLATED) as zf:
+            with zf.open(
+                "doc.kml", "w", force_zip64=True
+            ) as entry, io.TextIOWrapper(
+                entry, encoding="utf-8"
+            ) as out:
+                out.write(
+                    KML_HEADER
+                    + "<Document>"
+                    f"<name>{xml_escape(form.name)}</name>"
+                )
+                for region in regions:
+                    label = xml_escape(
+                        region or "No region"
+                    )
+                    out.write(
+                        f"<Folder><name>{label}</name>"
+                    )
+                    for placemarks in _export_rows(
+                        "kml",
+                        queryset.filter(region=region),
+                        ctx,
+                        progress,
+                    ):
+                        out.write(placemarks)
+                        count += 1
+                    out.write("</Folder>")
+                out.write("</Document></kml>")
+
+    stored = storage.relative_path(
+        EXPORT_FOLDER, kmz_name
+    )
+    return stored, count
+
+
+def stream_export(kind, queryset, form):
+    """Text pieces of a ``kind`` ("csv" or
+    "geojson") export of ``queryset``, for a
+    StreamingHttpResponse.
+
+    Rows are built in this process straight off
+    one server-side cursor, without chunking,
+    temp files or storage.
+    """
+    ctx = {"resolver": PlotAttributeResolver(form)}
+    rows = iter_export_rows(kind, queryset, ctx)
+    if kind == "csv":
+        return iter_csv(rows)
+    return iter_geojson(rows)
+
+
 def generate_geojson(
-    queryset, form, filename
+    queryset,
+    form,
+    filename,
+    compress=False,
+    progress=None,
 ):
     """Generate a GeoJSON file from a
     Plot queryset.
 
-    The file is written to a temp directory
-    then uploaded to persistent storage via
-    utils.storage.
+    Features are encoded in pk-range chunks by
+    _export_rows and streamed straight into the
+    storage file, so memory stays flat with the
+    number of plots. With ``compress`` the file
+    is written as ``.geojson.gz``.
 
     Returns (stored_file_path, record_count).
     """
-    option_map, type_map = build_option_lookup(
-        form
+    ctx = {"resolver": PlotAttributeResolver(form)}
+    geojson_name = f"{filename}.geojson"
+    if compress:
+        geojson_name += ".gz"
+    with storage.open_write(
+        EXPORT_FOLDER, geojson_name
+    ) as raw:
+        if compress:
+            raw = gzip.GzipFile(
+                filename=f"{filename}.geojson",
+                fileobj=raw,
+                mode="wb",
+            )
+        with io.TextIOWrapper(
+            raw, encoding="utf-8"
+        ) as out:
+            count = write_geojson(
+                _export_rows(
+                    "geojson", queryset, ctx, progress
+                ),
+                out,
+            )
+
+    stored = storage.relative_path(
+        EXPORT_FOLDER, geojson_name
     )
+    return stored, count
 
-    features = []
-    qs = queryset.select_related(
-        "submission__"
-        "main_plot_submission__"
-        "main_plot",
-        "farmer",
-        "form",
-    ).iterator()
-    for plot in qs:
-        try:
-            geom = _parse_wkt(plot.polygon_wkt)
-        except Exception as e:
-            logger.warning(
-                "Skipping plot %s: %s",
-                plot.uuid,
-                e,
+
+# Columnar formats carry the shapefile
+# attributes untruncated plus a WKB geometry
+ARROW_SCHEMA = pa.schema(
+    [(f[0], pa.string()) for f in SHP_FIELDS]
+    + [("geometry", pa.binary())]
+)
+
+# GeoParquet 1.1 column metadata; no "crs"
+# means OGC:CRS84 (lon/lat WGS 84)
+GEOPARQUET_META = {
+    "version": "1.1.0",
+    "primary_column": "geometry",
+    "columns": {
+        "geometry": {
+            "encoding": "WKB",
+            "geometry_types": [
+                "Polygon",
+                "MultiPolygon",
+            ],
+        }
+    },
+}
+
+
+def _arrow_batches(queryset, ctx, progress=None):
+    """Yield RecordBatches of ARROW_SCHEMA of
+    at most EXPORT_CHUNK_SIZE plots each."""
+    size = settings.EXPORT_CHUNK_SIZE
+    rows = []
+    for row in _export_rows(
+        "arrow", queryset, ctx, progress
+    ):
+        rows.append(row)
+        if len(rows) >= size:
+            yield _arrow_batch(rows)
+            rows = []
+    if rows:
+        yield _arrow_batch(rows)
+
+
+def _arrow_batch(rows):
+    return pa.RecordBatch.from_arrays(
+        [
+            pa.array(column, type=field.type)
+            for column, field in zip(
+                zip(*rows), ARROW_SCHEMA
             )
-            continue
+        ],
+        schema=ARROW_SCHEMA,
+    )
 
-        attrs = resolve_plot_attributes(
-            plot, option_map, type_map
-        )
-        features.append(
-            {
-                "type": "Feature",
-                "geometry": mapping(geom),
-                "properties": attrs,
-            }
-        )
 
-    collection = {
-        "type": "FeatureCollection",
-        "crs": {
-            "type": "name",
-            "properties": {
-                "name": (
-                    "urn:ogc:def:crs:"
-                    "EPSG::4326"
-                )
-            },
-        },
-        "features": features,
-    }
+def generate_geoparquet(
+    queryset, form, filename, progress=None
+):
+    """Generate a GeoParquet file from a Plot
+    queryset.
+
+    Each chunk of plots is written as its own
+    row group, straight into the storage file.
+
+    Returns (stored_file_path, record_count).
+    """
+    ctx = {"resolver": PlotAttributeResolver(form)}
+    parquet_name = f"{filename}.parquet"
+    schema = ARROW_SCHEMA.with_metadata(
+        {"geo": json.dumps(GEOPARQUET_META)}
+    )
+    count = 0
+    with storage.open_write(
+        EXPORT_FOLDER, parquet_name
+    ) as out:
+        with pq.ParquetWriter(
+            out, schema, compression="zstd"
+        ) as writer:
+            for batch in _arrow_batches(
+                queryset, ctx, progress
+            ):
+                writer.write_batch(batch)
+                count += batch.num_rows
+
+    stored = storage.relative_path(
+        EXPORT_FOLDER, parquet_name
+    )
+    return stored, count
+
+
+def generate_flatgeobuf(
+    queryset, form, filename, progress=None
+):
+    """Generate a FlatGeobuf file from a Plot
+    queryset.
+
+    Batches are streamed into GDAL, which writes
+    the packed Hilbert R-tree index so readers
+    can fetch a bbox without a full scan. GDAL
+    needs a real path, so the file is built in a
+    temp directory then uploaded.
+
+    Returns (stored_file_path, record_count).
+    """
+    ctx = {"resolver": PlotAttributeResolver(form)}
+    fgb_name = f"{filename}.fgb"
+    count = 0
+
+    def counted():
+        nonlocal count
+        for batch in _arrow_batches(
+            queryset, ctx, progress
+        ):
+            count += batch.num_rows
+            yield batch
 
-    geojson_name = f"{filename}.geojson"
     with tempfile.TemporaryDirectory() as tmpdir:
-        tmp_path = os.path.join(
-            tmpdir, geojson_name
+        fgb_path = os.path.join(tmpdir, fgb_name)
+        pyogrio.write_arrow(
+            pa.RecordBatchReader.from_batches(
+                ARROW_SCHEMA, counted()
+            ),
+            fgb_path,
+            layer=filename,
+            driver="FlatGeobuf",
+            geometry_name="geometry",
+            geometry_type="Unknown",
+            crs="EPSG:4326",
+            layer_options={"SPATIAL_INDEX": "YES"},
         )
-        with open(
-            tmp_path, "w", encoding="utf-8"
-        ) as f:
-            json.dump(collection, f)
-
         stored = storage.upload(
-            tmp_path,
+            fgb_path,
             folder=EXPORT_FOLDER,
-            filename=geojson_name,
+            filename=fgb_name,
         )
 
-    return stored, len(features)
-
-
-WHITESPACE_RE = re.compile(r"\s+")
+    return stored, count
 
 
 def _extract_avg_altitude(raw_data, form):
@@ -586,26 +936,11 @@ def _extract_avg_altitude(raw_data, form):
         if val:
             geoshape_str = val
             break
-    if not geoshape_str:
-        return ""
-    try:
-        segments = geoshape_str.strip().split(";")
-        altitudes = []
-        for seg in segments:
-            seg = seg.strip()
-            if not seg:
-                continue
-            parts = WHITESPACE_RE.split(seg)
-            if len(parts) >= 3:
-                alt = float(parts[2])
-                altitudes.append(alt)
-        if altitudes:
-            avg = sum(altitudes) / len(altitudes)
-            return round(avg, 3)
-    except (ValueError, IndexError):
-        pass
-    return ""
+    altitude = average_altitude(geoshape_str)
+    return "" if altitude is None else altitude
+
 
+XLSX_CHUNK_SIZE = 2000
 
 PLOT_TABLE_HEADERS = [
     "Submission ID",
@@ -726,21 +1061,63 @@ def _build_farmer_headers(form):
     return headers, all_fields
 
 
-def generate_xlsx(queryset, form, filename):
+def _plot_centroid(plot):
+    """(lat, lon) of the plot, from the
+    precomputed columns when they are set."""
+    if plot.centroid_lat is not None:
+        return plot.centroid_lat, plot.centroid_lon
+    if not plot.polygon_wkt:
+        return "", ""
+    # Rows saved before the columns existed
+    try:
+        c = _parse_wkt(plot.polygon_wkt).centroid
+        return round(c.y, 6), round(c.x, 6)
+    except Exception:
+        return "", ""
+
+
+def _farmer_rows(queryset, farmer_fields):
+    """Yield one Farmer table row per farmer
+    linked to ``queryset``, ordered by numeric
+    uid."""
+    farmers = (
+        Farmer.objects.filter(
+            pk__in=queryset.order_by().values(
+                "farmer_id"
+            )
+        )
+        .annotate(uid_num=Cast("uid", IntegerField()))
+        .order_by("uid_num")
+        .values_list("uid", "values")
+    )
+    for uid, vals in farmers.iterator(
+        chunk_size=XLSX_CHUNK_SIZE
+    ):
+        vals = vals or {}
+        yield [f"{PREFIX_FARM_ID}{uid}"] + [
+            vals.get(field) or ""
+            for field in farmer_fields
+        ]
+
+
+def generate_xlsx(
+    queryset, form, filename, progress=None
+):
     """Generate an XLSX file with two sheets:
     'Farmer table' and 'Plot Table'.
 
     Matches the Afforestation Monitoring Database
     column format.
 
+    Uses openpyxl write-only mode: plot rows are
+    streamed from _export_rows and farmer rows
+    from a second query ordered by uid, so memory
+    stays flat as the row count grows.
+    Centroid and altitude come from the
+    precomputed Plot columns.
+
     Returns (stored_file_path, record_count).
     """
-    storage_key = quote(
-        settings.STORAGE_SECRET, safe=""
-    )
-    web_domain = settings.WEBDOMAIN.rstrip("/")
-    kobo_base_url = _get_kobo_base_url()
-
     # Build dynamic farmer headers
     farmer_headers, farmer_fields = (
         _build_farmer_headers(form)
@@ -759,134 +1136,282 @@ def generate_xlsx(queryset, form, filename):
         deed_map[m.field.name] = (
             m.form_question.name
         )
-    td1_key = deed_map.get("title_deed_1")
-    td2_key = deed_map.get("title_deed_2")
+    ctx = {
+        "form": form,
+        "storage_key": quote(
+            settings.STORAGE_SECRET, safe=""
+        ),
+        "web_domain": settings.WEBDOMAIN.rstrip("/"),
+        "kobo_base_url": _get_kobo_base_url(),
+        "td1_key": deed_map.get("title_deed_1"),
+        "td2_key": deed_map.get("title_deed_2"),
+    }
 
-    wb = Workbook()
+    wb = Workbook(write_only=True)
 
     # --- Farmer table sheet ---
-    ws_farmer = wb.active
-    ws_farmer.title = "Farmer table"
+    ws_farmer = wb.create_sheet(title="Farmer table")
     ws_farmer.append(farmer_headers)
+    for row in _farmer_rows(queryset, farmer_fields):
+        ws_farmer.append(row)
 
-    seen_farmers = {}
-    plot_rows = []
+    # --- Plot Table sheet ---
+    ws_plot = wb.create_sheet(title="Plot Table")
+    ws_plot.append(PLOT_TABLE_HEADERS)
 
-    qs = queryset.select_related(
-        "submission__"
-        "main_plot_submission__"
-        "main_plot",
-        "farmer",
-        "form",
+    count = 0
+    for row in _export_rows(
+        "xlsx", queryset, ctx, progress
+    ):
+        ws_plot.append(row)
+        count += 1
+
+    xlsx_name = f"{filename}.xlsx"
+    with storage.open_write(
+        EXPORT_FOLDER, xlsx_name
+    ) as out:
+        wb.save(out)
+
+    stored = storage.relative_path(
+        EXPORT_FOLDER, xlsx_name
     )
+    return stored, count
 
-    for plot in qs.iterator():
-        sub = plot.submission
-        raw = sub.raw_data or {} if sub else {}
-        farmer = plot.farmer
-
-        farmer_id = ""
-        if farmer:
-            farmer_id = f"AB{farmer.uid}"
-            if farmer.uid not in seen_farmers:
-                seen_farmers[farmer.uid] = (
-                    farmer.values or {}
-                )
 
-        # Title deed URLs
-        td1_url = _resolve_attachment_url(
-            raw, td1_key, kobo_base_url
+def _shp_row(row, ctx):
+    """(pyshp parts, record values) of a plot row,
+    or None when its geometry is invalid."""
+    parts = _wkt_to_pyshp_parts(row[ROW_WKT])
+    if parts is None:
+        logger.warning(
+            "Skipping plot %s: invalid geometry",
+            row[ROW_UUID],
         )
-        td2_url = _resolve_attachment_url(
-            raw, td2_key, kobo_base_url
+        return None
+    attrs = ctx["resolver"].record(row)
+    return parts, [attrs[f[0]] for f in SHP_FIELDS]
+
+
+def _geojson_row(row, ctx):
+    """JSON-encoded Feature of a plot row, or None
+    when its geometry cannot be parsed."""
+    try:
+        geom = _parse_wkt(row[ROW_WKT])
+    except Exception as e:
+        logger.warning(
+            "Skipping plot %s: %s", row[ROW_UUID], e
         )
+        return None
+    return json.dumps(
+        {
+            "type": "Feature",
+            "geometry": mapping(geom),
+            "properties": ctx["resolver"].record(row),
+        }
+    )
 
-        # Centroid from polygon
-        centroid_lat = ""
-        centroid_lon = ""
-        if plot.polygon_wkt:
-            try:
-                geom = _parse_wkt(
-                    plot.polygon_wkt
-                )
-                c = geom.centroid
-                centroid_lat = round(c.y, 6)
-                centroid_lon = round(c.x, 6)
-            except Exception:
-                pass
-
-        submission_id = (
-            f"{PREFIX_SUBM_ID}{sub.kobo_id}"
-            if sub
-            else ""
+
+def _arrow_row(row, ctx):
+    """Untruncated SHP_FIELDS values and WKB
+    geometry of a plot row, or None when its
+    geometry cannot be parsed."""
+    try:
+        geom = _parse_wkt(row[ROW_WKT])
+    except Exception as e:
+        logger.warning(
+            "Skipping plot %s: %s", row[ROW_UUID], e
         )
+        return None
+    attrs = ctx["resolver"].record(row, max_length=None)
+    return [attrs[f[0]] for f in SHP_FIELDS] + [
+        geom.wkb
+    ]
 
-        plot_uid = ""
-        if (
-            sub
-            and hasattr(sub, "main_plot_submission")
-            and sub.main_plot_submission
-        ):
-            plot_uid = (
-                sub.main_plot_submission
-                .main_plot.uid
-            )
 
-        altitude = _extract_avg_altitude(
-            raw, form
+def _csv_row(row, ctx):
+    """Untruncated SHP_FIELDS values and stored
+    WKT of a plot row."""
+    attrs = ctx["resolver"].record(row, max_length=None)
+    return [attrs[f[0]] for f in SHP_FIELDS] + [
+        row[ROW_WKT] or ""
+    ]
+
+
+def _kml_row(row, ctx):
+    """KML Placemark(s) of a plot row with its
+    attributes as ExtendedData, or None when its
+    geometry cannot be parsed."""
+    attrs = ctx["resolver"].record(row, max_length=None)
+    extended = (
+        "<ExtendedData>"
+        + "".join(
+            f'<Data name="{key}">'
+            f"<value>{xml_escape(str(value))}</value>"
+            "</Data>"
+            for key, value in attrs.items()
         )
+        + "</ExtendedData>"
+    )
+    placemarks = _kml_placemarks(
+        row[ROW_WKT],
+        row[ROW_NAME] or str(row[ROW_UUID]),
+        extended,
+    )
+    if not placemarks:
+        logger.warning(
+            "Skipping plot %s: invalid geometry",
+            row[ROW_UUID],
+        )
+        return None
+    return placemarks
 
-        plot_rows.append([
-            submission_id,
-            plot_uid,
-            farmer_id,
-            td1_url,
-            td2_url,
-            centroid_lat,
-            centroid_lon,
-            altitude,
-            (
-                f"{web_domain}"
-                f"/api/v1/odk/plots"
-                f"/{plot.uuid}/kml"
-                f"/?key={storage_key}"
-                if plot.polygon_wkt
-                else ""
-            ),
-            "",  # Plantation Polygon
-        ])
 
-    # Write farmer rows sorted by uid
-    for uid in sorted(
-        seen_farmers.keys(),
-        key=lambda u: int(u),
+def _xlsx_row(plot, ctx):
+    """Plot Table row of a plot."""
+    sub = plot.submission
+    raw = sub.raw_data or {} if sub else {}
+    farmer = plot.farmer
+
+    # Title deed URLs
+    td1_url = _resolve_attachment_url(
+        raw, ctx["td1_key"], ctx["kobo_base_url"]
+    )
+    td2_url = _resolve_attachment_url(
+        raw, ctx["td2_key"], ctx["kobo_base_url"]
+    )
+
+    centroid_lat, centroid_lon = _plot_centroid(plot)
+    altitude = plot.altitude
+    if altitude is None:
+        # Only rows saved before the column existed
+        # are parsed again
+        altitude = "" if plot.altitude_computed else (
+            _extract_avg_altitude(raw, ctx["form"])
+        )
+
+    submission_id = (
+        f"{PREFIX_SUBM_ID}{sub.kobo_id}" if sub else ""
+    )
+
+    plot_uid = ""
+    if (
+        sub
+        and hasattr(sub, "main_plot_submission")
+        and sub.main_plot_submission
     ):
-        vals = seen_farmers[uid]
-        row = [f"{PREFIX_FARM_ID}{uid}"]
-        for field in farmer_fields:
-            row.append(vals.get(field) or "")
-        ws_farmer.append(row)
+        plot_uid = (
+            sub.main_plot_submission.main_plot.uid
+        )
 
-    # --- Plot Table sheet ---
-    ws_plot = wb.create_sheet(title="Plot Table")
-    ws_plot.append(PLOT_TABLE_HEADERS)
-    for row in plot_rows:
-        ws_plot.append(row)
+    return [
+        submission_id,
+        plot_uid,
+        f"AB{farmer.uid}" if farmer else "",
+        td1_url,
+        td2_url,
+        centroid_lat,
+        centroid_lon,
+        altitude,
+        (
+            f"{ctx['web_domain']}"
+            f"/api/v1/odk/plots"
+            f"/{plot.uuid}/kml"
+            f"/?key={ctx['storage_key']}"
+            if plot.polygon_wkt
+            else ""
+        ),
+        "",  # Plantation Polygon
+    ]
 
-    # Write to temp file and upload
-    xlsx_name = f"{filename}.xlsx"
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmp_path = os.path.join(
-            tmpdir, xlsx_name
+
+ROW_BUILDERS = {
+    "shp": _shp_row,
+    "geojson": _geojson_row,
+    "arrow": _arrow_row,
+    "csv": _csv_row,
+    "kml": _kml_row,
+    "xlsx": _xlsx_row,
+}
+
+
+def _export_plots(kind, queryset):
+    """Plots of ``queryset`` in pk order: model
+    instances for the XLSX sheet, PLOT_ROW_FIELDS
+    tuples for the attribute formats."""
+    queryset = queryset.order_by("pk")
+    if kind == "xlsx":
+        return queryset.select_related(
+            "submission__"
+            "main_plot_submission__"
+            "main_plot",
+            "farmer",
         )
-        wb.save(tmp_path)
-        stored = storage.upload(
-            tmp_path,
-            folder=EXPORT_FOLDER,
-            filename=xlsx_name,
+    return queryset.values_list(*PLOT_ROW_FIELDS)
+
+
+def iter_export_rows(kind, queryset, ctx):
+    """Yield the ``kind`` rows of ``queryset`` in
+    pk order from a single server-side cursor."""
+    build = ROW_BUILDERS[kind]
+    plots = _export_plots(kind, queryset)
+    for plot in plots.iterator(chunk_size=500):
+        row = build(plot, ctx)
+        if row is not None:
+            yield row
+
+
+def render_chunk(kind, query, bounds, ctx):
+    """Rows of the plots of ``query`` within the
+    pk range ``bounds``, in pk order.
+
+    Runs in export worker processes, so it takes
+    the pickled Query rather than a QuerySet.
+    """
+    qs = Plot.objects.all()
+    qs.query = query
+    first, last = bounds
+    return list(
+        iter_export_rows(
+            kind,
+            qs.filter(pk__gte=first, pk__lte=last),
+            ctx,
         )
+    )
+
 
-    return stored, len(plot_rows)
+def _export_rows(kind, queryset, ctx, progress=None):
+    """Yield the ``kind`` rows of ``queryset`` in
+    pk order.
+
+    The plots are split into EXPORT_CHUNK_SIZE pk
+    ranges rendered on EXPORT_WORKERS processes;
+    chunks are merged back in order. A JobProgress
+    ``progress`` is advanced after each chunk and
+    raises JobCancelled there once the job is
+    cancelled.
+    """
+    size = settings.EXPORT_CHUNK_SIZE
+    args = [
+        (kind, queryset.query, bounds, ctx)
+        for bounds in pk_ranges(queryset, size)
+    ]
+    remaining = 0
+    if progress:
+        remaining = queryset.count()
+        progress.expect(remaining)
+    with closing(
+        map_ordered(
+            render_chunk,
+            args,
+            settings.EXPORT_WORKERS,
+        )
+    ) as chunks:
+        for rows in chunks:
+            yield from rows
+            if progress:
+                done = min(size, remaining)
+                remaining -= done
+                progress.advance(done)
 
 
 def cleanup_old_exports(max_age_hours=24):
@@ -1,7 +1,5 @@
 import logging
 
-from django_q.tasks import async_task
-
 from rest_framework.exceptions import ValidationError
 
 from api.v1.v1_odk.constants import (
@@ -17,17 +15,26 @@ from api.v1.v1_odk.models import (
     FormQuestion,
     Plot,
 )
+from api.v1.v1_odk.utils.export_cache import bump_data_version
+from api.v1.v1_odk.utils.kobo_outbox import (
+    queue_submission_data,
+)
+from api.v1.v1_odk.utils.resolved_labels import (
+    label_fingerprint,
+)
 from utils.polygon import (
     _extract_first_nonempty,
     _geometry_error_type,
     _split_csv_fields,
     compute_bbox,
+    compute_centroid,
     extract_plot_data,
     find_overlapping_plots,
     parse_wkt_polygon,
     validate_polygon,
     wkt_to_odk_geoshape,
 )
+from utils.task_queue import async_task
 
 logger = logging.getLogger(__name__)
 
@@ -58,7 +65,13 @@ def sync_form_questions(form, content):
     Preserves FieldMapping records by saving
     and restoring them across the question
     rebuild.
+
+    Queues a background re-resolve of stored
+    submission labels when option labels, types
+    or the question set changed.
     """
+    old_fingerprint = label_fingerprint(form)
+
     # Save existing field mappings before delete
     saved_mappings = list(
         FieldMapping.objects.filter(
@@ -187,6 +200,19 @@ def sync_form_questions(form, content):
                 ignore_conflicts=True,
             )
 
+    labels_changed = (
+        label_fingerprint(form) != old_fingerprint
+    )
+    if labels_changed:
+        # Exports resolve option labels
+        bump_data_version(form)
+    if labels_changed and form.submissions.exists():
+        async_task(
+            "api.v1.v1_odk.tasks"
+            ".reresolve_submission_labels",
+            form.pk,
+        )
+
     return len(created_qs)
 
 
@@ -375,6 +401,8 @@ def validate_and_check_plot(plot):
         plot.max_lat = None
         plot.min_lon = None
         plot.max_lon = None
+        plot.centroid_lat = None
+        plot.centroid_lon = None
         plot.save(
             update_fields=[
                 "flagged_for_review",
@@ -383,6 +411,8 @@ def validate_and_check_plot(plot):
                 "max_lat",
                 "min_lon",
                 "max_lon",
+                "centroid_lat",
+                "centroid_lon",
             ]
         )
         return
@@ -402,6 +432,8 @@ def validate_and_check_plot(plot):
         plot.max_lat = None
         plot.min_lon = None
         plot.max_lon = None
+        plot.centroid_lat = None
+        plot.centroid_lon = None
         plot.save(
             update_fields=[
                 "flagged_for_review",
@@ -410,6 +442,8 @@ def validate_and_check_plot(plot):
                 "max_lat",
                 "min_lon",
                 "max_lon",
+                "centroid_lat",
+                "centroid_lon",
             ]
         )
         return
@@ -428,6 +462,8 @@ def validate_and_check_plot(plot):
         plot.max_lat = None
         plot.min_lon = None
         plot.max_lon = None
+        plot.centroid_lat = None
+        plot.centroid_lon = None
         plot.save(
             update_fields=[
                 "flagged_for_review",
@@ -436,6 +472,8 @@ def validate_and_check_plot(plot):
                 "max_lat",
                 "min_lon",
                 "max_lon",
+                "centroid_lat",
+                "centroid_lon",
             ]
         )
         return
@@ -451,6 +489,9 @@ def validate_and_check_plot(plot):
     plot.max_lat = bbox["max_lat"]
     plot.min_lon = bbox["min_lon"]
     plot.max_lon = bbox["max_lon"]
+    plot.centroid_lat, plot.centroid_lon = (
+        compute_centroid(coords)
+    )
     plot.save(
         update_fields=[
             "flagged_for_review",
@@ -459,6 +500,8 @@ def validate_and_check_plot(plot):
             "max_lat",
             "min_lon",
             "max_lon",
+            "centroid_lat",
+            "centroid_lon",
         ]
     )
     check_and_flag_overlaps(plot)
@@ -489,6 +532,10 @@ def rederive_plots(form):
         plot.max_lat = data["max_lat"]
         plot.min_lon = data["min_lon"]
         plot.max_lon = data["max_lon"]
+        plot.centroid_lat = data["centroid_lat"]
+        plot.centroid_lon = data["centroid_lon"]
+        plot.altitude = data["altitude"]
+        plot.altitude_computed = True
         plot.flagged_for_review = data[
             "flagged_for_review"
         ]
@@ -509,6 +556,10 @@ def rederive_plots(form):
                 "max_lat",
                 "min_lon",
                 "max_lon",
+                "centroid_lat",
+                "centroid_lon",
+                "altitude",
+                "altitude_computed",
                 "flagged_for_review",
                 "flagged_reason",
             ],
@@ -567,16 +618,10 @@ def dispatch_kobo_geometry_sync(
     if not odk_geoshape:
         return
 
-    async_task(
-        "api.v1.v1_odk.tasks"
-        ".sync_kobo_submission_geometry",
-        user.kobo_url,
-        user.kobo_username,
-        user.kobo_password,
-        form.asset_uid,
-        plot.submission.kobo_id,
-        polygon_field_name,
-        odk_geoshape,
+    queue_submission_data(
+        user,
+        plot.submission,
+        {polygon_field_name: odk_geoshape},
     )
 
 
@@ -610,6 +655,32 @@ def parse_field_spec(spec):
     ]
 
 
+def parse_sparse_fields(params, allowed):
+    """Parse the ``fields`` (alias ``columns``)
+    query param into a list of field names.
+
+    Returns None when absent or empty.
+    Raises ValidationError for unknown names.
+    """
+    raw = params.get("fields") or params.get(
+        "columns"
+    )
+    names = parse_field_spec(raw)
+    if not names:
+        return None
+    unknown = [n for n in names if n not in allowed]
+    if unknown:
+        raise ValidationError(
+            {
+                "fields": (
+                    "Unknown field(s): "
+                    + ", ".join(unknown)
+                )
+            }
+        )
+    return names
+
+
 def _parse_date_param(params, name):
     """Parse an integer timestamp query param.
 
@@ -7,7 +7,16 @@ from django.core.management.base import (
 from api.v1.v1_odk.constants import (
     ApprovalStatusTypes,
 )
-from api.v1.v1_odk.models import Submission
+from api.v1.v1_odk.models import (
+    FormMetadata,
+    Submission,
+)
+from api.v1.v1_odk.utils.export_cache import (
+    bump_data_version,
+)
+from api.v1.v1_odk.utils.stats_rollup import (
+    refresh_plot_stats,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +59,7 @@ class Command(BaseCommand):
         checked = 0
         updated = 0
         skipped = 0
+        touched_forms = set()
 
         reverse_map = (
             ApprovalStatusTypes.ReverseKoboStatusMap
@@ -99,9 +109,16 @@ class Command(BaseCommand):
                         "approval_status"
                     ]
                 )
+                touched_forms.add(sub.form_id)
 
             updated += 1
 
+        for form in FormMetadata.objects.filter(
+            pk__in=touched_forms
+        ):
+            refresh_plot_stats(form)
+            bump_data_version(form)
+
         if dry_run:
             self.stdout.write(
                 self.style.WARNING(
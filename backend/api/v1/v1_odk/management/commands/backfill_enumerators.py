@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+
+from api.v1.v1_odk.models import FormMetadata
+from api.v1.v1_odk.utils.enumerator_directory import (
+    refresh_enumerators,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the enumerator directory from "
+        "existing submissions, grouping by "
+        "raw_data enumerator_id."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--form",
+            type=str,
+            default=None,
+            help="asset_uid of a specific form",
+        )
+
+    def handle(self, *args, **options):
+        form_uid = options["form"]
+        if form_uid:
+            forms = FormMetadata.objects.filter(
+                asset_uid=form_uid
+            )
+            if not forms.exists():
+                self.stderr.write(
+                    self.style.ERROR(
+                        f"Form {form_uid} not found"
+                    )
+                )
+                return
+        else:
+            forms = FormMetadata.objects.all()
+
+        total = 0
+        for form in forms:
+            count = refresh_enumerators(form)
+            total += count
+            self.stdout.write(
+                f"  {form.asset_uid}: {count}"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Built {total} enumerator row(s)"
+            )
+        )
@@ -0,0 +1,147 @@
+import multiprocessing
+import resource
+import time
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+)
+from django.db import connections
+
+from api.v1.v1_odk.export import (
+    generate_geojson,
+    generate_xlsx,
+)
+from api.v1.v1_odk.models import FormMetadata, Plot
+from utils import storage
+
+GENERATORS = {
+    "xlsx": generate_xlsx,
+    "geojson": generate_geojson,
+}
+
+
+def _first_plots(form, size):
+    """The ``size`` lowest-pk plots of the form
+    as a filterable queryset."""
+    pks = Plot.objects.filter(form=form).order_by(
+        "pk"
+    ).values_list("pk", flat=True)
+    cutoff = pks[size - 1:size].first()
+    if cutoff is None:
+        return None
+    return Plot.objects.filter(
+        form=form, pk__lte=cutoff
+    )
+
+
+def _run(fmt, form_pk, size, queue):
+    """Child process: export and report wall
+    time and peak RSS of this process only."""
+    form = FormMetadata.objects.get(pk=form_pk)
+    qs = _first_plots(form, size)
+    started = time.perf_counter()
+    try:
+        path, count = GENERATORS[fmt](
+            qs, form, f"benchmark_{fmt}_{size}"
+        )
+    except Exception as e:
+        queue.put(e)
+        raise
+    elapsed = time.perf_counter() - started
+    storage.delete(path)
+    # ru_maxrss is in KiB on Linux
+    rss = resource.getrusage(
+        resource.RUSAGE_SELF
+    ).ru_maxrss
+    queue.put((count, elapsed, rss / 1024))
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the plot exporters on the first N "
+        "plots of an existing form and report the "
+        "peak RSS of each run. Each run is a fresh "
+        "process; output files are removed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--form",
+            type=str,
+            required=True,
+            help="asset_uid of the form to export",
+        )
+        parser.add_argument(
+            "--sizes",
+            type=str,
+            default="10000,50000,100000",
+            help="Comma-separated plot counts",
+        )
+        parser.add_argument(
+            "--formats",
+            type=str,
+            default="xlsx",
+            help=(
+                "Comma-separated formats: "
+                + ", ".join(GENERATORS)
+            ),
+        )
+
+    def handle(self, *args, **options):
+        try:
+            form = FormMetadata.objects.get(
+                asset_uid=options["form"]
+            )
+        except FormMetadata.DoesNotExist:
+            raise CommandError(
+                f"Form {options['form']} not found"
+            )
+        sizes = [
+            int(s)
+            for s in options["sizes"].split(",")
+            if s.strip()
+        ]
+        formats = [
+            f.strip()
+            for f in options["formats"].split(",")
+            if f.strip()
+        ]
+        unknown = set(formats) - set(GENERATORS)
+        if unknown:
+            raise CommandError(
+                f"Unknown format(s): {sorted(unknown)}"
+            )
+
+        ctx = multiprocessing.get_context("fork")
+        for fmt in formats:
+            for size in sizes:
+                if _first_plots(form, size) is None:
+                    self.stdout.write(
+                        f"{fmt:<8} n={size:<7} "
+                        "skipped (not enough plots)"
+                    )
+                    continue
+                # Children must open their own
+                # database connections
+                connections.close_all()
+                queue = ctx.Queue()
+                proc = ctx.Process(
+                    target=_run,
+                    args=(fmt, form.pk, size, queue),
+                )
+                proc.start()
+                result = queue.get()
+                proc.join()
+                if isinstance(result, Exception):
+                    raise CommandError(
+                        f"{fmt} n={size} failed: "
+                        f"{result}"
+                    )
+                count, elapsed, rss_mb = result
+                self.stdout.write(
+                    f"{fmt:<8} n={size:<7} "
+                    f"rows={count:<7} "
+                    f"{elapsed:8.1f} s  "
+                    f"peak RSS {rss_mb:8.1f} MB"
+                )
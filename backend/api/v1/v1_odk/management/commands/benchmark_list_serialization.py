@@ -0,0 +1,166 @@
+import time
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+)
+
+from api.v1.v1_odk.models import (
+    FormMetadata,
+    Plot,
+    Submission,
+)
+from api.v1.v1_odk.serializers import (
+    PlotSerializer,
+    SubmissionListSerializer,
+    build_option_lookup,
+)
+from api.v1.v1_odk.utils.fast_list import (
+    build_plot_rows,
+    build_submission_rows,
+    plot_values,
+    serialize_by_pk,
+    submission_values,
+)
+
+
+def _timed(func, repeat):
+    """Best-of-N wall time in milliseconds."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(
+            best, elapsed
+        )
+    return best
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the serializer and values() read "
+        "paths of the submission and plot list "
+        "endpoints on existing data. Read-only."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--form",
+            type=str,
+            required=True,
+            help="asset_uid of the form to read",
+        )
+        parser.add_argument(
+            "--sizes",
+            type=str,
+            default="100,500,1000",
+            help="Comma-separated page sizes",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Runs per measurement (best kept)",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            form = FormMetadata.objects.get(
+                asset_uid=options["form"]
+            )
+        except FormMetadata.DoesNotExist:
+            raise CommandError(
+                f"Form {options['form']} not found"
+            )
+        sizes = [
+            int(s)
+            for s in options["sizes"].split(",")
+            if s.strip()
+        ]
+        repeat = max(options["repeat"], 1)
+
+        option_map, type_map = build_option_lookup(
+            form
+        )
+        sub_serializer = SubmissionListSerializer(
+            context={
+                "option_lookup": option_map,
+                "type_map": type_map,
+                "question_names": set(
+                    form.questions.values_list(
+                        "name", flat=True
+                    )
+                ),
+            }
+        )
+        plot_serializer = PlotSerializer()
+        subs = (
+            Submission.objects.filter(form=form)
+            .prefetch_related(
+                "main_plot_submission__main_plot"
+            )
+            .order_by("-submission_time")
+        )
+        plots = (
+            Plot.objects.filter(form=form)
+            .select_related("submission")
+            .prefetch_related(
+                "submission__"
+                "main_plot_submission__"
+                "main_plot"
+            )
+            .order_by("-submission__submission_time")
+        )
+        cases = [
+            (
+                "submissions",
+                subs,
+                sub_serializer,
+                submission_values,
+                build_submission_rows,
+            ),
+            (
+                "plots",
+                plots,
+                plot_serializer,
+                plot_values,
+                build_plot_rows,
+            ),
+        ]
+
+        for name, qs, serializer, values, build in cases:
+            serializer_class = type(serializer)
+            for size in sizes:
+
+                def slow():
+                    serializer_class(
+                        list(qs[:size]),
+                        many=True,
+                        context=serializer.context,
+                    ).data
+
+                def fast():
+                    build(
+                        list(
+                            values(
+                                qs, serializer.fields
+                            )[:size]
+                        ),
+                        serializer,
+                        lambda pks: serialize_by_pk(
+                            qs, serializer, pks
+                        ),
+                    )
+
+                slow_ms = _timed(slow, repeat)
+                fast_ms = _timed(fast, repeat)
+                ratio = (
+                    slow_ms / fast_ms if fast_ms else 0
+                )
+                self.stdout.write(
+                    f"{name:<12} n={size:<5} "
+                    f"serializer {slow_ms:8.1f} ms  "
+                    f"values {fast_ms:8.1f} ms  "
+                    f"({ratio:.1f}x)"
+                )
@@ -0,0 +1,173 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F
+
+from api.v1.v1_odk.models import (
+    FormMetadata,
+    Plot,
+    PlotStatsRollup,
+    PlotTimeseriesRollup,
+)
+from api.v1.v1_odk.utils.stats_rollup import (
+    live_rollup_rows,
+    refresh_plot_stats,
+    timeseries_rows,
+)
+
+
+def _key(day, region, sub_region, status):
+    return (day, region, sub_region, status)
+
+
+def _compare(live_rows, stored_rows, key):
+    """Diff (count, area) per key between live
+    rows and stored rollup rows."""
+    live = {}
+    for r in live_rows:
+        count, area = live.get(key(r), (0, 0))
+        live[key(r)] = (
+            count + r["plot_count"],
+            round(area + (r["total_area"] or 0), 6),
+        )
+    stored = {}
+    for r in stored_rows:
+        count, area = stored.get(key(r), (0, 0))
+        stored[key(r)] = (
+            count + r["plot_count"],
+            round(area + r["area_ha"], 6),
+        )
+    diffs = []
+    for k in sorted(set(live) | set(stored), key=str):
+        expected = live.get(k, (0, 0))
+        actual = stored.get(k, (0, 0))
+        if expected != actual:
+            diffs.append(
+                f"{k}: rollup {actual}, "
+                f"live {expected}"
+            )
+    return diffs
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the plot stats and timeseries "
+        "rollups against live plot data and "
+        "optionally rebuild forms that drifted "
+        "or were never built."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--form",
+            type=str,
+            default=None,
+            help="asset_uid of a specific form",
+        )
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Rebuild inconsistent forms",
+        )
+
+    def _diff(self, form):
+        """Return a list of human-readable
+        differences for one form."""
+        diffs = _compare(
+            live_rollup_rows(form),
+            PlotStatsRollup.objects.filter(
+                form=form
+            ).values(
+                "day",
+                "region",
+                "sub_region",
+                "plot_count",
+                "area_ha",
+                status=F("approval_status"),
+            ),
+            lambda r: _key(
+                r["day"],
+                r["region"],
+                r["sub_region"],
+                r["status"],
+            ),
+        )
+        diffs += _compare(
+            timeseries_rows(
+                Plot.objects.filter(form=form)
+            ),
+            PlotTimeseriesRollup.objects.filter(
+                form=form
+            ).values(
+                "event",
+                "day",
+                "region",
+                "sub_region",
+                "enumerator",
+                "plot_count",
+                "area_ha",
+                status=F("approval_status"),
+            ),
+            lambda r: (
+                r["event"],
+                r["day"],
+                r["region"],
+                r["sub_region"],
+                r["enumerator"],
+                r["status"],
+            ),
+        )
+        return diffs
+
+    def handle(self, *args, **options):
+        form_uid = options["form"]
+        forms = FormMetadata.objects.all()
+        if form_uid:
+            forms = forms.filter(asset_uid=form_uid)
+            if not forms.exists():
+                self.stderr.write(
+                    self.style.ERROR(
+                        f"Form {form_uid} not found"
+                    )
+                )
+                return
+
+        bad = 0
+        for form in forms:
+            if not form.stats_rollup_ready:
+                diffs = ["rollup not built"]
+            else:
+                diffs = self._diff(form)
+            if not diffs:
+                self.stdout.write(
+                    f"  {form.asset_uid}: OK"
+                )
+                continue
+            bad += 1
+            self.stdout.write(
+                self.style.WARNING(
+                    f"  {form.asset_uid}: "
+                    f"{len(diffs)} difference(s)"
+                )
+            )
+            for diff in diffs[:20]:
+                self.stdout.write(f"    {diff}")
+            if options["fix"]:
+                refresh_plot_stats(form)
+                self.stdout.write(
+                    f"    rebuilt {form.asset_uid}"
+                )
+
+        if bad and not options["fix"]:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{bad} form(s) inconsistent; "
+                    f"rerun with --fix to rebuild"
+                )
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    "Stats rollup consistent"
+                    if not bad
+                    else f"Rebuilt {bad} form(s)"
+                )
+            )
@@ -8,6 +8,10 @@ from api.v1.v1_odk.models import (
 from api.v1.v1_odk.utils.farmer_sync import (
     sync_farmers_for_form,
 )
+from api.v1.v1_odk.utils.uid_allocator import (
+    FARMER_SCOPE,
+    reseed_counter,
+)
 
 
 class Command(BaseCommand):
@@ -34,10 +38,21 @@ class Command(BaseCommand):
                 "to a specific form's farmers."
             ),
         )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            default=False,
+            help=(
+                "Re-process every submission "
+                "instead of only changed ones. "
+                "Implied by --clean."
+            ),
+        )
 
     def handle(self, *args, **options):
         form_uid = options["form"]
         clean = options["clean"]
+        full = clean or options["full"]
 
         if form_uid:
             try:
@@ -69,7 +84,9 @@ class Command(BaseCommand):
         total_linked = 0
 
         for form in forms:
-            result = sync_farmers_for_form(form)
+            result = sync_farmers_for_form(
+                form, full=full
+            )
             total_created += result["created"]
             total_updated += result["updated"]
             total_linked += result["linked"]
@@ -130,5 +147,8 @@ class Command(BaseCommand):
         )
         deleted_count = orphaned.count()
         orphaned.delete()
+        # Let re-synced farmers reuse the freed
+        # UIDs, as before the UID counter existed
+        reseed_counter(FARMER_SCOPE)
 
         return deleted_count
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.28 on 2026-10-19 04:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("v1_odk", "0014_mainplotsubmission_onetoone"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="submission",
+            name="resolved_data",
+            field=models.JSONField(
+                blank=True,
+                help_text="Question-level raw_data values with select options resolved to labels. NULL means labels are not resolved yet and readers fall back to raw_data.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="submission",
+            name="resolved_enumerator",
+            field=models.CharField(
+                blank=True,
+                help_text="Enumerator label resolved from enumerator_id at ingest time",
+                max_length=500,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="submission",
+            name="resolved_region",
+            field=models.CharField(
+                blank=True,
+                help_text="Region label resolved from region_field at ingest time",
+                max_length=500,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="submission",
+            name="resolved_sub_region",
+            field=models.CharField(
+                blank=True,
+                help_text="Sub-region label resolved from sub_region_field at ingest time",
+                max_length=500,
+                null=True,
+            ),
+        ),
+    ]
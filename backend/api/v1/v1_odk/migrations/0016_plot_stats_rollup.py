@@ -0,0 +1,70 @@
+# Generated by Django 4.2.28 on 2026-10-19 04:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("v1_odk", "0015_submission_resolved_labels"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="formmetadata",
+            name="stats_rollup_ready",
+            field=models.BooleanField(
+                default=False,
+                help_text="True once PlotStatsRollup was fully built for this form; stats fall back to live queries until then.",
+            ),
+        ),
+        migrations.CreateModel(
+            name="PlotStatsRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "day",
+                    models.IntegerField(
+                        blank=True,
+                        help_text="UTC day of submission_time as days since epoch; NULL for plots without a submission",
+                        null=True,
+                    ),
+                ),
+                ("region", models.CharField(max_length=255)),
+                ("sub_region", models.CharField(max_length=255)),
+                (
+                    "approval_status",
+                    models.IntegerField(
+                        blank=True,
+                        choices=[(1, "Approved"), (2, "Not approved")],
+                        null=True,
+                    ),
+                ),
+                ("plot_count", models.PositiveIntegerField(default=0)),
+                ("area_ha", models.FloatField(default=0)),
+                (
+                    "form",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stats_rollup",
+                        to="v1_odk.formmetadata",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "plot_stats_rollup",
+                "indexes": [
+                    models.Index(fields=["form", "day"], name="plot_stats_form_day_idx")
+                ],
+            },
+        ),
+    ]
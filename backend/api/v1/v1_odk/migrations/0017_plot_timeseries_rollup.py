@@ -0,0 +1,77 @@
+# Generated by Django 4.2.28 on 2026-10-19 05:06
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def reset_rollup_ready(apps, schema_editor):
+    # Forms built before this table existed need a
+    # full rebuild (check_stats_rollup --fix)
+    FormMetadata = apps.get_model("v1_odk", "FormMetadata")
+    FormMetadata.objects.update(stats_rollup_ready=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("v1_odk", "0016_plot_stats_rollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PlotTimeseriesRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "event",
+                    models.CharField(
+                        choices=[
+                            ("collected", "Collected"),
+                            ("approved", "Approved"),
+                            ("rejected", "Rejected"),
+                        ],
+                        max_length=16,
+                    ),
+                ),
+                ("day", models.IntegerField(help_text="UTC days since epoch")),
+                ("region", models.CharField(max_length=255)),
+                ("sub_region", models.CharField(max_length=255)),
+                ("enumerator", models.CharField(blank=True, max_length=500, null=True)),
+                (
+                    "approval_status",
+                    models.IntegerField(
+                        blank=True,
+                        choices=[(1, "Approved"), (2, "Not approved")],
+                        null=True,
+                    ),
+                ),
+                ("plot_count", models.PositiveIntegerField(default=0)),
+                ("area_ha", models.FloatField(default=0)),
+                (
+                    "form",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="timeseries_rollup",
+                        to="v1_odk.formmetadata",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "plot_timeseries_rollup",
+                "indexes": [
+                    models.Index(fields=["form", "day"], name="plot_ts_form_day_idx")
+                ],
+            },
+        ),
+        migrations.RunPython(
+            reset_rollup_ready, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.28 on 2026-10-19 05:16
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("v1_odk", "0017_plot_timeseries_rollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FormFilterCatalog",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("data", models.JSONField(default=dict)),
+                ("etag", models.CharField(max_length=64)),
+                ("built_at", models.DateTimeField(auto_now=True)),
+                (
+                    "form",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="filter_catalog",
+                        to="v1_odk.formmetadata",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "form_filter_catalogs",
+            },
+        ),
+    ]
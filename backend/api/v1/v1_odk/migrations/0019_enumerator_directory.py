@@ -0,0 +1,66 @@
+# Generated by Django 4.2.28 on 2026-10-19 05:22
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("v1_odk", "0018_form_filter_catalog"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="formmetadata",
+            name="enumerators_ready",
+            field=models.BooleanField(
+                default=False,
+                help_text="True once the Enumerator directory was built for this form; it is built on first use otherwise.",
+            ),
+        ),
+        migrations.CreateModel(
+            name="Enumerator",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("code", models.CharField(max_length=255)),
+                ("name", models.CharField(max_length=500)),
+                ("submission_count", models.PositiveIntegerField(default=0)),
+                ("approved_count", models.PositiveIntegerField(default=0)),
+                ("rejected_count", models.PositiveIntegerField(default=0)),
+                (
+                    "last_seen_at",
+                    models.BigIntegerField(
+                        blank=True,
+                        help_text="Latest submission_time (epoch ms)",
+                        null=True,
+                    ),
+                ),
+                (
+                    "form",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="enumerators",
+                        to="v1_odk.formmetadata",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "enumerators",
+                "indexes": [
+                    models.Index(
+                        fields=["form", "name"], name="enumerator_form_name_idx"
+                    )
+                ],
+                "unique_together": {("form", "code")},
+            },
+        ),
+    ]
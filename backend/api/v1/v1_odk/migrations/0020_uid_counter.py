@@ -0,0 +1,78 @@
+# Generated by Django 4.2.28 on 2026-10-19 05:33
+
+from django.db import migrations, models
+from django.db.models import IntegerField, Max
+from django.db.models.functions import Cast, Substr
+
+PLOT_PREFIX_LEN = len("PLT")
+
+
+def seed_counters(apps, schema_editor):
+    """Start the counters at the current UID
+    maxima."""
+    Farmer = apps.get_model("v1_odk", "Farmer")
+    MainPlot = apps.get_model("v1_odk", "MainPlot")
+    UidCounter = apps.get_model("v1_odk", "UidCounter")
+    farmer_max = Farmer.objects.aggregate(
+        m=Max(Cast("uid", IntegerField()))
+    )["m"]
+    # Scopes without rows are seeded on first use
+    counters = []
+    if farmer_max is not None:
+        counters.append(
+            UidCounter(scope="farmer", last_value=farmer_max)
+        )
+    plot_maxima = (
+        MainPlot.objects.values("form_id")
+        .annotate(
+            m=Max(
+                Cast(
+                    Substr("uid", PLOT_PREFIX_LEN + 1),
+                    IntegerField(),
+                )
+            )
+        )
+        .order_by()
+    )
+    for row in plot_maxima:
+        if row["m"] is None:
+            continue
+        counters.append(
+            UidCounter(
+                scope=f"plot:{row['form_id']}",
+                last_value=row["m"],
+            )
+        )
+    UidCounter.objects.bulk_create(counters)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("v1_odk", "0019_enumerator_directory"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UidCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("scope", models.CharField(max_length=64, unique=True)),
+                ("last_value", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "db_table": "uid_counters",
+            },
+        ),
+        migrations.RunPython(
+            seed_counters, migrations.RunPython.noop
+        ),
+    ]
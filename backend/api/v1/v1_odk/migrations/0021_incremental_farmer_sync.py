@@ -0,0 +1,43 @@
+# Generated by Django 4.2.28 on 2026-10-19 05:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("v1_odk", "0020_uid_counter"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="farmerfieldmapping",
+            name="synced_signature",
+            field=models.CharField(
+                blank=True,
+                help_text="Signature of the fields and option labels the last farmer sync used; a change forces a full rebuild",
+                max_length=40,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="submission",
+            name="content_hash",
+            field=models.CharField(
+                blank=True,
+                help_text="SHA-1 of raw_data, rewritten on every raw_data write",
+                max_length=40,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="submission",
+            name="farmer_synced_hash",
+            field=models.CharField(
+                blank=True,
+                help_text="content_hash seen by the last farmer sync; a mismatch marks the submission for the next incremental run",
+                max_length=40,
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.28 on 2026-10-19 05:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("v1_odk", "0021_incremental_farmer_sync"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="plot",
+            name="altitude",
+            field=models.FloatField(
+                blank=True,
+                help_text="Average altitude of the raw ODK geoshape vertices",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="plot",
+            name="centroid_lat",
+            field=models.FloatField(
+                blank=True, help_text="Pre-computed polygon centroid", null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="plot",
+            name="centroid_lon",
+            field=models.FloatField(
+                blank=True, help_text="Pre-computed polygon centroid", null=True
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.28 on 2026-10-19 06:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("v1_odk", "0022_plot_centroid_altitude"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="formmetadata",
+            name="data_version",
+            field=models.BigIntegerField(
+                default=0,
+                help_text="Bumped whenever exported plot data of this form changes; part of the export cache key.",
+            ),
+        ),
+    ]
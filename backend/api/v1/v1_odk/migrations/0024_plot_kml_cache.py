@@ -0,0 +1,40 @@
+# Generated by Django 4.2.28 on 2026-10-19 06:44
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("v1_odk", "0023_form_data_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PlotKml",
+            fields=[
+                (
+                    "plot",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="kml_cache",
+                        serialize=False,
+                        to="v1_odk.plot",
+                    ),
+                ),
+                ("version", models.CharField(max_length=40)),
+                (
+                    "kml",
+                    models.TextField(
+                        blank=True, help_text="Empty for invalid geometry"
+                    ),
+                ),
+                ("rendered_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "plot_kml",
+            },
+        ),
+    ]
@@ -0,0 +1,94 @@
+# Generated by Django 4.2.28 on 2026-10-19 07:03
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("v1_odk", "0024_plot_kml_cache"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="KoboOutbox",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("kind", models.CharField(max_length=20)),
+                ("approval_status", models.IntegerField(blank=True, null=True)),
+                ("data", models.JSONField(blank=True, null=True)),
+                ("status", models.CharField(default="pending", max_length=20)),
+                ("attempts", models.IntegerField(default=0)),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("last_error", models.TextField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("sent_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "audit",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="kobo_outbox",
+                        to="v1_odk.rejectionaudit",
+                    ),
+                ),
+                (
+                    "form",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="kobo_outbox",
+                        to="v1_odk.formmetadata",
+                    ),
+                ),
+                (
+                    "submission",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="kobo_outbox",
+                        to="v1_odk.submission",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        help_text="Whose Kobo credentials to use",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="kobo_outbox",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "kobo_outbox",
+                "indexes": [
+                    models.Index(
+                        fields=["status", "next_attempt_at"], name="kobo_outbox_due_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="kobooutbox",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("status", "pending")),
+                fields=("submission", "kind"),
+                name="kobo_outbox_one_pending",
+            ),
+        ),
+    ]
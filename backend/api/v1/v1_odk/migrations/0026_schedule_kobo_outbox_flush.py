@@ -0,0 +1,41 @@
+# Generated by Django 4.2.28 on 2026-10-19 07:03
+
+from django.db import migrations
+
+FLUSH_FUNC = "api.v1.v1_odk.utils.kobo_outbox.flush_kobo_outbox"
+
+
+def schedule_flush(apps, schema_editor):
+    # Run by the kobo-writeback qcluster every
+    # minute
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.update_or_create(
+        name="flush_kobo_outbox",
+        defaults={
+            "func": FLUSH_FUNC,
+            "schedule_type": "I",
+            "minutes": 1,
+            "repeats": -1,
+            "cluster": "kobo-writeback",
+        },
+    )
+
+
+def unschedule_flush(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.filter(func=FLUSH_FUNC).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("v1_odk", "0025_kobo_outbox"),
+        (
+            "django_q",
+            "0019_alter_task_options_alter_ormq_key_alter_ormq_lock_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.RunPython(schedule_flush, unschedule_flush),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.28 on 2026-10-19 07:10
+
+from django.db import migrations, models
+
+RETRY_FUNC = "api.v1.v1_odk.utils.kobo_outbox.retry_failed_audits"
+
+
+def schedule_retry(apps, schema_editor):
+    # Run by the kobo-writeback qcluster every
+    # 5 minutes
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.update_or_create(
+        name="retry_failed_audits",
+        defaults={
+            "func": RETRY_FUNC,
+            "schedule_type": "I",
+            "minutes": 5,
+            "repeats": -1,
+            "cluster": "kobo-writeback",
+        },
+    )
+
+
+def unschedule_retry(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.filter(func=RETRY_FUNC).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("v1_odk", "0026_schedule_kobo_outbox_flush"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="rejectionaudit",
+            name="next_retry_at",
+            field=models.DateTimeField(
+                blank=True, help_text="Earliest retry by retry_failed_audits", null=True
+            ),
+        ),
+        migrations.RunPython(schedule_retry, unschedule_retry),
+    ]
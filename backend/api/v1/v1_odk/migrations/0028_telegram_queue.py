@@ -0,0 +1,54 @@
+# Generated by Django 4.2.28 on 2026-10-19 07:17
+
+from django.db import migrations, models
+
+DISPATCH_FUNC = "api.v1.v1_odk.tasks.dispatch_telegram_notifications"
+
+
+def schedule_dispatch(apps, schema_editor):
+    # Picks up notifications left queued by rate
+    # limits or send errors
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.update_or_create(
+        name="dispatch_telegram_notifications",
+        defaults={
+            "func": DISPATCH_FUNC,
+            "schedule_type": "I",
+            "minutes": 1,
+            "repeats": -1,
+            "cluster": "notify",
+        },
+    )
+
+
+def unschedule_dispatch(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.filter(func=DISPATCH_FUNC).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("v1_odk", "0027_audit_retry"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="rejectionaudit",
+            name="telegram_queued_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Waiting for dispatch_telegram_notifications",
+                null=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rejectionaudit",
+            index=models.Index(
+                condition=models.Q(("telegram_queued_at__isnull", False)),
+                fields=["telegram_queued_at"],
+                name="rejection_tg_queued_idx",
+            ),
+        ),
+        migrations.RunPython(schedule_dispatch, unschedule_dispatch),
+    ]
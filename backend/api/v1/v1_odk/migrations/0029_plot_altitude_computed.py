@@ -0,0 +1,34 @@
+# Generated by Django 4.2.28 on 2026-10-19 08:09
+
+from django.db import migrations, models
+
+
+def mark_derived(apps, schema_editor):
+    # Rows with an altitude were derived already;
+    # the rest keep the export-time fallback until
+    # they are re-derived
+    Plot = apps.get_model("v1_odk", "Plot")
+    Plot.objects.filter(altitude__isnull=False).update(
+        altitude_computed=True
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("v1_odk", "0028_telegram_queue"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="plot",
+            name="altitude_computed",
+            field=models.BooleanField(
+                default=False,
+                help_text="altitude was derived from the raw data (it may still be empty)",
+            ),
+        ),
+        migrations.RunPython(
+            mark_derived, migrations.RunPython.noop
+        ),
+    ]
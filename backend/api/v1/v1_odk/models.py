@@ -2,6 +2,7 @@ import uuid
 
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 from api.v1.v1_odk.constants import (
     ApprovalStatusTypes,
@@ -94,6 +95,30 @@ class FormMetadata(models.Model):
             "after PLT00350)."
         ),
     )
+    stats_rollup_ready = models.BooleanField(
+        default=False,
+        help_text=(
+            "True once PlotStatsRollup was fully "
+            "built for this form; stats fall back "
+            "to live queries until then."
+        ),
+    )
+    enumerators_ready = models.BooleanField(
+        default=False,
+        help_text=(
+            "True once the Enumerator directory "
+            "was built for this form; it is built "
+            "on first use otherwise."
+        ),
+    )
+    data_version = models.BigIntegerField(
+        default=0,
+        help_text=(
+            "Bumped whenever exported plot data of "
+            "this form changes; part of the export "
+            "cache key."
+        ),
+    )
 
     class Meta:
         db_table = "form_metadata"
@@ -159,6 +184,63 @@ class Submission(models.Model):
         blank=True,
         help_text="Timestamp of last validator action",
     )
+    resolved_region = models.CharField(
+        max_length=500,
+        null=True,
+        blank=True,
+        help_text=(
+            "Region label resolved from "
+            "region_field at ingest time"
+        ),
+    )
+    resolved_sub_region = models.CharField(
+        max_length=500,
+        null=True,
+        blank=True,
+        help_text=(
+            "Sub-region label resolved from "
+            "sub_region_field at ingest time"
+        ),
+    )
+    resolved_enumerator = models.CharField(
+        max_length=500,
+        null=True,
+        blank=True,
+        help_text=(
+            "Enumerator label resolved from "
+            "enumerator_id at ingest time"
+        ),
+    )
+    resolved_data = models.JSONField(
+        null=True,
+        blank=True,
+        help_text=(
+            "Question-level raw_data values with "
+            "select options resolved to labels. "
+            "NULL means labels are not resolved "
+            "yet and readers fall back to "
+            "raw_data."
+        ),
+    )
+    content_hash = models.CharField(
+        max_length=40,
+        null=True,
+        blank=True,
+        help_text=(
+            "SHA-1 of raw_data, rewritten on "
+            "every raw_data write"
+        ),
+    )
+    farmer_synced_hash = models.CharField(
+        max_length=40,
+        null=True,
+        blank=True,
+        help_text=(
+            "content_hash seen by the last farmer "
+            "sync; a mismatch marks the submission "
+            "for the next incremental run"
+        ),
+    )
 
     class Meta:
         db_table = "submissions"
@@ -200,6 +282,31 @@ class Plot(models.Model):
     max_lat = models.FloatField(null=True, blank=True, db_index=True)
     min_lon = models.FloatField(null=True, blank=True, db_index=True)
     max_lon = models.FloatField(null=True, blank=True, db_index=True)
+    centroid_lat = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Pre-computed polygon centroid",
+    )
+    centroid_lon = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Pre-computed polygon centroid",
+    )
+    altitude = models.FloatField(
+        null=True,
+        blank=True,
+        help_text=(
+            "Average altitude of the raw ODK "
+            "geoshape vertices"
+        ),
+    )
+    altitude_computed = models.BooleanField(
+        default=False,
+        help_text=(
+            "altitude was derived from the raw "
+            "data (it may still be empty)"
+        ),
+    )
     form = models.ForeignKey(
         FormMetadata,
         on_delete=models.CASCADE,
@@ -303,10 +410,20 @@ class RejectionAudit(models.Model):
         null=True,
         blank=True,
     )
+    next_retry_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Earliest retry by retry_failed_audits",
+    )
     synced_at = models.DateTimeField(
         null=True,
         blank=True,
     )
+    telegram_queued_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Waiting for dispatch_telegram_notifications",
+    )
     telegram_sent_at = models.DateTimeField(
         null=True,
         blank=True,
@@ -324,6 +441,15 @@ class RejectionAudit(models.Model):
     class Meta:
         db_table = "rejection_audits"
         ordering = ["-rejected_at"]
+        indexes = [
+            models.Index(
+                fields=["telegram_queued_at"],
+                name="rejection_tg_queued_idx",
+                condition=models.Q(
+                    telegram_queued_at__isnull=False
+                ),
+            ),
+        ]
 
     def __str__(self):
         return (
@@ -468,6 +594,16 @@ class FarmerFieldMapping(models.Model):
             "AB00350)."
         ),
     )
+    synced_signature = models.CharField(
+        max_length=40,
+        null=True,
+        blank=True,
+        help_text=(
+            "Signature of the fields and option "
+            "labels the last farmer sync used; "
+            "a change forces a full rebuild"
+        ),
+    )
 
     class Meta:
         db_table = "farmer_field_mapping"
@@ -541,3 +677,318 @@ class MainPlotSubmission(models.Model):
 
     def __str__(self):
         return f"{self.main_plot.uid} - {self.submission.kobo_id}"
+
+
+class PlotStatsRollup(models.Model):
+    """Per-form plot counts and areas grouped by
+    the dimensions the dashboard stats filter on.
+
+    Maintained by utils.stats_rollup; rows for a
+    day are rebuilt whenever a plot or its
+    submission changes.
+    """
+
+    form = models.ForeignKey(
+        FormMetadata,
+        on_delete=models.CASCADE,
+        related_name="stats_rollup",
+    )
+    day = models.IntegerField(
+        null=True,
+        blank=True,
+        help_text=(
+            "UTC day of submission_time as days "
+            "since epoch; NULL for plots without "
+            "a submission"
+        ),
+    )
+    region = models.CharField(max_length=255)
+    sub_region = models.CharField(max_length=255)
+    approval_status = models.IntegerField(
+        choices=ApprovalStatus.choices,
+        null=True,
+        blank=True,
+    )
+    plot_count = models.PositiveIntegerField(
+        default=0
+    )
+    area_ha = models.FloatField(default=0)
+
+    class Meta:
+        db_table = "plot_stats_rollup"
+        indexes = [
+            models.Index(
+                fields=["form", "day"],
+                name="plot_stats_form_day_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.form_id} {self.day} "
+            f"{self.region}/{self.sub_region}"
+        )
+
+
+class TimeseriesEvent(models.TextChoices):
+    COLLECTED = "collected", "Collected"
+    APPROVED = "approved", "Approved"
+    REJECTED = "rejected", "Rejected"
+
+
+class PlotTimeseriesRollup(models.Model):
+    """Daily plot events for the timeseries chart.
+
+    ``collected`` rows are bucketed by the
+    submission_time day; ``approved``/``rejected``
+    rows by the day of the review (updated_at,
+    falling back to submission_time for reviews
+    made in Kobo). Maintained alongside
+    PlotStatsRollup by utils.stats_rollup.
+    """
+
+    form = models.ForeignKey(
+        FormMetadata,
+        on_delete=models.CASCADE,
+        related_name="timeseries_rollup",
+    )
+    event = models.CharField(
+        max_length=16,
+        choices=TimeseriesEvent.choices,
+    )
+    day = models.IntegerField(
+        help_text="UTC days since epoch",
+    )
+    region = models.CharField(max_length=255)
+    sub_region = models.CharField(max_length=255)
+    enumerator = models.CharField(
+        max_length=500,
+        null=True,
+        blank=True,
+    )
+    approval_status = models.IntegerField(
+        choices=ApprovalStatus.choices,
+        null=True,
+        blank=True,
+    )
+    plot_count = models.PositiveIntegerField(
+        default=0
+    )
+    area_ha = models.FloatField(default=0)
+
+    class Meta:
+        db_table = "plot_timeseries_rollup"
+        indexes = [
+            models.Index(
+                fields=["form", "day"],
+                name="plot_ts_form_day_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.form_id} {self.day} {self.event}"
+
+
+class FormFilterCatalog(models.Model):
+    """Per-form filter dropdown catalogue.
+
+    Regions, sub-regions by region (with resolved
+    labels) and filter question options with plot
+    counts, rebuilt on sync and question sync and
+    served by plots/filter_options with an ETag.
+    """
+
+    form = models.OneToOneField(
+        FormMetadata,
+        on_delete=models.CASCADE,
+        related_name="filter_catalog",
+    )
+    data = models.JSONField(default=dict)
+    etag = models.CharField(max_length=64)
+    built_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "form_filter_catalogs"
+
+    def __str__(self):
+        return f"{self.form_id} {self.etag}"
+
+
+class Enumerator(models.Model):
+    """Per-form enumerator directory.
+
+    One row per distinct raw_data enumerator_id,
+    with its resolved name and submission counts.
+    Maintained by utils.enumerator_directory on
+    sync, review and edit.
+    """
+
+    form = models.ForeignKey(
+        FormMetadata,
+        on_delete=models.CASCADE,
+        related_name="enumerators",
+    )
+    code = models.CharField(max_length=255)
+    name = models.CharField(max_length=500)
+    submission_count = models.PositiveIntegerField(
+        default=0
+    )
+    approved_count = models.PositiveIntegerField(
+        default=0
+    )
+    rejected_count = models.PositiveIntegerField(
+        default=0
+    )
+    last_seen_at = models.BigIntegerField(
+        null=True,
+        blank=True,
+        help_text=(
+            "Latest submission_time (epoch ms)"
+        ),
+    )
+
+    class Meta:
+        db_table = "enumerators"
+        unique_together = ("form", "code")
+        indexes = [
+            models.Index(
+                fields=["form", "name"],
+                name="enumerator_form_name_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.code} ({self.name})"
+
+
+class UidCounter(models.Model):
+    """Last allocated number of a UID sequence.
+
+    ``farmer`` holds the global farmer UID
+    counter and ``plot:<form pk>`` the per-form
+    PLT counters. Rows are locked with SELECT ...
+    FOR UPDATE by utils.uid_allocator.
+    """
+
+    scope = models.CharField(
+        max_length=64,
+        unique=True,
+    )
+    last_value = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = "uid_counters"
+
+    def __str__(self):
+        return f"{self.scope}={self.last_value}"
+
+
+class PlotKml(models.Model):
+    """Rendered KML of a plot for plots/{uuid}/kml.
+
+    ``version`` is a hash of the inputs of the
+    rendering (polygon WKT and name); a row with
+    another version is stale and re-rendered on
+    the next request. It doubles as the ETag.
+    """
+
+    plot = models.OneToOneField(
+        Plot,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="kml_cache",
+    )
+    version = models.CharField(max_length=40)
+    kml = models.TextField(
+        blank=True,
+        help_text="Empty for invalid geometry",
+    )
+    rendered_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "plot_kml"
+
+    def __str__(self):
+        return f"{self.plot_id} {self.version}"
+
+
+class KoboOutbox(models.Model):
+    """A local change waiting to be written back
+    to KoboToolbox.
+
+    Rows are sent in bulk by flush_kobo_outbox.
+    There is at most one pending row per
+    submission and kind: a later review replaces
+    the pending status and later edits are merged
+    into the pending data.
+    """
+
+    kind = models.CharField(max_length=20)
+    form = models.ForeignKey(
+        FormMetadata,
+        on_delete=models.CASCADE,
+        related_name="kobo_outbox",
+    )
+    submission = models.ForeignKey(
+        Submission,
+        on_delete=models.CASCADE,
+        related_name="kobo_outbox",
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="kobo_outbox",
+        help_text="Whose Kobo credentials to use",
+    )
+    approval_status = models.IntegerField(
+        null=True, blank=True
+    )
+    data = models.JSONField(null=True, blank=True)
+    audit = models.ForeignKey(
+        RejectionAudit,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="kobo_outbox",
+    )
+    status = models.CharField(
+        max_length=20,
+        default=SyncStatus.PENDING,
+    )
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now
+    )
+    last_error = models.TextField(
+        null=True, blank=True
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True
+    )
+    sent_at = models.DateTimeField(
+        null=True, blank=True
+    )
+
+    class Meta:
+        db_table = "kobo_outbox"
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_at"],
+                name="kobo_outbox_due_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["submission", "kind"],
+                condition=models.Q(
+                    status=SyncStatus.PENDING
+                ),
+                name="kobo_outbox_one_pending",
+            ),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.kind} of {self.submission_id} "
+            f"({self.status})"
+        )
@@ -3,15 +3,28 @@ import re
 
 from django.conf import settings as django_settings
 from django.db.models import (
+    BooleanField,
     Count,
     Exists,
+    ExpressionWrapper,
+    Max,
+    Min,
     OuterRef,
     Q,
     Sum,
 )
-from django.http import HttpResponse
-from django_q.tasks import async_task
-from drf_spectacular.utils import extend_schema
+from django.db.models.functions import Lower
+from django.http import (
+    HttpResponse,
+    StreamingHttpResponse,
+)
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_etags
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import (
+    OpenApiParameter,
+    extend_schema,
+)
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.mixins import (
@@ -36,41 +49,118 @@ from api.v1.v1_jobs.serializers import JobSerializer
 from api.v1.v1_odk.constants import (
     ApprovalStatusTypes,
 )
-from api.v1.v1_odk.export import _wkt_to_kml
+from api.v1.v1_odk.export import (
+    filtered_plots,
+    stream_export,
+    with_geometry,
+)
 from api.v1.v1_odk.funcs import (
     check_and_flag_overlaps,
     dispatch_kobo_geometry_sync,
     parse_date_range,
+    parse_sparse_fields,
     strip_id_prefix,
     validate_and_check_plot,
 )
 from api.v1.v1_odk.models import (
+    Enumerator,
     Farmer,
     FarmerFieldMapping,
+    FormFilterCatalog,
     FormMetadata,
     FormQuestion,
     MainPlotSubmission,
     Plot,
-    Submission,
 )
 from api.v1.v1_odk.serializers import (
     PlotOverlapQuerySerializer,
     PlotSerializer,
     StatsSerializer,
-    build_option_lookup,
-    resolve_value,
+    TimeseriesSerializer,
 )
 from api.v1.v1_odk.utils.area_calc import (
     calculate_area_ha,
 )
+from api.v1.v1_odk.utils.enumerator_directory import (
+    ensure_enumerators,
+)
+from api.v1.v1_odk.utils.export_cache import (
+    bump_data_version,
+    export_cache_key,
+    find_cached_export,
+    reuse_cached_export,
+)
+from api.v1.v1_odk.utils.fast_list import (
+    build_plot_rows,
+    plot_values,
+    serialize_by_pk,
+)
+from api.v1.v1_odk.utils.filter_catalog import (
+    invalidate_filter_catalog,
+    refresh_filter_catalog,
+    render_filter_options,
+)
+from api.v1.v1_odk.utils.plot_kml import (
+    cached_plot_kml,
+    plot_kml_name,
+)
+from api.v1.v1_odk.utils.stats_rollup import (
+    live_stats,
+    refresh_plot_stats_for_plot,
+    refresh_rollups_for,
+    rollup_stats,
+)
+from api.v1.v1_odk.utils.timeseries import (
+    build_timeseries,
+)
 from utils.polygon import (
     extract_plot_data,
     wkt_to_odk_geoshape,
 )
+from utils.task_queue import async_task
 
 logger = logging.getLogger(__name__)
 
 
+EXPORT_FORMATS = {
+    "shp": JobTypes.export_shapefile,
+    "geojson": JobTypes.export_geojson,
+    "xlsx": JobTypes.export_xlsx,
+    "geoparquet": JobTypes.export_geoparquet,
+    "fgb": JobTypes.export_flatgeobuf,
+    "csv": JobTypes.export_csv,
+    "kmz": JobTypes.export_kmz,
+}
+
+STREAM_CONTENT_TYPES = {
+    "csv": "text/csv",
+    "geojson": "application/geo+json",
+}
+
+
+def export_filters(data):
+    """Export filters of a request body, in the
+    form stored in Jobs.info["filters"]."""
+    filters = {}
+    status_param = data.get("status")
+    if status_param and status_param != "all":
+        filters["status"] = status_param
+    for f in [
+        "search",
+        "region",
+        "sub_region",
+        "start_date",
+        "end_date",
+    ]:
+        val = data.get(f)
+        if val:
+            filters[f] = val
+    dynamic = data.get("dynamic_filters")
+    if dynamic and isinstance(dynamic, dict):
+        filters["dynamic_filters"] = dynamic
+    return filters
+
+
 @extend_schema(tags=["Plots"])
 class PlotViewSet(
     ListModelMixin,
@@ -158,6 +248,9 @@ class PlotViewSet(
         start_date, end_date = parse_date_range(
             params
         )
+        if self.action == "timeseries":
+            # Applied to event days instead
+            start_date = end_date = None
         if start_date is not None:
             qs = qs.filter(
                 submission__submission_time__gte=(
@@ -210,10 +303,90 @@ class PlotViewSet(
                             )
                 except FormMetadata.DoesNotExist:
                     pass
+        if self.action == "list":
+            fields = self._get_sparse_fields()
+            if fields:
+                qs = self._apply_sparse_projection(
+                    qs, fields
+                )
+        return qs
+
+    def get_serializer_context(self):
+        ctx = super().get_serializer_context()
+        if self.action == "list":
+            ctx["fields"] = self._get_sparse_fields()
+        return ctx
+
+    def list(self, request, *args, **kwargs):
+        """List via ``.values()`` over the stored
+        label columns; same payload as the
+        serializer path."""
+        serializer = self.get_serializer()
+        queryset = self.filter_queryset(
+            self.get_queryset()
+        )
+        rows = plot_values(queryset, serializer.fields)
+        page = self.paginate_queryset(rows)
+        results = build_plot_rows(
+            rows if page is None else page,
+            serializer,
+            lambda pks: serialize_by_pk(
+                queryset, serializer, pks
+            ),
+        )
+        if page is None:
+            return Response(results)
+        return self.get_paginated_response(results)
+
+    def _get_sparse_fields(self):
+        """Requested ``fields``/``columns`` for the
+        list action, or None for the full row."""
+        if not hasattr(self, "_sparse_fields"):
+            self._sparse_fields = parse_sparse_fields(
+                self.request.query_params,
+                PlotSerializer.Meta.fields,
+            )
+        return self._sparse_fields
+
+    def _apply_sparse_projection(self, qs, fields):
+        """Load only the columns the requested
+        fields need.
+
+        The submission's raw_data and resolved_data
+        are always deferred (labels come from the
+        stored resolved columns), and polygon_wkt
+        unless it was asked for.
+        """
+        related = ["form"]
+        deferred = [
+            "submission__raw_data",
+            "submission__resolved_data",
+        ]
+        if "polygon_wkt" not in fields:
+            deferred.append("polygon_wkt")
+        if "farmer_uid" in fields:
+            related.append("farmer")
+        if "updated_by_name" in fields:
+            related.append("submission__updated_by")
+        qs = (
+            qs.select_related(*related)
+            .defer(*deferred)
+            .annotate(
+                labels_stored=ExpressionWrapper(
+                    Q(
+                        submission__resolved_data__isnull=False  # noqa: E501
+                    ),
+                    output_field=BooleanField(),
+                )
+            )
+        )
+        if "main_plot_uid" not in fields:
+            qs = qs.prefetch_related(None)
         return qs
 
     def perform_update(self, serializer):
         instance = serializer.save()
+        bump_data_version(instance.form)
         if "polygon_wkt" in serializer.validated_data:
             odk_str = wkt_to_odk_geoshape(
                 instance.polygon_wkt
@@ -230,6 +403,15 @@ class PlotViewSet(
                 instance,
                 instance.polygon_wkt,
             )
+            refresh_plot_stats_for_plot(instance)
+
+    def perform_destroy(self, instance):
+        form = instance.form
+        sub = instance.submission
+        instance.delete()
+        refresh_rollups_for(form, sub)
+        bump_data_version(form)
+        invalidate_filter_catalog(form)
 
     @extend_schema(
         request=PlotOverlapQuerySerializer,
@@ -288,6 +470,10 @@ class PlotViewSet(
         plot.max_lat = plot_data["max_lat"]
         plot.min_lon = plot_data["min_lon"]
         plot.max_lon = plot_data["max_lon"]
+        plot.centroid_lat = plot_data["centroid_lat"]
+        plot.centroid_lon = plot_data["centroid_lon"]
+        plot.altitude = plot_data["altitude"]
+        plot.altitude_computed = True
         plot.flagged_for_review = plot_data[
             "flagged_for_review"
         ]
@@ -308,6 +494,8 @@ class PlotViewSet(
         dispatch_kobo_geometry_sync(
             request.user, plot, plot.polygon_wkt
         )
+        refresh_plot_stats_for_plot(plot)
+        bump_data_version(plot.form)
         return Response(PlotSerializer(plot).data)
 
     @extend_schema(
@@ -322,7 +510,10 @@ class PlotViewSet(
     def kml(self, request, uuid=None):
         """Return KML file for a plot polygon.
 
-        Authenticated via ?key=STORAGE_SECRET."""
+        Authenticated via ?key=STORAGE_SECRET.
+        Served from the PlotKml cache with ETag and
+        Last-Modified, so unchanged plots answer
+        conditional requests with 304."""
         key = request.query_params.get("key", "")
         if key != django_settings.STORAGE_SECRET:
             return Response(
@@ -337,11 +528,8 @@ class PlotViewSet(
                     status.HTTP_404_NOT_FOUND
                 ),
             )
-        name = plot.plot_name or str(plot.uuid)
-        kml_content = _wkt_to_kml(
-            plot.polygon_wkt, name=name
-        )
-        if not kml_content:
+        cache = cached_plot_kml(plot)
+        if not cache.kml:
             return Response(
                 {"detail": "Invalid geometry"},
                 status=(
@@ -349,24 +537,41 @@ class PlotViewSet(
                     .HTTP_422_UNPROCESSABLE_ENTITY
                 ),
             )
-        # Sanitize filename for header safety
-        safe_name = (
-            re.sub(r"[^\w\s\-.]", "", name)[
-                :100
-            ].strip()
-            or "plot"
+        etag = f'"{cache.version}"'
+        last_modified = int(
+            cache.rendered_at.timestamp()
         )
-        resp = HttpResponse(
-            kml_content,
-            content_type=(
-                "application/vnd"
-                ".google-earth.kml+xml"
-            ),
+        resp = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=last_modified,
         )
-        resp["Content-Disposition"] = (
-            "attachment; "
-            f'filename="{safe_name}.kml"'
+        if resp is None:
+            # Sanitize filename for header safety
+            safe_name = (
+                re.sub(
+                    r"[^\w\s\-.]",
+                    "",
+                    plot_kml_name(plot),
+                )[:100].strip()
+                or "plot"
+            )
+            resp = HttpResponse(
+                cache.kml,
+                content_type=(
+                    "application/vnd"
+                    ".google-earth.kml+xml"
+                ),
+            )
+            resp["Content-Disposition"] = (
+                "attachment; "
+                f'filename="{safe_name}.kml"'
+            )
+        resp["ETag"] = etag
+        resp["Last-Modified"] = http_date(
+            last_modified
         )
+        resp["Cache-Control"] = "private, no-cache"
         return resp
 
     @extend_schema(
@@ -376,7 +581,11 @@ class PlotViewSet(
     @action(detail=False, methods=["get"])
     def filter_options(self, request):
         """Return distinct regions, sub_regions, and
-        configured dynamic filter options."""
+        configured dynamic filter options.
+
+        Served from the form's FormFilterCatalog,
+        built on first use and refreshed by sync;
+        honours If-None-Match."""
         form_id = request.query_params.get(
             "form_id"
         )
@@ -389,211 +598,45 @@ class PlotViewSet(
                 },
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        try:
-            form = FormMetadata.objects.get(
-                asset_uid=form_id
-            )
-        except FormMetadata.DoesNotExist:
-            return Response(
-                {"detail": "Form not found"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
-
-        qs = Plot.objects.filter(
+        catalog = FormFilterCatalog.objects.filter(
             form__asset_uid=form_id
-        )
-
-        # Build option lookups for region and
-        # sub_region fields to resolve raw codes
-        option_map, _ = build_option_lookup(form)
-
-        def _resolve_label(raw_val, field_spec):
-            """Resolve a raw joined value to
-            labels using option lookups.
-
-            When positional lookup fails (the
-            stored value has fewer parts than
-            fields because empty fields were
-            skipped), try all fields' options
-            as fallback.
-            """
-            if not raw_val:
-                return raw_val
-            fields = [
-                f.strip()
-                for f in (
-                    field_spec or ""
-                ).split(",")
-                if f.strip()
-            ]
-            parts = raw_val.split(" - ")
-            resolved = []
-            for i, part in enumerate(parts):
-                label = part
-                if i < len(fields):
-                    opts = option_map.get(
-                        fields[i], {}
-                    )
-                    label = opts.get(part, part)
-                # Fallback: if positional lookup
-                # returned the raw code, search
-                # all fields in the spec.
-                if label == part:
-                    for f in fields:
-                        opts = option_map.get(
-                            f, {}
-                        )
-                        if part in opts:
-                            label = opts[part]
-                            break
-                resolved.append(label)
-            return " - ".join(resolved)
-
-        raw_regions = list(
-            qs.exclude(region="")
-            .values_list("region", flat=True)
-            .distinct()
-            .order_by("region")
-        )
-        regions = sorted(
-            [
-                {
-                    "value": r,
-                    "label": _resolve_label(
-                        r, form.region_field
-                    ),
-                }
-                for r in raw_regions
-            ],
-            key=lambda x: x["label"],
-        )
-
-        sub_region_qs = qs.exclude(sub_region="")
-        region = request.query_params.get("region")
-        if region:
-            sub_region_qs = (
-                sub_region_qs.filter(region=region)
-            )
-        raw_sub_regions = list(
-            sub_region_qs.values_list(
-                "sub_region", flat=True
-            )
-            .distinct()
-            .order_by("sub_region")
-        )
-        sub_regions = sorted(
-            [
-                {
-                    "value": w,
-                    "label": _resolve_label(
-                        w, form.sub_region_field
-                    ),
-                }
-                for w in raw_sub_regions
-            ],
-            key=lambda x: x["label"],
-        )
-
-        dynamic_filters = []
-        filter_field_names = (
-            form.filter_fields or []
-        )
-        if filter_field_names:
-            questions = (
-                FormQuestion.objects.filter(
-                    form=form,
-                    name__in=filter_field_names,
-                ).prefetch_related("options")
-            )
-            for q in questions:
-                dynamic_filters.append(
-                    {
-                        "name": q.name,
-                        "label": q.label,
-                        "type": q.type,
-                        "options": sorted(
-                            [
-                                {
-                                    "name": o.name,
-                                    "label": (
-                                        o.label
-                                    ),
-                                }
-                                for o in (
-                                    q.options.all()
-                                )
-                            ],
-                            key=lambda x: (
-                                x["label"]
-                            ),
-                        ),
-                    }
+        ).first()
+        if catalog is None:
+            try:
+                form = FormMetadata.objects.get(
+                    asset_uid=form_id
                 )
+            except FormMetadata.DoesNotExist:
+                return Response(
+                    {"detail": "Form not found"},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            catalog = refresh_filter_catalog(form)
 
-        response_data = {
-            "regions": regions,
-            "sub_regions": sub_regions,
-            "dynamic_filters": dynamic_filters,
-        }
-
-        all_eligible = (
-            request.query_params.get(
-                "all_eligible"
+        etag = f'"{catalog.etag}"'
+        if etag in parse_etags(
+            request.headers.get("If-None-Match", "")
+        ):
+            resp = Response(
+                status=status.HTTP_304_NOT_MODIFIED
             )
-            == "true"
-        )
-        if all_eligible:
-            excluded = set()
-            for spec in [
-                form.region_field,
-                form.sub_region_field,
-                form.plot_name_field,
-            ]:
-                if spec:
-                    for f in spec.split(","):
-                        s = f.strip()
-                        if s:
-                            excluded.add(s)
-            eligible_qs = (
-                FormQuestion.objects.filter(
-                    form=form,
-                    type__startswith="select_",
+        else:
+            resp = Response(
+                render_filter_options(
+                    catalog.data,
+                    region=request.query_params.get(
+                        "region"
+                    ),
+                    all_eligible=(
+                        request.query_params.get(
+                            "all_eligible"
+                        )
+                        == "true"
+                    ),
                 )
-                .exclude(name__in=excluded)
-                .prefetch_related("options")
-                .order_by("label")
             )
-            available = []
-            for q in eligible_qs:
-                available.append(
-                    {
-                        "name": q.name,
-                        "label": q.label,
-                        "type": q.type,
-                        "options": sorted(
-                            [
-                                {
-                                    "name": o.name,
-                                    "label": (
-                                        o.label
-                                    ),
-                                }
-                                for o in (
-                                    q.options
-                                    .all()
-                                )
-                            ],
-                            key=lambda x: (
-                                x["label"]
-                            ),
-                        ),
-                    }
-                )
-            response_data[
-                "available_filters"
-            ] = available
-
-        return Response(response_data)
+        resp["ETag"] = etag
+        return resp
 
     @extend_schema(
         tags=["Plots"],
@@ -606,51 +649,18 @@ class PlotViewSet(
 
         Reuses get_queryset() so all filters
         (form_id, region, sub_region, date range,
-        dynamic filters) are applied."""
+        dynamic filters) are applied. Answered
+        from PlotStatsRollup when the filters map
+        onto its dimensions."""
         qs = self.get_queryset().order_by()
-
-        pending_q = Q(
-            submission__approval_status__isnull=True  # noqa: E501
-        ) | Q(
-            submission__approval_status=(
-                ApprovalStatusTypes.PENDING
-            )
+        result = rollup_stats(
+            request.query_params, qs
         )
+        if result is None:
+            result = live_stats(qs)
 
-        approved_q = Q(
-            submission__approval_status=(
-                ApprovalStatusTypes.APPROVED
-            )
-        )
-
-        result = qs.aggregate(
-            total_plots=Count("id", distinct=True),
-            total_area_ha=Sum("area_ha"),
-            approved_count=Count(
-                "id",
-                filter=approved_q,
-                distinct=True,
-            ),
-            pending_count=Count(
-                "id",
-                filter=pending_q,
-                distinct=True,
-            ),
-            pending_area_ha=Sum(
-                "area_ha",
-                filter=pending_q,
-            ),
-        )
-
-        approved_area_ha = (
-            qs.filter(approved_q).aggregate(
-                total=Sum("area_ha")
-            )["total"]
-            or 0
-        )
-
-        total = result["total_plots"] or 0
-        approved = result["approved_count"] or 0
+        total = result["total_plots"]
+        approved = result["approved_count"]
         approval_pct = (
             round(approved / total * 100, 1)
             if total > 0
@@ -661,19 +671,17 @@ class PlotViewSet(
             data={
                 "total_plots": total,
                 "total_area_ha": round(
-                    result["total_area_ha"] or 0,
-                    2,
+                    result["total_area_ha"], 2
                 ),
                 "approval_percentage": approval_pct,
                 "approved_area_ha": round(
-                    approved_area_ha, 2
+                    result["approved_area_ha"], 2
                 ),
                 "pending_count": (
-                    result["pending_count"] or 0
+                    result["pending_count"]
                 ),
                 "pending_area_ha": round(
-                    result["pending_area_ha"] or 0,
-                    2,
+                    result["pending_area_ha"], 2
                 ),
             }
         )
@@ -682,17 +690,53 @@ class PlotViewSet(
 
     @extend_schema(
         tags=["Plots"],
-        summary=(
-            "Export plots as Shapefile or GeoJSON"
-        ),
+        summary="Plot events over time",
+        parameters=[
+            OpenApiParameter(
+                name="bucket",
+                required=False,
+                default="day",
+                enum=["day", "week", "month"],
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name="group_by",
+                required=False,
+                enum=[
+                    "region",
+                    "sub_region",
+                    "enumerator",
+                ],
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+            ),
+        ],
+        responses=TimeseriesSerializer,
     )
-    @action(detail=False, methods=["post"])
-    def export(self, request):
-        """Initiate async export of filtered
-        plots as Shapefile or GeoJSON."""
-        form_id = request.data.get("form_id")
+    @action(detail=False, methods=["get"])
+    def timeseries(self, request):
+        """Collected, approved and rejected plots
+        and approved hectares per day/week/month.
+
+        Takes the same filters as ``stats``; the
+        date range selects the days the events
+        happened on. Answered from
+        PlotTimeseriesRollup when the filters map
+        onto its dimensions."""
+        data = build_timeseries(
+            request.query_params,
+            self.get_queryset()
+            .prefetch_related(None)
+            .order_by(),
+        )
+        return Response(data)
+
+    def _export_form(self, form_id):
+        """(form, None) or (None, error Response)
+        for the form_id of an export request."""
         if not form_id:
-            return Response(
+            return None, Response(
                 {
                     "message": (
                         "form_id is required"
@@ -702,30 +746,105 @@ class PlotViewSet(
                     status.HTTP_400_BAD_REQUEST
                 ),
             )
-
-        if not FormMetadata.objects.filter(
+        form = FormMetadata.objects.filter(
             asset_uid=form_id
-        ).exists():
-            return Response(
+        ).first()
+        if form is None:
+            return None, Response(
                 {"message": "Form not found"},
                 status=(
                     status.HTTP_404_NOT_FOUND
                 ),
             )
+        return form, None
+
+    def _queue_export(
+        self,
+        request,
+        form_id,
+        fmt,
+        filters,
+        compress=None,
+        response_status=status.HTTP_201_CREATED,
+    ):
+        """Create the export job and queue it,
+        or finish it at once when an identical
+        export of the same data version still has
+        its file in storage."""
+        job_type = EXPORT_FORMATS[fmt]
+        info = {
+            "form_id": form_id,
+            "filters": filters,
+            "cache_key": export_cache_key(
+                form_id,
+                job_type,
+                filters,
+                {"compress": compress or ""},
+            ),
+        }
+        if compress:
+            info["compress"] = compress
+        job = Jobs.objects.create(
+            type=job_type,
+            status=JobStatus.pending,
+            created_by=request.user,
+            info=info,
+        )
+
+        cached = find_cached_export(
+            info["cache_key"]
+        )
+        if cached:
+            reuse_cached_export(job, cached)
+            return Response(
+                JobSerializer(job).data,
+                status=response_status,
+            )
+
+        task_id = async_task(
+            "api.v1.v1_odk.tasks"
+            ".generate_export_file",
+            job.id,
+        )
+        job.task_id = task_id
+        job.save()
+
+        return Response(
+            JobSerializer(job).data,
+            status=response_status,
+        )
+
+    @extend_schema(
+        tags=["Plots"],
+        summary=(
+            "Export plots as Shapefile, GeoJSON, "
+            "GeoParquet, FlatGeobuf, KMZ, CSV "
+            "or XLSX"
+        ),
+    )
+    @action(detail=False, methods=["post"])
+    def export(self, request):
+        """Initiate async export of filtered
+        plots as Shapefile, GeoJSON, GeoParquet,
+        FlatGeobuf, KMZ, CSV or XLSX.
+
+        Finishes immediately when an identical
+        export of the same data version still has
+        its file in storage."""
+        form_id = request.data.get("form_id")
+        _form, error = self._export_form(form_id)
+        if error:
+            return error
 
         fmt = request.data.get("format", "shp")
-        valid_formats = {
-            "shp": JobTypes.export_shapefile,
-            "geojson": JobTypes.export_geojson,
-            "xlsx": JobTypes.export_xlsx,
-        }
-        if fmt not in valid_formats:
+        if fmt not in EXPORT_FORMATS:
             return Response(
                 {
                     "message": (
                         "Invalid format. Use "
                         "'shp', 'geojson', "
-                        "or 'xlsx'"
+                        "'geoparquet', 'fgb', "
+                        "'kmz', 'csv' or 'xlsx'"
                     )
                 },
                 status=(
@@ -733,54 +852,101 @@ class PlotViewSet(
                 ),
             )
 
-        filters = {}
-        status_param = request.data.get("status")
-        if (
-            status_param
-            and status_param != "all"
+        compress = request.data.get("compress")
+        if compress and (
+            compress != "gzip" or fmt != "geojson"
         ):
-            filters["status"] = status_param
-        search = request.data.get("search")
-        if search:
-            filters["search"] = search
-        for f in [
-            "region",
-            "sub_region",
-            "start_date",
-            "end_date",
-        ]:
-            val = request.data.get(f)
-            if val:
-                filters[f] = val
-        dynamic = request.data.get(
-            "dynamic_filters"
-        )
-        if dynamic and isinstance(dynamic, dict):
-            filters["dynamic_filters"] = dynamic
+            return Response(
+                {
+                    "message": (
+                        "compress='gzip' is only "
+                        "supported for 'geojson'"
+                    )
+                },
+                status=(
+                    status.HTTP_400_BAD_REQUEST
+                ),
+            )
 
-        job = Jobs.objects.create(
-            type=valid_formats[fmt],
-            status=JobStatus.pending,
-            created_by=request.user,
-            info={
-                "form_id": form_id,
-                "filters": filters,
-            },
+        return self._queue_export(
+            request,
+            form_id,
+            fmt,
+            export_filters(request.data),
+            compress,
         )
 
-        task_id = async_task(
-            "api.v1.v1_odk.tasks"
-            ".generate_export_file",
-            job.id,
-            timeout=300,
+    @extend_schema(
+        tags=["Plots"],
+        summary=(
+            "Download filtered plots as CSV or "
+            "GeoJSON in the response"
+        ),
+        responses={
+            (200, "text/csv"): OpenApiTypes.BINARY,
+            (
+                200,
+                "application/geo+json",
+            ): OpenApiTypes.BINARY,
+            202: JobSerializer,
+        },
+    )
+    @action(detail=False, methods=["post"])
+    def download(self, request):
+        """Stream the filtered plots as CSV or
+        GeoJSON straight from a database cursor.
+
+        Takes the same body as ``export``. When
+        more than EXPORT_STREAM_MAX_ROWS plots
+        match, an export job is queued instead and
+        returned with 202, to be polled as usual.
+        """
+        form_id = request.data.get("form_id")
+        form, error = self._export_form(form_id)
+        if error:
+            return error
+
+        fmt = request.data.get("format", "csv")
+        if fmt not in STREAM_CONTENT_TYPES:
+            return Response(
+                {
+                    "message": (
+                        "Invalid format. Use "
+                        "'csv' or 'geojson'"
+                    )
+                },
+                status=(
+                    status.HTTP_400_BAD_REQUEST
+                ),
+            )
+
+        filters = export_filters(request.data)
+        qs = with_geometry(
+            filtered_plots(form, filters)
         )
-        job.task_id = task_id
-        job.save()
+        if (
+            qs.count()
+            > django_settings.EXPORT_STREAM_MAX_ROWS
+        ):
+            return self._queue_export(
+                request,
+                form_id,
+                fmt,
+                filters,
+                response_status=(
+                    status.HTTP_202_ACCEPTED
+                ),
+            )
 
-        return Response(
-            JobSerializer(job).data,
-            status=status.HTTP_201_CREATED,
+        response = StreamingHttpResponse(
+            stream_export(fmt, qs, form),
+            content_type=STREAM_CONTENT_TYPES[fmt],
+        )
+        response["Content-Disposition"] = (
+            "attachment; "
+            f'filename="plots_{form_id}.{fmt}"'
         )
+        return response
 
 
 @extend_schema(tags=["Farmers"])
@@ -941,11 +1107,13 @@ class EnumeratorViewSet(
 ):
     """List unique enumerators from submissions.
 
-    Enumerators are derived from the enumerator_id
-    field in submission raw_data, resolved via
-    form question options."""
+    Served from the Enumerator directory, which
+    holds one row per form and enumerator_id with
+    the name resolved via form question options.
+    Without form_id, rows are merged by code
+    across forms."""
 
-    queryset = Submission.objects.all()
+    queryset = Enumerator.objects.all()
     permission_classes = [IsAuthenticated]
     serializer_class = None
 
@@ -957,102 +1125,30 @@ class EnumeratorViewSet(
             "search"
         )
 
-        qs = Submission.objects.all()
+        forms = FormMetadata.objects.all()
+        qs = Enumerator.objects.all()
         if form_id:
-            qs = qs.filter(
-                form__asset_uid=form_id
-            )
-
-        # Get unique enumerator_id values
-        qs = qs.filter(
-            raw_data__enumerator_id__isnull=(
-                False
-            )
-        ).exclude(raw_data__enumerator_id="")
-
-        seen = {}
-        forms_cache = {}
-
-        for sub in qs.select_related(
-            "form"
-        ).iterator():
-            raw = sub.raw_data or {}
-            raw_val = raw.get("enumerator_id")
-            if not raw_val:
-                continue
-
-            form = sub.form
-            form_pk = form.pk
-            if form_pk not in forms_cache:
-                om, tm = build_option_lookup(form)
-                forms_cache[form_pk] = (om, tm)
-            om, tm = forms_cache[form_pk]
-
-            opts = om.get("enumerator_id")
-            if opts:
-                resolved = resolve_value(
-                    raw_val,
-                    opts,
-                    tm.get("enumerator_id"),
-                )
-            else:
-                resolved = raw_val
-
-            label = str(resolved).strip()
-            key = str(raw_val).strip()
-            if key and key not in seen:
-                seen[key] = {
-                    "code": key,
-                    "name": label,
-                    "submission_count": 1,
-                }
-            elif key in seen:
-                seen[key][
-                    "submission_count"
-                ] += 1
-
-        results = sorted(
-            seen.values(),
-            key=lambda x: x["name"].lower(),
-        )
+            forms = forms.filter(asset_uid=form_id)
+            qs = qs.filter(form__asset_uid=form_id)
+        ensure_enumerators(forms)
 
         if search:
-            q = search.lower()
-            results = [
-                r
-                for r in results
-                if q in r["name"].lower()
-            ]
-
-        # Manual pagination
-        try:
-            limit = max(
-                1,
-                int(
-                    request.query_params.get(
-                        "limit", 10
-                    )
-                ),
-            )
-        except (ValueError, TypeError):
-            limit = 10
-        try:
-            offset = max(
-                0,
-                int(
-                    request.query_params.get(
-                        "offset", 0
-                    )
+            qs = qs.filter(name__icontains=search)
+        qs = (
+            qs.values("code")
+            .annotate(
+                name=Min("name"),
+                submission_count=Sum(
+                    "submission_count"
                 ),
+                approved_count=Sum("approved_count"),
+                rejected_count=Sum("rejected_count"),
+                last_seen_at=Max("last_seen_at"),
             )
-        except (ValueError, TypeError):
-            offset = 0
-        total = len(results)
-        page = results[offset: offset + limit]
+            .order_by(Lower("name"), "code")
+        )
 
-        return Response(
-            {
-                "count": total,
-                "results": page,
-            }
+        page = self.paginate_queryset(qs)
+        return self.get_paginated_response(
+            list(page)
         )
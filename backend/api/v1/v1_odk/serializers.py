@@ -26,6 +26,85 @@ from utils.custom_serializer_fields import (
 )
 
 
+def has_stored_labels(submission):
+    """True when the submission's labels were
+    precomputed at ingest time.
+
+    Prefers the ``labels_stored`` annotation added
+    by sparse list queries, which avoids loading
+    the deferred resolved_data column.
+    """
+    flag = getattr(submission, "labels_stored", None)
+    if flag is not None:
+        return flag
+    return submission.resolved_data is not None
+
+
+class SparseFieldsMixin:
+    """Drop serializer fields not listed in
+    ``context["fields"]`` when it is given."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        wanted = self.context.get("fields")
+        if wanted:
+            for name in set(self.fields) - set(wanted):
+                self.fields.pop(name)
+
+
+class RawDataKeyField(serializers.CharField):
+    """Read-only CharField over a raw_data key.
+
+    When raw_data is deferred, reads the value
+    from the ``annotation`` extracted in SQL
+    instead of loading the full JSON payload.
+    """
+
+    def __init__(self, key, annotation, **kwargs):
+        self.annotation = annotation
+        kwargs["source"] = f"raw_data.{key}"
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        if "raw_data" in instance.get_deferred_fields():
+            return getattr(
+                instance, self.annotation, None
+            )
+        return super().get_attribute(instance)
+
+
+def enrich_attachments(submission_uuid, attachments):
+    """Sanitise attachment metadata for list
+    responses, adding the local storage URL."""
+    encoded_key = quote(
+        settings.STORAGE_SECRET, safe=""
+    )
+    enriched = []
+    for att in attachments:
+        uid = att.get("uid")
+        basename = att.get(
+            "media_file_basename",
+            "img.jpg",
+        )
+        ext = basename.rsplit(".", 1)[-1] or "jpg"
+        sanitised = {
+            "question_xpath": att.get(
+                "question_xpath"
+            ),
+        }
+        if uid:
+            sanitised["local_url"] = (
+                f"/storage"
+                f"/{ATTACHMENTS_FOLDER}"
+                f"/{submission_uuid}"
+                f"/{uid}.{ext}"
+                f"?key={encoded_key}"
+            )
+        enriched.append(sanitised)
+    return enriched
+
+
 def build_option_lookup(form):
     """Build option lookup dicts for a form.
 
@@ -86,7 +165,9 @@ class FormMetadataSerializer(serializers.ModelSerializer):
         return obj.submissions.count()
 
 
-class SubmissionListSerializer(serializers.ModelSerializer):
+class SubmissionListSerializer(
+    SparseFieldsMixin, serializers.ModelSerializer
+):
     """Lightweight list serializer.
 
     Returns only question-level resolved values
@@ -101,8 +182,8 @@ class SubmissionListSerializer(serializers.ModelSerializer):
     resolved_data = (
         serializers.SerializerMethodField()
     )
-    start = serializers.CharField(source="raw_data.start", read_only=True)
-    end = serializers.CharField(source="raw_data.end", read_only=True)
+    start = RawDataKeyField("start", "sort_start")
+    end = RawDataKeyField("end", "sort_end")
     reviewed_by = serializers.CharField(
         source="updated_by.name", read_only=True, default=None
     )
@@ -140,15 +221,51 @@ class SubmissionListSerializer(serializers.ModelSerializer):
         ]
 
     def get_resolved_data(self, obj):
+        question_names = self.context.get(
+            "question_names"
+        )
+        stored = obj.resolved_data
+        if (
+            stored is not None
+            and question_names is not None
+        ):
+            # Labels precomputed at ingest time
+            resolved = {
+                k: v
+                for k, v in stored.items()
+                if k in question_names
+            }
+            attachments = stored.get(
+                "_attachments", []
+            )
+        else:
+            resolved, attachments = (
+                self._resolve_raw_data(
+                    obj, question_names
+                )
+            )
+
+        if attachments:
+            resolved["_attachments"] = (
+                enrich_attachments(
+                    obj.uuid, attachments
+                )
+            )
+        return resolved
+
+    def _resolve_raw_data(self, obj, question_names):
+        """Resolve select options from raw_data.
+
+        Fallback for submissions whose labels have
+        not been precomputed yet. Returns
+        (resolved, attachments).
+        """
         option_map = self.context.get(
             "option_lookup", {}
         )
         type_map = self.context.get(
             "type_map", {}
         )
-        question_names = self.context.get(
-            "question_names"
-        )
         raw = obj.raw_data or {}
 
         # Resolve select options
@@ -170,43 +287,9 @@ class SubmissionListSerializer(serializers.ModelSerializer):
                 for k, v in resolved.items()
                 if k in question_names
             }
-
-        # Enrich attachments with local URLs
-        attachments = raw.get(
+        return resolved, raw.get(
             "_attachments", []
         )
-        if attachments:
-            key = settings.STORAGE_SECRET
-            enriched = []
-            for att in attachments:
-                uid = att.get("uid")
-                basename = att.get(
-                    "media_file_basename",
-                    "img.jpg",
-                )
-                ext = (
-                    basename.rsplit(".", 1)[-1]
-                    or "jpg"
-                )
-                sanitised = {
-                    "question_xpath": att.get(
-                        "question_xpath"
-                    ),
-                }
-                if uid:
-                    encoded_key = quote(
-                        key, safe=""
-                    )
-                    sanitised["local_url"] = (
-                        f"/storage"
-                        f"/{ATTACHMENTS_FOLDER}"
-                        f"/{obj.uuid}"
-                        f"/{uid}.{ext}"
-                        f"?key={encoded_key}"
-                    )
-                enriched.append(sanitised)
-            resolved["_attachments"] = enriched
-        return resolved
 
     def _resolve_field(self, obj, field_name):
         raw = obj.raw_data or {}
@@ -248,6 +331,8 @@ class SubmissionListSerializer(serializers.ModelSerializer):
         return " - ".join(parts) if parts else None
 
     def get_region(self, obj):
+        if has_stored_labels(obj):
+            return obj.resolved_region
         form = obj.form
         field_spec = form.region_field or "region"
         region = self._resolve_fields(obj, field_spec)
@@ -258,6 +343,8 @@ class SubmissionListSerializer(serializers.ModelSerializer):
         return region
 
     def get_sub_region(self, obj):
+        if has_stored_labels(obj):
+            return obj.resolved_sub_region
         form = obj.form
         field_spec = (
             form.sub_region_field or "sub_region"
@@ -731,7 +818,9 @@ class SubmissionEditDataSerializer(
         return value
 
 
-class PlotSerializer(serializers.ModelSerializer):
+class PlotSerializer(
+    SparseFieldsMixin, serializers.ModelSerializer
+):
     plot_id = serializers.CharField(
         source="submission.kobo_id", read_only=True
     )
@@ -820,7 +909,22 @@ class PlotSerializer(serializers.ModelSerializer):
                 parts.append(val)
         return " - ".join(parts) if parts else None
 
+    @staticmethod
+    def _stored_labels(obj):
+        """Return the linked submission when its
+        labels were precomputed, else None."""
+        sub = obj.submission
+        if sub is None:
+            return None
+        flag = getattr(obj, "labels_stored", None)
+        if flag is None:
+            flag = sub.resolved_data is not None
+        return sub if flag else None
+
     def get_region(self, obj):
+        sub = self._stored_labels(obj)
+        if sub is not None:
+            return sub.resolved_region
         field_spec = (
             obj.form.region_field or "region"
         )
@@ -834,6 +938,9 @@ class PlotSerializer(serializers.ModelSerializer):
         return region
 
     def get_sub_region(self, obj):
+        sub = self._stored_labels(obj)
+        if sub is not None:
+            return sub.resolved_sub_region
         field_spec = (
             obj.form.sub_region_field or "sub_region"
         )
@@ -847,6 +954,9 @@ class PlotSerializer(serializers.ModelSerializer):
         return sub_region
 
     def get_enumerator(self, obj):
+        sub = self._stored_labels(obj)
+        if sub is not None:
+            return sub.resolved_enumerator
         return self._resolve_plot_fields(
             obj, "enumerator_id"
         )
@@ -969,3 +1079,22 @@ class StatsSerializer(serializers.Serializer):
     approved_area_ha = serializers.FloatField()
     pending_count = serializers.IntegerField()
     pending_area_ha = serializers.FloatField()
+
+
+class TimeseriesPointSerializer(serializers.Serializer):
+    period = serializers.DateField()
+    group = serializers.CharField(
+        allow_null=True, required=False
+    )
+    collected = serializers.IntegerField()
+    approved = serializers.IntegerField()
+    rejected = serializers.IntegerField()
+    approved_area_ha = serializers.FloatField()
+
+
+class TimeseriesSerializer(serializers.Serializer):
+    bucket = serializers.ChoiceField(
+        choices=["day", "week", "month"]
+    )
+    group_by = serializers.CharField(allow_null=True)
+    results = TimeseriesPointSerializer(many=True)
@@ -1,43 +1,53 @@
 import logging
 import re
 import time
+from datetime import timedelta
 from io import BytesIO
 from pathlib import Path
 
 from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
-from django_q.tasks import async_task
 from PIL import Image, ImageOps
 
 from api.v1.v1_init.helpers import get_telegram_config
 from api.v1.v1_jobs.constants import JobStatus, JobTypes
 from api.v1.v1_jobs.models import Jobs
+from api.v1.v1_jobs.progress import JobCancelled, JobProgress
 from api.v1.v1_odk.constants import (ATTACHMENTS_FOLDER, PREFIX_FARM_ID,
                                      PREFIX_SUBM_ID, ApprovalStatusTypes,
                                      SyncStatus)
-from api.v1.v1_odk.export import (cleanup_old_exports, generate_geojson,
-                                  generate_shapefile, generate_xlsx)
-from api.v1.v1_odk.models import FormMetadata, Plot, RejectionAudit, Submission
-from api.v1.v1_odk.serializers import build_option_lookup, resolve_value
+from api.v1.v1_odk.export import (PlotAttributeResolver,
+                                  cleanup_old_exports, compile_field_spec,
+                                  filtered_plots, generate_csv,
+                                  generate_flatgeobuf, generate_geojson,
+                                  generate_geoparquet, generate_kmz,
+                                  generate_shapefile, generate_xlsx,
+                                  with_geometry)
+from api.v1.v1_odk.models import FormMetadata, RejectionAudit, Submission
 from api.v1.v1_odk.utils.farmer_sync import sync_farmers_for_form
+from api.v1.v1_odk.utils.resolved_labels import reresolve_form_labels
+from utils import storage
 from utils.encryption import decrypt
 from utils.kobo_client import KoboClient, KoboUnauthorizedError
-from utils.telegram_client import TelegramClient, TelegramSendError
+from utils.task_queue import async_task, queue_for, queue_timeout
+from utils.telegram_client import (TelegramClient, TelegramRateLimited,
+                                   TelegramSendError)
 
 logger = logging.getLogger(__name__)
 
-
-STATUS_MAP = {
-    "approved": ApprovalStatusTypes.APPROVED,
-    "rejected": ApprovalStatusTypes.REJECTED,
-}
+# Telegram rejects longer messages
+TELEGRAM_MESSAGE_LIMIT = 4096
 
 
 def generate_export_file(job_id):
-    """Generate export file (Shapefile or GeoJSON)
-    for the given job.
+    """Generate the export file for the given job.
 
     Called asynchronously via Django-Q2 worker.
+    Progress is written to job.info["progress"];
+    a job cancelled while queued is skipped, one
+    cancelled while running stops at the next
+    chunk and leaves no file behind.
     """
     try:
         job = Jobs.objects.get(pk=job_id)
@@ -45,8 +55,12 @@ def generate_export_file(job_id):
         logger.error("Job %s not found", job_id)
         return
 
+    if job.status == JobStatus.cancelled:
+        logger.info("Export job %s was cancelled", job_id)
+        return
     job.status = JobStatus.on_progress
     job.save()
+    progress = JobProgress(job)
 
     try:
         cleanup_old_exports()
@@ -57,49 +71,7 @@ def generate_export_file(job_id):
 
         form = FormMetadata.objects.get(asset_uid=form_id)
 
-        qs = Plot.objects.filter(form=form)
-
-        # Apply status filter
-        status_param = filters.get("status")
-        if status_param:
-            if status_param == "flagged":
-                qs = qs.filter(flagged_for_review=True)
-            elif status_param == "pending":
-                qs = qs.filter(
-                    submission__approval_status__isnull=True,  # noqa: E501
-                )
-            elif status_param in STATUS_MAP:
-                qs = qs.filter(
-                    submission__approval_status=(STATUS_MAP[status_param])
-                )
-
-        # Apply search filter
-        search = filters.get("search")
-        if search:
-            qs = qs.filter(plot_name__icontains=search)
-
-        # Region / sub-region filters
-        region = filters.get("region")
-        if region:
-            qs = qs.filter(region=region)
-        sub_region = filters.get("sub_region")
-        if sub_region:
-            qs = qs.filter(sub_region=sub_region)
-
-        # Date range filters
-        start_date = filters.get("start_date")
-        if start_date:
-            qs = qs.filter(submission__submission_time__gte=(int(start_date)))
-        end_date = filters.get("end_date")
-        if end_date:
-            qs = qs.filter(submission__submission_time__lte=(int(end_date)))
-
-        # Dynamic raw_data filters
-        dynamic = filters.get("dynamic_filters", {})
-        allowed = form.filter_fields or []
-        for field, val in dynamic.items():
-            if field in allowed:
-                qs = qs.filter(**{"submission__" "raw_data__" f"{field}": val})
+        qs = filtered_plots(form, filters)
 
         filename = f"plots_{form_id}_{job_id}"
 
@@ -110,24 +82,61 @@ def generate_export_file(job_id):
             safe_name = re.sub(r"[^\w\-.]", "_", form.name)[:80].strip("_") \
                 or "export"
             xlsx_filename = f"{safe_name}_{ts}"
-            file_path, count = generate_xlsx(qs, form, xlsx_filename)
+            file_path, count = generate_xlsx(
+                qs, form, xlsx_filename, progress=progress
+            )
         else:
-            # SHP/GeoJSON require geometry
-            qs = qs.filter(polygon_wkt__isnull=False).exclude(polygon_wkt="")
+            # Spatial formats require geometry
+            qs = with_geometry(qs)
 
             if job.type == (JobTypes.export_geojson):
-                file_path, count = generate_geojson(qs, form, filename)
+                file_path, count = generate_geojson(
+                    qs,
+                    form,
+                    filename,
+                    compress=info.get("compress") == "gzip",
+                    progress=progress,
+                )
+            elif job.type == JobTypes.export_geoparquet:
+                file_path, count = generate_geoparquet(
+                    qs, form, filename, progress=progress
+                )
+            elif job.type == JobTypes.export_flatgeobuf:
+                file_path, count = generate_flatgeobuf(
+                    qs, form, filename, progress=progress
+                )
+            elif job.type == JobTypes.export_kmz:
+                file_path, count = generate_kmz(
+                    qs, form, filename, progress=progress
+                )
+            elif job.type == JobTypes.export_csv:
+                file_path, count = generate_csv(
+                    qs, form, filename, progress=progress
+                )
             else:
-                file_path, count = generate_shapefile(qs, form, filename)
+                file_path, count = generate_shapefile(
+                    qs, form, filename, progress=progress
+                )
 
-        job.status = JobStatus.done
         job.info = {
-            **info,
+            **(job.info or {}),
             "file_path": file_path,
             "record_count": count,
         }
-        job.available = timezone.now()
-        job.save()
+        # Not if cancelled after the last chunk
+        finished = (
+            Jobs.objects.filter(pk=job_id)
+            .exclude(status=JobStatus.cancelled)
+            .update(
+                status=JobStatus.done,
+                info=job.info,
+                available=timezone.now(),
+            )
+        )
+        if not finished:
+            storage.delete(file_path)
+            logger.info("Export job %s was cancelled", job_id)
+            return
 
         logger.info(
             "Export job %s completed: " "%d records, file=%s",
@@ -136,12 +145,34 @@ def generate_export_file(job_id):
             file_path,
         )
     except Exception as e:
+        # GDAL reports JobCancelled raised in its
+        # input stream as its own error
+        if isinstance(e, JobCancelled) or Jobs.objects.filter(
+            pk=job_id, status=JobStatus.cancelled
+        ).exists():
+            logger.info("Export job %s was cancelled", job_id)
+            return
         logger.exception("Export job %s failed", job_id)
         job.status = JobStatus.failed
         job.result = str(e)
         job.save()
 
 
+def reresolve_submission_labels(form_id):
+    """Recompute stored resolved labels for all
+    submissions of a form.
+
+    Queued after question sync changes option
+    labels or region/sub-region mapping changes.
+    """
+    try:
+        form = FormMetadata.objects.get(pk=form_id)
+    except FormMetadata.DoesNotExist:
+        logger.error("Form %s not found", form_id)
+        return 0
+    return reresolve_form_labels(form)
+
+
 def sync_kobo_validation_status(
     kobo_url,
     kobo_username,
@@ -345,47 +376,22 @@ def _escape_markdown(text):
 def _resolve_field_spec(raw_data, field_spec, option_map, type_map):
     """Resolve a comma-separated field spec to
     human-readable labels using option_map."""
-    fields = [f.strip() for f in field_spec.split(",") if f.strip()]
-    parts = []
-    for field_name in fields:
-        raw_val = raw_data.get(field_name)
-        if raw_val is None:
-            continue
-        opts = option_map.get(field_name)
-        if opts:
-            resolved = resolve_value(
-                raw_val,
-                opts,
-                type_map.get(field_name),
-            )
-        else:
-            resolved = raw_val
-        val = str(resolved).strip()
-        if val:
-            parts.append(val)
-    return " - ".join(parts) if parts else None
+    return PlotAttributeResolver.resolve(
+        raw_data, compile_field_spec(field_spec, option_map, type_map)
+    )
 
 
-def _resolve_plot_location(submission, plot):
+def _resolve_plot_location(submission, plot, resolver=None):
     """Resolve plot location to human-readable
-    labels using the form's option lookup.
+    labels with the form's PlotAttributeResolver.
 
     Falls back to plot.region / plot.sub_region
     when raw_data resolution yields nothing."""
-    form = submission.form
+    if resolver is None:
+        resolver = PlotAttributeResolver(submission.form)
     raw_data = submission.raw_data or {}
-    option_map, type_map = build_option_lookup(form)
-
-    region_spec = form.region_field or "region"
-    sub_region_spec = form.sub_region_field or "sub_region"
-
-    region = _resolve_field_spec(raw_data, region_spec, option_map, type_map)
-    sub_region = _resolve_field_spec(
-        raw_data,
-        sub_region_spec,
-        option_map,
-        type_map,
-    )
+    region = resolver.resolve(raw_data, resolver.region)
+    sub_region = resolver.resolve(raw_data, resolver.sub_region)
 
     # Fall back to stored plot values
     if not region:
@@ -402,32 +408,139 @@ def _resolve_plot_location(submission, plot):
     return region or sub_region or "Unknown Location"
 
 
+def _rejection_details(audit, resolvers):
+    """Markdown-escaped fields of a rejection
+    for Telegram messages. `resolvers` caches a
+    PlotAttributeResolver per form."""
+    plot = audit.plot
+    submission = audit.submission
+    form_id = submission.form_id
+    if form_id not in resolvers:
+        resolvers[form_id] = PlotAttributeResolver(submission.form)
+
+    reason = audit.get_reason_category_display()
+    if audit.reason_text:
+        reason = f"{reason}: {audit.reason_text}"
+    submission_id = "N/A"
+    if submission.kobo_id:
+        submission_id = f"{PREFIX_SUBM_ID}{submission.kobo_id}"
+    farm_id = "N/A"
+    if plot.farmer and plot.farmer.uid:
+        farm_id = f"{PREFIX_FARM_ID}{plot.farmer.uid}"
+    rejected_at = (
+        audit.rejected_at.strftime("%Y-%m-%d %H:%M UTC")
+        if audit.rejected_at else "N/A"
+    )
+    details = {
+        "submission_id": submission_id,
+        "farm_id": farm_id,
+        "location": _resolve_plot_location(
+            submission, plot, resolvers[form_id]
+        ),
+        "reason": reason,
+        "validator": (
+            audit.validator.name if audit.validator else "Unknown"
+        ),
+        "time": rejected_at,
+    }
+    return {k: _escape_markdown(v) for k, v in details.items()}
+
+
+def _rejection_message(details):
+    return (
+        f"*Plot Rejected*\n\n"
+        f"*Submission ID:* {details['submission_id']}\n"
+        f"*Farm ID:* {details['farm_id']}\n"
+        f"*Location:* {details['location']}\n"
+        f"*Reason:* {details['reason']}\n"
+        f"*Validated by:* "
+        f"{details['validator']}\n"
+        f"*Time:* {details['time']}\n\n"
+        f"_Please review and recollect "
+        f"if needed._"
+    )
+
+
+def _digest_messages(items):
+    """Fold (audit, details) pairs into as few
+    messages as fit Telegram's length limit.
+    Yields (audits, text)."""
+    footer = "\n_Please review and recollect if needed._"
+    limit = TELEGRAM_MESSAGE_LIMIT - len(footer) - 40
+    batch, lines, size = [], [], 0
+    for audit, d in items:
+        line = (
+            f"- {d['submission_id']} | {d['farm_id']} | "
+            f"{d['location']}\n"
+            f"  {d['reason']} ({d['validator']}, {d['time']})\n"
+        )
+        if batch and size + len(line) > limit:
+            yield batch, _digest_text(lines, footer)
+            batch, lines, size = [], [], 0
+        batch.append(audit)
+        lines.append(line)
+        size += len(line)
+    if batch:
+        yield batch, _digest_text(lines, footer)
+
+
+def _digest_text(lines, footer):
+    return (
+        f"*{len(lines)} Plots Rejected*\n\n"
+        + "".join(lines)
+        + footer
+    )
+
+
 def send_telegram_rejection_notification(audit_id):
-    """Send Telegram notification for a
-    rejected plot submission.
+    """Queue the Telegram notification for a
+    rejected plot submission and dispatch the
+    queue.
 
     Called asynchronously after successful
     Kobo validation sync.
     """
-    try:
-        audit = RejectionAudit.objects.select_related(
-            "plot",
-            "submission",
-            "submission__form",
-            "validator",
-        ).get(pk=audit_id)
-    except RejectionAudit.DoesNotExist:
+    if not RejectionAudit.objects.filter(pk=audit_id).exists():
         logger.error(
             "RejectionAudit %s not found",
             audit_id,
         )
         return
-
+    RejectionAudit.objects.filter(
+        pk=audit_id,
+        telegram_sent_at__isnull=True,
+        telegram_queued_at__isnull=True,
+    ).update(telegram_queued_at=timezone.now())
+    dispatch_telegram_notifications()
+
+
+def dispatch_telegram_notifications():
+    """Send the queued rejection notifications
+    to the configured Telegram groups.
+
+    Audits are claimed in small batches (leased
+    for twice the notify queue timeout) and sent
+    with no transaction open; each delivery is
+    saved on its audits as soon as Telegram
+    accepts it, so a killed run never sends a
+    group the same rejection twice.
+
+    A chat with TELEGRAM_DIGEST_THRESHOLD or more
+    waiting rejections gets them folded into
+    digest messages. Sends respect the per-chat
+    rate limit and stop before the queue
+    timeout; rejections not yet delivered to
+    every group stay queued for the next run
+    (every minute) until TELEGRAM_QUEUE_MAX_AGE.
+    """
     tg_config = get_telegram_config()
     if not tg_config["enabled"]:
+        cleared = RejectionAudit.objects.filter(
+            telegram_queued_at__isnull=False
+        ).update(telegram_queued_at=None)
         logger.info(
-            "Telegram disabled, skipping " "notification for audit %s",
-            audit_id,
+            "Telegram disabled, skipping " "%s queued notification(s)",
+            cleared,
         )
         return
 
@@ -436,56 +549,12 @@ def send_telegram_rejection_notification(audit_id):
         logger.warning("TELEGRAM_BOT_TOKEN not set, " "skipping notification")
         return
 
-    plot = audit.plot
-    submission = audit.submission
-    validator_name = audit.validator.name if audit.validator else "Unknown"
-    category_display = audit.get_reason_category_display()
-    reason = category_display
-    if audit.reason_text:
-        reason = f"{category_display}: " f"{audit.reason_text}"
-
-    rejected_at_str = (
-        audit.rejected_at.strftime("%Y-%m-%d %H:%M UTC")
-        if audit.rejected_at else "N/A"
-    )
-    plot_location = _resolve_plot_location(submission, plot)
-
-    esc = _escape_markdown
-    submission_id = "N/A"
-    if submission.kobo_id:
-        submission_id = f"{PREFIX_SUBM_ID}{submission.kobo_id}"
-    farm_id = "N/A"
-    if plot.farmer and plot.farmer.uid:
-        farm_id = f"{PREFIX_FARM_ID}{plot.farmer.uid}"
-    message = (
-        f"*Plot Rejected*\n\n"
-        f"*Submission ID:* {esc(submission_id)}\n"
-        f"*Farm ID:* {esc(farm_id)}\n"
-        f"*Location:* {esc(plot_location)}\n"
-        f"*Reason:* {esc(reason)}\n"
-        f"*Validated by:* "
-        f"{esc(validator_name)}\n"
-        f"*Time:* {esc(rejected_at_str)}\n\n"
-        f"_Please review and recollect "
-        f"if needed._"
-    )
-
-    client = TelegramClient(bot_token)
-    chat_ids = []
-    message_ids = []
-    groups = [
-        (
-            "supervisor",
-            tg_config["supervisor_group_id"],
-        ),
-        (
-            "enumerator",
-            tg_config["enumerator_group_id"],
-        ),
-    ]
+    groups = []
     seen = set()
-
-    for label, chat_id in groups:
+    for label, chat_id in (
+        ("supervisor", tg_config["supervisor_group_id"]),
+        ("enumerator", tg_config["enumerator_group_id"]),
+    ):
         if not chat_id or chat_id in seen:
             logger.info(
                 "No %s group ID configured, " "skipping",
@@ -493,36 +562,202 @@ def send_telegram_rejection_notification(audit_id):
             )
             continue
         seen.add(chat_id)
-        try:
-            msg_id = client.send_message(chat_id, message)
-            chat_ids.append(chat_id)
-            message_ids.append(str(msg_id))
-            logger.info(
-                "Sent Telegram notification to " "%s group %s for audit %s",
-                label,
-                chat_id,
-                audit_id,
+        groups.append((label, chat_id))
+
+    TelegramDispatch(groups, bot_token).run()
+
+
+class TelegramDispatch:
+    """One run of dispatch_telegram_notifications."""
+
+    # Seconds a single send may take (HTTP timeout)
+    SEND_TIMEOUT = 10
+
+    def __init__(self, groups, bot_token):
+        self.groups = groups
+        self.chat_ids = {chat_id for _, chat_id in groups}
+        self.client = TelegramClient(
+            bot_token,
+            rate_per_minute=settings.TELEGRAM_CHAT_RATE_PER_MINUTE,
+            burst=settings.TELEGRAM_CHAT_BURST,
+            max_retry_wait=settings.TELEGRAM_MAX_RETRY_WAIT,
+        )
+        timeout = queue_timeout(
+            queue_for(
+                "api.v1.v1_odk.tasks"
+                ".dispatch_telegram_notifications"
             )
-        except TelegramSendError:
-            logger.exception(
-                "Failed to send Telegram "
-                "notification to %s group %s "
-                "for audit %s",
+        )
+        # No send starts after the deadline: it may
+        # wait out the rate limit and a 429
+        self.deadline = (
+            time.monotonic()
+            + timeout
+            - settings.TELEGRAM_MAX_RETRY_WAIT
+            - 60 / settings.TELEGRAM_CHAT_RATE_PER_MINUTE
+            - self.SEND_TIMEOUT
+        )
+        self.lease = timedelta(seconds=timeout * 2)
+        # What the rate limit lets one chat receive
+        # within the queue timeout
+        self.batch_size = int(
+            settings.TELEGRAM_CHAT_BURST
+            + settings.TELEGRAM_CHAT_RATE_PER_MINUTE
+            * timeout
+            / 60
+        )
+        self.max_age = timedelta(
+            seconds=settings.TELEGRAM_QUEUE_MAX_AGE
+        )
+        self.resolvers = {}
+        self.details = {}
+        self.claimed = set()
+        # Chats rate limited for the rest of the run
+        self.blocked = set()
+
+    def run(self):
+        while time.monotonic() < self.deadline:
+            if self.blocked >= self.chat_ids:
+                # Every chat is rate limited
+                break
+            audits = self._claim()
+            if not audits:
+                break
+            for label, chat_id in self.groups:
+                if chat_id not in self.blocked:
+                    self._send_to(label, chat_id, audits)
+            self._requeue(audits)
+
+    def _claim(self):
+        """Lease the next batch of queued audits,
+        so overlapping runs skip them."""
+        now = timezone.now()
+        with transaction.atomic():
+            audits = list(
+                RejectionAudit.objects.select_for_update(
+                    skip_locked=True, of=("self",)
+                )
+                .select_related(
+                    "plot",
+                    "plot__farmer",
+                    "submission",
+                    "submission__form",
+                    "validator",
+                )
+                .filter(telegram_queued_at__lte=now)
+                .exclude(pk__in=self.claimed)
+                .order_by("telegram_queued_at", "pk")[
+                    : self.batch_size
+                ]
+            )
+            RejectionAudit.objects.filter(
+                pk__in=[a.pk for a in audits]
+            ).update(telegram_queued_at=now + self.lease)
+        for a in audits:
+            a.telegram_queued_at = now + self.lease
+            self.claimed.add(a.pk)
+        return audits
+
+    def _messages(self, waiting):
+        for a in waiting:
+            if a.pk not in self.details:
+                self.details[a.pk] = _rejection_details(
+                    a, self.resolvers
+                )
+        if len(waiting) >= settings.TELEGRAM_DIGEST_THRESHOLD:
+            return _digest_messages(
+                (a, self.details[a.pk]) for a in waiting
+            )
+        return (
+            ([a], _rejection_message(self.details[a.pk]))
+            for a in waiting
+        )
+
+    def _send_to(self, label, chat_id, audits):
+        waiting = [
+            a
+            for a in audits
+            if chat_id not in (a.telegram_chat_ids or [])
+        ]
+        for batch, text in self._messages(waiting):
+            if time.monotonic() >= self.deadline:
+                return
+            audit_ids = [a.pk for a in batch]
+            try:
+                msg_id = self.client.send_message(chat_id, text)
+            except TelegramRateLimited as e:
+                # Leave the rest for the next run
+                logger.warning(
+                    "Telegram rate limit on %s group %s, "
+                    "retrying in %ss",
+                    label,
+                    chat_id,
+                    e.retry_after,
+                )
+                self.blocked.add(chat_id)
+                return
+            except TelegramSendError:
+                logger.exception(
+                    "Failed to send Telegram "
+                    "notification to %s group %s "
+                    "for audits %s",
+                    label,
+                    chat_id,
+                    audit_ids,
+                )
+                continue
+            self._record_sent(batch, chat_id, msg_id)
+            logger.info(
+                "Sent Telegram notification to " "%s group %s for audits %s",
                 label,
                 chat_id,
-                audit_id,
+                audit_ids,
             )
 
-    if chat_ids:
-        audit.telegram_sent_at = timezone.now()
-        audit.telegram_chat_ids = chat_ids
-        audit.telegram_message_id = ",".join(message_ids)
-        audit.save(
-            update_fields=[
+    def _record_sent(self, batch, chat_id, msg_id):
+        """Save a delivery on its audits right
+        away; done ones leave the queue."""
+        now = timezone.now()
+        for a in batch:
+            a.telegram_chat_ids = [
+                *(a.telegram_chat_ids or []),
+                chat_id,
+            ]
+            a.telegram_sent_at = a.telegram_sent_at or now
+            a.telegram_message_id = ",".join(
+                [
+                    *filter(None, [a.telegram_message_id]),
+                    str(msg_id),
+                ]
+            )[:100]
+            if self.chat_ids <= set(a.telegram_chat_ids):
+                a.telegram_queued_at = None
+        RejectionAudit.objects.bulk_update(
+            batch,
+            [
+                "telegram_queued_at",
                 "telegram_sent_at",
                 "telegram_chat_ids",
                 "telegram_message_id",
-            ]
+            ],
+        )
+
+    def _requeue(self, audits):
+        """Make undelivered audits due for the next
+        run, or drop those queued too long."""
+        now = timezone.now()
+        pending = [a for a in audits if a.telegram_queued_at]
+        for a in pending:
+            if now - (a.synced_at or a.rejected_at) > self.max_age:
+                logger.warning(
+                    "Giving up Telegram notification for " "audit %s",
+                    a.pk,
+                )
+                a.telegram_queued_at = None
+            else:
+                a.telegram_queued_at = now
+        RejectionAudit.objects.bulk_update(
+            pending, ["telegram_queued_at"]
         )
 
 
@@ -0,0 +1,134 @@
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from api.v1.v1_odk.export import (
+    PLOT_ROW_FIELDS,
+    PlotAttributeResolver,
+    iter_export_rows,
+)
+from api.v1.v1_odk.models import (
+    Farmer,
+    FormMetadata,
+    FormOption,
+    FormQuestion,
+    MainPlot,
+    MainPlotSubmission,
+    Plot,
+    Submission,
+)
+
+VALID_WKT = (
+    "POLYGON(("
+    "38.47 7.05,"
+    "38.48 7.05,"
+    "38.48 7.06,"
+    "38.47 7.06,"
+    "38.47 7.05))"
+)
+
+
+@override_settings(USE_TZ=False, TEST_ENV=True)
+class PlotAttributeResolverTest(TestCase):
+    def setUp(self):
+        self.form = FormMetadata.objects.create(
+            asset_uid="resolverForm",
+            name="Resolver",
+            region_field="region, zone",
+            sub_region_field="woreda",
+        )
+        question = FormQuestion.objects.create(
+            form=self.form,
+            name="region",
+            label="Region",
+            type="select_one",
+        )
+        FormOption.objects.create(
+            question=question, name="ET04", label="Amhara"
+        )
+        farmer = Farmer.objects.create(
+            uid="00001", lookup_key="Abebe"
+        )
+        main_plot = MainPlot.objects.create(
+            form=self.form, uid="PLT00001"
+        )
+        sub = Submission.objects.create(
+            uuid="resolver-1",
+            form=self.form,
+            kobo_id="101",
+            submission_time=1700000000000,
+            approval_status=1,
+            raw_data={
+                "region": "ET04",
+                "zone": "Z1",
+                "woreda": "W" * 300,
+                "enumerator_id": "enum-7",
+            },
+        )
+        MainPlotSubmission.objects.create(
+            main_plot=main_plot, submission=sub
+        )
+        Plot.objects.create(
+            form=self.form,
+            submission=sub,
+            farmer=farmer,
+            polygon_wkt=VALID_WKT,
+            flagged_for_review=True,
+            flagged_reason="overlap",
+            created_at=1700000000000,
+        )
+        # Bare plot: no submission or farmer
+        Plot.objects.create(
+            form=self.form,
+            polygon_wkt=VALID_WKT,
+            created_at=0,
+        )
+        self.plots = Plot.objects.filter(
+            form=self.form
+        ).order_by("pk")
+
+    def test_record_from_row(self):
+        resolver = PlotAttributeResolver(self.form)
+        full, bare = self.plots.values_list(
+            *PLOT_ROW_FIELDS
+        )
+        attrs = resolver.record(full)
+        self.assertEqual(attrs["SUBMISSION_ID"], "#101")
+        self.assertEqual(attrs["PLOT_ID"], "PLT00001")
+        self.assertEqual(attrs["FARMER_ID"], "AB00001")
+        self.assertEqual(attrs["ENUMERATOR"], "enum-7")
+        self.assertEqual(attrs["REGION"], "Amhara - Z1")
+        self.assertEqual(len(attrs["SUB_REGION"]), 254)
+        self.assertEqual(attrs["VAL_STATUS"], "approved")
+        self.assertEqual(attrs["NEEDS_RECL"], "Yes")
+        self.assertEqual(attrs["REJ_REASON"], "overlap")
+        self.assertEqual(
+            attrs["SUBMIT_AT"], "2023-11-14T22:13:20Z"
+        )
+        self.assertEqual(
+            len(
+                resolver.record(full, max_length=None)[
+                    "SUB_REGION"
+                ]
+            ),
+            300,
+        )
+
+        attrs = resolver.record(bare)
+        self.assertEqual(attrs["SUBMISSION_ID"], "")
+        self.assertEqual(attrs["PLOT_ID"], "")
+        self.assertEqual(attrs["FARMER_ID"], "")
+        self.assertEqual(attrs["REGION"], "")
+        self.assertEqual(attrs["VAL_STATUS"], "pending")
+        self.assertEqual(attrs["NEEDS_RECL"], "")
+
+    def test_rows_come_from_one_query(self):
+        ctx = {
+            "resolver": PlotAttributeResolver(self.form)
+        }
+        with self.assertNumQueries(1):
+            rows = list(
+                iter_export_rows("csv", self.plots, ctx)
+            )
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0][0], "#101")
+        self.assertEqual(rows[1][-1], VALID_WKT)
@@ -0,0 +1,201 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+)
+
+from api.v1.v1_odk.models import (
+    ApprovalStatus,
+    Enumerator,
+    FormMetadata,
+    FormOption,
+    FormQuestion,
+    Submission,
+)
+from api.v1.v1_odk.tests.mixins import (
+    OdkTestHelperMixin,
+)
+from api.v1.v1_odk.utils.enumerator_directory import (
+    refresh_enumerators,
+)
+
+URL = "/api/v1/odk/enumerators/"
+
+
+@override_settings(USE_TZ=False, TEST_ENV=True)
+class EnumeratorDirectoryTest(
+    TestCase, OdkTestHelperMixin
+):
+    def setUp(self):
+        self.user = self.create_kobo_user()
+        self.auth = self.get_auth_header()
+        self.form = FormMetadata.objects.create(
+            asset_uid="dirForm", name="Directory"
+        )
+        self.other = FormMetadata.objects.create(
+            asset_uid="dirOther", name="Other"
+        )
+        q = FormQuestion.objects.create(
+            form=self.form,
+            name="enumerator_id",
+            label="Enumerator",
+            type="select_one",
+        )
+        for code, label in (
+            ("E1", "Alice"),
+            ("E2", "bob"),
+            ("E3", "Carol"),
+        ):
+            FormOption.objects.create(
+                question=q, name=code, label=label
+            )
+        rows = [
+            (self.form, "E1", ApprovalStatus.APPROVED),
+            (self.form, "E1", ApprovalStatus.REJECTED),
+            (self.form, " E1 ", None),
+            (self.form, "E2", ApprovalStatus.APPROVED),
+            (self.other, "E1", ApprovalStatus.APPROVED),
+            (self.other, "X9", None),
+        ]
+        for i, (form, code, st) in enumerate(rows):
+            Submission.objects.create(
+                uuid=f"dir-{i}",
+                form=form,
+                kobo_id=str(i),
+                submission_time=1700000000000 + i,
+                approval_status=st,
+                raw_data={"enumerator_id": code},
+            )
+
+    def _list(self, **params):
+        resp = self.client.get(URL, params, **self.auth)
+        self.assertEqual(resp.status_code, 200)
+        return resp.json()
+
+    def test_counts_per_form(self):
+        data = self._list(form_id="dirForm")
+        self.assertEqual(data["count"], 2)
+        alice, bob = data["results"]
+        self.assertEqual(
+            alice,
+            {
+                "code": "E1",
+                "name": "Alice",
+                "submission_count": 3,
+                "approved_count": 1,
+                "rejected_count": 1,
+                "last_seen_at": 1700000000002,
+            },
+        )
+        self.assertEqual(bob["name"], "bob")
+
+    def test_merged_across_forms(self):
+        data = self._list()
+        self.assertEqual(
+            [r["code"] for r in data["results"]],
+            ["E1", "E2", "X9"],
+        )
+        self.assertEqual(
+            data["results"][0]["submission_count"], 4
+        )
+        self.assertEqual(
+            data["results"][0]["approved_count"], 2
+        )
+
+    def test_pagination_and_search_in_db(self):
+        self._list()
+        with CaptureQueriesContext(connection) as ctx:
+            data = self._list(limit=1, offset=1)
+        self.assertEqual(data["count"], 3)
+        self.assertEqual(
+            [r["code"] for r in data["results"]],
+            ["E2"],
+        )
+        sql = " ".join(
+            q["sql"] for q in ctx.captured_queries
+        )
+        self.assertNotIn('FROM "submissions"', sql)
+        self.assertIn("LIMIT 1", sql)
+        data = self._list(search="BOB")
+        self.assertEqual(
+            [r["code"] for r in data["results"]],
+            ["E2"],
+        )
+
+    @patch("api.v1.v1_odk.views.async_task")
+    def test_review_updates_counts(self, mock_task):
+        self._list()
+        resp = self.client.patch(
+            "/api/v1/odk/submissions/dir-2/",
+            {"approval_status": ApprovalStatus.APPROVED},
+            content_type="application/json",
+            **self.auth,
+        )
+        self.assertEqual(resp.status_code, 200)
+        row = Enumerator.objects.get(
+            form=self.form, code="E1"
+        )
+        self.assertEqual(row.approved_count, 2)
+
+    @patch("api.v1.v1_odk.views.async_task")
+    def test_edit_moves_submission(self, mock_task):
+        self._list()
+        resp = self.client.patch(
+            "/api/v1/odk/submissions/dir-0/"
+            "edit_data/",
+            {"fields": {"enumerator_id": "E3"}},
+            content_type="application/json",
+            **self.auth,
+        )
+        self.assertEqual(resp.status_code, 200)
+        rows = dict(
+            Enumerator.objects.filter(
+                form=self.form
+            ).values_list("code", "submission_count")
+        )
+        self.assertEqual(
+            rows, {"E1": 2, "E2": 1, "E3": 1}
+        )
+        self.assertEqual(
+            Enumerator.objects.get(code="E3").name,
+            "Carol",
+        )
+
+    def test_partial_refresh_needs_full_build(self):
+        refresh_enumerators(self.form, {"E1"})
+        self.assertFalse(Enumerator.objects.exists())
+        refresh_enumerators(self.form)
+        self.form.refresh_from_db()
+        self.assertTrue(self.form.enumerators_ready)
+        Submission.objects.filter(uuid="dir-3").update(
+            approval_status=None
+        )
+        refresh_enumerators(self.form, {"E1"})
+        # E2 untouched by a partial refresh
+        self.assertEqual(
+            Enumerator.objects.get(
+                code="E2"
+            ).approved_count,
+            1,
+        )
+
+    def test_backfill_command(self):
+        out = StringIO()
+        call_command(
+            "backfill_enumerators", stdout=out
+        )
+        self.assertIn(
+            "Built 4 enumerator row(s)",
+            out.getvalue(),
+        )
+        self.assertEqual(
+            FormMetadata.objects.filter(
+                enumerators_ready=True
+            ).count(),
+            2,
+        )
@@ -0,0 +1,280 @@
+import os
+import time
+from itertools import count
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from api.v1.v1_jobs.constants import JobStatus
+from api.v1.v1_jobs.models import Jobs
+from api.v1.v1_odk.funcs import sync_form_questions
+from api.v1.v1_odk.models import (
+    FieldSettings,
+    FormMetadata,
+    FormQuestion,
+    Plot,
+    Submission,
+)
+from api.v1.v1_odk.tasks import generate_export_file
+from api.v1.v1_odk.tests.mixins import (
+    OdkTestHelperMixin,
+)
+from api.v1.v1_odk.utils.export_cache import (
+    bump_data_version,
+    export_cache_key,
+)
+from utils import storage
+
+EXPORT_URL = "/api/v1/odk/plots/export/"
+
+VALID_WKT = (
+    "POLYGON(("
+    "38.47 7.05,"
+    "38.48 7.05,"
+    "38.48 7.06,"
+    "38.47 7.06,"
+    "38.47 7.05))"
+)
+
+
+@override_settings(USE_TZ=False, TEST_ENV=True)
+class ExportCacheTest(TestCase, OdkTestHelperMixin):
+    def setUp(self):
+        task_ids = count()
+        # Job.task_id is unique
+        patcher = patch(
+            "api.v1.v1_odk.plot_views.async_task",
+            side_effect=lambda *a, **k: (
+                f"task-{next(task_ids)}"
+            ),
+        )
+        self.mock_task = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = self.create_kobo_user()
+        self.auth = self.get_auth_header()
+        self.form = FormMetadata.objects.create(
+            asset_uid="cacheForm",
+            name="Cache",
+            filter_fields=["crop", "year"],
+        )
+        for i in range(2):
+            sub = Submission.objects.create(
+                uuid=f"cache-{i}",
+                form=self.form,
+                kobo_id=str(i),
+                submission_time=1700000000000,
+                raw_data={
+                    "crop": "bamboo",
+                    "year": 2024,
+                },
+            )
+            Plot.objects.create(
+                form=self.form,
+                submission=sub,
+                polygon_wkt=VALID_WKT,
+                region="R",
+                sub_region="S",
+                created_at=0,
+            )
+
+    def tearDown(self):
+        for job in Jobs.objects.all():
+            path = (job.info or {}).get("file_path")
+            if path and storage.check(path):
+                storage.delete(path)
+
+    def _export(self, **extra):
+        resp = self.client.post(
+            EXPORT_URL,
+            {
+                "form_id": "cacheForm",
+                "format": "geojson",
+                **extra,
+            },
+            content_type="application/json",
+            **self.auth,
+        )
+        self.assertEqual(resp.status_code, 201)
+        return Jobs.objects.get(pk=resp.json()["id"])
+
+    def _export_and_run(self, **extra):
+        job = self._export(**extra)
+        generate_export_file(job.pk)
+        job.refresh_from_db()
+        self.assertEqual(job.status, JobStatus.done)
+        return job
+
+    def test_repeat_export_reuses_file(self):
+        first = self._export_and_run(
+            dynamic_filters={
+                "crop": "bamboo",
+                "year": 2024,
+            }
+        )
+        full = storage.get_path(first.info["file_path"])
+        old = time.time() - 3600
+        os.utime(full, (old, old))
+
+        # Same filters in another key order
+        second = self._export(
+            dynamic_filters={
+                "year": 2024,
+                "crop": "bamboo",
+            }
+        )
+        self.assertEqual(second.status, JobStatus.done)
+        self.assertEqual(
+            second.info["file_path"],
+            first.info["file_path"],
+        )
+        self.assertEqual(
+            second.info["cached_from"], first.pk
+        )
+        self.assertEqual(
+            second.info["record_count"], 2
+        )
+        self.assertIsNotNone(second.available)
+        self.assertEqual(self.mock_task.call_count, 1)
+        # Reuse keeps the file from being cleaned
+        self.assertGreater(
+            os.path.getmtime(full), old + 60
+        )
+
+    def test_other_filters_or_options_miss(self):
+        self._export_and_run()
+        self.assertEqual(
+            self._export(search="x").status,
+            JobStatus.pending,
+        )
+        self.assertEqual(
+            self._export(compress="gzip").status,
+            JobStatus.pending,
+        )
+        self.assertEqual(self.mock_task.call_count, 3)
+
+    def test_data_change_misses(self):
+        self._export_and_run()
+        plot = Plot.objects.filter(
+            form=self.form
+        ).first()
+        self.client.delete(
+            f"/api/v1/odk/plots/{plot.uuid}/",
+            **self.auth,
+        )
+        self.form.refresh_from_db()
+        self.assertEqual(self.form.data_version, 1)
+        job = self._export()
+        self.assertEqual(job.status, JobStatus.pending)
+
+    def _version(self):
+        self.form.refresh_from_db()
+        return self.form.data_version
+
+    def test_filter_fields_change_bumps(self):
+        self.client.patch(
+            "/api/v1/odk/forms/cacheForm/",
+            {"filter_fields": ["crop"]},
+            content_type="application/json",
+            **self.auth,
+        )
+        self.assertEqual(self._version(), 1)
+        # Unchanged list: same files
+        self.client.patch(
+            "/api/v1/odk/forms/cacheForm/",
+            {"filter_fields": ["crop"]},
+            content_type="application/json",
+            **self.auth,
+        )
+        self.assertEqual(self._version(), 1)
+
+    def test_mapping_changes_bump(self):
+        FormQuestion.objects.create(
+            form=self.form, name="crop", label="Crop"
+        )
+        resp = self.client.put(
+            "/api/v1/odk/forms/cacheForm"
+            "/farmer-field-mapping/",
+            {"unique_fields": ["crop"]},
+            content_type="application/json",
+            **self.auth,
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(self._version(), 1)
+
+        FieldSettings.objects.create(name="title_deed_1")
+        question = FormQuestion.objects.get(
+            form=self.form, name="crop"
+        )
+        url = "/api/v1/odk/field-mappings/cacheForm/"
+        for q_id, version in (
+            (question.pk, 2),
+            (question.pk, 2),
+            (None, 3),
+        ):
+            self.client.put(
+                url,
+                {"title_deed_1": q_id},
+                content_type="application/json",
+                **self.auth,
+            )
+            self.assertEqual(self._version(), version)
+
+    def test_option_label_change_bumps(self):
+        def content(label):
+            return {
+                "survey": [
+                    {
+                        "type": "select_one crops",
+                        "name": "crop",
+                        "label": ["Crop"],
+                    }
+                ],
+                "choices": [
+                    {
+                        "list_name": "crops",
+                        "name": "bamboo",
+                        "label": [label],
+                    }
+                ],
+            }
+
+        with patch("api.v1.v1_odk.funcs.async_task"):
+            sync_form_questions(self.form, content("Bamboo"))
+            self.assertEqual(self._version(), 1)
+            sync_form_questions(self.form, content("Bamboo"))
+            self.assertEqual(self._version(), 1)
+            sync_form_questions(self.form, content("Bambú"))
+            self.assertEqual(self._version(), 2)
+
+    def test_deleted_file_misses(self):
+        first = self._export_and_run()
+        storage.delete(first.info["file_path"])
+        job = self._export()
+        self.assertEqual(job.status, JobStatus.pending)
+
+    def test_key_tracks_data_version(self):
+        filters = {"a": 1, "b": "x"}
+        key = export_cache_key(
+            "cacheForm", 1, filters, {}
+        )
+        self.assertEqual(
+            key,
+            export_cache_key(
+                "cacheForm", 1, {"b": "x", "a": 1}, {}
+            ),
+        )
+        # raw_data matches 1 and "1" differently
+        self.assertNotEqual(
+            key,
+            export_cache_key(
+                "cacheForm", 1, {"a": "1", "b": "x"}, {}
+            ),
+        )
+        bump_data_version(self.form)
+        self.assertNotEqual(
+            key,
+            export_cache_key(
+                "cacheForm", 1, filters, {}
+            ),
+        )
@@ -0,0 +1,163 @@
+import json
+import os
+
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import override_settings
+from openpyxl import load_workbook
+
+from api.v1.v1_odk.export import (
+    generate_geojson,
+    generate_shapefile,
+    generate_xlsx,
+)
+from api.v1.v1_odk.models import (
+    FormMetadata,
+    Plot,
+    Submission,
+)
+from api.v1.v1_odk.utils.export_chunks import (
+    map_ordered,
+    pk_ranges,
+)
+from utils.storage import get_path
+
+VALID_WKT = (
+    "POLYGON(("
+    "38.47 7.05,"
+    "38.48 7.05,"
+    "38.48 7.06,"
+    "38.47 7.06,"
+    "38.47 7.05))"
+)
+
+
+def _add_plots(form, count, bad=()):
+    for i in range(count):
+        sub = Submission.objects.create(
+            uuid=f"chunk-{i}",
+            form=form,
+            kobo_id=str(i),
+            submission_time=1700000000000,
+            raw_data={},
+        )
+        Plot.objects.create(
+            form=form,
+            submission=sub,
+            polygon_wkt=(
+                "POLYGON((1 2" if i in bad else VALID_WKT
+            ),
+            region="R",
+            sub_region="S",
+            created_at=0,
+        )
+
+
+def _load_geojson(rel_path):
+    full = get_path(rel_path)
+    with open(full) as f:
+        data = json.load(f)
+    os.remove(full)
+    return [
+        f["properties"]["SUBMISSION_ID"]
+        for f in data["features"]
+    ]
+
+
+@override_settings(
+    USE_TZ=False, TEST_ENV=True, EXPORT_CHUNK_SIZE=2
+)
+class ExportChunksTest(TestCase):
+    def setUp(self):
+        self.form = FormMetadata.objects.create(
+            asset_uid="chunkForm", name="Chunks"
+        )
+        _add_plots(self.form, 5, bad={2})
+        self.qs = Plot.objects.filter(form=self.form)
+
+    def test_pk_ranges(self):
+        pks = list(
+            self.qs.order_by("pk").values_list(
+                "pk", flat=True
+            )
+        )
+        self.assertEqual(
+            pk_ranges(self.qs, 2),
+            [
+                (pks[0], pks[1]),
+                (pks[2], pks[3]),
+                (pks[4], pks[4]),
+            ],
+        )
+        self.assertEqual(
+            pk_ranges(self.qs.none(), 2), []
+        )
+
+    def test_map_ordered_in_process(self):
+        self.assertEqual(
+            list(
+                map_ordered(
+                    pow, [(2, 1), (2, 2), (2, 3)], 1
+                )
+            ),
+            [2, 4, 8],
+        )
+
+    def test_chunks_merged_in_pk_order(self):
+        rel_path, count = generate_geojson(
+            self.qs, self.form, "chunked"
+        )
+        self.assertEqual(count, 4)
+        self.assertEqual(
+            _load_geojson(rel_path),
+            ["#0", "#1", "#3", "#4"],
+        )
+
+    def test_xlsx_and_shapefile_chunked(self):
+        rel_path, count = generate_xlsx(
+            self.qs, self.form, "chunked"
+        )
+        self.assertEqual(count, 5)
+        full = get_path(rel_path)
+        ws = load_workbook(full)["Plot Table"]
+        self.assertEqual(
+            [
+                r[0]
+                for r in ws.iter_rows(
+                    min_row=2, values_only=True
+                )
+            ],
+            ["#0", "#1", "#2", "#3", "#4"],
+        )
+        os.remove(full)
+        rel_path, count = generate_shapefile(
+            self.qs, self.form, "chunked"
+        )
+        self.assertEqual(count, 4)
+        os.remove(get_path(rel_path))
+
+
+@override_settings(
+    USE_TZ=False,
+    TEST_ENV=True,
+    EXPORT_CHUNK_SIZE=1,
+    EXPORT_WORKERS=2,
+)
+class ExportProcessPoolTest(TransactionTestCase):
+    """Chunks rendered in worker processes, which
+    only see committed rows."""
+
+    def test_geojson_across_processes(self):
+        form = FormMetadata.objects.create(
+            asset_uid="poolForm", name="Pool"
+        )
+        _add_plots(form, 4)
+        rel_path, count = generate_geojson(
+            Plot.objects.filter(form=form),
+            form,
+            "pooled",
+        )
+        self.assertEqual(count, 4)
+        self.assertEqual(
+            _load_geojson(rel_path),
+            ["#0", "#1", "#2", "#3"],
+        )
@@ -0,0 +1,168 @@
+import os
+import time
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from api.v1.v1_jobs.constants import JobStatus, JobTypes
+from api.v1.v1_jobs.models import Jobs
+from api.v1.v1_jobs.progress import JobProgress
+from api.v1.v1_jobs.serializers import JobSerializer
+from api.v1.v1_odk.export import EXPORT_FOLDER
+from api.v1.v1_odk.models import (
+    FormMetadata,
+    Plot,
+    Submission,
+)
+from api.v1.v1_odk.tasks import generate_export_file
+from api.v1.v1_odk.tests.mixins import (
+    OdkTestHelperMixin,
+)
+from utils import storage
+
+CANCEL_URL = "/api/v1/jobs/{job_id}/cancel/"
+
+VALID_WKT = (
+    "POLYGON(("
+    "38.47 7.05,"
+    "38.48 7.05,"
+    "38.48 7.06,"
+    "38.47 7.06,"
+    "38.47 7.05))"
+)
+
+
+@override_settings(
+    USE_TZ=False,
+    TEST_ENV=True,
+    EXPORT_CHUNK_SIZE=1,
+    JOB_PROGRESS_INTERVAL=0,
+)
+class ExportProgressTest(TestCase, OdkTestHelperMixin):
+    def setUp(self):
+        self.user = self.create_kobo_user()
+        self.auth = self.get_auth_header()
+        self.form = FormMetadata.objects.create(
+            asset_uid="progressForm", name="Progress"
+        )
+        for i in range(3):
+            sub = Submission.objects.create(
+                uuid=f"progress-{i}",
+                form=self.form,
+                kobo_id=str(i),
+                submission_time=1700000000000,
+                raw_data={},
+            )
+            Plot.objects.create(
+                form=self.form,
+                submission=sub,
+                polygon_wkt=VALID_WKT,
+                created_at=0,
+            )
+
+    def _job(self, job_type=JobTypes.export_geojson, **kw):
+        return Jobs.objects.create(
+            type=job_type,
+            created_by=self.user,
+            info={"form_id": "progressForm", "filters": {}},
+            **kw,
+        )
+
+    def _job_files(self, job):
+        folder = storage.get_path(EXPORT_FOLDER)
+        if not os.path.isdir(folder):
+            return []
+        prefix = f"plots_progressForm_{job.pk}"
+        return [
+            f for f in os.listdir(folder)
+            if f.startswith(prefix)
+        ]
+
+    def test_progress_written_per_chunk(self):
+        job = self._job()
+        with patch.object(
+            JobProgress,
+            "_save",
+            autospec=True,
+            side_effect=JobProgress._save,
+        ) as save:
+            generate_export_file(job.pk)
+        # expect plus one write per chunk
+        self.assertEqual(save.call_count, 4)
+        job.refresh_from_db()
+        self.assertEqual(job.status, JobStatus.done)
+        progress = job.info["progress"]
+        self.assertEqual(progress["processed"], 3)
+        self.assertEqual(progress["total"], 3)
+        self.assertEqual(job.info["record_count"], 3)
+        storage.delete(job.info["file_path"])
+
+    def test_serializer_eta(self):
+        now = time.time()
+        job = self._job(status=JobStatus.on_progress)
+        job.info["progress"] = {
+            "processed": 50,
+            "total": 200,
+            "started_at": now - 10,
+            "updated_at": now,
+        }
+        progress = JobSerializer(job).data["progress"]
+        self.assertEqual(progress["percent"], 25.0)
+        self.assertIn(progress["eta_seconds"], (29, 30))
+        job.status = JobStatus.done
+        self.assertIsNone(
+            JobSerializer(job).data["progress"]
+        )
+
+    def test_cancel_endpoint(self):
+        job = self._job()
+        url = CANCEL_URL.format(job_id=job.pk)
+        resp = self.client.post(url, **self.auth)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["status"], "cancelled")
+        # Already finished
+        resp = self.client.post(url, **self.auth)
+        self.assertEqual(resp.status_code, 400)
+        other = Jobs.objects.create(
+            type=JobTypes.export_geojson, info={}
+        )
+        resp = self.client.post(
+            CANCEL_URL.format(job_id=other.pk), **self.auth
+        )
+        self.assertEqual(resp.status_code, 404)
+
+        # Cancelled while queued: never runs
+        generate_export_file(job.pk)
+        job.refresh_from_db()
+        self.assertEqual(job.status, JobStatus.cancelled)
+        self.assertNotIn("progress", job.info)
+
+    def _run_cancelled_after_start(self, job):
+        expect = JobProgress.expect
+
+        def expect_then_cancel(progress, count):
+            expect(progress, count)
+            Jobs.objects.filter(pk=progress.job.pk).update(
+                status=JobStatus.cancelled
+            )
+
+        with patch.object(
+            JobProgress, "expect", expect_then_cancel
+        ):
+            generate_export_file(job.pk)
+        job.refresh_from_db()
+        self.assertEqual(job.status, JobStatus.cancelled)
+        self.assertIsNone(job.result)
+        self.assertEqual(self._job_files(job), [])
+        self.assertEqual(
+            job.info["progress"]["processed"], 0
+        )
+
+    def test_cancel_stops_running_export(self):
+        self._run_cancelled_after_start(self._job())
+
+    def test_cancel_stops_flatgeobuf_export(self):
+        self._run_cancelled_after_start(
+            self._job(JobTypes.export_flatgeobuf)
+        )
@@ -607,6 +607,64 @@ class GenerateXlsxTest(TestCase):
         )
         self.assertEqual(count, 3)
 
+    def test_precomputed_centroid_and_altitude(self):
+        Plot.objects.filter(pk=self.plot1.pk).update(
+            centroid_lat=1.5,
+            centroid_lon=2.5,
+            altitude=100.0,
+            altitude_computed=True,
+        )
+        wb, _ = self._generate_and_load()
+        rows = {
+            row[0]: row
+            for row in wb["Plot Table"].iter_rows(
+                min_row=2, values_only=True
+            )
+        }
+        self.assertEqual(
+            rows["#101"][5:8], (1.5, 2.5, 100)
+        )
+        # Legacy rows fall back to the polygon
+        self.assertAlmostEqual(
+            rows["#102"][5], 7.055, places=2
+        )
+        self.assertAlmostEqual(
+            rows["#102"][7], 2984.0
+        )
+
+    def test_computed_empty_altitude_not_reparsed(self):
+        Plot.objects.update(
+            altitude=None, altitude_computed=True
+        )
+        with patch(
+            "api.v1.v1_odk.export._extract_avg_altitude"
+        ) as extract:
+            wb, _ = self._generate_and_load()
+        extract.assert_not_called()
+        altitudes = [
+            row[7]
+            for row in wb["Plot Table"].iter_rows(
+                min_row=2, values_only=True
+            )
+        ]
+        self.assertEqual(altitudes, [None, None])
+
+    def test_farmers_ordered_by_numeric_uid(self):
+        big = Farmer.objects.create(
+            uid="100000", lookup_key="big", values={}
+        )
+        Plot.objects.filter(pk=self.plot1.pk).update(
+            farmer=big
+        )
+        wb, _ = self._generate_and_load()
+        ws = wb["Farmer table"]
+        self.assertEqual(
+            [r[0] for r in ws.iter_rows(
+                min_row=2, values_only=True
+            )],
+            ["AB00002", "AB100000"],
+        )
+
 
 @override_settings(
     USE_TZ=False, TEST_ENV=True
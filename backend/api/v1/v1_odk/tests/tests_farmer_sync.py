@@ -1,8 +1,13 @@
 from io import StringIO
 
 from django.core.management import call_command
+from django.db import connection
+from django.db.models import F
 from django.test import TestCase
-from django.test.utils import override_settings
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+)
 
 from api.v1.v1_odk.models import (
     Farmer,
@@ -20,6 +25,7 @@ from api.v1.v1_odk.utils.farmer_sync import (
     build_farmer_lookup_key,
     generate_next_farmer_uid,
     resolve_field_value,
+    submission_content_hash,
     sync_farmers_for_form,
     update_farmer_for_submission,
 )
@@ -310,6 +316,9 @@ class SyncFarmersTest(TestCase):
         # Update submission raw_data
         sub = Submission.objects.get(kobo_id="k001")
         sub.raw_data["age_of_farmer"] = "39"
+        sub.content_hash = submission_content_hash(
+            sub.raw_data
+        )
         sub.save()
 
         # Second sync
@@ -869,6 +878,234 @@ class SyncFarmersUidStartTest(TestCase):
 
 
 @override_settings(USE_TZ=False, TEST_ENV=True)
+class SyncFarmersBatchTest(TestCase):
+    """The batch engine gives the per-row
+    results with a constant number of queries."""
+
+    def setUp(self):
+        self.form = _create_form_with_questions()
+        FarmerFieldMapping.objects.create(
+            form=self.form,
+            unique_fields="First_Name,Father_s_Name",
+            values_fields="age_of_farmer",
+            uid_start=10,
+        )
+
+    def _add(self, kobo_id, first, father, age):
+        return _create_submission(
+            self.form,
+            kobo_id,
+            {
+                "First_Name": first,
+                "Father_s_Name": father,
+                "age_of_farmer": age,
+            },
+        )
+
+    def test_uid_block_in_submission_order(self):
+        Farmer.objects.create(
+            uid="00012",
+            lookup_key="Abebe - Kebede",
+            values={},
+        )
+        self._add("k1", "Chala", "Tesfa", "30")
+        self._add("k2", "Abebe", "Kebede", "40")
+        self._add("k3", "Bontu", "Gudina", "25")
+        # Same farmer again: last values win
+        _, plot = self._add("k4", "Chala", "Tesfa", "31")
+        self._add("k5", "", "", "50")
+
+        result = sync_farmers_for_form(self.form)
+        self.assertEqual(
+            result,
+            {"created": 2, "updated": 2, "linked": 4},
+        )
+        uids = dict(
+            Farmer.objects.values_list(
+                "lookup_key", "uid"
+            )
+        )
+        self.assertEqual(
+            uids,
+            {
+                "Abebe - Kebede": "00012",
+                "Chala - Tesfa": "00013",
+                "Bontu - Gudina": "00014",
+            },
+        )
+        chala = Farmer.objects.get(uid="00013")
+        self.assertEqual(
+            chala.values["age_of_farmer"], "31"
+        )
+        plot.refresh_from_db()
+        self.assertEqual(plot.farmer_id, chala.pk)
+
+        # Re-sync has nothing left to process
+        result = sync_farmers_for_form(self.form)
+        self.assertEqual(
+            result,
+            {"created": 0, "updated": 0, "linked": 0},
+        )
+        result = sync_farmers_for_form(
+            self.form, full=True
+        )
+        self.assertEqual(
+            result,
+            {"created": 0, "updated": 4, "linked": 0},
+        )
+
+    def test_query_count_independent_of_size(self):
+        # First allocation seeds the UID counter
+        self._add("w", "Warm", "F", "1")
+        sync_farmers_for_form(self.form)
+
+        Farmer.objects.all().delete()
+        for i in range(3):
+            self._add(f"a{i}", f"N{i}", "F", "1")
+        with CaptureQueriesContext(connection) as ctx:
+            sync_farmers_for_form(self.form)
+        small = len(ctx.captured_queries)
+
+        Farmer.objects.all().delete()
+        for i in range(30):
+            self._add(f"b{i}", f"M{i}", "F", "1")
+        with CaptureQueriesContext(connection) as ctx:
+            result = sync_farmers_for_form(self.form)
+        self.assertEqual(result["created"], 34)
+        self.assertEqual(
+            len(ctx.captured_queries), small
+        )
+
+
+class SyncFarmersIncrementalTest(TestCase):
+    """Only submissions whose content_hash moved
+    since the last run are re-read."""
+
+    def setUp(self):
+        self.form = _create_form_with_questions()
+        self.mapping = FarmerFieldMapping.objects.create(
+            form=self.form,
+            unique_fields="First_Name,Father_s_Name",
+            values_fields="age_of_farmer",
+        )
+        for i in range(3):
+            _create_submission(
+                self.form,
+                f"k{i}",
+                {
+                    "First_Name": f"N{i}",
+                    "Father_s_Name": "F",
+                    "age_of_farmer": "30",
+                },
+            )
+        sync_farmers_for_form(self.form)
+
+    def _edit(self, kobo_id, **fields):
+        sub = Submission.objects.get(kobo_id=kobo_id)
+        sub.raw_data.update(fields)
+        sub.content_hash = submission_content_hash(
+            sub.raw_data
+        )
+        sub.save()
+
+    def test_first_run_fills_hashes(self):
+        self.assertFalse(
+            Submission.objects.filter(
+                content_hash__isnull=True
+            ).exists()
+        )
+        self.assertEqual(
+            Submission.objects.exclude(
+                farmer_synced_hash=F("content_hash")
+            ).count(),
+            0,
+        )
+        self.assertIsNotNone(
+            FarmerFieldMapping.objects.get(
+                pk=self.mapping.pk
+            ).synced_signature
+        )
+
+    def test_only_changed_submissions(self):
+        self._edit("k1", age_of_farmer="31")
+        with CaptureQueriesContext(connection) as ctx:
+            result = sync_farmers_for_form(self.form)
+        self.assertEqual(
+            result,
+            {"created": 0, "updated": 1, "linked": 0},
+        )
+        self.assertEqual(
+            Farmer.objects.get(
+                lookup_key="N1 - F"
+            ).values["age_of_farmer"],
+            "31",
+        )
+        # The edited row is re-read, the others
+        # are filtered out in SQL
+        sql = " ".join(
+            q["sql"] for q in ctx.captured_queries
+        )
+        self.assertIn("farmer_synced_hash", sql)
+
+    def test_new_submission_and_unlinked_plot(self):
+        _create_submission(
+            self.form,
+            "k9",
+            {"First_Name": "New", "Father_s_Name": "F"},
+        )
+        Plot.objects.filter(
+            submission__kobo_id="k0"
+        ).update(farmer=None)
+        result = sync_farmers_for_form(self.form)
+        self.assertEqual(
+            result,
+            {"created": 1, "updated": 1, "linked": 2},
+        )
+
+    def test_mapping_change_rebuilds(self):
+        self.mapping.values_fields = (
+            "age_of_farmer,phone_q"
+        )
+        self.mapping.save()
+        result = sync_farmers_for_form(self.form)
+        self.assertEqual(result["updated"], 3)
+        self.assertIn(
+            "phone_q",
+            Farmer.objects.first().values,
+        )
+        result = sync_farmers_for_form(self.form)
+        self.assertEqual(result["updated"], 0)
+
+    def test_option_label_change_rebuilds(self):
+        question = FormQuestion.objects.get(
+            form=self.form, name="age_of_farmer"
+        )
+        question.type = "select_one"
+        question.save()
+        FormOption.objects.create(
+            question=question, name="30", label="Thirty"
+        )
+        result = sync_farmers_for_form(self.form)
+        self.assertEqual(result["updated"], 3)
+        self.assertEqual(
+            Farmer.objects.first().values[
+                "age_of_farmer"
+            ],
+            "Thirty",
+        )
+
+    def test_command_full_flag(self):
+        out = StringIO()
+        call_command(
+            "sync_farmers",
+            "--form",
+            "test_form",
+            "--full",
+            stdout=out,
+        )
+        self.assertIn("updated=3", out.getvalue())
+
+
 class SyncFarmersCleanCommandTest(TestCase):
     """Tests for --clean flag in sync_farmers
     management command."""
@@ -0,0 +1,293 @@
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+)
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from api.v1.v1_odk.models import (
+    Farmer,
+    FormMetadata,
+    FormOption,
+    FormQuestion,
+    MainPlot,
+    MainPlotSubmission,
+    Plot,
+    Submission,
+)
+from api.v1.v1_odk.serializers import (
+    PlotSerializer,
+    SubmissionListSerializer,
+    build_option_lookup,
+)
+from api.v1.v1_odk.tests.mixins import (
+    OdkTestHelperMixin,
+)
+from api.v1.v1_odk.utils.resolved_labels import (
+    reresolve_form_labels,
+)
+
+
+def _json(data):
+    return json.loads(JSONRenderer().render(data))
+
+
+@override_settings(USE_TZ=False, TEST_ENV=True)
+class FastListTest(TestCase, OdkTestHelperMixin):
+    """The values() read path must return exactly
+    what the serializers return."""
+
+    def setUp(self):
+        self.user = self.create_kobo_user()
+        self.auth = self.get_auth_header()
+        self.form = FormMetadata.objects.create(
+            asset_uid="fastForm",
+            name="Fast Form",
+            region_field="region",
+            sub_region_field="woreda",
+        )
+        for name, qtype in (
+            ("region", "select_one"),
+            ("woreda", "text"),
+            ("crop", "select_one"),
+            ("enumerator_id", "text"),
+        ):
+            q = FormQuestion.objects.create(
+                form=self.form,
+                name=name,
+                label=name.title(),
+                type=qtype,
+            )
+            if name == "region":
+                FormOption.objects.create(
+                    question=q,
+                    name="ET04",
+                    label="Oromia",
+                )
+            if name == "crop":
+                FormOption.objects.create(
+                    question=q,
+                    name="bamboo",
+                    label="Bamboo",
+                )
+        farmer = Farmer.objects.create(
+            uid="AB00001", lookup_key="Abebe"
+        )
+        main_plot = MainPlot.objects.create(
+            form=self.form, uid="PLT00001"
+        )
+        full = Submission.objects.create(
+            uuid="fast-001",
+            form=self.form,
+            kobo_id="101",
+            submission_time=1700000000003,
+            instance_name="Abebe",
+            approval_status=1,
+            updated_by=self.user,
+            updated_at=timezone.now(),
+            raw_data={
+                "region": "ET04",
+                "woreda": "Jimma",
+                "crop": "bamboo",
+                "enumerator_id": "enum_01",
+                "start": "2024-01-01T08:00:00",
+                "end": "2024-01-01T09:00:00",
+                "_attachments": [
+                    {
+                        "uid": "att1",
+                        "media_file_basename": "a.png",
+                        "question_xpath": "photo",
+                    },
+                    {"question_xpath": "sketch"},
+                ],
+            },
+        )
+        MainPlotSubmission.objects.create(
+            main_plot=main_plot, submission=full
+        )
+        Plot.objects.create(
+            form=self.form,
+            submission=full,
+            farmer=farmer,
+            plot_name="",
+            polygon_wkt="POLYGON((0 0,1 0,1 1,0 0))",
+            min_lat=0.0,
+            max_lat=1.0,
+            min_lon=0.0,
+            max_lon=1.0,
+            area_ha=1.25,
+            region="Oromia",
+            sub_region="Jimma",
+            created_at=1700000000000,
+            flagged_for_review=True,
+            flagged_reason=[{"type": "overlap"}],
+        )
+        # No plot, reviewer, start; null end
+        Submission.objects.create(
+            uuid="fast-002",
+            form=self.form,
+            kobo_id="102",
+            submission_time=1700000000002,
+            raw_data={"region": "ET99", "end": None},
+        )
+        # Plot without area and a plot name
+        bare = Submission.objects.create(
+            uuid="fast-003",
+            form=self.form,
+            kobo_id="103",
+            submission_time=1700000000001,
+            raw_data={"crop": "other"},
+        )
+        Plot.objects.create(
+            form=self.form,
+            submission=bare,
+            plot_name="Named plot",
+            created_at=1700000000000,
+        )
+        reresolve_form_labels(self.form)
+        # Not yet backfilled: serializer fallback
+        Submission.objects.create(
+            uuid="fast-004",
+            form=self.form,
+            kobo_id="104",
+            submission_time=1700000000000,
+            raw_data={"region": "ET04", "start": 1},
+        )
+
+    def _expected_submissions(self):
+        option_map, type_map = build_option_lookup(
+            self.form
+        )
+        qs = Submission.objects.filter(
+            form=self.form
+        ).order_by("-submission_time")
+        return _json(
+            SubmissionListSerializer(
+                qs,
+                many=True,
+                context={
+                    "option_lookup": option_map,
+                    "type_map": type_map,
+                    "question_names": {
+                        "crop",
+                        "enumerator_id",
+                    },
+                },
+            ).data
+        )
+
+    def test_submissions_match_serializer(self):
+        resp = self.client.get(
+            "/api/v1/odk/submissions/",
+            {"asset_uid": "fastForm"},
+            **self.auth,
+        )
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual(data["count"], 4)
+        self.assertEqual(
+            data["results"],
+            self._expected_submissions(),
+        )
+        missing_start = data["results"][1]
+        self.assertNotIn("start", missing_start)
+        self.assertIsNone(missing_start["end"])
+
+    def test_plots_match_serializer(self):
+        resp = self.client.get(
+            "/api/v1/odk/plots/",
+            {"form_id": "fastForm"},
+            **self.auth,
+        )
+        self.assertEqual(resp.status_code, 200)
+        qs = Plot.objects.filter(
+            form=self.form
+        ).order_by("-submission__submission_time")
+        expected = _json(
+            PlotSerializer(qs, many=True).data
+        )
+        self.assertEqual(
+            resp.json()["results"], expected
+        )
+
+    def test_sparse_fields_on_fast_path(self):
+        resp = self.client.get(
+            "/api/v1/odk/submissions/",
+            {
+                "asset_uid": "fastForm",
+                "fields": "uuid,start,area_ha",
+            },
+            **self.auth,
+        )
+        expected = [
+            {
+                k: row[k]
+                for k in ("uuid", "start", "area_ha")
+                if k in row
+            }
+            for row in self._expected_submissions()
+        ]
+        self.assertEqual(
+            resp.json()["results"], expected
+        )
+
+    def test_plot_query_count_is_constant(self):
+        def run():
+            with CaptureQueriesContext(
+                connection
+            ) as ctx:
+                self.client.get(
+                    "/api/v1/odk/plots/",
+                    {"form_id": "fastForm"},
+                    **self.auth,
+                )
+            return len(ctx.captured_queries)
+
+        before = run()
+        for i in range(5):
+            sub = Submission.objects.create(
+                uuid=f"extra-{i}",
+                form=self.form,
+                kobo_id=str(200 + i),
+                submission_time=1700000001000 + i,
+                raw_data={},
+            )
+            Plot.objects.create(
+                form=self.form,
+                submission=sub,
+                created_at=1700000000000,
+            )
+        reresolve_form_labels(self.form)
+        self.assertEqual(run(), before)
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command(
+            "benchmark_list_serialization",
+            "--form",
+            "fastForm",
+            "--sizes",
+            "2,4",
+            "--repeat",
+            "1",
+            stdout=out,
+        )
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[0].startswith("submissions"))
+        self.assertTrue(lines[3].startswith("plots"))
+
+    def test_benchmark_command_unknown_form(self):
+        with self.assertRaises(CommandError):
+            call_command(
+                "benchmark_list_serialization",
+                "--form",
+                "missing",
+            )
@@ -0,0 +1,213 @@
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+)
+
+from api.v1.v1_odk.models import (
+    FormFilterCatalog,
+    FormMetadata,
+    FormOption,
+    FormQuestion,
+    Plot,
+    Submission,
+)
+from api.v1.v1_odk.tests.mixins import (
+    OdkTestHelperMixin,
+)
+from api.v1.v1_odk.utils.filter_catalog import (
+    resolve_joined_label,
+)
+
+URL = "/api/v1/odk/plots/filter_options/"
+
+
+@override_settings(USE_TZ=False, TEST_ENV=True)
+class FilterCatalogTest(TestCase, OdkTestHelperMixin):
+    def setUp(self):
+        self.user = self.create_kobo_user()
+        self.auth = self.get_auth_header()
+        self.form = FormMetadata.objects.create(
+            asset_uid="catForm",
+            name="Catalog",
+            region_field="region",
+            sub_region_field="woreda",
+            filter_fields=["species"],
+        )
+        for name, options in (
+            ("region", [("ET04", "Oromia")]),
+            ("woreda", [("W01", "Jimma")]),
+            (
+                "species",
+                [
+                    ("bamboo", "Bamboo"),
+                    ("teak", "Teak"),
+                ],
+            ),
+        ):
+            q = FormQuestion.objects.create(
+                form=self.form,
+                name=name,
+                label=name.title(),
+                type="select_one",
+            )
+            for opt, label in options:
+                FormOption.objects.create(
+                    question=q, name=opt, label=label
+                )
+        rows = [
+            ("ET04", "W01", "bamboo"),
+            ("ET04", "W02", "bamboo"),
+            ("ET07", "W09", "teak"),
+            ("ET07", "", None),
+        ]
+        for i, (region, woreda, species) in (
+            enumerate(rows)
+        ):
+            sub = Submission.objects.create(
+                uuid=f"cat-{i}",
+                form=self.form,
+                kobo_id=str(i),
+                submission_time=1700000000000,
+                raw_data={"species": species},
+            )
+            Plot.objects.create(
+                form=self.form,
+                submission=sub,
+                region=region,
+                sub_region=woreda,
+                created_at=0,
+            )
+
+    def _get(self, etag=None, **params):
+        params.setdefault("form_id", "catForm")
+        headers = dict(self.auth)
+        if etag:
+            headers["HTTP_IF_NONE_MATCH"] = etag
+        return self.client.get(URL, params, **headers)
+
+    def test_catalog_content(self):
+        data = self._get().json()
+        self.assertEqual(
+            data["regions"],
+            [
+                {"value": "ET07", "label": "ET07"},
+                {"value": "ET04", "label": "Oromia"},
+            ],
+        )
+        self.assertEqual(
+            [s["label"] for s in data["sub_regions"]],
+            ["Jimma", "W02", "W09"],
+        )
+        species = data["dynamic_filters"][0]
+        self.assertEqual(
+            species["options"],
+            [
+                {
+                    "name": "bamboo",
+                    "label": "Bamboo",
+                    "count": 2,
+                },
+                {
+                    "name": "teak",
+                    "label": "Teak",
+                    "count": 1,
+                },
+            ],
+        )
+        self.assertNotIn("available_filters", data)
+
+    def test_sub_regions_by_region(self):
+        data = self._get(region="ET07").json()
+        self.assertEqual(
+            data["sub_regions"],
+            [{"value": "W09", "label": "W09"}],
+        )
+        data = self._get(region="missing").json()
+        self.assertEqual(data["sub_regions"], [])
+
+    def test_etag_and_not_modified(self):
+        resp = self._get()
+        self.assertEqual(resp.status_code, 200)
+        etag = resp["ETag"]
+        self.assertTrue(etag.startswith('"'))
+        resp = self._get(etag=etag)
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp["ETag"], etag)
+        resp = self._get(etag='"stale"')
+        self.assertEqual(resp.status_code, 200)
+
+    def test_repeat_call_skips_plot_scans(self):
+        self._get()
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self._get(region="ET04")
+        self.assertEqual(resp.status_code, 200)
+        sql = " ".join(
+            q["sql"] for q in ctx.captured_queries
+        )
+        self.assertIn("form_filter_catalogs", sql)
+        self.assertNotIn('FROM "plots"', sql)
+        self.assertNotIn("form_questions", sql)
+
+    def test_unknown_form(self):
+        resp = self._get(form_id="nope")
+        self.assertEqual(resp.status_code, 404)
+
+    @patch("api.v1.v1_odk.plot_views.async_task")
+    def test_plot_delete_invalidates(self, mock_task):
+        etag = self._get()["ETag"]
+        plot = Plot.objects.get(submission__uuid="cat-2")
+        self.client.delete(
+            f"/api/v1/odk/plots/{plot.uuid}/",
+            **self.auth,
+        )
+        self.assertFalse(
+            FormFilterCatalog.objects.exists()
+        )
+        resp = self._get(etag=etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotIn(
+            "W09",
+            [s["value"] for s in resp.json()["sub_regions"]],
+        )
+
+    def test_filter_fields_change_rebuilds(self):
+        self._get()
+        resp = self.client.patch(
+            "/api/v1/odk/forms/catForm/",
+            {"filter_fields": []},
+            content_type="application/json",
+            **self.auth,
+        )
+        self.assertEqual(resp.status_code, 200)
+        catalog = FormFilterCatalog.objects.get(
+            form=self.form
+        )
+        self.assertEqual(
+            catalog.data["dynamic_filters"], []
+        )
+
+    def test_resolve_joined_label_fallback(self):
+        option_map = {
+            "a": {"x": "X"},
+            "b": {"y": "Y", "x": "other"},
+        }
+        # Skipped empty field: "y" is looked up
+        # positionally in "a" and found in "b"
+        self.assertEqual(
+            resolve_joined_label("y", "a,b", option_map),
+            "Y",
+        )
+        self.assertEqual(
+            resolve_joined_label(
+                "x - x", "b,a", option_map
+            ),
+            "other - X",
+        )
+        self.assertEqual(
+            resolve_joined_label("", "a", option_map),
+            "",
+        )
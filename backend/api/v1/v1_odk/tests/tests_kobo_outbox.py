@@ -0,0 +1,465 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from api.v1.v1_odk.constants import (
+    ApprovalStatusTypes,
+    SyncStatus,
+)
+from api.v1.v1_odk.models import (
+    FormMetadata,
+    KoboOutbox,
+    Plot,
+    RejectionAudit,
+    Submission,
+)
+from api.v1.v1_odk.tests.mixins import (
+    OdkTestHelperMixin,
+)
+from api.v1.v1_odk.utils.kobo_outbox import (
+    flush_kobo_outbox,
+    queue_submission_data,
+    queue_validation_status,
+    retry_failed_audits,
+)
+
+APPROVED = ApprovalStatusTypes.APPROVED
+REJECTED = ApprovalStatusTypes.REJECTED
+
+
+class WorkerKilled(BaseException):
+    """Stands in for the worker being killed at
+    the queue timeout."""
+
+
+@override_settings(
+    USE_TZ=False,
+    TEST_ENV=True,
+    KOBO_OUTBOX_BATCH_SIZE=2,
+    KOBO_OUTBOX_MAX_ATTEMPTS=2,
+)
+@patch("api.v1.v1_odk.utils.kobo_outbox.KoboClient")
+class KoboOutboxTest(TestCase, OdkTestHelperMixin):
+    def setUp(self):
+        self.user = self.create_kobo_user()
+        self.form = FormMetadata.objects.create(
+            asset_uid="outboxForm", name="Outbox"
+        )
+        self.subs = [
+            Submission.objects.create(
+                uuid=f"outbox-{i}",
+                form=self.form,
+                kobo_id=str(100 + i),
+                submission_time=1700000000000,
+                raw_data={},
+            )
+            for i in range(4)
+        ]
+
+    def _audit(self, sub):
+        plot = Plot.objects.create(
+            form=self.form,
+            submission=sub,
+            created_at=0,
+        )
+        return RejectionAudit.objects.create(
+            plot=plot,
+            submission=sub,
+            validator=self.user,
+            reason_category="other",
+        )
+
+    def test_statuses_sent_in_bulk(self, mock_cls):
+        client = mock_cls.return_value
+        for sub in self.subs[:3]:
+            queue_validation_status(
+                self.user, sub, APPROVED
+            )
+        queue_validation_status(
+            self.user, self.subs[3], REJECTED
+        )
+        result = flush_kobo_outbox()
+
+        self.assertEqual(result, {"sent": 4, "failed": 0})
+        calls = [
+            c.args
+            for c in client.update_validation_statuses.call_args_list
+        ]
+        # Three approvals in batches of two
+        self.assertEqual(
+            calls,
+            [
+                (
+                    "outboxForm",
+                    ["100", "101"],
+                    "validation_status_approved",
+                ),
+                (
+                    "outboxForm",
+                    ["102"],
+                    "validation_status_approved",
+                ),
+                (
+                    "outboxForm",
+                    ["103"],
+                    "validation_status_not_approved",
+                ),
+            ],
+        )
+        self.assertFalse(
+            KoboOutbox.objects.filter(
+                status=SyncStatus.PENDING
+            ).exists()
+        )
+        self.assertEqual(flush_kobo_outbox()["sent"], 0)
+
+    def test_later_changes_coalesce(self, mock_cls):
+        client = mock_cls.return_value
+        sub = self.subs[0]
+        audit = self._audit(sub)
+        queue_validation_status(
+            self.user, sub, REJECTED, audit
+        )
+        queue_validation_status(self.user, sub, APPROVED)
+        queue_submission_data(self.user, sub, {"a": "1"})
+        queue_submission_data(
+            self.user, sub, {"a": "2", "b": "x"}
+        )
+        queue_submission_data(
+            self.user, self.subs[1], {"b": "x", "a": "2"}
+        )
+        self.assertEqual(KoboOutbox.objects.count(), 3)
+        audit.refresh_from_db()
+        self.assertEqual(
+            audit.sync_status, SyncStatus.SUPERSEDED
+        )
+
+        flush_kobo_outbox()
+        client.update_validation_statuses.assert_called_once_with(
+            "outboxForm",
+            ["100"],
+            "validation_status_approved",
+        )
+        # Identical data: one call for both
+        client.update_submissions_data.assert_called_once_with(
+            "outboxForm",
+            ["100", "101"],
+            {"a": "2", "b": "x"},
+        )
+
+    @patch("api.v1.v1_odk.utils.kobo_outbox.async_task")
+    @patch(
+        "api.v1.v1_odk.utils.kobo_outbox.get_telegram_config",
+        return_value={"enabled": True},
+    )
+    def test_audit_synced_then_notified(
+        self, _config, mock_async, mock_cls
+    ):
+        audit = self._audit(self.subs[0])
+        queue_validation_status(
+            self.user, self.subs[0], REJECTED, audit
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            flush_kobo_outbox()
+        audit.refresh_from_db()
+        self.assertEqual(
+            audit.sync_status, SyncStatus.SYNCED
+        )
+        self.assertIsNotNone(audit.synced_at)
+        self.assertIsNotNone(audit.telegram_queued_at)
+        mock_async.assert_called_once_with(
+            "api.v1.v1_odk.tasks"
+            ".dispatch_telegram_notifications"
+        )
+
+    def test_failures_back_off_then_give_up(
+        self, mock_cls
+    ):
+        client = mock_cls.return_value
+        client.update_validation_statuses.side_effect = (
+            Exception("502 Bad Gateway")
+        )
+        audit = self._audit(self.subs[0])
+        queue_validation_status(
+            self.user, self.subs[0], REJECTED, audit
+        )
+        self.assertEqual(flush_kobo_outbox()["failed"], 1)
+        entry = KoboOutbox.objects.get()
+        self.assertEqual(entry.status, SyncStatus.PENDING)
+        self.assertEqual(entry.attempts, 1)
+        self.assertIn("502", entry.last_error)
+        self.assertGreater(
+            entry.next_attempt_at, timezone.now()
+        )
+        # Not due yet
+        self.assertEqual(flush_kobo_outbox()["failed"], 0)
+
+        KoboOutbox.objects.update(
+            next_attempt_at=timezone.now()
+            - timedelta(seconds=1)
+        )
+        flush_kobo_outbox()
+        entry.refresh_from_db()
+        audit.refresh_from_db()
+        self.assertEqual(entry.status, SyncStatus.FAILED)
+        self.assertEqual(
+            audit.sync_status, SyncStatus.FAILED
+        )
+        self.assertIsNotNone(audit.last_sync_attempt)
+
+    def test_killed_flush_keeps_sent_batches(
+        self, mock_cls
+    ):
+        client = mock_cls.return_value
+        client.update_validation_statuses.side_effect = [
+            None,
+            WorkerKilled(),
+        ]
+        audit = self._audit(self.subs[0])
+        queue_validation_status(
+            self.user, self.subs[0], REJECTED, audit
+        )
+        for sub in self.subs[1:]:
+            queue_validation_status(
+                self.user, sub, APPROVED
+            )
+        with self.assertRaises(WorkerKilled):
+            flush_kobo_outbox()
+
+        statuses = dict(
+            KoboOutbox.objects.values_list(
+                "submission__kobo_id", "status"
+            )
+        )
+        self.assertEqual(
+            statuses,
+            {
+                "100": SyncStatus.SYNCED,
+                "101": SyncStatus.SENDING,
+                "102": SyncStatus.SENDING,
+                "103": SyncStatus.PENDING,
+            },
+        )
+        audit.refresh_from_db()
+        self.assertEqual(
+            audit.sync_status, SyncStatus.SYNCED
+        )
+
+        # Lease over: the killed batch is sent again
+        client.update_validation_statuses.side_effect = (
+            None
+        )
+        KoboOutbox.objects.filter(
+            status=SyncStatus.SENDING
+        ).update(
+            next_attempt_at=timezone.now()
+            - timedelta(seconds=1)
+        )
+        with self.assertLogs(
+            "api.v1.v1_odk.utils.kobo_outbox",
+            level="WARNING",
+        ):
+            self.assertEqual(
+                flush_kobo_outbox()["sent"], 3
+            )
+
+    def test_change_queued_while_sending(
+        self, mock_cls
+    ):
+        client = mock_cls.return_value
+        sub = self.subs[0]
+        queue_submission_data(self.user, sub, {"a": "1"})
+
+        def edit_then_fail(*args):
+            queue_submission_data(
+                self.user, sub, {"b": "2"}
+            )
+            raise Exception("502 Bad Gateway")
+
+        client.update_submissions_data.side_effect = (
+            edit_then_fail
+        )
+        flush_kobo_outbox()
+        self.assertEqual(
+            dict(
+                KoboOutbox.objects.values_list(
+                    "status", "data"
+                )
+            ),
+            {
+                SyncStatus.SUPERSEDED: {"a": "1"},
+                SyncStatus.PENDING: {"a": "1", "b": "2"},
+            },
+        )
+
+    @patch(
+        "api.v1.v1_odk.utils.kobo_outbox._time_budget",
+        return_value=(0, timedelta(minutes=2)),
+    )
+    def test_no_call_past_deadline(
+        self, _budget, mock_cls
+    ):
+        queue_validation_status(
+            self.user, self.subs[0], APPROVED
+        )
+        self.assertEqual(flush_kobo_outbox()["sent"], 0)
+        mock_cls.return_value \
+            .update_validation_statuses.assert_not_called()
+
+
+@override_settings(USE_TZ=False, TEST_ENV=True)
+@patch("api.v1.v1_odk.utils.kobo_outbox.KoboClient")
+class RejectionAuditRetryTest(TestCase, OdkTestHelperMixin):
+    def setUp(self):
+        self.user = self.create_kobo_user()
+        self.form = FormMetadata.objects.create(
+            asset_uid="retryForm", name="Retry"
+        )
+        self.audits = []
+        for i in range(3):
+            sub = Submission.objects.create(
+                uuid=f"retry-{i}",
+                form=self.form,
+                kobo_id=str(200 + i),
+                submission_time=1700000000000,
+                approval_status=REJECTED,
+                raw_data={},
+            )
+            plot = Plot.objects.create(
+                form=self.form,
+                submission=sub,
+                created_at=0,
+            )
+            self.audits.append(
+                RejectionAudit.objects.create(
+                    plot=plot,
+                    submission=sub,
+                    validator=self.user,
+                    reason_category="other",
+                    sync_status=SyncStatus.FAILED,
+                )
+            )
+
+    def test_failed_audits_sent_in_bulk(self, mock_cls):
+        client = mock_cls.return_value
+        # Reviewed again since: no longer rejected
+        sub = self.audits[2].submission
+        sub.approval_status = APPROVED
+        sub.save()
+
+        result = retry_failed_audits()
+        self.assertEqual(
+            result,
+            {
+                "synced": 2,
+                "failed": 0,
+                "superseded": 1,
+                "backlog": 0,
+            },
+        )
+        client.update_validation_statuses.assert_called_once_with(
+            "retryForm",
+            ["200", "201"],
+            "validation_status_not_approved",
+        )
+        statuses = [
+            RejectionAudit.objects.get(pk=a.pk).sync_status
+            for a in self.audits
+        ]
+        self.assertEqual(
+            statuses,
+            [
+                SyncStatus.SYNCED,
+                SyncStatus.SYNCED,
+                SyncStatus.SUPERSEDED,
+            ],
+        )
+
+    def test_backoff_on_failure(self, mock_cls):
+        client = mock_cls.return_value
+        client.update_validation_statuses.side_effect = (
+            Exception("timeout")
+        )
+        # Still owned by the outbox
+        queue_validation_status(
+            self.user,
+            self.audits[2].submission,
+            REJECTED,
+            self.audits[2],
+        )
+        result = retry_failed_audits()
+        self.assertEqual(result["failed"], 2)
+        self.assertEqual(result["backlog"], 2)
+        audit = RejectionAudit.objects.get(
+            pk=self.audits[0].pk
+        )
+        self.assertEqual(audit.retry_count, 1)
+        self.assertEqual(
+            audit.kobo_response, {"error": "timeout"}
+        )
+        self.assertGreater(
+            audit.next_retry_at,
+            timezone.now() + timedelta(seconds=500),
+        )
+        # Backing off: nothing due
+        client.update_validation_statuses.reset_mock()
+        self.assertEqual(retry_failed_audits()["failed"], 0)
+        client.update_validation_statuses.assert_not_called()
+
+    @override_settings(KOBO_OUTBOX_BATCH_SIZE=1)
+    def test_killed_sweep_keeps_batch_results(
+        self, mock_cls
+    ):
+        client = mock_cls.return_value
+        client.update_validation_statuses.side_effect = [
+            None,
+            Exception("timeout"),
+            WorkerKilled(),
+        ]
+        with self.assertRaises(WorkerKilled):
+            with self.assertLogs(
+                "api.v1.v1_odk.utils.kobo_outbox",
+                level="WARNING",
+            ):
+                retry_failed_audits()
+
+        synced, failed, killed = [
+            RejectionAudit.objects.get(pk=a.pk)
+            for a in self.audits
+        ]
+        self.assertEqual(
+            synced.sync_status, SyncStatus.SYNCED
+        )
+        self.assertEqual(failed.retry_count, 1)
+        # Leased: not retried by the next sweep
+        self.assertEqual(killed.retry_count, 0)
+        self.assertGreater(
+            killed.next_retry_at, timezone.now()
+        )
+        client.update_validation_statuses.reset_mock()
+        retry_failed_audits()
+        client.update_validation_statuses.assert_not_called()
+
+    def test_stats_endpoint(self, mock_cls):
+        auth = self.get_auth_header()
+        resp = self.client.get(
+            "/api/v1/admin/kobo-sync/", **auth
+        )
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual(data["audits"]["failed"], 3)
+        self.assertEqual(data["audits"]["retry_due"], 3)
+        self.assertEqual(data["outbox"]["pending"], 0)
+        retry_failed_audits()
+        data = self.client.get(
+            "/api/v1/admin/kobo-sync/", **auth
+        ).json()
+        self.assertEqual(
+            data["audits"]["synced_last_hour"], 3
+        )
+        self.assertIsNone(
+            data["audits"]["oldest_unsynced_seconds"]
+        )
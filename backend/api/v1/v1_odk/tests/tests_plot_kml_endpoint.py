@@ -1,16 +1,24 @@
+import os
+from unittest.mock import patch
+from xml.etree import ElementTree
+from zipfile import ZipFile
+
 from django.conf import settings
 from django.test import TestCase
 from django.test.utils import override_settings
 
+from api.v1.v1_odk.export import generate_kmz
 from api.v1.v1_odk.models import (
     FormMetadata,
     FormQuestion,
     Plot,
+    PlotKml,
     Submission,
 )
 from api.v1.v1_odk.tests.mixins import (
     OdkTestHelperMixin,
 )
+from utils.storage import get_path
 
 VALID_WKT = (
     "POLYGON(("
@@ -121,3 +129,94 @@ class PlotKmlEndpointTest(
         )
         resp = self.client.get(url)
         self.assertEqual(resp.status_code, 404)
+
+    def _kml_url(self, plot=None):
+        return (
+            f"/api/v1/odk/plots/"
+            f"{(plot or self.plot).uuid}/kml/"
+            f"?key={settings.STORAGE_SECRET}"
+        )
+
+    def test_cached_with_etag(self):
+        resp = self.client.get(self._kml_url())
+        etag = resp["ETag"]
+        self.assertIn("Last-Modified", resp)
+        cache = PlotKml.objects.get(plot=self.plot)
+        self.assertEqual(etag, f'"{cache.version}"')
+
+        with patch(
+            "api.v1.v1_odk.utils.plot_kml._wkt_to_kml"
+        ) as render:
+            resp = self.client.get(
+                self._kml_url(), HTTP_IF_NONE_MATCH=etag
+            )
+            self.assertEqual(resp.status_code, 304)
+            self.assertEqual(resp["ETag"], etag)
+            resp = self.client.get(self._kml_url())
+            self.assertEqual(resp.status_code, 200)
+            self.assertIn("<kml", resp.content.decode())
+        render.assert_not_called()
+
+    def test_geometry_change_rerenders(self):
+        etag = self.client.get(self._kml_url())["ETag"]
+        self.plot.polygon_wkt = (
+            "POLYGON((38.5 7.1,38.6 7.1,"
+            "38.6 7.2,38.5 7.1))"
+        )
+        self.plot.save()
+        resp = self.client.get(
+            self._kml_url(), HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(resp["ETag"], etag)
+        self.assertIn("38.6,7.2,0", resp.content.decode())
+
+    def test_invalid_geometry_returns_422(self):
+        plot = _create_plot(
+            self.form, "203", wkt="LINESTRING(1 2,3 4)"
+        )
+        for _ in range(2):
+            resp = self.client.get(self._kml_url(plot))
+            self.assertEqual(resp.status_code, 422)
+        self.assertEqual(
+            PlotKml.objects.get(plot=plot).kml, ""
+        )
+
+
+@override_settings(USE_TZ=False, TEST_ENV=True)
+class PlotKmzExportTest(TestCase):
+    def test_generate_kmz_folders_by_region(self):
+        form = _setup_form()
+        _create_plot(form, "301")
+        other = _create_plot(form, "302")
+        other.region = "Oromia & Co"
+        other.save()
+        _create_plot(form, "303", wkt="POLYGON((1 2")
+        rel_path, count = generate_kmz(
+            Plot.objects.filter(form=form), form, "test_kmz"
+        )
+        full = get_path(rel_path)
+        self.assertTrue(rel_path.endswith(".kmz"))
+        self.assertEqual(count, 2)
+        with ZipFile(full) as zf:
+            doc = zf.read("doc.kml").decode()
+        os.remove(full)
+        root = ElementTree.fromstring(doc)
+        ns = {"k": "http://www.opengis.net/kml/2.2"}
+        folders = root.findall("k:Document/k:Folder", ns)
+        self.assertEqual(
+            [f.find("k:name", ns).text for f in folders],
+            ["Amhara", "Oromia & Co"],
+        )
+        placemark = folders[0].find("k:Placemark", ns)
+        self.assertEqual(
+            placemark.find("k:name", ns).text, "Plot 301"
+        )
+        data = {
+            d.get("name"): d.find("k:value", ns).text
+            for d in placemark.findall(
+                "k:ExtendedData/k:Data", ns
+            )
+        }
+        self.assertEqual(data["SUBMISSION_ID"], "#301")
+        self.assertEqual(data["VAL_STATUS"], "pending")
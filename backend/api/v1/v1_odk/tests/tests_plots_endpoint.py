@@ -3,7 +3,13 @@ from unittest.mock import patch
 from django.test import TestCase
 from django.test.utils import override_settings
 
-from api.v1.v1_odk.models import ApprovalStatus, FormMetadata, Plot, Submission
+from api.v1.v1_odk.models import (
+    ApprovalStatus,
+    FormMetadata,
+    KoboOutbox,
+    Plot,
+    Submission,
+)
 from api.v1.v1_odk.tests.mixins import OdkTestHelperMixin
 
 
@@ -242,10 +248,7 @@ class PlotViewTest(TestCase, OdkTestHelperMixin):
             len(resp.json()["results"]), 0
         )
 
-    @patch("api.v1.v1_odk.funcs.async_task")
-    def test_patch_polygon_triggers_kobo_sync(
-        self, mock_async,
-    ):
+    def test_patch_polygon_queues_kobo_sync(self):
         sub = self._create_submission(
             kobo_id="300",
             raw_data={
@@ -274,13 +277,9 @@ class PlotViewTest(TestCase, OdkTestHelperMixin):
             **self.auth,
         )
         self.assertEqual(resp.status_code, 200)
-        mock_async.assert_called_once()
-        args = mock_async.call_args[0]
-        self.assertEqual(
-            args[0],
-            "api.v1.v1_odk.tasks"
-            ".sync_kobo_submission_geometry",
-        )
+        entry = KoboOutbox.objects.get()
+        self.assertEqual(entry.submission, sub)
+        self.assertEqual(list(entry.data), ["geoshape"])
 
     @patch("api.v1.v1_odk.funcs.async_task")
     def test_patch_without_polygon_no_sync(
@@ -296,3 +295,4 @@ class PlotViewTest(TestCase, OdkTestHelperMixin):
         )
         self.assertEqual(resp.status_code, 200)
         mock_async.assert_not_called()
+        self.assertFalse(KoboOutbox.objects.exists())
@@ -1,9 +1,14 @@
+import csv
+import gzip
+import io
 import json
 import os
 import tempfile
 import zipfile
 from unittest.mock import patch
 
+import pyarrow.parquet as pq
+import pyogrio
 from django.test import TestCase
 from django.test.utils import override_settings
 
@@ -13,7 +18,14 @@ from api.v1.v1_jobs.constants import (
 )
 from api.v1.v1_jobs.models import Jobs
 from api.v1.v1_odk.export import (
+    CSV_HEADERS,
+    SHP_FIELDS,
+    generate_csv,
+    generate_flatgeobuf,
+    generate_geojson,
+    generate_geoparquet,
     generate_shapefile,
+    write_geojson,
 )
 from utils.storage import get_path
 from api.v1.v1_odk.models import (
@@ -39,6 +51,7 @@ JOB_URL = "/api/v1/jobs/{job_id}/"
 DOWNLOAD_URL = (
     "/api/v1/jobs/{job_id}/download/"
 )
+STREAM_URL = "/api/v1/odk/plots/download/"
 
 
 @override_settings(
@@ -162,7 +175,7 @@ class PlotExportEndpointTest(
             EXPORT_URL,
             {
                 "form_id": "export-form-1",
-                "format": "csv",
+                "format": "dxf",
             },
             content_type="application/json",
             **self.auth,
@@ -234,6 +247,36 @@ class PlotExportEndpointTest(
             data["type"], "export_geojson"
         )
 
+    @patch(
+        "api.v1.v1_odk.plot_views.async_task",
+        return_value="fake-task-id",
+    )
+    def test_export_geojson_gzip(self, _mock_task):
+        resp = self.client.post(
+            EXPORT_URL,
+            {
+                "form_id": "export-form-1",
+                "format": "geojson",
+                "compress": "gzip",
+            },
+            content_type="application/json",
+            **self.auth,
+        )
+        self.assertEqual(resp.status_code, 201)
+        job = Jobs.objects.get(pk=resp.json()["id"])
+        self.assertEqual(job.info["compress"], "gzip")
+        resp = self.client.post(
+            EXPORT_URL,
+            {
+                "form_id": "export-form-1",
+                "format": "shp",
+                "compress": "gzip",
+            },
+            content_type="application/json",
+            **self.auth,
+        )
+        self.assertEqual(resp.status_code, 400)
+
     @patch(
         "api.v1.v1_odk.plot_views.async_task",
         return_value="fake-task-id",
@@ -325,6 +368,56 @@ class PlotExportEndpointTest(
             resp.status_code, 404
         )
 
+    def _done_geojson_job(self):
+        self._create_plot()
+        rel_path, count = generate_geojson(
+            Plot.objects.filter(form=self.form),
+            self.form,
+            "test_accel",
+        )
+        self.addCleanup(os.remove, get_path(rel_path))
+        return Jobs.objects.create(
+            type=JobTypes.export_geojson,
+            status=JobStatus.done,
+            created_by=self.user,
+            info={"file_path": rel_path},
+        )
+
+    def test_download_streams_without_accel(self):
+        job = self._done_geojson_job()
+        resp = self.client.get(
+            DOWNLOAD_URL.format(job_id=job.id),
+            **self.auth,
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotIn("X-Accel-Redirect", resp)
+        data = json.loads(b"".join(resp.streaming_content))
+        self.assertEqual(len(data["features"]), 1)
+
+    @override_settings(
+        EXPORT_ACCEL_REDIRECT_PREFIX="/internal/exports/"
+    )
+    def test_download_uses_accel_redirect(self):
+        job = self._done_geojson_job()
+        resp = self.client.get(
+            DOWNLOAD_URL.format(job_id=job.id),
+            **self.auth,
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(
+            resp["X-Accel-Redirect"],
+            "/internal/exports/test_accel.geojson",
+        )
+        self.assertEqual(resp.content, b"")
+        self.assertEqual(
+            resp["Content-Type"], "application/geo+json"
+        )
+        self.assertIn(
+            'filename="test_accel.geojson"',
+            resp["Content-Disposition"],
+        )
+        self.assertIn("private", resp["Cache-Control"])
+
     # --- Shapefile Generation Tests ---
 
     def test_generate_shapefile_output(self):
@@ -490,6 +583,231 @@ class PlotExportEndpointTest(
 
         os.remove(full)
 
+    def test_generate_geojson_gzip(self):
+        self._create_plot(name="GZ Farmer")
+        self._create_plot(
+            name="Bad Geometry", wkt="POLYGON((1 2"
+        )
+        rel_path, count = generate_geojson(
+            Plot.objects.filter(form=self.form),
+            self.form,
+            "test_gz",
+            compress=True,
+        )
+        full = get_path(rel_path)
+        self.assertTrue(
+            rel_path.endswith(".geojson.gz")
+        )
+        self.assertEqual(count, 1)
+        self.assertFalse(
+            os.path.exists(f"{full}.part")
+        )
+        with gzip.open(full, "rt") as f:
+            data = json.load(f)
+        self.assertEqual(
+            data["crs"]["properties"]["name"],
+            "urn:ogc:def:crs:EPSG::4326",
+        )
+        self.assertEqual(
+            data["features"][0]["properties"][
+                "VAL_STATUS"
+            ],
+            "pending",
+        )
+        os.remove(full)
+
+    def test_write_geojson_streams(self):
+        out = io.StringIO()
+
+        def features():
+            yield '{"type": "Feature", "id": 1}'
+            # Header and first feature are out
+            # before the second is produced
+            self.assertIn('"id": 1}', out.getvalue())
+            yield '{"type": "Feature", "id": 2}'
+
+        self.assertEqual(write_geojson(features(), out), 2)
+        data = json.loads(out.getvalue())
+        self.assertEqual(
+            [f["id"] for f in data["features"]],
+            [1, 2],
+        )
+        out = io.StringIO()
+        write_geojson(iter(()), out)
+        self.assertEqual(
+            json.loads(out.getvalue())["features"], []
+        )
+
+    @patch(
+        "api.v1.v1_odk.plot_views.async_task",
+        return_value="fake-task-id",
+    )
+    def test_export_columnar_formats(self, _mock_task):
+        for fmt, job_type in [
+            ("geoparquet", "export_geoparquet"),
+            ("fgb", "export_flatgeobuf"),
+        ]:
+            Jobs.objects.all().delete()
+            resp = self.client.post(
+                EXPORT_URL,
+                {"form_id": "export-form-1", "format": fmt},
+                content_type="application/json",
+                **self.auth,
+            )
+            self.assertEqual(resp.status_code, 201)
+            self.assertEqual(resp.json()["type"], job_type)
+
+    def test_generate_geoparquet_output(self):
+        long_reason = "x" * 300
+        self._create_plot(
+            name="PQ Farmer", flagged_reason=long_reason
+        )
+        self._create_plot(
+            name="Bad Geometry", wkt="POLYGON((1 2"
+        )
+        rel_path, count = generate_geoparquet(
+            Plot.objects.filter(form=self.form),
+            self.form,
+            "test_pq",
+        )
+        full = get_path(rel_path)
+        self.assertTrue(rel_path.endswith(".parquet"))
+        self.assertEqual(count, 1)
+        table = pq.read_table(full)
+        self.assertEqual(
+            table.column_names,
+            [f[0] for f in SHP_FIELDS] + ["geometry"],
+        )
+        geo = json.loads(table.schema.metadata[b"geo"])
+        self.assertEqual(geo["primary_column"], "geometry")
+        self.assertEqual(
+            geo["columns"]["geometry"]["encoding"], "WKB"
+        )
+        row = table.to_pylist()[0]
+        # Not cut to the dBase field width
+        self.assertEqual(row["REJ_REASON"], long_reason)
+        self.assertEqual(row["VAL_STATUS"], "pending")
+        self.assertEqual(row["geometry"][:1], b"\x01")
+        os.remove(full)
+
+    def test_generate_flatgeobuf_output(self):
+        self._create_plot(name="FGB Farmer")
+        self._create_plot(
+            name="Far Away",
+            wkt="POLYGON((10 10,11 10,11 11,10 10))",
+        )
+        rel_path, count = generate_flatgeobuf(
+            Plot.objects.filter(form=self.form),
+            self.form,
+            "test_fgb",
+        )
+        full = get_path(rel_path)
+        self.assertTrue(rel_path.endswith(".fgb"))
+        self.assertEqual(count, 2)
+        info = pyogrio.read_info(full)
+        self.assertEqual(info["features"], 2)
+        self.assertEqual(info["crs"], "EPSG:4326")
+        self.assertIn("REJ_REASON", list(info["fields"]))
+        self.assertTrue(
+            info["capabilities"]["fast_spatial_filter"]
+        )
+        # bbox reads go through the spatial index
+        _meta, table = pyogrio.read_arrow(
+            full, bbox=(38.4, 7.0, 38.5, 7.1)
+        )
+        self.assertEqual(table.num_rows, 1)
+        self.assertEqual(
+            table.column("VAL_STATUS").to_pylist(),
+            ["pending"],
+        )
+        os.remove(full)
+
+    def test_generate_csv_output(self):
+        long_reason = "y" * 300
+        self._create_plot(
+            name="CSV Farmer", flagged_reason=long_reason
+        )
+        rel_path, count = generate_csv(
+            Plot.objects.filter(form=self.form),
+            self.form,
+            "test_csv",
+        )
+        full = get_path(rel_path)
+        self.assertEqual(count, 1)
+        with open(full, newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(list(rows[0]), CSV_HEADERS)
+        self.assertEqual(rows[0]["REJ_REASON"], long_reason)
+        self.assertEqual(rows[0]["WKT"], VALID_WKT)
+        os.remove(full)
+
+    # --- Streaming Download Tests ---
+
+    def _stream(self, **body):
+        return self.client.post(
+            STREAM_URL,
+            {"form_id": "export-form-1", **body},
+            content_type="application/json",
+            **self.auth,
+        )
+
+    def test_download_streams_csv(self):
+        self._create_plot(name="Streamed")
+        self._create_plot(name="No Geometry", wkt=None)
+        self._create_plot(
+            name="Approved", approval_status=1
+        )
+        resp = self._stream(status="pending")
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.streaming)
+        self.assertEqual(resp["Content-Type"], "text/csv")
+        self.assertIn(
+            'filename="plots_export-form-1.csv"',
+            resp["Content-Disposition"],
+        )
+        body = b"".join(resp.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["VAL_STATUS"], "pending")
+        self.assertFalse(Jobs.objects.exists())
+
+    def test_download_streams_geojson(self):
+        self._create_plot(name="One")
+        self._create_plot(name="Two")
+        resp = self._stream(format="geojson")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(
+            resp["Content-Type"], "application/geo+json"
+        )
+        data = json.loads(
+            b"".join(resp.streaming_content)
+        )
+        self.assertEqual(len(data["features"]), 2)
+
+    @override_settings(EXPORT_STREAM_MAX_ROWS=1)
+    @patch(
+        "api.v1.v1_odk.plot_views.async_task",
+        return_value="fake-task-id",
+    )
+    def test_download_falls_back_to_job(self, mock_task):
+        self._create_plot(name="One")
+        self._create_plot(name="Two")
+        resp = self._stream(format="geojson", search="o")
+        self.assertEqual(resp.status_code, 202)
+        self.assertEqual(resp.json()["type"], "export_geojson")
+        job = Jobs.objects.get(pk=resp.json()["id"])
+        self.assertEqual(job.info["filters"], {"search": "o"})
+        mock_task.assert_called_once()
+
+    def test_download_validation(self):
+        self.assertEqual(
+            self._stream(format="shp").status_code, 400
+        )
+        self.assertEqual(
+            self._stream(form_id="missing").status_code,
+            404,
+        )
+
     # --- Attribute Tests ---
 
     def test_export_attributes_approved(self):
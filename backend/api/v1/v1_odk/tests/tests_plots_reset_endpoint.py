@@ -3,9 +3,13 @@ from unittest.mock import patch
 from django.test import TestCase
 from django.test.utils import override_settings
 
-from api.v1.v1_odk.constants import FlagType
+from api.v1.v1_odk.constants import (
+    FlagType,
+    KoboOutboxKind,
+)
 from api.v1.v1_odk.models import (
     FormMetadata,
+    KoboOutbox,
     Plot,
     Submission,
 )
@@ -290,10 +294,7 @@ class PlotResetPolygonTest(TestCase, OdkTestHelperMixin):
             )
         )
 
-    @patch("api.v1.v1_odk.funcs.async_task")
-    def test_reset_triggers_kobo_sync(
-        self, mock_async,
-    ):
+    def test_reset_queues_kobo_sync(self):
         plot = self._create_plot_with_edited_geo()
         resp = self.client.post(
             f"/api/v1/odk/plots/{plot.uuid}"
@@ -301,10 +302,8 @@ class PlotResetPolygonTest(TestCase, OdkTestHelperMixin):
             **self.auth,
         )
         self.assertEqual(resp.status_code, 200)
-        mock_async.assert_called_once()
-        args = mock_async.call_args[0]
+        entry = KoboOutbox.objects.get()
+        self.assertEqual(entry.kind, KoboOutboxKind.DATA)
         self.assertEqual(
-            args[0],
-            "api.v1.v1_odk.tasks"
-            ".sync_kobo_submission_geometry",
+            entry.submission, plot.submission
         )
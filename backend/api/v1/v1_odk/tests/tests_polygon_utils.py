@@ -3,6 +3,7 @@ from django.test import TestCase
 from api.v1.v1_odk.constants import FlagType
 from utils.polygon import (
     _build_joined_value,
+    average_altitude,
     compute_bbox,
     coords_to_odk_geoshape,
     coords_to_wkt,
@@ -101,6 +102,19 @@ class ComputeBboxTest(TestCase):
         self.assertAlmostEqual(bbox["max_lat"], 9.1)
 
 
+class AverageAltitudeTest(TestCase):
+    def test_mean_of_vertices(self):
+        self.assertEqual(
+            average_altitude("1 2 10 5; 1 3 11 5"),
+            10.5,
+        )
+
+    def test_no_altitude(self):
+        self.assertIsNone(average_altitude("1 2; 1 3"))
+        self.assertIsNone(average_altitude(""))
+        self.assertIsNone(average_altitude("1 2 x 0"))
+
+
 class ValidatePolygonTest(TestCase):
     def test_valid_large_polygon(self):
         coords = [
@@ -215,6 +229,9 @@ class ExtractPlotDataTest(TestCase):
         )
         self.assertIn("POLYGON", result["polygon_wkt"])
         self.assertIsNotNone(result["min_lat"])
+        self.assertEqual(result["centroid_lat"], 0.0005)
+        self.assertEqual(result["centroid_lon"], 0.0005)
+        self.assertEqual(result["altitude"], 0.0)
 
     def test_plot_name_partial_fields(self):
         form = self._mock_form(
@@ -6,6 +6,7 @@ from django.test.utils import override_settings
 from api.v1.v1_odk.models import (
     ApprovalStatus,
     FormMetadata,
+    KoboOutbox,
     Plot,
     RejectionAudit,
     Submission,
@@ -177,10 +178,7 @@ class RejectionAuditEndpointTest(
         )
         self.assertEqual(resp.status_code, 200)
 
-    @patch("api.v1.v1_odk.views.async_task")
-    def test_reject_dispatches_with_hook(
-        self, mock_async
-    ):
+    def test_reject_queues_audit_with_sync(self):
         resp = self.client.patch(
             "/api/v1/odk/submissions/"
             "sub-audit-001/",
@@ -196,14 +194,11 @@ class RejectionAuditEndpointTest(
             **self.auth,
         )
         self.assertEqual(resp.status_code, 200)
-        mock_async.assert_called_once()
-        kwargs = mock_async.call_args[1]
+        entry = KoboOutbox.objects.get()
         self.assertEqual(
-            kwargs["hook"],
-            "api.v1.v1_odk.tasks"
-            ".on_kobo_sync_complete",
+            entry.audit,
+            RejectionAudit.objects.get(),
         )
-        self.assertIn("audit_id", kwargs)
 
     @patch("api.v1.v1_odk.views.async_task")
     def test_audit_stores_validator(
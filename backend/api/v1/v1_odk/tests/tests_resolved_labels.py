@@ -0,0 +1,303 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from api.v1.v1_odk.funcs import sync_form_questions
+from api.v1.v1_odk.models import (
+    FormMetadata,
+    FormOption,
+    FormQuestion,
+    Plot,
+    Submission,
+)
+from api.v1.v1_odk.tests.mixins import (
+    OdkTestHelperMixin,
+)
+from api.v1.v1_odk.utils.resolved_labels import (
+    build_label_context,
+    compute_resolved_labels,
+    reresolve_form_labels,
+)
+
+
+def _content(region_label="Oromia"):
+    """Kobo asset content with a region select."""
+    return {
+        "survey": [
+            {
+                "type": "select_one",
+                "name": "region",
+                "$xpath": "region",
+                "label": ["Region"],
+                "select_from_list_name": "regions",
+            },
+            {
+                "type": "text",
+                "name": "woreda",
+                "$xpath": "woreda",
+                "label": ["Woreda"],
+            },
+            {
+                "type": "select_one",
+                "name": "enumerator_id",
+                "$xpath": "enumerator_id",
+                "label": ["Enumerator"],
+                "select_from_list_name": "enums",
+            },
+        ],
+        "choices": [
+            {
+                "list_name": "regions",
+                "name": "ET04",
+                "label": [region_label],
+            },
+            {
+                "list_name": "enums",
+                "name": "enum_01",
+                "label": ["Abebe"],
+            },
+        ],
+    }
+
+
+@override_settings(USE_TZ=False, TEST_ENV=True)
+class ResolvedLabelsTest(
+    TestCase, OdkTestHelperMixin
+):
+    def setUp(self):
+        self.user = self.create_kobo_user()
+        self.auth = self.get_auth_header()
+        self.form = FormMetadata.objects.create(
+            asset_uid="labelsForm",
+            name="Labels Form",
+            region_field="region",
+            sub_region_field="woreda",
+        )
+        sync_form_questions(self.form, _content())
+        self.sub = Submission.objects.create(
+            uuid="labels-001",
+            form=self.form,
+            kobo_id="1",
+            submission_time=1700000000000,
+            raw_data={
+                "region": "ET04",
+                "woreda": "not in list - Jimma",
+                "enumerator_id": "enum_01",
+                "_id": 1,
+                "_attachments": [
+                    {
+                        "uid": "att1",
+                        "media_file_basename": (
+                            "photo.png"
+                        ),
+                        "question_xpath": "photo",
+                        "download_url": "https://x",
+                    }
+                ],
+            },
+        )
+        self.plot = Plot.objects.create(
+            form=self.form,
+            submission=self.sub,
+            region="ET04",
+            sub_region="Jimma",
+            created_at=1700000000000,
+        )
+
+    def test_compute_resolved_labels(self):
+        ctx = build_label_context(self.form)
+        values = compute_resolved_labels(
+            self.sub.raw_data, self.form, ctx
+        )
+        self.assertEqual(
+            values["resolved_region"], "Oromia"
+        )
+        self.assertEqual(
+            values["resolved_sub_region"], "Jimma"
+        )
+        self.assertEqual(
+            values["resolved_enumerator"], "Abebe"
+        )
+        data = values["resolved_data"]
+        self.assertEqual(data["region"], "Oromia")
+        # System keys are not projected
+        self.assertNotIn("_id", data)
+        # Attachments keep only URL metadata
+        self.assertEqual(
+            data["_attachments"],
+            [
+                {
+                    "uid": "att1",
+                    "media_file_basename": (
+                        "photo.png"
+                    ),
+                    "question_xpath": "photo",
+                }
+            ],
+        )
+
+    def test_list_endpoints_read_stored_columns(self):
+        reresolve_form_labels(self.form)
+        # Mark the stored columns so we can tell
+        # they are read instead of recomputed
+        Submission.objects.filter(
+            pk=self.sub.pk
+        ).update(
+            resolved_region="Stored Region",
+            resolved_enumerator="Stored Enum",
+        )
+        resp = self.client.get(
+            "/api/v1/odk/submissions/",
+            {"asset_uid": "labelsForm"},
+            **self.auth,
+        )
+        row = resp.json()["results"][0]
+        self.assertEqual(
+            row["region"], "Stored Region"
+        )
+        self.assertEqual(row["sub_region"], "Jimma")
+        self.assertEqual(
+            row["resolved_data"]["enumerator_id"],
+            "Abebe",
+        )
+        att = row["resolved_data"]["_attachments"][0]
+        self.assertIn(
+            "/storage/attachments/labels-001/"
+            "att1.png",
+            att["local_url"],
+        )
+
+        resp = self.client.get(
+            "/api/v1/odk/plots/",
+            {"form_id": "labelsForm"},
+            **self.auth,
+        )
+        row = resp.json()["results"][0]
+        self.assertEqual(
+            row["region"], "Stored Region"
+        )
+        self.assertEqual(
+            row["enumerator"], "Stored Enum"
+        )
+
+    def test_list_matches_fallback_output(self):
+        """Stored and on-the-fly paths return the
+        same payload."""
+        url = "/api/v1/odk/submissions/"
+        params = {"asset_uid": "labelsForm"}
+        before = self.client.get(
+            url, params, **self.auth
+        ).json()["results"]
+        reresolve_form_labels(self.form)
+        after = self.client.get(
+            url, params, **self.auth
+        ).json()["results"]
+        self.assertEqual(before, after)
+
+        plot_url = "/api/v1/odk/plots/"
+        plot_params = {"form_id": "labelsForm"}
+        Submission.objects.filter(
+            pk=self.sub.pk
+        ).update(resolved_data=None)
+        before = self.client.get(
+            plot_url, plot_params, **self.auth
+        ).json()["results"]
+        reresolve_form_labels(self.form)
+        after = self.client.get(
+            plot_url, plot_params, **self.auth
+        ).json()["results"]
+        self.assertEqual(before, after)
+
+    def test_question_sync_reresolves_labels(self):
+        reresolve_form_labels(self.form)
+        sync_form_questions(
+            self.form,
+            _content(region_label="Oromia Region"),
+        )
+        self.sub.refresh_from_db()
+        self.assertEqual(
+            self.sub.resolved_region,
+            "Oromia Region",
+        )
+        self.assertEqual(
+            self.sub.resolved_data["region"],
+            "Oromia Region",
+        )
+
+    @patch("api.v1.v1_odk.funcs.async_task")
+    def test_unchanged_question_sync_skips_job(
+        self, mock_task
+    ):
+        sync_form_questions(self.form, _content())
+        mock_task.assert_not_called()
+
+    @patch("api.v1.v1_odk.views.async_task")
+    def test_edit_data_updates_stored_labels(
+        self, mock_task
+    ):
+        reresolve_form_labels(self.form)
+        q = FormQuestion.objects.get(
+            form=self.form, name="region"
+        )
+        FormOption.objects.create(
+            question=q, name="ET05", label="Somali"
+        )
+        resp = self.client.patch(
+            "/api/v1/odk/submissions/"
+            "labels-001/edit_data/",
+            {"fields": {"region": "ET05"}},
+            content_type="application/json",
+            **self.auth,
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.sub.refresh_from_db()
+        self.assertEqual(
+            self.sub.resolved_region, "Somali"
+        )
+        self.assertEqual(
+            self.sub.resolved_data["region"],
+            "Somali",
+        )
+
+    def test_mapping_change_reresolves(self):
+        reresolve_form_labels(self.form)
+        resp = self.client.patch(
+            "/api/v1/odk/forms/labelsForm/",
+            {"region_field": "region,woreda"},
+            content_type="application/json",
+            **self.auth,
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.sub.refresh_from_db()
+        self.assertTrue(
+            self.sub.resolved_region.startswith(
+                "Oromia - "
+            )
+        )
+
+    def test_backfill_command(self):
+        out = StringIO()
+        call_command(
+            "backfill_resolved_labels",
+            "--form",
+            "labelsForm",
+            stdout=out,
+        )
+        self.assertIn("1 submission", out.getvalue())
+        self.sub.refresh_from_db()
+        self.assertEqual(
+            self.sub.resolved_region, "Oromia"
+        )
+
+    def test_backfill_command_unknown_form(self):
+        err = StringIO()
+        call_command(
+            "backfill_resolved_labels",
+            "--form",
+            "missing",
+            stderr=err,
+        )
+        self.assertIn("not found", err.getvalue())
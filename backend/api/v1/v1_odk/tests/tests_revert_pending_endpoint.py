@@ -7,6 +7,7 @@ from api.v1.v1_odk.constants import FlagType
 from api.v1.v1_odk.models import (
     ApprovalStatus,
     FormMetadata,
+    KoboOutbox,
     Plot,
     Submission,
 )
@@ -249,11 +250,8 @@ class RevertToPendingRechecksPlotTest(
         sub.refresh_from_db()
         self.assertIsNone(sub.approval_status)
 
-    @patch("api.v1.v1_odk.views.async_task")
-    def test_revert_dispatches_kobo_sync(
-        self, mock_async
-    ):
-        """Reverting to pending dispatches Kobo
+    def test_revert_queues_kobo_sync(self):
+        """Reverting to pending queues a Kobo
         sync with PENDING status."""
         sub, plot = self._create_sub_and_plot(
             "rev-007",
@@ -268,12 +266,6 @@ class RevertToPendingRechecksPlotTest(
         resp = self._revert("rev-007")
         self.assertEqual(resp.status_code, 200)
 
-        mock_async.assert_called()
-        args = mock_async.call_args[0]
-        self.assertEqual(
-            args[0],
-            "api.v1.v1_odk.tasks"
-            ".sync_kobo_validation_status",
-        )
+        entry = KoboOutbox.objects.get(submission=sub)
         # approval_status=None maps to PENDING=0
-        self.assertEqual(args[6], 0)
+        self.assertEqual(entry.approval_status, 0)
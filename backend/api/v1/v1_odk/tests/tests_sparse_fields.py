@@ -0,0 +1,234 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+)
+
+from api.v1.v1_odk.models import (
+    FormMetadata,
+    FormOption,
+    FormQuestion,
+    Plot,
+    Submission,
+)
+from api.v1.v1_odk.tests.mixins import (
+    OdkTestHelperMixin,
+)
+from api.v1.v1_odk.utils.resolved_labels import (
+    reresolve_form_labels,
+)
+
+
+@override_settings(USE_TZ=False, TEST_ENV=True)
+class SparseFieldsTest(TestCase, OdkTestHelperMixin):
+    def setUp(self):
+        self.user = self.create_kobo_user()
+        self.auth = self.get_auth_header()
+        self.form = FormMetadata.objects.create(
+            asset_uid="sparseForm",
+            name="Sparse Form",
+            region_field="region",
+            sub_region_field="woreda",
+        )
+        q = FormQuestion.objects.create(
+            form=self.form,
+            name="region",
+            label="Region",
+            type="select_one",
+        )
+        FormOption.objects.create(
+            question=q, name="ET04", label="Oromia"
+        )
+        FormQuestion.objects.create(
+            form=self.form,
+            name="woreda",
+            label="Woreda",
+            type="text",
+        )
+        for i in range(3):
+            sub = Submission.objects.create(
+                uuid=f"sparse-{i}",
+                form=self.form,
+                kobo_id=str(100 + i),
+                submission_time=1700000000000 + i,
+                instance_name=f"Farmer {i}",
+                raw_data={
+                    "region": "ET04",
+                    "woreda": "Jimma",
+                    "start": "2024-01-01T08:00:00",
+                    "end": "2024-01-01T09:00:00",
+                },
+            )
+            Plot.objects.create(
+                form=self.form,
+                submission=sub,
+                plot_name=f"Plot {i}",
+                polygon_wkt=(
+                    "POLYGON((0 0,1 0,1 1,0 0))"
+                ),
+                region="Oromia",
+                sub_region="Jimma",
+                created_at=1700000000000,
+            )
+        reresolve_form_labels(self.form)
+
+    def _get(self, url, **params):
+        return self.client.get(url, params, **self.auth)
+
+    def test_submissions_fields_limit_payload(self):
+        url = "/api/v1/odk/submissions/"
+        full = self._get(
+            url, asset_uid="sparseForm"
+        ).json()["results"]
+        resp = self._get(
+            url,
+            asset_uid="sparseForm",
+            fields="uuid,start,end,region,sub_region",
+        )
+        self.assertEqual(resp.status_code, 200)
+        rows = resp.json()["results"]
+        keys = ["uuid", "start", "end", "region", "sub_region"]
+        for row in rows:
+            self.assertEqual(set(row), set(keys))
+        self.assertEqual(
+            rows,
+            [{k: r[k] for k in keys} for r in full],
+        )
+        self.assertEqual(rows[0]["region"], "Oromia")
+        self.assertEqual(
+            rows[0]["start"], "2024-01-01T08:00:00"
+        )
+
+    def test_submissions_sparse_query_skips_raw_data(self):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self._get(
+                "/api/v1/odk/submissions/",
+                asset_uid="sparseForm",
+                fields="uuid,region,form",
+            )
+        self.assertEqual(resp.status_code, 200)
+        list_sql = [
+            q["sql"]
+            for q in ctx.captured_queries
+            if 'FROM "submissions"' in q["sql"]
+            and "LIMIT" in q["sql"]
+        ]
+        self.assertEqual(len(list_sql), 1)
+        select = list_sql[0].split(
+            ' FROM "submissions"'
+        )[0]
+        select = select.replace(
+            '"submissions"."resolved_data" IS NOT NULL',
+            "",
+        )
+        self.assertNotIn(
+            '"submissions"."raw_data",', select
+        )
+        self.assertNotIn(
+            '"submissions"."resolved_data"', select
+        )
+
+    def test_submissions_columns_alias(self):
+        resp = self._get(
+            "/api/v1/odk/submissions/",
+            asset_uid="sparseForm",
+            columns="uuid,kobo_id",
+        )
+        self.assertEqual(
+            set(resp.json()["results"][0]),
+            {"uuid", "kobo_id"},
+        )
+
+    def test_submissions_resolved_data_field(self):
+        resp = self._get(
+            "/api/v1/odk/submissions/",
+            asset_uid="sparseForm",
+            fields="uuid,resolved_data",
+        )
+        row = resp.json()["results"][0]
+        # Mapped region/woreda questions are not
+        # repeated inside resolved_data
+        self.assertEqual(
+            set(row), {"uuid", "resolved_data"}
+        )
+        self.assertEqual(row["resolved_data"], {})
+
+    def test_unknown_field_returns_400(self):
+        resp = self._get(
+            "/api/v1/odk/submissions/",
+            fields="uuid,raw_data",
+        )
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("raw_data", str(resp.json()))
+        resp = self._get(
+            "/api/v1/odk/plots/", fields="bogus"
+        )
+        self.assertEqual(resp.status_code, 400)
+
+    def test_plots_fields_limit_payload(self):
+        url = "/api/v1/odk/plots/"
+        full = self._get(
+            url, form_id="sparseForm"
+        ).json()["results"]
+        keys = [
+            "uuid",
+            "plot_name",
+            "region",
+            "enumerator",
+            "approval_status",
+        ]
+        resp = self._get(
+            url,
+            form_id="sparseForm",
+            fields=",".join(keys),
+        )
+        self.assertEqual(resp.status_code, 200)
+        rows = resp.json()["results"]
+        self.assertEqual(
+            rows,
+            [{k: r[k] for k in keys} for r in full],
+        )
+        self.assertNotIn("polygon_wkt", rows[0])
+
+    def test_plots_sparse_query_defers_heavy_columns(
+        self,
+    ):
+        with CaptureQueriesContext(connection) as ctx:
+            self._get(
+                "/api/v1/odk/plots/",
+                form_id="sparseForm",
+                fields="uuid,region,sub_region",
+            )
+        list_sql = [
+            q["sql"]
+            for q in ctx.captured_queries
+            if 'FROM "plots"' in q["sql"]
+            and "LIMIT" in q["sql"]
+        ]
+        self.assertEqual(len(list_sql), 1)
+        select = list_sql[0].split(' FROM "plots"')[0]
+        select = select.replace(
+            '"submissions"."resolved_data" IS NOT NULL',
+            "",
+        )
+        for col in (
+            '"plots"."polygon_wkt"',
+            '"submissions"."raw_data",',
+            '"submissions"."resolved_data"',
+        ):
+            self.assertNotIn(col, select)
+
+    def test_sparse_labels_fall_back_when_not_stored(
+        self,
+    ):
+        Submission.objects.update(resolved_data=None)
+        resp = self._get(
+            "/api/v1/odk/plots/",
+            form_id="sparseForm",
+            fields="uuid,region",
+        )
+        self.assertEqual(
+            resp.json()["results"][0]["region"],
+            "Oromia",
+        )
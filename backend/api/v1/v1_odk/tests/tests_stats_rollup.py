@@ -0,0 +1,243 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+)
+
+from api.v1.v1_odk.models import (
+    ApprovalStatus,
+    FormMetadata,
+    Plot,
+    PlotStatsRollup,
+    Submission,
+)
+from api.v1.v1_odk.tests.mixins import (
+    OdkTestHelperMixin,
+)
+from api.v1.v1_odk.utils.stats_rollup import (
+    DAY_MS,
+    refresh_plot_stats,
+)
+
+DAY0 = 19700 * DAY_MS  # 2023-12-09 00:00 UTC
+
+
+@override_settings(USE_TZ=False, TEST_ENV=True)
+class StatsRollupTest(TestCase, OdkTestHelperMixin):
+    def setUp(self):
+        self.user = self.create_kobo_user()
+        self.auth = self.get_auth_header()
+        self.form = FormMetadata.objects.create(
+            asset_uid="rollupForm", name="Rollup"
+        )
+        rows = [
+            # (day, hour, region, status, area)
+            (0, 1, "A", ApprovalStatus.APPROVED, 1.5),
+            (0, 23, "A", None, 2.0),
+            (1, 6, "B", ApprovalStatus.REJECTED, 0.5),
+            (1, 12, "A", ApprovalStatus.APPROVED, None),
+            (2, 3, "B", None, 4.25),
+            (3, 18, "B", ApprovalStatus.APPROVED, 3.0),
+        ]
+        for i, (day, hour, region, st, area) in (
+            enumerate(rows)
+        ):
+            sub = Submission.objects.create(
+                uuid=f"rollup-{i}",
+                form=self.form,
+                kobo_id=str(i),
+                submission_time=(
+                    DAY0 + day * DAY_MS + hour * 3600000
+                ),
+                approval_status=st,
+                raw_data={},
+            )
+            Plot.objects.create(
+                form=self.form,
+                submission=sub,
+                region=region,
+                sub_region=f"{region}1",
+                area_ha=area,
+                created_at=0,
+            )
+        # Plot without a submission counts as
+        # pending when no date filter is applied
+        Plot.objects.create(
+            form=self.form,
+            region="A",
+            sub_region="A1",
+            area_ha=1.0,
+            created_at=0,
+        )
+
+    def _stats(self, **params):
+        params.setdefault("form_id", "rollupForm")
+        resp = self.client.get(
+            "/api/v1/odk/plots/stats/",
+            params,
+            **self.auth,
+        )
+        self.assertEqual(resp.status_code, 200)
+        return resp.json()
+
+    def _compare(self, **params):
+        """Stats from the rollup equal the live
+        query for the same filters."""
+        FormMetadata.objects.filter(
+            pk=self.form.pk
+        ).update(stats_rollup_ready=False)
+        live = self._stats(**params)
+        self.form.refresh_from_db()
+        refresh_plot_stats(self.form)
+        self.assertEqual(self._stats(**params), live)
+        return live
+
+    def test_rollup_matches_live(self):
+        cases = [
+            {},
+            {"region": "A"},
+            {"region": "B", "sub_region": "B1"},
+            {"status": "pending"},
+            {"status": "approved"},
+            {"status": "rejected"},
+            # Day-aligned range
+            {
+                "start_date": DAY0 + DAY_MS,
+                "end_date": DAY0 + 3 * DAY_MS - 1,
+            },
+            # Mid-day edges use the live query
+            {
+                "start_date": DAY0 + 12 * 3600000,
+                "end_date": DAY0 + 3 * DAY_MS + 3600000,
+            },
+            {"start_date": DAY0 + 2 * 3600000},
+            {"end_date": DAY0 + DAY_MS + 7 * 3600000},
+            # Inside a single day
+            {
+                "start_date": DAY0 + 3600000,
+                "end_date": DAY0 + 2 * 3600000,
+            },
+        ]
+        for params in cases:
+            with self.subTest(params=params):
+                self._compare(**params)
+
+    def test_unfiltered_totals(self):
+        refresh_plot_stats(self.form)
+        data = self._stats()
+        self.assertEqual(data["total_plots"], 7)
+        self.assertEqual(data["total_area_ha"], 12.25)
+        self.assertEqual(data["approved_area_ha"], 4.5)
+        self.assertEqual(data["pending_count"], 3)
+        self.assertEqual(data["pending_area_ha"], 7.25)
+
+    def test_stats_read_rollup_not_plots(self):
+        refresh_plot_stats(self.form)
+        with CaptureQueriesContext(connection) as ctx:
+            self._stats(region="A")
+        sql = " ".join(
+            q["sql"] for q in ctx.captured_queries
+        )
+        self.assertIn("plot_stats_rollup", sql)
+        self.assertNotIn('FROM "plots"', sql)
+
+    def test_unmapped_filters_fall_back(self):
+        refresh_plot_stats(self.form)
+        # Stale rollup: only live answers see it
+        Plot.objects.filter(region="B").update(
+            flagged_for_review=True
+        )
+        data = self._stats(status="flagged")
+        self.assertEqual(data["total_plots"], 3)
+        data = self._stats(search="3")
+        self.assertEqual(data["total_plots"], 1)
+
+    def test_not_built_form_uses_live_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            data = self._stats()
+        self.assertEqual(data["total_plots"], 7)
+        sql = " ".join(
+            q["sql"] for q in ctx.captured_queries
+        )
+        self.assertIn('FROM "plots"', sql)
+
+    @patch("api.v1.v1_odk.views.async_task")
+    def test_approval_updates_rollup(self, mock_task):
+        refresh_plot_stats(self.form)
+        resp = self.client.patch(
+            "/api/v1/odk/submissions/rollup-1/",
+            {"approval_status": ApprovalStatus.APPROVED},
+            content_type="application/json",
+            **self.auth,
+        )
+        self.assertEqual(resp.status_code, 200)
+        data = self._stats()
+        self.assertEqual(data["approved_area_ha"], 6.5)
+        self.assertEqual(data["pending_count"], 2)
+
+    @patch("api.v1.v1_odk.plot_views.async_task")
+    def test_plot_delete_updates_rollup(self, mock_task):
+        refresh_plot_stats(self.form)
+        plot = Plot.objects.get(
+            submission__uuid="rollup-4"
+        )
+        resp = self.client.delete(
+            f"/api/v1/odk/plots/{plot.uuid}/",
+            **self.auth,
+        )
+        self.assertEqual(resp.status_code, 204)
+        data = self._stats()
+        self.assertEqual(data["total_plots"], 6)
+        self.assertEqual(data["total_area_ha"], 8.0)
+
+    def test_partial_refresh_only_touches_day(self):
+        refresh_plot_stats(self.form)
+        other_days = list(
+            PlotStatsRollup.objects.exclude(
+                day=19700
+            ).values_list("pk", flat=True)
+        )
+        refresh_plot_stats(self.form, {19700})
+        self.assertEqual(
+            sorted(
+                PlotStatsRollup.objects.exclude(
+                    day=19700
+                ).values_list("pk", flat=True)
+            ),
+            sorted(other_days),
+        )
+
+    def test_check_command_reports_and_fixes(self):
+        out = StringIO()
+        call_command(
+            "check_stats_rollup",
+            "--form",
+            "rollupForm",
+            stdout=out,
+        )
+        self.assertIn("rollup not built", out.getvalue())
+
+        refresh_plot_stats(self.form)
+        # Bypass the maintained write paths
+        Submission.objects.filter(
+            uuid="rollup-1"
+        ).update(approval_status=ApprovalStatus.APPROVED)
+        out = StringIO()
+        call_command("check_stats_rollup", stdout=out)
+        self.assertIn("1 form(s) inconsistent", out.getvalue())
+
+        out = StringIO()
+        call_command(
+            "check_stats_rollup", "--fix", stdout=out
+        )
+        self.assertIn("rebuilt rollupForm", out.getvalue())
+        out = StringIO()
+        call_command("check_stats_rollup", stdout=out)
+        self.assertIn(
+            "Stats rollup consistent", out.getvalue()
+        )
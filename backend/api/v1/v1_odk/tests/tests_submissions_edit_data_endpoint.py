@@ -10,6 +10,7 @@ from api.v1.v1_odk.models import (
     FormMetadata,
     FormOption,
     FormQuestion,
+    KoboOutbox,
     Plot,
     Submission,
 )
@@ -195,12 +196,9 @@ class SubmissionEditDataTest(
             self.plot.plot_name, "Tadesse"
         )
 
-    @patch("api.v1.v1_odk.views.async_task")
-    def test_edit_syncs_to_kobo(
-        self, mock_async
-    ):
-        """Editing queues async task with
-        correct args."""
+    def test_edit_syncs_to_kobo(self):
+        """Editing queues the edit in the Kobo
+        outbox; later edits are merged."""
         resp = self.client.patch(
             self.url,
             {"fields": {"farmer_name": "Abebe"}},
@@ -208,17 +206,21 @@ class SubmissionEditDataTest(
             **self.auth,
         )
         self.assertEqual(resp.status_code, 200)
-        mock_async.assert_called_once()
-        args = mock_async.call_args[0]
+        entry = KoboOutbox.objects.get()
+        self.assertEqual(entry.form.asset_uid, "editForm")
+        self.assertEqual(entry.submission.kobo_id, "100")
         self.assertEqual(
-            args[0],
-            "api.v1.v1_odk.tasks"
-            ".sync_kobo_submission_data",
+            entry.data, {"farmer_name": "Abebe"}
+        )
+        self.client.patch(
+            self.url,
+            {"fields": {"farmer_name": "Kebede"}},
+            content_type="application/json",
+            **self.auth,
         )
-        self.assertEqual(args[4], "editForm")
-        self.assertEqual(args[5], "100")
+        entry = KoboOutbox.objects.get()
         self.assertEqual(
-            args[6], {"farmer_name": "Abebe"}
+            entry.data, {"farmer_name": "Kebede"}
         )
 
     def test_edit_requires_auth(self):
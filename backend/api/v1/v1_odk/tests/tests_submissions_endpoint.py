@@ -3,9 +3,11 @@ from unittest.mock import patch
 from django.test import TestCase
 from django.test.utils import override_settings
 
+from api.v1.v1_odk.constants import KoboOutboxKind
 from api.v1.v1_odk.models import (
     ApprovalStatus,
     FormMetadata,
+    KoboOutbox,
     Plot,
     Submission,
 )
@@ -281,10 +283,7 @@ class SubmissionKoboSyncDispatchTest(
             raw_data={"q1": "a1"},
         )
 
-    @patch("api.v1.v1_odk.views.async_task")
-    def test_approve_dispatches_kobo_sync(
-        self, mock_async,
-    ):
+    def test_approve_queues_kobo_sync(self):
         resp = self.client.patch(
             "/api/v1/odk/submissions/"
             "sub-sync-001/",
@@ -297,25 +296,19 @@ class SubmissionKoboSyncDispatchTest(
             **self.auth,
         )
         self.assertEqual(resp.status_code, 200)
-        mock_async.assert_called_once()
-        args = mock_async.call_args[0]
-        self.assertEqual(
-            args[0],
-            "api.v1.v1_odk.tasks"
-            ".sync_kobo_validation_status",
-        )
+        entry = KoboOutbox.objects.get()
         self.assertEqual(
-            args[5], ["500"]
+            entry.kind,
+            KoboOutboxKind.VALIDATION_STATUS,
         )
+        self.assertEqual(entry.submission, self.sub)
+        self.assertEqual(entry.user, self.user)
         self.assertEqual(
-            args[6],
+            entry.approval_status,
             ApprovalStatus.APPROVED,
         )
 
-    @patch("api.v1.v1_odk.views.async_task")
-    def test_reject_dispatches_kobo_sync(
-        self, mock_async,
-    ):
+    def test_reject_queues_kobo_sync(self):
         Plot.objects.create(
             plot_name="Sync Plot",
             form=self.form,
@@ -339,10 +332,9 @@ class SubmissionKoboSyncDispatchTest(
             **self.auth,
         )
         self.assertEqual(resp.status_code, 200)
-        mock_async.assert_called_once()
-        args = mock_async.call_args[0]
+        entry = KoboOutbox.objects.get()
         self.assertEqual(
-            args[6],
+            entry.approval_status,
             ApprovalStatus.REJECTED,
         )
 
@@ -389,3 +381,4 @@ class SubmissionKoboSyncDispatchTest(
         )
         self.assertEqual(resp.status_code, 200)
         mock_async.assert_not_called()
+        self.assertFalse(KoboOutbox.objects.exists())
@@ -1,6 +1,8 @@
+from datetime import timedelta
 from unittest.mock import MagicMock, patch
 
 from django.test import TestCase, override_settings
+from django.utils import timezone
 
 from api.v1.v1_odk.constants import SyncStatus
 from api.v1.v1_odk.models import (
@@ -10,10 +12,17 @@ from api.v1.v1_odk.models import (
     Submission,
 )
 from api.v1.v1_odk.tasks import (
+    dispatch_telegram_notifications,
     on_kobo_sync_complete,
     send_telegram_rejection_notification,
 )
 from api.v1.v1_users.models import SystemUser
+from utils.telegram_client import TelegramRateLimited
+
+
+class WorkerKilled(BaseException):
+    """Stands in for the worker being killed at
+    the queue timeout."""
 
 
 @override_settings(USE_TZ=False, TEST_ENV=True)
@@ -388,3 +397,232 @@ class TelegramNotificationTaskTest(TestCase):
             self.audit.telegram_chat_ids,
             ["-100001"],
         )
+
+
+@override_settings(
+    USE_TZ=False,
+    TEST_ENV=True,
+    TELEGRAM_ENABLED=True,
+    TELEGRAM_BOT_TOKEN="test-token",
+    TELEGRAM_SUPERVISOR_GROUP_ID="-100001",
+    TELEGRAM_ENUMERATOR_GROUP_ID="-100002",
+    TELEGRAM_DIGEST_THRESHOLD=3,
+)
+@patch("api.v1.v1_odk.tasks.TelegramClient")
+class TelegramDispatchTest(TestCase):
+    def setUp(self):
+        form = FormMetadata.objects.create(
+            asset_uid="formTGD",
+            name="Form TGD",
+        )
+        validator = SystemUser.objects.create_superuser(
+            email="tgd-val@test.local",
+            password="Changeme123",
+            name="tgd-validator",
+        )
+        self.audits = []
+        for i in range(4):
+            sub = Submission.objects.create(
+                uuid=f"sub-tgd-{i}",
+                form=form,
+                kobo_id=str(900 + i),
+                submission_time=1700000000000,
+                raw_data={},
+            )
+            plot = Plot.objects.create(
+                plot_name=f"TGD Plot {i}",
+                form=form,
+                region="Region D",
+                created_at=1700000000000,
+                submission=sub,
+            )
+            self.audits.append(
+                RejectionAudit.objects.create(
+                    plot=plot,
+                    submission=sub,
+                    validator=validator,
+                    reason_category="overlap",
+                    telegram_queued_at=timezone.now(),
+                )
+            )
+
+    def test_burst_sent_as_digest(self, mock_client_cls):
+        mock_client = mock_client_cls.return_value
+        mock_client.send_message.side_effect = [10, 11]
+
+        dispatch_telegram_notifications()
+
+        # One digest per group
+        self.assertEqual(
+            mock_client.send_message.call_count, 2
+        )
+        chat_id, text = (
+            mock_client.send_message.call_args[0]
+        )
+        self.assertEqual(chat_id, "-100002")
+        self.assertIn("*4 Plots Rejected*", text)
+        for i in range(4):
+            self.assertIn(f"#{900 + i}", text)
+        for audit in self.audits:
+            audit.refresh_from_db()
+            self.assertIsNone(audit.telegram_queued_at)
+            self.assertEqual(
+                audit.telegram_chat_ids,
+                ["-100001", "-100002"],
+            )
+            self.assertEqual(
+                audit.telegram_message_id, "10,11"
+            )
+
+    def test_rate_limited_stays_queued(
+        self, mock_client_cls
+    ):
+        mock_client = mock_client_cls.return_value
+        mock_client.send_message.side_effect = [
+            10,
+            TelegramRateLimited("429", 120),
+        ]
+        with self.assertLogs(
+            "api.v1.v1_odk.tasks", level="WARNING"
+        ):
+            dispatch_telegram_notifications()
+
+        audit = RejectionAudit.objects.get(
+            pk=self.audits[0].pk
+        )
+        self.assertIsNotNone(audit.telegram_queued_at)
+        self.assertEqual(
+            audit.telegram_chat_ids, ["-100001"]
+        )
+
+        # Next run only sends what is missing
+        mock_client.send_message.reset_mock()
+        mock_client.send_message.side_effect = [12]
+        dispatch_telegram_notifications()
+        mock_client.send_message.assert_called_once()
+        self.assertEqual(
+            mock_client.send_message.call_args[0][0],
+            "-100002",
+        )
+        audit.refresh_from_db()
+        self.assertIsNone(audit.telegram_queued_at)
+        self.assertEqual(
+            audit.telegram_message_id, "10,12"
+        )
+
+    @patch(
+        "api.v1.v1_odk.tasks.TelegramDispatch._claim",
+        autospec=True,
+    )
+    def test_stops_when_all_chats_limited(
+        self, mock_claim, mock_client_cls
+    ):
+        mock_client = mock_client_cls.return_value
+        mock_client.send_message.side_effect = (
+            TelegramRateLimited("429", 120)
+        )
+        # One audit per claim
+        mock_claim.side_effect = [
+            [audit] for audit in self.audits
+        ] + [[]]
+        with self.assertLogs(
+            "api.v1.v1_odk.tasks", level="WARNING"
+        ):
+            dispatch_telegram_notifications()
+        # Both chats hit the limit on the first batch
+        mock_claim.assert_called_once()
+        self.assertEqual(
+            mock_client.send_message.call_count, 2
+        )
+
+    @override_settings(TELEGRAM_QUEUE_MAX_AGE=60)
+    def test_gives_up_after_max_age(
+        self, mock_client_cls
+    ):
+        mock_client = mock_client_cls.return_value
+        mock_client.send_message.side_effect = (
+            TelegramRateLimited("429", 120)
+        )
+        RejectionAudit.objects.update(
+            rejected_at=timezone.now()
+            - timedelta(minutes=5)
+        )
+        with self.assertLogs(
+            "api.v1.v1_odk.tasks", level="WARNING"
+        ):
+            dispatch_telegram_notifications()
+        self.assertFalse(
+            RejectionAudit.objects.filter(
+                telegram_queued_at__isnull=False
+            ).exists()
+        )
+
+    def test_killed_run_does_not_resend(
+        self, mock_client_cls
+    ):
+        mock_client = mock_client_cls.return_value
+        mock_client.send_message.side_effect = [
+            10,
+            WorkerKilled(),
+        ]
+        with self.assertRaises(WorkerKilled):
+            dispatch_telegram_notifications()
+
+        # The supervisor digest was recorded at once
+        audit = RejectionAudit.objects.get(
+            pk=self.audits[0].pk
+        )
+        self.assertEqual(
+            audit.telegram_chat_ids, ["-100001"]
+        )
+        self.assertEqual(audit.telegram_message_id, "10")
+        # Leased: an overlapping run skips it
+        self.assertGreater(
+            audit.telegram_queued_at, timezone.now()
+        )
+        mock_client.send_message.reset_mock()
+        dispatch_telegram_notifications()
+        mock_client.send_message.assert_not_called()
+
+        # Lease over: only the missing group is sent
+        RejectionAudit.objects.update(
+            telegram_queued_at=timezone.now()
+        )
+        mock_client.send_message.side_effect = [11]
+        dispatch_telegram_notifications()
+        mock_client.send_message.assert_called_once()
+        self.assertEqual(
+            mock_client.send_message.call_args[0][0],
+            "-100002",
+        )
+        audit.refresh_from_db()
+        self.assertIsNone(audit.telegram_queued_at)
+        self.assertEqual(
+            audit.telegram_message_id, "10,11"
+        )
+
+    def test_sent_audit_not_queued_again(
+        self, mock_client_cls
+    ):
+        mock_client = mock_client_cls.return_value
+        mock_client.send_message.return_value = 10
+        RejectionAudit.objects.exclude(
+            pk=self.audits[0].pk
+        ).update(telegram_queued_at=None)
+
+        send_telegram_rejection_notification(
+            self.audits[0].pk
+        )
+        # Two groups, below the digest threshold
+        self.assertEqual(
+            mock_client.send_message.call_count, 2
+        )
+        self.assertIn(
+            "*Plot Rejected*",
+            mock_client.send_message.call_args[0][1],
+        )
+        mock_client.send_message.reset_mock()
+        send_telegram_rejection_notification(
+            self.audits[0].pk
+        )
+        mock_client.send_message.assert_not_called()
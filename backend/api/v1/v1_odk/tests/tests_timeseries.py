@@ -0,0 +1,223 @@
+from datetime import datetime
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+)
+
+from api.v1.v1_odk.models import (
+    ApprovalStatus,
+    FormMetadata,
+    Plot,
+    PlotTimeseriesRollup,
+    Submission,
+)
+from api.v1.v1_odk.tests.mixins import (
+    OdkTestHelperMixin,
+)
+from api.v1.v1_odk.utils.stats_rollup import (
+    DAY_MS,
+    refresh_plot_stats,
+)
+
+DAY0 = 19700 * DAY_MS  # Sat 2023-12-09 00:00 UTC
+HOUR = 3600000
+
+
+@override_settings(USE_TZ=False, TEST_ENV=True)
+class TimeseriesTest(TestCase, OdkTestHelperMixin):
+    def setUp(self):
+        self.user = self.create_kobo_user()
+        self.auth = self.get_auth_header()
+        self.form = FormMetadata.objects.create(
+            asset_uid="tsForm", name="Timeseries"
+        )
+        rows = [
+            # (day, region, enumerator, status,
+            #  reviewed, area)
+            (0, "A", "Abebe", None, None, 2.0),
+            (0, "A", "Abebe", ApprovalStatus.APPROVED,
+             datetime(2023, 12, 11, 9), 1.5),
+            (1, "B", "Sara", ApprovalStatus.REJECTED,
+             datetime(2023, 12, 10, 15), 0.5),
+            # Reviewed in Kobo: no updated_at
+            (2, "B", "Sara", ApprovalStatus.APPROVED,
+             None, 3.0),
+            (30, "A", None, ApprovalStatus.APPROVED,
+             datetime(2024, 1, 9, 1), None),
+        ]
+        for i, (day, region, enum, st, rev, area) in (
+            enumerate(rows)
+        ):
+            sub = Submission.objects.create(
+                uuid=f"ts-{i}",
+                form=self.form,
+                kobo_id=str(i),
+                submission_time=(
+                    DAY0 + day * DAY_MS + 8 * HOUR
+                ),
+                approval_status=st,
+                updated_at=rev,
+                resolved_enumerator=enum,
+                raw_data={},
+            )
+            Plot.objects.create(
+                form=self.form,
+                submission=sub,
+                region=region,
+                sub_region=f"{region}1",
+                area_ha=area,
+                created_at=0,
+            )
+
+    def _get(self, expected_status=200, **params):
+        params.setdefault("form_id", "tsForm")
+        resp = self.client.get(
+            "/api/v1/odk/plots/timeseries/",
+            params,
+            **self.auth,
+        )
+        self.assertEqual(
+            resp.status_code, expected_status
+        )
+        return resp.json()
+
+    def _compare(self, **params):
+        """The rollup answers exactly what the
+        live query answers."""
+        FormMetadata.objects.filter(
+            pk=self.form.pk
+        ).update(stats_rollup_ready=False)
+        live = self._get(**params)
+        self.form.refresh_from_db()
+        refresh_plot_stats(self.form)
+        self.assertEqual(self._get(**params), live)
+        return live
+
+    def test_rollup_matches_live(self):
+        cases = [
+            {},
+            {"bucket": "week"},
+            {"bucket": "month", "group_by": "region"},
+            {"group_by": "enumerator"},
+            {"group_by": "sub_region", "region": "B"},
+            {"status": "approved"},
+            {"status": "pending"},
+            {
+                "start_date": DAY0 + DAY_MS,
+                "end_date": DAY0 + 2 * DAY_MS + HOUR,
+            },
+        ]
+        for params in cases:
+            with self.subTest(params=params):
+                self._compare(**params)
+
+    def test_daily_events(self):
+        data = self._compare()
+        self.assertEqual(data["bucket"], "day")
+        self.assertIsNone(data["group_by"])
+        by_day = {
+            r["period"]: r for r in data["results"]
+        }
+        self.assertEqual(
+            by_day["2023-12-09"]["collected"], 2
+        )
+        # Review days come from updated_at
+        self.assertEqual(
+            by_day["2023-12-10"]["rejected"], 1
+        )
+        # Plus the Kobo review, which falls back
+        # to the submission day
+        self.assertEqual(
+            by_day["2023-12-11"]["approved"], 2
+        )
+        self.assertEqual(
+            by_day["2023-12-11"]["approved_area_ha"],
+            4.5,
+        )
+        self.assertEqual(
+            by_day["2023-12-11"]["collected"], 1
+        )
+        self.assertEqual(len(by_day), 5)
+
+    def test_week_and_month_buckets(self):
+        refresh_plot_stats(self.form)
+        weeks = self._get(bucket="week")["results"]
+        self.assertEqual(
+            [w["period"] for w in weeks],
+            ["2023-12-04", "2023-12-11", "2024-01-08"],
+        )
+        self.assertEqual(weeks[0]["collected"], 3)
+        self.assertEqual(weeks[1]["approved"], 2)
+        self.assertEqual(
+            weeks[1]["approved_area_ha"], 4.5
+        )
+        months = self._get(
+            bucket="month", group_by="region"
+        )["results"]
+        self.assertEqual(
+            [(m["period"], m["group"]) for m in months],
+            [
+                ("2023-12-01", "A"),
+                ("2023-12-01", "B"),
+                ("2024-01-01", "A"),
+            ],
+        )
+        self.assertEqual(months[2]["approved"], 1)
+
+    def test_reads_rollup_not_plots(self):
+        refresh_plot_stats(self.form)
+        with CaptureQueriesContext(connection) as ctx:
+            self._get(bucket="week", region="A")
+        sql = " ".join(
+            q["sql"] for q in ctx.captured_queries
+        )
+        self.assertIn("plot_timeseries_rollup", sql)
+        self.assertNotIn('FROM "plots"', sql)
+
+    def test_invalid_params(self):
+        data = self._get(400, bucket="year")
+        self.assertIn("bucket", data)
+        data = self._get(400, group_by="farmer")
+        self.assertIn("group_by", data)
+
+    @patch("api.v1.v1_odk.views.async_task")
+    def test_approval_moves_event(self, mock_task):
+        refresh_plot_stats(self.form)
+        resp = self.client.patch(
+            "/api/v1/odk/submissions/ts-2/",
+            {"approval_status": ApprovalStatus.APPROVED},
+            content_type="application/json",
+            **self.auth,
+        )
+        self.assertEqual(resp.status_code, 200)
+        data = self._get()
+        self.assertEqual(
+            sum(r["rejected"] for r in data["results"]),
+            0,
+        )
+        self.assertEqual(
+            sum(r["approved"] for r in data["results"]),
+            4,
+        )
+        out = StringIO()
+        call_command("check_stats_rollup", stdout=out)
+        self.assertIn(
+            "Stats rollup consistent", out.getvalue()
+        )
+
+    def test_check_command_sees_timeseries(self):
+        refresh_plot_stats(self.form)
+        PlotTimeseriesRollup.objects.filter(
+            event="rejected"
+        ).delete()
+        out = StringIO()
+        call_command("check_stats_rollup", stdout=out)
+        self.assertIn(
+            "1 form(s) inconsistent", out.getvalue()
+        )
@@ -0,0 +1,125 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+)
+
+from api.v1.v1_odk.models import (
+    Farmer,
+    FormMetadata,
+    MainPlot,
+    Plot,
+    Submission,
+    UidCounter,
+)
+from api.v1.v1_odk.utils.plot_id import (
+    create_main_plot_for_submission,
+)
+from api.v1.v1_odk.utils.uid_allocator import (
+    FARMER_SCOPE,
+    allocate_farmer_uids,
+    allocate_plot_uids,
+    allocate_uids,
+    plot_scope,
+    reseed_counter,
+)
+
+
+@override_settings(USE_TZ=False, TEST_ENV=True)
+class UidAllocatorTest(TestCase):
+    def setUp(self):
+        self.form = FormMetadata.objects.create(
+            asset_uid="uidForm", name="UID"
+        )
+        self.other = FormMetadata.objects.create(
+            asset_uid="uidOther",
+            name="Other",
+            plot_uid_start=500,
+        )
+
+    def test_blocks_are_contiguous(self):
+        self.assertEqual(
+            allocate_farmer_uids(3),
+            ["00001", "00002", "00003"],
+        )
+        self.assertEqual(
+            allocate_farmer_uids(2),
+            ["00004", "00005"],
+        )
+        self.assertEqual(allocate_uids("x", 0), [])
+
+    def test_min_start_is_a_floor(self):
+        self.assertEqual(
+            allocate_farmer_uids(min_start=351),
+            ["00351"],
+        )
+        self.assertEqual(
+            allocate_farmer_uids(min_start=10),
+            ["00352"],
+        )
+
+    def test_seeded_from_table_maximum(self):
+        Farmer.objects.create(
+            uid="00400", lookup_key="x", values={}
+        )
+        self.assertEqual(
+            allocate_farmer_uids(min_start=351),
+            ["00401"],
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            allocate_farmer_uids()
+        sql = " ".join(
+            q["sql"] for q in ctx.captured_queries
+        )
+        self.assertNotIn('"farmers"', sql)
+        self.assertIn("FOR UPDATE", sql)
+
+    def test_plot_counters_per_form(self):
+        self.assertEqual(
+            allocate_plot_uids(self.form, 2),
+            ["PLT00001", "PLT00002"],
+        )
+        self.assertEqual(
+            allocate_plot_uids(self.other),
+            ["PLT00500"],
+        )
+        self.assertEqual(
+            UidCounter.objects.get(
+                scope=plot_scope(self.form)
+            ).last_value,
+            2,
+        )
+
+    def test_reseed_counter(self):
+        allocate_farmer_uids(5)
+        Farmer.objects.create(
+            uid="00002", lookup_key="y", values={}
+        )
+        self.assertEqual(reseed_counter(FARMER_SCOPE), 2)
+        self.assertEqual(
+            allocate_farmer_uids(), ["00003"]
+        )
+
+    def test_collision_reseeds_and_retries(self):
+        allocate_plot_uids(self.form)
+        # Taken outside the allocator
+        MainPlot.objects.create(
+            form=self.form, uid="PLT00002"
+        )
+        sub = Submission.objects.create(
+            uuid="uid-sub",
+            form=self.form,
+            kobo_id="1",
+            submission_time=1700000000000,
+            raw_data={},
+        )
+        Plot.objects.create(
+            form=self.form,
+            submission=sub,
+            created_at=0,
+        )
+        main_plot = create_main_plot_for_submission(
+            sub
+        )
+        self.assertEqual(main_plot.uid, "PLT00003")
@@ -0,0 +1,130 @@
+import logging
+
+from django.db import transaction
+from django.db.models import Count, Max, Q
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.functions import Trim
+
+from api.v1.v1_odk.constants import ApprovalStatusTypes
+from api.v1.v1_odk.models import (
+    Enumerator,
+    FormMetadata,
+    Submission,
+)
+from api.v1.v1_odk.serializers import (
+    build_option_lookup,
+    resolve_value,
+)
+
+logger = logging.getLogger(__name__)
+
+ENUMERATOR_FIELD = "enumerator_id"
+
+
+def enumerator_code(raw_data):
+    """Directory key of a submission's raw_data,
+    or None when it has no enumerator."""
+    value = (raw_data or {}).get(ENUMERATOR_FIELD)
+    if not value:
+        return None
+    return str(value).strip() or None
+
+
+def _grouped_counts(form, codes=None):
+    """GROUP BY raw_data->>'enumerator_id' over the
+    form's submissions."""
+    qs = (
+        Submission.objects.filter(form=form)
+        .annotate(
+            code=Trim(
+                KeyTextTransform(
+                    ENUMERATOR_FIELD, "raw_data"
+                )
+            )
+        )
+        .exclude(code__isnull=True)
+        .exclude(code="")
+    )
+    if codes is not None:
+        qs = qs.filter(code__in=codes)
+    return (
+        qs.values("code")
+        .annotate(
+            submission_count=Count("id"),
+            approved_count=Count(
+                "id",
+                filter=Q(
+                    approval_status=(
+                        ApprovalStatusTypes.APPROVED
+                    )
+                ),
+            ),
+            rejected_count=Count(
+                "id",
+                filter=Q(
+                    approval_status=(
+                        ApprovalStatusTypes.REJECTED
+                    )
+                ),
+            ),
+            last_seen_at=Max("submission_time"),
+        )
+        .order_by()
+    )
+
+
+def refresh_enumerators(form, codes=None):
+    """Rebuild the directory rows of ``form``.
+
+    With ``codes`` only those enumerators are
+    recounted, which is how reviews and edits keep
+    the directory current. Partial refreshes are
+    skipped until the form has been built once.
+    """
+    if codes is not None:
+        if not form.enumerators_ready:
+            return
+        codes = {c for c in codes if c}
+        if not codes:
+            return
+    option_map, type_map = build_option_lookup(form)
+    opts = option_map.get(ENUMERATOR_FIELD)
+    with transaction.atomic():
+        # Serialise concurrent refreshes per form
+        list(
+            FormMetadata.objects.select_for_update()
+            .filter(pk=form.pk)
+            .values_list("pk", flat=True)
+        )
+        rows = []
+        for row in _grouped_counts(form, codes):
+            name = row["code"]
+            if opts:
+                name = str(
+                    resolve_value(
+                        row["code"],
+                        opts,
+                        type_map.get(ENUMERATOR_FIELD),
+                    )
+                ).strip()
+            rows.append(
+                Enumerator(form=form, name=name, **row)
+            )
+        existing = Enumerator.objects.filter(form=form)
+        if codes is not None:
+            existing = existing.filter(code__in=codes)
+        existing.delete()
+        Enumerator.objects.bulk_create(rows)
+        if codes is None and not form.enumerators_ready:
+            FormMetadata.objects.filter(
+                pk=form.pk
+            ).update(enumerators_ready=True)
+            form.enumerators_ready = True
+    return len(rows)
+
+
+def ensure_enumerators(forms):
+    """Build the directory of any form in
+    ``forms`` that has not been built yet."""
+    for form in forms.filter(enumerators_ready=False):
+        refresh_enumerators(form)
@@ -0,0 +1,90 @@
+import hashlib
+import json
+import logging
+import os
+
+from django.db.models import F
+from django.utils import timezone
+
+from api.v1.v1_jobs.constants import JobStatus
+from api.v1.v1_jobs.models import Jobs
+from api.v1.v1_odk.models import FormMetadata
+from utils import storage
+
+logger = logging.getLogger(__name__)
+
+
+def bump_data_version(form):
+    """Mark the exported data of ``form`` as
+    changed so cached export files stop
+    matching."""
+    FormMetadata.objects.filter(pk=form.pk).update(
+        data_version=F("data_version") + 1
+    )
+
+
+def export_cache_key(form_id, job_type, filters, options):
+    """Content address of an export: the form,
+    its current data_version, the job type, the
+    filters and output options (e.g.
+    compression).
+
+    Keys are sorted at every level, so filter
+    dicts sent in another order still match.
+    Values are kept as sent: 2024 and "2024"
+    filter raw_data differently."""
+    version = (
+        FormMetadata.objects.filter(asset_uid=form_id)
+        .values_list("data_version", flat=True)
+        .first()
+    )
+    payload = json.dumps(
+        {
+            "form_id": form_id,
+            "data_version": version,
+            "type": job_type,
+            "filters": filters,
+            "options": options,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def find_cached_export(cache_key):
+    """Latest completed job for ``cache_key``
+    whose file is still in storage, or None."""
+    jobs = Jobs.objects.filter(
+        status=JobStatus.done,
+        info__cache_key=cache_key,
+    ).order_by("-available")
+    for job in jobs:
+        path = (job.info or {}).get("file_path")
+        if path and storage.check(path):
+            return job
+    return None
+
+
+def reuse_cached_export(job, source):
+    """Complete ``job`` with the file of
+    ``source`` and refresh the file's age so
+    cleanup_old_exports keeps it."""
+    path = source.info["file_path"]
+    os.utime(storage.get_path(path))
+    job.status = JobStatus.done
+    job.info = {
+        **(job.info or {}),
+        "file_path": path,
+        "record_count": source.info.get(
+            "record_count"
+        ),
+        "cached_from": source.pk,
+    }
+    job.available = timezone.now()
+    job.save()
+    logger.info(
+        "Export job %s reused file of job %s",
+        job.pk,
+        source.pk,
+    )
+    return job
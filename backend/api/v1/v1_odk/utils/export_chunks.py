@@ -0,0 +1,89 @@
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+def pk_ranges(queryset, chunk_size):
+    """Split ``queryset`` into inclusive
+    (first_pk, last_pk) ranges of at most
+    ``chunk_size`` rows, in pk order."""
+    pks = list(
+        queryset.order_by("pk").values_list(
+            "pk", flat=True
+        )
+    )
+    return [
+        (pks[i], pks[min(i + chunk_size, len(pks)) - 1])
+        for i in range(0, len(pks), chunk_size)
+    ]
+
+
+def map_ordered(func, arg_list, workers):
+    """Yield ``func(*args)`` for each entry of
+    ``arg_list``, in order.
+
+    With more than one worker the calls run in a
+    fork-based process pool. At most two calls per
+    worker are in flight, so finished chunks do not
+    pile up while the caller is still writing
+    earlier ones. Children inherit the settings and
+    open their own database connections.
+
+    Daemonic processes may not have children
+    (e.g. django-q workers with
+    daemonize_workers on); they run the calls
+    in-process instead.
+    """
+    if (
+        workers > 1
+        and multiprocessing.current_process().daemon
+    ):
+        logger.warning(
+            "Daemonic process, running %d chunk(s) "
+            "in-process",
+            len(arg_list),
+        )
+        workers = 1
+    if workers <= 1 or len(arg_list) <= 1:
+        for args in arg_list:
+            yield func(*args)
+        return
+
+    # A forked child must not reuse the parent's
+    # database socket
+    connections.close_all()
+    logger.info(
+        "Running %d chunk(s) on %d worker(s)",
+        len(arg_list),
+        workers,
+    )
+    remaining = iter(arg_list)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("fork"),
+    ) as pool:
+        pending = deque()
+        try:
+            for args in remaining:
+                pending.append(pool.submit(func, *args))
+                if len(pending) >= workers * 2:
+                    break
+            while pending:
+                result = pending.popleft().result()
+                args = next(remaining, None)
+                if args is not None:
+                    pending.append(
+                        pool.submit(func, *args)
+                    )
+                yield result
+        finally:
+            # Closed early (e.g. the job was
+            # cancelled): drop queued calls rather
+            # than wait for them
+            for future in pending:
+                future.cancel()
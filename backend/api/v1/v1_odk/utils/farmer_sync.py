@@ -1,17 +1,26 @@
+import hashlib
+import json
 import logging
 
-from django.db import IntegrityError
-from django.db.models import IntegerField, Max
-from django.db.models.functions import Cast
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
 
 from api.v1.v1_odk.models import (
     Farmer,
     FarmerFieldMapping,
+    Plot,
+    Submission,
 )
 from api.v1.v1_odk.serializers import (
     build_option_lookup,
     resolve_value,
 )
+from api.v1.v1_odk.utils.uid_allocator import (
+    FARMER_SCOPE,
+    allocate_farmer_uids,
+    max_farmer_uid,
+    reseed_counter,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -87,6 +96,10 @@ def build_farmer_lookup_key(
 def generate_next_farmer_uid(min_start=1):
     """Generate the next sequential farmer UID.
 
+    Reads the table maximum without reserving
+    anything; new farmers get their UIDs from
+    allocate_farmer_uids.
+
     Uses numeric Cast + Max to avoid lexicographic
     ordering issues with string UIDs (e.g. "99999"
     sorting after "100000").
@@ -104,12 +117,7 @@ def generate_next_farmer_uid(min_start=1):
     Returns:
         str: e.g. "00001", "00042", "100000"
     """
-    result = Farmer.objects.aggregate(
-        max_uid=Max(
-            Cast("uid", IntegerField())
-        )
-    )
-    max_uid = result["max_uid"]
+    max_uid = max_farmer_uid()
     if max_uid is None:
         return str(min_start).zfill(5)
     next_uid = max(max_uid + 1, min_start)
@@ -145,16 +153,174 @@ def build_farmer_values(
     return result
 
 
-def sync_farmers_for_form(form):
-    """Sync Farmer records for all submissions
-    in a given form.
+BATCH_SIZE = 1000
+
+
+def _chunks(items, size=BATCH_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _existing_farmer_pks(lookup_keys):
+    """Map lookup_key -> Farmer pk for the given
+    keys, read in chunks."""
+    found = {}
+    for chunk in _chunks(list(lookup_keys)):
+        found.update(
+            Farmer.objects.filter(
+                lookup_key__in=chunk
+            ).values_list("lookup_key", "pk")
+        )
+    return found
+
+
+def _create_farmers(new_keys, values_by_key, min_start):
+    """bulk_create farmers for ``new_keys`` (in
+    order) with one allocated UID block.
+
+    Returns lookup_key -> pk. On IntegrityError
+    (UIDs taken outside the allocator) the
+    counter is reseeded and the block retried.
+    """
+    for attempt in range(3):
+        uids = allocate_farmer_uids(
+            len(new_keys), min_start=min_start
+        )
+        farmers = [
+            Farmer(
+                uid=uid,
+                lookup_key=key,
+                values=values_by_key[key],
+            )
+            for uid, key in zip(uids, new_keys)
+        ]
+        try:
+            with transaction.atomic():
+                for chunk in _chunks(farmers):
+                    Farmer.objects.bulk_create(chunk)
+        except IntegrityError:
+            if attempt == 2:
+                raise
+            reseed_counter(FARMER_SCOPE)
+            continue
+        return {f.lookup_key: f.pk for f in farmers}
+
+
+def _sha1(payload):
+    return hashlib.sha1(
+        json.dumps(
+            payload,
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        ).encode()
+    ).hexdigest()
+
+
+def submission_content_hash(raw_data):
+    """Change hash stored in
+    Submission.content_hash."""
+    return _sha1(raw_data or {})
+
+
+def mapping_signature(
+    unique_fields, all_fields, option_map, type_map
+):
+    """Hash of everything besides raw_data that
+    feeds lookup keys and farmer values."""
+    return _sha1(
+        {
+            "unique": unique_fields,
+            "fields": all_fields,
+            "options": {
+                f: option_map.get(f) for f in all_fields
+            },
+            "types": {
+                f: type_map.get(f) for f in all_fields
+            },
+        }
+    )
+
+
+def pending_submissions(form):
+    """Submissions farmer sync has not seen in
+    their current state.
+
+    Plots without a farmer are included as well,
+    so plots created or unlinked after their
+    submission was synced get picked up.
+    """
+    return form.submissions.filter(
+        Q(content_hash__isnull=True)
+        | Q(farmer_synced_hash__isnull=True)
+        | ~Q(farmer_synced_hash=F("content_hash"))
+        | Q(plot__isnull=False, plot__farmer__isnull=True)
+    )
+
+
+def _mark_synced(seen):
+    """Record the hashes farmer sync processed.
+
+    ``seen`` holds (pk, content_hash, synced_hash,
+    computed_hash). Rows whose content_hash was
+    missing get it filled in; other rows only move
+    farmer_synced_hash, so an ingest racing with
+    the sync still leaves its row pending.
+    """
+    synced = []
+    filled = []
+    for pk, content, previous, digest in seen:
+        if content is None:
+            filled.append(
+                Submission(
+                    pk=pk,
+                    content_hash=digest,
+                    farmer_synced_hash=digest,
+                )
+            )
+        elif previous != content:
+            synced.append(
+                Submission(
+                    pk=pk, farmer_synced_hash=content
+                )
+            )
+    Submission.objects.bulk_update(
+        synced,
+        ["farmer_synced_hash"],
+        batch_size=BATCH_SIZE,
+    )
+    Submission.objects.bulk_update(
+        filled,
+        ["content_hash", "farmer_synced_hash"],
+        batch_size=BATCH_SIZE,
+    )
+
+
+def sync_farmers_for_form(form, full=False):
+    """Sync Farmer records for the submissions
+    of a given form.
 
     Reads FarmerFieldMapping config, resolves field
     values directly from raw_data, creates/updates
     Farmer records, and links plots.
 
+    Only submissions whose content_hash changed
+    since the last run (see pending_submissions)
+    are processed. Everything is re-read when
+    ``full`` is set or when the mapping fields or
+    their option labels changed.
+
+    Keys are computed in memory and written in
+    batches: existing farmers are read once by
+    lookup_key, new farmers get a contiguous UID
+    block in submission order, and values and plot
+    links go through bulk_update. When several
+    submissions share a key, the last one's values
+    win, as with per-row saves.
+
     Args:
         form: FormMetadata instance
+        full: re-process every submission
 
     Returns:
         dict: {"created": N, "updated": N, "linked": N}
@@ -183,21 +349,63 @@ def sync_farmers_for_form(form):
         for f in mapping.values_fields.split(",")
         if f.strip()
     ]
+    # Store both unique_fields and
+    # values_fields in farmer.values
+    all_fields = list(
+        dict.fromkeys(unique_fields + values_fields)
+    )
     uid_start = mapping.uid_start
 
     option_map, type_map = build_option_lookup(form)
+    signature = mapping_signature(
+        unique_fields, all_fields, option_map, type_map
+    )
+    full = full or (
+        mapping.synced_signature != signature
+    )
+    submissions = (
+        form.submissions.all()
+        if full
+        else pending_submissions(form)
+    )
 
-    created = 0
-    updated = 0
-    linked = 0
-
-    submissions = form.submissions.select_related(
-        "plot"
-    ).all()
-
-    for submission in submissions:
-        raw_data = submission.raw_data or {}
-
+    # (plot_pk, plot_farmer_id, lookup_key) in
+    # submission order; values_by_key keeps
+    # first-seen key order for UID allocation
+    links = []
+    values_by_key = {}
+    seen = []
+    keyed = 0
+    rows = (
+        submissions.order_by("pk")
+        .values_list(
+            "pk",
+            "content_hash",
+            "farmer_synced_hash",
+            "raw_data",
+            "plot__id",
+            "plot__farmer_id",
+        )
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    for (
+        pk,
+        content,
+        previous,
+        raw_data,
+        plot_pk,
+        farmer_id,
+    ) in rows:
+        raw_data = raw_data or {}
+        seen.append(
+            (
+                pk,
+                content,
+                previous,
+                content
+                or submission_content_hash(raw_data),
+            )
+        )
         lookup_key = build_farmer_lookup_key(
             raw_data,
             unique_fields,
@@ -206,64 +414,67 @@ def sync_farmers_for_form(form):
         )
         if not lookup_key:
             continue
-
-        # Store both unique_fields and
-        # values_fields in farmer.values
-        all_fields = list(
-            dict.fromkeys(
-                unique_fields + values_fields
-            )
-        )
-        values = build_farmer_values(
+        keyed += 1
+        values_by_key[lookup_key] = build_farmer_values(
             raw_data,
             all_fields,
             option_map,
             type_map,
         )
+        if plot_pk is not None:
+            links.append(
+                (plot_pk, farmer_id, lookup_key)
+            )
 
-        try:
-            farmer = Farmer.objects.get(
-                lookup_key=lookup_key
+    existing = _existing_farmer_pks(values_by_key)
+    new_keys = [
+        k for k in values_by_key if k not in existing
+    ]
+    pks = dict(existing)
+    if new_keys:
+        pks.update(
+            _create_farmers(
+                new_keys, values_by_key, uid_start
             )
-            farmer.values = values
-            farmer.save(update_fields=["values"])
-            updated += 1
-        except Farmer.DoesNotExist:
-            # Retry on IntegrityError to handle
-            # concurrent UID generation races
-            for attempt in range(3):
-                uid = generate_next_farmer_uid(
-                    min_start=uid_start,
-                )
-                try:
-                    farmer = (
-                        Farmer.objects.create(
-                            uid=uid,
-                            lookup_key=lookup_key,
-                            values=values,
-                        )
-                    )
-                    created += 1
-                    break
-                except IntegrityError:
-                    if attempt == 2:
-                        raise
-                    continue
+        )
+    created = len(new_keys)
+    updated = keyed - created
+
+    changed = []
+    for chunk in _chunks(list(existing)):
+        for farmer in Farmer.objects.filter(
+            lookup_key__in=chunk
+        ).only("pk", "lookup_key", "values"):
+            values = values_by_key[farmer.lookup_key]
+            if farmer.values != values:
+                farmer.values = values
+                changed.append(farmer)
+    Farmer.objects.bulk_update(
+        changed, ["values"], batch_size=BATCH_SIZE
+    )
 
-        try:
-            plot = submission.plot
-        except Exception:
-            plot = None
+    relinked = [
+        Plot(pk=plot_pk, farmer_id=pks[key])
+        for plot_pk, farmer_id, key in links
+        if farmer_id != pks[key]
+    ]
+    Plot.objects.bulk_update(
+        relinked, ["farmer"], batch_size=BATCH_SIZE
+    )
+    linked = len(relinked)
 
-        if plot and plot.farmer_id != farmer.pk:
-            plot.farmer = farmer
-            plot.save(update_fields=["farmer"])
-            linked += 1
+    _mark_synced(seen)
+    if mapping.synced_signature != signature:
+        mapping.synced_signature = signature
+        mapping.save(update_fields=["synced_signature"])
 
     logger.info(
-        "sync_farmers_for_form %s: "
-        "created=%d updated=%d linked=%d",
+        "sync_farmers_for_form %s (%s): "
+        "processed=%d created=%d updated=%d "
+        "linked=%d",
         form.asset_uid,
+        "full" if full else "incremental",
+        len(seen),
         created,
         updated,
         linked,
@@ -280,7 +491,7 @@ def update_farmer_for_submission(form, submission):
     submission after field edits.
 
     Unlike sync_farmers_for_form (which re-processes
-    ALL submissions and creates new Farmer records
+    changed submissions and creates new Farmer records
     when lookup_keys change), this function respects
     the existing Plot.farmer relationship:
 
@@ -492,16 +703,18 @@ def _find_or_create_farmer(
         return farmer
     except Farmer.DoesNotExist:
         for attempt in range(3):
-            uid = generate_next_farmer_uid(
+            [uid] = allocate_farmer_uids(
                 min_start=min_start,
             )
             try:
-                return Farmer.objects.create(
-                    uid=uid,
-                    lookup_key=lookup_key,
-                    values=values,
-                )
+                with transaction.atomic():
+                    return Farmer.objects.create(
+                        uid=uid,
+                        lookup_key=lookup_key,
+                        values=values,
+                    )
             except IntegrityError:
                 if attempt == 2:
                     raise
+                reseed_counter(FARMER_SCOPE)
                 continue
@@ -0,0 +1,260 @@
+"""Fast read path for the submission and plot
+list endpoints.
+
+Rows are fetched with ``.values()`` over the
+columns precomputed at ingest time and assembled
+into the same dicts the list serializers would
+produce, without instantiating a model or running
+per-row ``SerializerMethodField`` calls. Rows whose
+labels have not been stored yet are handed back
+to the regular serializer.
+"""
+
+from operator import itemgetter
+
+from django.db.models import (
+    BooleanField,
+    ExpressionWrapper,
+    Q,
+)
+from django.db.models.fields.json import KeyTransform
+from rest_framework import serializers
+
+from api.v1.v1_odk.serializers import (
+    enrich_attachments,
+)
+
+_SKIP = object()
+
+SUBMISSION_COLUMNS = {
+    "uuid": "uuid",
+    "form": "form__asset_uid",
+    "kobo_id": "kobo_id",
+    "reviewed_by": "updated_by__name",
+    "instance_name": "instance_name",
+    "region": "resolved_region",
+    "sub_region": "resolved_sub_region",
+    "approval_status": "approval_status",
+    "resolved_data": "resolved_data",
+    "area_ha": "plot__area_ha",
+    "main_plot_uid": (
+        "main_plot_submission__main_plot__uid"
+    ),
+}
+
+PLOT_COLUMNS = {
+    "plot_id": "submission__kobo_id",
+    "main_plot_uid": (
+        "submission__main_plot_submission"
+        "__main_plot__uid"
+    ),
+    "uuid": "uuid",
+    "plot_name": "plot_name",
+    "instance_name": "submission__instance_name",
+    "polygon_wkt": "polygon_wkt",
+    "min_lat": "min_lat",
+    "max_lat": "max_lat",
+    "min_lon": "min_lon",
+    "max_lon": "max_lon",
+    "form_id": "form__asset_uid",
+    "region": "submission__resolved_region",
+    "sub_region": "submission__resolved_sub_region",
+    "area_ha": "area_ha",
+    "enumerator": "submission__resolved_enumerator",
+    "created_at": "created_at",
+    "submission_uuid": "submission__uuid",
+    "approval_status": "submission__approval_status",
+    "flagged_for_review": "flagged_for_review",
+    "flagged_reason": "flagged_reason",
+    "updated_by_name": "submission__updated_by__name",
+    "updated_at": "submission__updated_at",
+    "farmer_uid": "farmer__uid",
+}
+
+
+def _stored_flag(lookup):
+    return ExpressionWrapper(
+        Q(**{f"{lookup}__isnull": False}),
+        output_field=BooleanField(),
+    )
+
+
+def _column_getter(field, column):
+    """Getter applying the serializer field's
+    to_representation, as DRF does for non-null
+    attributes. Method fields and slug relations
+    (already selected as the slug) return as-is."""
+    if isinstance(
+        field,
+        (
+            serializers.SerializerMethodField,
+            serializers.RelatedField,
+        ),
+    ):
+        return itemgetter(column)
+    rep = field.to_representation
+
+    def get(row):
+        value = row[column]
+        return None if value is None else rep(value)
+
+    return get
+
+
+def _raw_key_getter(field, key):
+    """Getter for a raw_data key. A missing key
+    drops the field, like DRF's SkipField."""
+    rep = field.to_representation
+    value_col = f"fast_{key}"
+    has_col = f"fast_has_{key}"
+
+    def get(row):
+        if not row[has_col]:
+            return _SKIP
+        value = row[value_col]
+        return None if value is None else rep(value)
+
+    return get
+
+
+def _resolved_data_getter(question_names):
+    def get(row):
+        stored = row["resolved_data"]
+        resolved = {
+            k: v
+            for k, v in stored.items()
+            if k in question_names
+        }
+        attachments = stored.get("_attachments", [])
+        if attachments:
+            resolved["_attachments"] = (
+                enrich_attachments(
+                    row["uuid"], attachments
+                )
+            )
+        return resolved
+
+    return get
+
+
+def _plot_name(row):
+    return row["plot_name"] or row[
+        "submission__instance_name"
+    ]
+
+
+def submission_values(queryset, fields):
+    """Values queryset with the columns needed
+    for the given (bound) serializer fields."""
+    columns = {"pk", "uuid"}
+    extra = {
+        "fast_stored": _stored_flag("resolved_data"),
+    }
+    for name in fields:
+        if name in ("start", "end"):
+            extra[f"fast_{name}"] = KeyTransform(
+                name, "raw_data"
+            )
+            extra[f"fast_has_{name}"] = (
+                ExpressionWrapper(
+                    Q(raw_data__has_key=name),
+                    output_field=BooleanField(),
+                )
+            )
+        else:
+            columns.add(SUBMISSION_COLUMNS[name])
+    return queryset.prefetch_related(None).values(
+        *columns, **extra
+    )
+
+
+def plot_values(queryset, fields):
+    """Values queryset with the columns needed
+    for the given (bound) serializer fields."""
+    columns = {"pk"}
+    for name in fields:
+        columns.add(PLOT_COLUMNS[name])
+    if "plot_name" in fields:
+        columns.add("submission__instance_name")
+    return queryset.prefetch_related(None).values(
+        *columns,
+        fast_stored=_stored_flag(
+            "submission__resolved_data"
+        ),
+    )
+
+
+def _assemble(page, getters, fallback):
+    pending = [
+        row["pk"]
+        for row in page
+        if not row["fast_stored"]
+    ]
+    slow = fallback(pending) if pending else {}
+    results = []
+    for row in page:
+        if not row["fast_stored"]:
+            data = slow.get(row["pk"])
+            if data is not None:
+                results.append(data)
+            continue
+        out = {}
+        for name, get in getters:
+            value = get(row)
+            if value is not _SKIP:
+                out[name] = value
+        results.append(out)
+    return results
+
+
+def build_submission_rows(page, serializer, fallback):
+    """Assemble SubmissionListSerializer output
+    for a page of ``submission_values`` rows.
+
+    ``fallback(pks)`` returns ``{pk: data}`` for
+    rows without stored labels.
+    """
+    question_names = serializer.context[
+        "question_names"
+    ]
+    getters = []
+    for name, field in serializer.fields.items():
+        if name in ("start", "end"):
+            get = _raw_key_getter(field, name)
+        elif name == "resolved_data":
+            get = _resolved_data_getter(
+                question_names
+            )
+        else:
+            get = _column_getter(
+                field, SUBMISSION_COLUMNS[name]
+            )
+        getters.append((name, get))
+    return _assemble(page, getters, fallback)
+
+
+def build_plot_rows(page, serializer, fallback):
+    """Assemble PlotSerializer output for a page
+    of ``plot_values`` rows."""
+    getters = []
+    for name, field in serializer.fields.items():
+        if name == "plot_name":
+            get = _plot_name
+        else:
+            get = _column_getter(
+                field, PLOT_COLUMNS[name]
+            )
+        getters.append((name, get))
+    return _assemble(page, getters, fallback)
+
+
+def serialize_by_pk(queryset, serializer, pks):
+    """Serialize the given rows through the
+    regular serializer, keyed by pk."""
+    serializer_class = type(serializer)
+    return {
+        obj.pk: serializer_class(
+            obj, context=serializer.context
+        ).data
+        for obj in queryset.filter(pk__in=pks)
+    }
@@ -0,0 +1,237 @@
+import hashlib
+import json
+import logging
+
+from django.db.models import Count
+from django.db.models.fields.json import KeyTextTransform
+
+from api.v1.v1_odk.models import (
+    FormFilterCatalog,
+    FormQuestion,
+    Plot,
+)
+from api.v1.v1_odk.serializers import (
+    build_option_lookup,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_joined_label(raw_val, field_spec, option_map):
+    """Resolve a raw joined value to labels using
+    option lookups.
+
+    When positional lookup fails (the stored value
+    has fewer parts than fields because empty
+    fields were skipped), try all fields' options
+    as fallback.
+    """
+    if not raw_val:
+        return raw_val
+    fields = [
+        f.strip()
+        for f in (field_spec or "").split(",")
+        if f.strip()
+    ]
+    # Merged lookup for the fallback, first field
+    # in the spec wins
+    fallback = {}
+    for f in reversed(fields):
+        fallback.update(option_map.get(f, {}))
+    resolved = []
+    for i, part in enumerate(raw_val.split(" - ")):
+        label = part
+        if i < len(fields):
+            label = option_map.get(
+                fields[i], {}
+            ).get(part, part)
+        if label == part:
+            label = fallback.get(part, part)
+        resolved.append(label)
+    return " - ".join(resolved)
+
+
+def _labelled(values, field_spec, option_map):
+    return sorted(
+        [
+            {
+                "value": v,
+                "label": resolve_joined_label(
+                    v, field_spec, option_map
+                ),
+            }
+            for v in values
+        ],
+        key=lambda x: x["label"],
+    )
+
+
+def _question_entry(question, counts=None):
+    options = []
+    for o in question.options.all():
+        option = {"name": o.name, "label": o.label}
+        if counts is not None:
+            option["count"] = counts.get(o.name, 0)
+        options.append(option)
+    return {
+        "name": question.name,
+        "label": question.label,
+        "type": question.type,
+        "options": sorted(
+            options, key=lambda x: x["label"]
+        ),
+    }
+
+
+def _option_counts(plots, name):
+    """Plots per raw_data value of ``name``,
+    matching the filter__<name> semantics."""
+    rows = (
+        plots.annotate(
+            value=KeyTextTransform(
+                name, "submission__raw_data"
+            )
+        )
+        .values("value")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    return {
+        r["value"]: r["n"]
+        for r in rows
+        if r["value"] is not None
+    }
+
+
+def build_filter_catalog(form):
+    """Everything plots/filter_options can return
+    for ``form``, independent of query params."""
+    plots = Plot.objects.filter(form=form)
+    option_map, _ = build_option_lookup(form)
+
+    pairs = list(
+        plots.exclude(sub_region="")
+        .values_list("region", "sub_region")
+        .distinct()
+        .order_by()
+    )
+    by_region = {}
+    for region, sub_region in pairs:
+        by_region.setdefault(region, set()).add(
+            sub_region
+        )
+    raw_regions = set(
+        plots.exclude(region="")
+        .values_list("region", flat=True)
+        .distinct()
+        .order_by()
+    )
+    sub_labels = {
+        s["value"]: s
+        for s in _labelled(
+            {s for _, s in pairs},
+            form.sub_region_field,
+            option_map,
+        )
+    }
+    sub_regions = sorted(
+        sub_labels.values(),
+        key=lambda x: x["label"],
+    )
+
+    dynamic_filters = []
+    if form.filter_fields:
+        questions = FormQuestion.objects.filter(
+            form=form,
+            name__in=form.filter_fields,
+        ).prefetch_related("options")
+        for q in questions:
+            dynamic_filters.append(
+                _question_entry(
+                    q, _option_counts(plots, q.name)
+                )
+            )
+
+    excluded = set()
+    for spec in [
+        form.region_field,
+        form.sub_region_field,
+        form.plot_name_field,
+    ]:
+        for f in (spec or "").split(","):
+            if f.strip():
+                excluded.add(f.strip())
+    eligible = (
+        FormQuestion.objects.filter(
+            form=form,
+            type__startswith="select_",
+        )
+        .exclude(name__in=excluded)
+        .prefetch_related("options")
+        .order_by("label")
+    )
+
+    return {
+        "regions": _labelled(
+            raw_regions, form.region_field, option_map
+        ),
+        "sub_regions": sub_regions,
+        "sub_regions_by_region": {
+            region: sorted(
+                [sub_labels[s] for s in subs],
+                key=lambda x: x["label"],
+            )
+            for region, subs in by_region.items()
+        },
+        "dynamic_filters": dynamic_filters,
+        "available_filters": [
+            _question_entry(q) for q in eligible
+        ],
+    }
+
+
+def refresh_filter_catalog(form):
+    """Rebuild and store the catalogue of
+    ``form``. The ETag is a hash of the content,
+    so unchanged rebuilds keep client caches
+    valid."""
+    data = build_filter_catalog(form)
+    etag = hashlib.sha1(
+        json.dumps(data, sort_keys=True).encode()
+    ).hexdigest()
+    catalog, _ = FormFilterCatalog.objects.update_or_create(
+        form=form,
+        defaults={"data": data, "etag": etag},
+    )
+    return catalog
+
+
+def invalidate_filter_catalog(form):
+    """Drop the stored catalogue; the next
+    filter_options call rebuilds it."""
+    FormFilterCatalog.objects.filter(
+        form=form
+    ).delete()
+
+
+def render_filter_options(
+    data, region=None, all_eligible=False
+):
+    """Shape a stored catalogue into the
+    filter_options response."""
+    if region:
+        sub_regions = data[
+            "sub_regions_by_region"
+        ].get(region, [])
+    else:
+        sub_regions = data["sub_regions"]
+    response = {
+        "regions": data["regions"],
+        "sub_regions": sub_regions,
+        "dynamic_filters": data["dynamic_filters"],
+    }
+    if all_eligible:
+        response["available_filters"] = data[
+            "available_filters"
+        ]
+    return response
@@ -0,0 +1,656 @@
+import logging
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q
+from django.utils import timezone
+
+from api.v1.v1_init.helpers import get_telegram_config
+from api.v1.v1_odk.constants import (
+    ApprovalStatusTypes,
+    KoboOutboxKind,
+    SyncStatus,
+)
+from api.v1.v1_odk.models import KoboOutbox, RejectionAudit
+from utils.encryption import decrypt
+from utils.kobo_client import KoboClient
+from utils.task_queue import async_task, queue_for, queue_timeout
+
+logger = logging.getLogger(__name__)
+
+# Sent rows are kept this long for inspection
+SENT_RETENTION = timedelta(days=7)
+
+FLUSH_TASK = "api.v1.v1_odk.utils.kobo_outbox.flush_kobo_outbox"
+RETRY_TASK = "api.v1.v1_odk.utils.kobo_outbox.retry_failed_audits"
+# Longest a single Kobo call may take
+KOBO_CALL_TIMEOUT = KoboClient.DEFAULT_TIMEOUT
+
+
+def _time_budget(task):
+    """(deadline, lease) of a run of ``task``.
+
+    No Kobo call is started after the monotonic
+    ``deadline``, so the last one ends within the
+    queue's timeout. Rows claimed for longer than
+    ``lease`` belong to a run that was killed.
+    """
+    timeout = queue_timeout(queue_for(task))
+    deadline = (
+        time.monotonic()
+        + timeout
+        - KOBO_CALL_TIMEOUT
+        - 5
+    )
+    return deadline, timedelta(seconds=timeout * 2)
+
+
+def _pending(submission, kind):
+    return (
+        KoboOutbox.objects.select_for_update()
+        .filter(
+            submission=submission,
+            kind=kind,
+            status=SyncStatus.PENDING,
+        )
+        .first()
+    )
+
+
+def queue_validation_status(
+    user, submission, approval_status, audit=None
+):
+    """Queue a Kobo validation status update of
+    ``submission`` (an ApprovalStatusTypes value).
+
+    Replaces the status of a pending entry of the
+    submission; a RejectionAudit it carried is
+    marked superseded.
+    """
+    with transaction.atomic():
+        entry = _pending(
+            submission, KoboOutboxKind.VALIDATION_STATUS
+        )
+        if entry is None:
+            return KoboOutbox.objects.create(
+                kind=KoboOutboxKind.VALIDATION_STATUS,
+                form=submission.form,
+                submission=submission,
+                user=user,
+                approval_status=approval_status,
+                audit=audit,
+            )
+        if entry.audit_id and entry.audit_id != (
+            audit.pk if audit else None
+        ):
+            RejectionAudit.objects.filter(
+                pk=entry.audit_id
+            ).update(sync_status=SyncStatus.SUPERSEDED)
+        entry.user = user
+        entry.approval_status = approval_status
+        entry.audit = audit
+        entry.save(
+            update_fields=[
+                "user",
+                "approval_status",
+                "audit",
+            ]
+        )
+        return entry
+
+
+def queue_submission_data(user, submission, data):
+    """Queue a Kobo data update of
+    ``submission``, merged into a pending one
+    (later values win)."""
+    with transaction.atomic():
+        entry = _pending(submission, KoboOutboxKind.DATA)
+        if entry is None:
+            return KoboOutbox.objects.create(
+                kind=KoboOutboxKind.DATA,
+                form=submission.form,
+                submission=submission,
+                user=user,
+                data=data,
+            )
+        entry.user = user
+        entry.data = {**(entry.data or {}), **data}
+        entry.save(update_fields=["user", "data"])
+        return entry
+
+
+def _client(user):
+    return KoboClient(
+        user.kobo_url,
+        user.kobo_username,
+        decrypt(user.kobo_password),
+    )
+
+
+def _send(entries):
+    """One bulk Kobo call for ``entries`` (all of
+    one group)."""
+    first = entries[0]
+    client = _client(first.user)
+    kobo_ids = [e.submission.kobo_id for e in entries]
+    if first.kind == KoboOutboxKind.VALIDATION_STATUS:
+        client.update_validation_statuses(
+            first.form.asset_uid,
+            kobo_ids,
+            ApprovalStatusTypes.KoboStatusMap[
+                first.approval_status
+            ],
+        )
+    else:
+        client.update_submissions_data(
+            first.form.asset_uid, kobo_ids, first.data
+        )
+
+
+def _retry_delay(attempts):
+    return timedelta(
+        seconds=min(
+            settings.KOBO_OUTBOX_RETRY_BASE
+            * 2 ** (attempts - 1),
+            settings.KOBO_OUTBOX_RETRY_MAX,
+        )
+    )
+
+
+def _release(entry, fields):
+    """Put a sending entry back to pending, or
+    fold it into the pending entry queued for its
+    submission while it was in flight (whose
+    values are newer)."""
+    newer = _pending(entry.submission, entry.kind)
+    if newer is None:
+        entry.status = SyncStatus.PENDING
+    else:
+        if entry.kind == KoboOutboxKind.DATA:
+            newer.data = {
+                **(entry.data or {}),
+                **(newer.data or {}),
+            }
+            newer.save(update_fields=["data"])
+        elif entry.audit_id and (
+            entry.audit_id != newer.audit_id
+        ):
+            RejectionAudit.objects.filter(
+                pk=entry.audit_id
+            ).update(sync_status=SyncStatus.SUPERSEDED)
+        entry.status = SyncStatus.SUPERSEDED
+    entry.save(update_fields=["status", *fields])
+
+
+def _mark_failed(entries, error, now):
+    fields = ["attempts", "last_error", "next_attempt_at"]
+    gave_up = []
+    for entry in entries:
+        entry.attempts += 1
+        entry.last_error = str(error)[:1000]
+        if entry.attempts >= settings.KOBO_OUTBOX_MAX_ATTEMPTS:
+            entry.status = SyncStatus.FAILED
+            entry.save(update_fields=["status", *fields])
+            gave_up.append(entry.audit_id)
+        else:
+            entry.next_attempt_at = now + _retry_delay(
+                entry.attempts
+            )
+            _release(entry, fields)
+    audit_ids = [e.audit_id for e in entries if e.audit_id]
+    RejectionAudit.objects.filter(
+        pk__in=audit_ids
+    ).update(last_sync_attempt=now)
+    RejectionAudit.objects.filter(
+        pk__in=[pk for pk in gave_up if pk]
+    ).update(sync_status=SyncStatus.FAILED)
+
+
+def _mark_sent(entries, now):
+    for entry in entries:
+        entry.attempts += 1
+        entry.status = SyncStatus.SYNCED
+        entry.sent_at = now
+    KoboOutbox.objects.bulk_update(
+        entries, ["attempts", "status", "sent_at"]
+    )
+    _mark_audits_synced(
+        [e.audit_id for e in entries if e.audit_id], now
+    )
+
+
+def _mark_audits_synced(audit_ids, now):
+    """Record the rejections as synced and queue
+    their Telegram notifications."""
+    if not audit_ids:
+        return
+    notify = get_telegram_config()["enabled"]
+    fields = {
+        "sync_status": SyncStatus.SYNCED,
+        "synced_at": now,
+        "last_sync_attempt": now,
+        "next_retry_at": None,
+    }
+    if notify:
+        fields["telegram_queued_at"] = now
+    RejectionAudit.objects.filter(pk__in=audit_ids).update(
+        **fields
+    )
+    if not notify:
+        logger.info(
+            "Telegram disabled, skipping notification "
+            "for audits %s",
+            audit_ids,
+        )
+        return
+    # One dispatch sends them all, as a digest for
+    # large batches. After commit: it reads the
+    # queued audits.
+    transaction.on_commit(
+        lambda: async_task(
+            "api.v1.v1_odk.tasks"
+            ".dispatch_telegram_notifications"
+        )
+    )
+
+
+def _release_stale(now):
+    """Return entries left sending by a killed
+    flush to pending. Kobo may or may not have
+    applied them; sending them again is
+    harmless."""
+    with transaction.atomic():
+        stale = list(
+            KoboOutbox.objects.select_for_update(
+                skip_locked=True, of=("self",)
+            )
+            .filter(
+                status=SyncStatus.SENDING,
+                next_attempt_at__lte=now,
+            )
+            .select_related("submission")
+        )
+        for entry in stale:
+            entry.next_attempt_at = now
+            _release(entry, ["next_attempt_at"])
+    if stale:
+        logger.warning(
+            "Kobo outbox: %d entries left sending "
+            "by an earlier flush requeued",
+            len(stale),
+        )
+
+
+def _claim_batch(now, lease):
+    """Mark the next batch of due entries (one
+    bulk call: same credentials, asset and
+    change) as sending until ``now + lease``.
+
+    Committed before the Kobo call, so a change
+    queued meanwhile gets a new pending entry
+    instead of merging into one in flight.
+    """
+    with transaction.atomic():
+        due = (
+            KoboOutbox.objects.select_for_update(
+                skip_locked=True, of=("self",)
+            )
+            .filter(
+                status=SyncStatus.PENDING,
+                next_attempt_at__lte=now,
+            )
+            .select_related("form", "submission", "user")
+            .order_by("pk")
+        )
+        first = due.first()
+        if first is None:
+            return []
+        same = due.filter(
+            user_id=first.user_id,
+            form_id=first.form_id,
+            kind=first.kind,
+        )
+        if first.kind == KoboOutboxKind.VALIDATION_STATUS:
+            same = same.filter(
+                approval_status=first.approval_status
+            )
+        else:
+            same = same.filter(data=first.data)
+        batch = list(same[: settings.KOBO_OUTBOX_BATCH_SIZE])
+        KoboOutbox.objects.filter(
+            pk__in=[e.pk for e in batch]
+        ).update(
+            status=SyncStatus.SENDING,
+            next_attempt_at=now + lease,
+        )
+    return batch
+
+
+def flush_kobo_outbox():
+    """Send the due pending outbox entries to
+    Kobo, one bulk call per group of at most
+    KOBO_OUTBOX_BATCH_SIZE submissions.
+
+    Each batch is claimed, sent and recorded in
+    its own steps, with no transaction open over
+    the Kobo call, so a run killed at its queue
+    timeout keeps the batches already sent. A run
+    stops starting calls when the next one might
+    outlast that timeout, and after
+    KOBO_OUTBOX_FLUSH_LIMIT entries.
+
+    Failed calls are retried with exponential
+    backoff up to KOBO_OUTBOX_MAX_ATTEMPTS.
+
+    Returns {"sent": n, "failed": n}.
+    """
+    deadline, lease = _time_budget(FLUSH_TASK)
+    now = timezone.now()
+    _release_stale(now)
+    sent = failed = batches = 0
+    while (
+        sent + failed < settings.KOBO_OUTBOX_FLUSH_LIMIT
+        and time.monotonic() < deadline
+    ):
+        batch = _claim_batch(now, lease)
+        if not batch:
+            break
+        batches += 1
+        try:
+            _send(batch)
+        except Exception as e:
+            logger.warning(
+                "Kobo write-back of %d "
+                "submission(s) failed: %s",
+                len(batch),
+                e,
+            )
+            with transaction.atomic():
+                _mark_failed(batch, e, now)
+            failed += len(batch)
+        else:
+            with transaction.atomic():
+                _mark_sent(batch, now)
+            sent += len(batch)
+
+    KoboOutbox.objects.filter(
+        status=SyncStatus.SYNCED,
+        sent_at__lt=now - SENT_RETENTION,
+    ).delete()
+    if batches:
+        logger.info(
+            "Kobo outbox: %d sent in %d call(s), "
+            "%d failed",
+            sent,
+            batches,
+            failed,
+        )
+    return {"sent": sent, "failed": failed}
+
+
+def _audit_retry_delay(retry_count):
+    return timedelta(
+        seconds=min(
+            settings.AUDIT_RETRY_BASE * 2 ** retry_count,
+            settings.AUDIT_RETRY_MAX,
+        )
+    )
+
+
+def _audits_to_retry(now, due=True):
+    """Failed audits, and pending ones the outbox
+    no longer holds (e.g. queued before it
+    existed), left to retry; with ``due`` only
+    those whose backoff has passed."""
+    stale = now - timedelta(
+        seconds=settings.AUDIT_STALE_PENDING
+    )
+    qs = RejectionAudit.objects.filter(
+        Q(sync_status=SyncStatus.FAILED)
+        | Q(
+            sync_status=SyncStatus.PENDING,
+            rejected_at__lt=stale,
+        ),
+        retry_count__lt=settings.AUDIT_RETRY_MAX_ATTEMPTS,
+        validator__isnull=False,
+    )
+    if due:
+        qs = qs.filter(
+            Q(next_retry_at__isnull=True)
+            | Q(next_retry_at__lte=now)
+        )
+    return (
+        qs
+        .exclude(validator__kobo_password__isnull=True)
+        .exclude(validator__kobo_password="")
+        .exclude(
+            kobo_outbox__status__in=[
+                SyncStatus.PENDING,
+                SyncStatus.SENDING,
+            ]
+        )
+    )
+
+
+def _claim_audits(now, lease):
+    """Lock the due audits and lease them until
+    ``now + lease``, so overlapping sweeps skip
+    them. Returns the audits to send, grouped by
+    (validator, asset), and the ids of those the
+    submission has moved past."""
+    with transaction.atomic():
+        audits = list(
+            _audits_to_retry(now)
+            .select_for_update(
+                skip_locked=True, of=("self",)
+            )
+            .select_related("submission__form", "validator")
+            .order_by("rejected_at")[
+                : settings.KOBO_OUTBOX_FLUSH_LIMIT
+            ]
+        )
+        RejectionAudit.objects.filter(
+            pk__in=[a.pk for a in audits]
+        ).update(next_retry_at=now + lease)
+    latest = dict(
+        RejectionAudit.objects.filter(
+            submission_id__in={
+                a.submission_id for a in audits
+            }
+        )
+        .values("submission_id")
+        .annotate(latest=Max("pk"))
+        .values_list("submission_id", "latest")
+    )
+    groups = defaultdict(list)
+    stale_ids = []
+    for audit in audits:
+        if (
+            audit.submission.approval_status
+            != ApprovalStatusTypes.REJECTED
+            or latest[audit.submission_id] != audit.pk
+        ):
+            stale_ids.append(audit.pk)
+            continue
+        key = (
+            audit.validator_id,
+            audit.submission.form.asset_uid,
+        )
+        groups[key].append(audit)
+    return groups, stale_ids
+
+
+def _mark_audits_failed(batch, error, now):
+    for audit in batch:
+        audit.retry_count += 1
+        audit.sync_status = SyncStatus.FAILED
+        audit.last_sync_attempt = now
+        audit.next_retry_at = now + _audit_retry_delay(
+            audit.retry_count
+        )
+        audit.kobo_response = {"error": str(error)[:1000]}
+    RejectionAudit.objects.bulk_update(
+        batch,
+        [
+            "retry_count",
+            "sync_status",
+            "last_sync_attempt",
+            "next_retry_at",
+            "kobo_response",
+        ],
+    )
+
+
+def retry_failed_audits():
+    """Re-send rejections whose Kobo sync failed
+    or never happened.
+
+    Due audits (exponential backoff on
+    retry_count) are claimed, then sent with one
+    bulk update_validation_statuses call per
+    validator and asset, in batches of
+    KOBO_OUTBOX_BATCH_SIZE. Each batch's result is
+    committed on its own, with no transaction
+    open over the Kobo call; synced ones get
+    their Telegram notification. Audits whose
+    submission was reviewed again since are
+    marked superseded instead. Batches not
+    started before the queue timeout are left
+    due for the next sweep.
+
+    Returns counts of the sweep and the backlog
+    left.
+    """
+    deadline, lease = _time_budget(RETRY_TASK)
+    now = timezone.now()
+    groups, stale_ids = _claim_audits(now, lease)
+    with transaction.atomic():
+        superseded = RejectionAudit.objects.filter(
+            pk__in=stale_ids
+        ).update(sync_status=SyncStatus.SUPERSEDED)
+
+    status_uid = ApprovalStatusTypes.KoboStatusMap[
+        ApprovalStatusTypes.REJECTED
+    ]
+    size = settings.KOBO_OUTBOX_BATCH_SIZE
+    batches = [
+        (asset_uid, group[i:i + size])
+        for (_, asset_uid), group in groups.items()
+        for i in range(0, len(group), size)
+    ]
+    synced = failed = 0
+    for n, (asset_uid, batch) in enumerate(batches):
+        if time.monotonic() >= deadline:
+            # Due again on the next sweep
+            RejectionAudit.objects.filter(
+                pk__in=[
+                    a.pk for _, b in batches[n:] for a in b
+                ]
+            ).update(next_retry_at=now)
+            break
+        try:
+            _client(
+                batch[0].validator
+            ).update_validation_statuses(
+                asset_uid,
+                [a.submission.kobo_id for a in batch],
+                status_uid,
+            )
+        except Exception as e:
+            logger.warning(
+                "Retry of %d rejection(s) on "
+                "asset %s failed: %s",
+                len(batch),
+                asset_uid,
+                e,
+            )
+            with transaction.atomic():
+                _mark_audits_failed(batch, e, now)
+            failed += len(batch)
+        else:
+            with transaction.atomic():
+                _mark_audits_synced(
+                    [a.pk for a in batch], now
+                )
+            synced += len(batch)
+
+    result = {
+        "synced": synced,
+        "failed": failed,
+        "superseded": superseded,
+        "backlog": _audits_to_retry(
+            now, due=False
+        ).count(),
+    }
+    if batches or stale_ids:
+        logger.info("Rejection audit retry: %s", result)
+    return result
+
+
+def kobo_sync_stats():
+    """Backlog and last-hour throughput of Kobo
+    write-backs (outbox rows and rejection
+    audits)."""
+    now = timezone.now()
+    hour_ago = now - timedelta(hours=1)
+    outbox = KoboOutbox.objects.aggregate(
+        pending=Count(
+            "pk", filter=Q(status=SyncStatus.PENDING)
+        ),
+        due=Count(
+            "pk",
+            filter=Q(
+                status=SyncStatus.PENDING,
+                next_attempt_at__lte=now,
+            ),
+        ),
+        sending=Count(
+            "pk", filter=Q(status=SyncStatus.SENDING)
+        ),
+        failed=Count(
+            "pk", filter=Q(status=SyncStatus.FAILED)
+        ),
+        sent_last_hour=Count(
+            "pk", filter=Q(sent_at__gte=hour_ago)
+        ),
+    )
+    audits = RejectionAudit.objects.aggregate(
+        pending=Count(
+            "pk", filter=Q(sync_status=SyncStatus.PENDING)
+        ),
+        failed=Count(
+            "pk", filter=Q(sync_status=SyncStatus.FAILED)
+        ),
+        gave_up=Count(
+            "pk",
+            filter=Q(
+                sync_status=SyncStatus.FAILED,
+                retry_count__gte=(
+                    settings.AUDIT_RETRY_MAX_ATTEMPTS
+                ),
+            ),
+        ),
+        synced_last_hour=Count(
+            "pk", filter=Q(synced_at__gte=hour_ago)
+        ),
+        oldest_unsynced=Min(
+            "rejected_at",
+            filter=Q(
+                sync_status__in=[
+                    SyncStatus.PENDING,
+                    SyncStatus.FAILED,
+                ]
+            ),
+        ),
+    )
+    oldest = audits.pop("oldest_unsynced")
+    audits["oldest_unsynced_seconds"] = (
+        int((now - oldest).total_seconds())
+        if oldest
+        else None
+    )
+    audits["retry_due"] = _audits_to_retry(now).count()
+    return {"outbox": outbox, "audits": audits}
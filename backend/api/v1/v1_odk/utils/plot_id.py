@@ -1,18 +1,21 @@
 import logging
 
 from django.db import IntegrityError, transaction
-from django.db.models import IntegerField, Max
-from django.db.models.functions import Cast, Substr
 
 from api.v1.v1_odk.constants import PREFIX_PLOT_ID
 from api.v1.v1_odk.models import (
     MainPlot,
     MainPlotSubmission,
 )
+from api.v1.v1_odk.utils.uid_allocator import (
+    allocate_plot_uids,
+    max_plot_uid,
+    plot_scope,
+    reseed_counter,
+)
 
 logger = logging.getLogger(__name__)
 
-_PREFIX_LEN = len(PREFIX_PLOT_ID)
 _MAX_RETRIES = 3
 
 
@@ -21,8 +24,9 @@ def generate_next_plot_uid(form):
     scoped to a form.
 
     Format: PLT00001, PLT00351, etc.
-    Uses numeric Cast + Max to avoid lexicographic
-    ordering issues.
+    Reads the table maximum without reserving
+    anything; new MainPlots get their UIDs from
+    allocate_plot_uids.
 
     Args:
         form: FormMetadata instance (uses
@@ -32,18 +36,7 @@ def generate_next_plot_uid(form):
         str: e.g. "PLT00001", "PLT00351"
     """
     effective_min = form.plot_uid_start or 1
-
-    result = MainPlot.objects.filter(
-        form=form,
-    ).aggregate(
-        max_uid=Max(
-            Cast(
-                Substr("uid", _PREFIX_LEN + 1),
-                IntegerField(),
-            )
-        )
-    )
-    max_uid = result["max_uid"]
+    max_uid = max_plot_uid(form)
     if max_uid is None:
         next_num = effective_min
     else:
@@ -55,8 +48,9 @@ def create_main_plot_for_submission(submission):
     """Create a MainPlot and link it to the
     submission on approval.
 
-    Handles concurrent creation race via retry
-    on IntegrityError (same pattern as farmer UID).
+    The UID comes from the form's counter; an
+    IntegrityError (UID taken outside the
+    allocator) reseeds the counter and retries.
 
     Args:
         submission: Submission instance being
@@ -80,7 +74,7 @@ def create_main_plot_for_submission(submission):
     form = submission.form
 
     for attempt in range(_MAX_RETRIES):
-        uid = generate_next_plot_uid(form)
+        [uid] = allocate_plot_uids(form)
         try:
             with transaction.atomic():
                 main_plot = MainPlot.objects.create(
@@ -102,5 +96,6 @@ def create_main_plot_for_submission(submission):
                     submission.uuid,
                 )
                 raise
+            reseed_counter(plot_scope(form))
             continue
     return None
@@ -0,0 +1,26 @@
+from api.v1.v1_odk.export import _wkt_to_kml, kml_version
+from api.v1.v1_odk.models import PlotKml
+
+
+def plot_kml_name(plot):
+    return plot.plot_name or str(plot.uuid)
+
+
+def cached_plot_kml(plot):
+    """PlotKml row of ``plot``, rendered again
+    only when its geometry or name changed since
+    the last rendering."""
+    name = plot_kml_name(plot)
+    version = kml_version(plot.polygon_wkt, name)
+    cache = PlotKml.objects.filter(plot=plot).first()
+    if cache is None or cache.version != version:
+        cache, _ = PlotKml.objects.update_or_create(
+            plot=plot,
+            defaults={
+                "version": version,
+                "kml": _wkt_to_kml(
+                    plot.polygon_wkt, name=name
+                ),
+            },
+        )
+    return cache
@@ -0,0 +1,243 @@
+import logging
+import re
+
+from api.v1.v1_odk.models import (
+    FormQuestion,
+    Submission,
+)
+from api.v1.v1_odk.serializers import (
+    build_option_lookup,
+    resolve_value,
+)
+
+logger = logging.getLogger(__name__)
+
+NOT_IN_LIST_RE = re.compile(r"^not in list\s*-\s*")
+
+RESOLVED_FIELDS = [
+    "resolved_region",
+    "resolved_sub_region",
+    "resolved_enumerator",
+    "resolved_data",
+]
+
+_MAX_LABEL_LENGTH = 500
+
+# Attachment keys the list serializer needs to
+# build local URLs
+_ATTACHMENT_KEYS = (
+    "uid",
+    "media_file_basename",
+    "question_xpath",
+)
+
+
+def build_label_context(form):
+    """Build the lookup maps needed to resolve
+    labels for every submission of a form.
+
+    Returns a dict with option_map, type_map and
+    question_names (all FormQuestion names of the
+    form). Build once per batch and reuse it.
+    """
+    option_map, type_map = build_option_lookup(form)
+    question_names = set(
+        FormQuestion.objects.filter(
+            form=form
+        ).values_list("name", flat=True)
+    )
+    return {
+        "option_map": option_map,
+        "type_map": type_map,
+        "question_names": question_names,
+    }
+
+
+def label_fingerprint(form):
+    """Return a comparable snapshot of everything
+    that affects resolved labels for a form.
+
+    Used to detect whether a question sync changed
+    option labels, question types or the question
+    set.
+    """
+    ctx = build_label_context(form)
+    return (
+        ctx["option_map"],
+        ctx["type_map"],
+        ctx["question_names"],
+    )
+
+
+def resolve_field_spec(
+    raw_data, field_spec, option_map, type_map
+):
+    """Resolve a comma-separated field spec to
+    labels. Non-empty values joined with ' - '."""
+    if not raw_data or not field_spec:
+        return None
+    fields = [
+        f.strip()
+        for f in field_spec.split(",")
+        if f.strip()
+    ]
+    parts = []
+    for field in fields:
+        raw_val = raw_data.get(field)
+        if raw_val is None:
+            continue
+        opts = option_map.get(field)
+        if opts:
+            resolved = resolve_value(
+                raw_val, opts, type_map.get(field)
+            )
+        else:
+            resolved = raw_val
+        val = str(resolved).strip()
+        if val:
+            parts.append(val)
+    return " - ".join(parts) if parts else None
+
+
+def _clean_location(value):
+    """Strip the 'not in list - ' prefix Kobo
+    adds for 'other' location answers."""
+    if not value:
+        return value
+    return NOT_IN_LIST_RE.sub("", value)[
+        :_MAX_LABEL_LENGTH
+    ]
+
+
+def _project_resolved_data(raw_data, ctx):
+    """Keep question-level keys of raw_data with
+    select options resolved, plus the attachment
+    metadata needed to build local URLs."""
+    option_map = ctx["option_map"]
+    type_map = ctx["type_map"]
+    question_names = ctx["question_names"]
+    resolved = {}
+    for key, val in raw_data.items():
+        if key not in question_names:
+            continue
+        if key in option_map and val is not None:
+            resolved[key] = resolve_value(
+                val,
+                option_map[key],
+                type_map.get(key),
+            )
+        else:
+            resolved[key] = val
+    attachments = raw_data.get("_attachments")
+    if attachments:
+        resolved["_attachments"] = [
+            {
+                k: att[k]
+                for k in _ATTACHMENT_KEYS
+                if k in att
+            }
+            for att in attachments
+        ]
+    return resolved
+
+
+def compute_resolved_labels(raw_data, form, ctx):
+    """Compute the resolved_* column values for a
+    submission's raw_data.
+
+    Returns a dict keyed by Submission field name,
+    suitable for update_or_create defaults.
+    """
+    raw_data = raw_data or {}
+    option_map = ctx["option_map"]
+    type_map = ctx["type_map"]
+    region = resolve_field_spec(
+        raw_data,
+        form.region_field or "region",
+        option_map,
+        type_map,
+    )
+    sub_region = resolve_field_spec(
+        raw_data,
+        form.sub_region_field or "sub_region",
+        option_map,
+        type_map,
+    )
+    enumerator = resolve_field_spec(
+        raw_data,
+        "enumerator_id",
+        option_map,
+        type_map,
+    )
+    return {
+        "resolved_region": _clean_location(region),
+        "resolved_sub_region": _clean_location(
+            sub_region
+        ),
+        "resolved_enumerator": (
+            enumerator[:_MAX_LABEL_LENGTH]
+            if enumerator
+            else None
+        ),
+        "resolved_data": _project_resolved_data(
+            raw_data, ctx
+        ),
+    }
+
+
+def apply_resolved_labels(submission, ctx):
+    """Set resolved_* attributes on a submission
+    in place. Caller is responsible for saving
+    with RESOLVED_FIELDS."""
+    values = compute_resolved_labels(
+        submission.raw_data,
+        submission.form,
+        ctx,
+    )
+    for attr, val in values.items():
+        setattr(submission, attr, val)
+    return submission
+
+
+def reresolve_form_labels(form, batch_size=500):
+    """Recompute stored labels for every
+    submission of a form.
+
+    Run after question/option sync or a change
+    to region_field/sub_region_field.
+
+    Returns the number of submissions updated.
+    """
+    ctx = build_label_context(form)
+    qs = (
+        Submission.objects.filter(form=form)
+        .only("pk", "raw_data")
+        .order_by("pk")
+    )
+    batch = []
+    total = 0
+    for sub in qs.iterator(chunk_size=batch_size):
+        values = compute_resolved_labels(
+            sub.raw_data, form, ctx
+        )
+        for attr, val in values.items():
+            setattr(sub, attr, val)
+        batch.append(sub)
+        if len(batch) >= batch_size:
+            Submission.objects.bulk_update(
+                batch, RESOLVED_FIELDS
+            )
+            total += len(batch)
+            batch = []
+    if batch:
+        Submission.objects.bulk_update(
+            batch, RESOLVED_FIELDS
+        )
+        total += len(batch)
+    logger.info(
+        "Re-resolved labels for %d submissions "
+        "of form %s",
+        total,
+        form.asset_uid,
+    )
+    return total
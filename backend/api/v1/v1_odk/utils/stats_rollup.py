@@ -0,0 +1,440 @@
+import logging
+from datetime import timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import (
+    Count,
+    ExpressionWrapper,
+    F,
+    Func,
+    IntegerField,
+    Q,
+    Sum,
+)
+from django.db.models.functions import Coalesce
+
+from api.v1.v1_odk.constants import (
+    ApprovalStatusTypes,
+    STATUS_MAP,
+)
+from api.v1.v1_odk.funcs import parse_date_range
+from api.v1.v1_odk.models import (
+    FormMetadata,
+    Plot,
+    PlotStatsRollup,
+    PlotTimeseriesRollup,
+    TimeseriesEvent,
+)
+
+logger = logging.getLogger(__name__)
+
+DAY_MS = 86_400_000
+
+STAT_KEYS = (
+    "total_plots",
+    "total_area_ha",
+    "approved_count",
+    "approved_area_ha",
+    "pending_count",
+    "pending_area_ha",
+)
+
+
+def epoch_day(submission_time):
+    """UTC day (days since epoch) of an epoch-ms
+    timestamp, or None."""
+    if submission_time is None:
+        return None
+    return submission_time // DAY_MS
+
+
+def datetime_day(value):
+    """UTC day (days since epoch) of a datetime;
+    naive values are taken as UTC."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=dt_timezone.utc)
+    return int(value.timestamp()) // 86400
+
+
+class EpochDay(Func):
+    """UTC days since epoch of a timestamp
+    column."""
+
+    template = (
+        "CAST(FLOOR(EXTRACT(EPOCH FROM "
+        "%(expressions)s) / 86400) AS integer)"
+    )
+    output_field = IntegerField()
+
+
+def _submission_day():
+    return ExpressionWrapper(
+        F("submission__submission_time") / DAY_MS,
+        output_field=IntegerField(),
+    )
+
+
+def _day_q(days):
+    values = [d for d in days if d is not None]
+    q = Q(day__in=values)
+    if None in days:
+        q |= Q(day__isnull=True)
+    return q
+
+
+def live_rollup_rows(form, days=None):
+    """Group the form's plots into rollup rows,
+    optionally only for the given days."""
+    plots = Plot.objects.filter(form=form).annotate(
+        day=_submission_day()
+    )
+    if days is not None:
+        plots = plots.filter(_day_q(days))
+    return list(
+        plots.values(
+            "day",
+            "region",
+            "sub_region",
+            status=F("submission__approval_status"),
+        )
+        .annotate(
+            plot_count=Count("id"),
+            total_area=Sum("area_ha"),
+        )
+        .order_by()
+    )
+
+
+def timeseries_rows(
+    plots, days=None, first=None, last=None
+):
+    """Group plots into timeseries event rows
+    (see PlotTimeseriesRollup), optionally only
+    for events falling on the given days or in
+    the inclusive ``first``..``last`` range."""
+    plots = plots.filter(submission__isnull=False)
+    dims = {
+        "enumerator": F(
+            "submission__resolved_enumerator"
+        ),
+        "status": F("submission__approval_status"),
+    }
+    review_day = Coalesce(
+        EpochDay("submission__updated_at"),
+        _submission_day(),
+    )
+    events = [
+        (
+            TimeseriesEvent.COLLECTED,
+            None,
+            _submission_day(),
+        ),
+        (
+            TimeseriesEvent.APPROVED,
+            ApprovalStatusTypes.APPROVED,
+            review_day,
+        ),
+        (
+            TimeseriesEvent.REJECTED,
+            ApprovalStatusTypes.REJECTED,
+            review_day,
+        ),
+    ]
+    rows = []
+    for event, status, day_expr in events:
+        qs = plots.annotate(day=day_expr)
+        if status is not None:
+            qs = qs.filter(
+                submission__approval_status=status
+            )
+        if days is not None:
+            qs = qs.filter(_day_q(days))
+        if first is not None:
+            qs = qs.filter(day__gte=first)
+        if last is not None:
+            qs = qs.filter(day__lte=last)
+        for row in (
+            qs.values(
+                "day", "region", "sub_region", **dims
+            )
+            .annotate(
+                plot_count=Count("id"),
+                total_area=Sum("area_ha"),
+            )
+            .order_by()
+        ):
+            row["event"] = event.value
+            rows.append(row)
+    return rows
+
+
+def refresh_plot_stats(form, days=None):
+    """Rebuild the stats and timeseries rollup
+    rows of ``form``.
+
+    With ``days`` only those UTC days are rebuilt,
+    which is how writes keep the rollups current.
+    Partial refreshes are skipped until the form
+    has been fully built once.
+    """
+    if days is not None and not form.stats_rollup_ready:
+        return
+    with transaction.atomic():
+        # Serialise concurrent refreshes per form
+        list(
+            FormMetadata.objects.select_for_update()
+            .filter(pk=form.pk)
+            .values_list("pk", flat=True)
+        )
+        rows = live_rollup_rows(form, days)
+        existing = PlotStatsRollup.objects.filter(
+            form=form
+        )
+        events = PlotTimeseriesRollup.objects.filter(
+            form=form
+        )
+        if days is not None:
+            existing = existing.filter(_day_q(days))
+            events = events.filter(_day_q(days))
+        existing.delete()
+        events.delete()
+        PlotTimeseriesRollup.objects.bulk_create(
+            [
+                PlotTimeseriesRollup(
+                    form=form,
+                    event=row["event"],
+                    day=row["day"],
+                    region=row["region"],
+                    sub_region=row["sub_region"],
+                    enumerator=row["enumerator"],
+                    approval_status=row["status"],
+                    plot_count=row["plot_count"],
+                    area_ha=row["total_area"] or 0,
+                )
+                for row in timeseries_rows(
+                    Plot.objects.filter(form=form), days
+                )
+            ]
+        )
+        PlotStatsRollup.objects.bulk_create(
+            [
+                PlotStatsRollup(
+                    form=form,
+                    day=row["day"],
+                    region=row["region"],
+                    sub_region=row["sub_region"],
+                    approval_status=row["status"],
+                    plot_count=row["plot_count"],
+                    area_ha=row["total_area"] or 0,
+                )
+                for row in rows
+            ]
+        )
+        if days is None and not form.stats_rollup_ready:
+            FormMetadata.objects.filter(
+                pk=form.pk
+            ).update(stats_rollup_ready=True)
+            form.stats_rollup_ready = True
+
+
+def submission_days(submission, *previous):
+    """Rollup days a submission's plot touches:
+    its submission day plus the review days in
+    ``updated_at`` and any ``previous`` values.
+    A missing submission maps to the None day."""
+    if submission is None:
+        return {None}
+    days = {epoch_day(submission.submission_time)}
+    for value in (submission.updated_at, *previous):
+        if value is not None:
+            days.add(datetime_day(value))
+    return days
+
+
+def refresh_rollups_for(form, submission, *previous):
+    """Rebuild the rollup days touched by one
+    submission (or plot without submission)."""
+    refresh_plot_stats(
+        form, submission_days(submission, *previous)
+    )
+
+
+def refresh_plot_stats_for_plot(plot):
+    refresh_rollups_for(plot.form, plot.submission)
+
+
+def live_stats(qs):
+    """Stats card totals over a plot queryset."""
+    pending_q = Q(
+        submission__approval_status__isnull=True
+    ) | Q(
+        submission__approval_status=(
+            ApprovalStatusTypes.PENDING
+        )
+    )
+    approved_q = Q(
+        submission__approval_status=(
+            ApprovalStatusTypes.APPROVED
+        )
+    )
+    result = qs.aggregate(
+        total_plots=Count("id", distinct=True),
+        total_area_ha=Sum("area_ha"),
+        approved_count=Count(
+            "id",
+            filter=approved_q,
+            distinct=True,
+        ),
+        pending_count=Count(
+            "id",
+            filter=pending_q,
+            distinct=True,
+        ),
+        pending_area_ha=Sum(
+            "area_ha",
+            filter=pending_q,
+        ),
+    )
+    result["approved_area_ha"] = qs.filter(
+        approved_q
+    ).aggregate(total=Sum("area_ha"))["total"]
+    return {k: result[k] or 0 for k in STAT_KEYS}
+
+
+def _full_day_window(start, end):
+    """Whole UTC days inside [start, end] (epoch
+    ms, inclusive). Bounds are None when open."""
+    first = None
+    last = None
+    if start is not None:
+        first = -(-start // DAY_MS)
+    if end is not None:
+        last = (end + 1) // DAY_MS - 1
+    return first, last
+
+
+def rollup_scope(params, model):
+    """Rows of a rollup ``model`` matching the
+    form, status, region and sub_region filters.
+
+    Returns None when the filters do not map onto
+    the rollup dimensions (search, flagged, dynamic
+    filters) or a form is not built yet.
+    """
+    if params.get("search") or any(
+        k.startswith("filter__") for k in params
+    ):
+        return None
+    status_param = params.get("status")
+    if status_param == "flagged":
+        return None
+
+    form_id = params.get("form_id")
+    forms = FormMetadata.objects.all()
+    rows = model.objects.all()
+    if form_id:
+        forms = forms.filter(asset_uid=form_id)
+        rows = rows.filter(form__asset_uid=form_id)
+    if forms.filter(stats_rollup_ready=False).exists():
+        return None
+
+    if status_param == "pending":
+        rows = rows.filter(
+            Q(approval_status__isnull=True)
+            | Q(
+                approval_status=(
+                    ApprovalStatusTypes.PENDING
+                )
+            )
+        )
+    elif status_param in STATUS_MAP:
+        rows = rows.filter(
+            approval_status=STATUS_MAP[status_param]
+        )
+    region = params.get("region")
+    if region:
+        rows = rows.filter(region=region)
+    sub_region = params.get("sub_region")
+    if sub_region:
+        rows = rows.filter(sub_region=sub_region)
+    return rows
+
+
+def rollup_stats(params, live_qs):
+    """Stats card totals answered from the rollup.
+
+    Returns None when ``rollup_scope`` cannot
+    answer the filters. Date ranges use whole days
+    from the rollup and ``live_qs`` for the
+    partial days at the edges.
+    """
+    rows = rollup_scope(params, PlotStatsRollup)
+    if rows is None:
+        return None
+    pending_q = Q(approval_status__isnull=True) | Q(
+        approval_status=ApprovalStatusTypes.PENDING
+    )
+    approved_q = Q(
+        approval_status=ApprovalStatusTypes.APPROVED
+    )
+
+    edges = None
+    start, end = parse_date_range(params)
+    if start is not None or end is not None:
+        first, last = _full_day_window(start, end)
+        if (
+            first is not None
+            and last is not None
+            and first > last
+        ):
+            return None
+        rows = rows.filter(day__isnull=False)
+        window = Q()
+        if first is not None:
+            rows = rows.filter(day__gte=first)
+            window &= Q(
+                submission__submission_time__gte=(
+                    first * DAY_MS
+                )
+            )
+        if last is not None:
+            rows = rows.filter(day__lte=last)
+            window &= Q(
+                submission__submission_time__lt=(
+                    (last + 1) * DAY_MS
+                )
+            )
+        starts_mid_day = (
+            first is not None
+            and start < first * DAY_MS
+        )
+        ends_mid_day = (
+            last is not None
+            and end >= (last + 1) * DAY_MS
+        )
+        if starts_mid_day or ends_mid_day:
+            edges = live_qs.exclude(window)
+
+    result = rows.aggregate(
+        total_plots=Sum("plot_count"),
+        total_area_ha=Sum("area_ha"),
+        approved_count=Sum(
+            "plot_count", filter=approved_q
+        ),
+        approved_area_ha=Sum(
+            "area_ha", filter=approved_q
+        ),
+        pending_count=Sum(
+            "plot_count", filter=pending_q
+        ),
+        pending_area_ha=Sum(
+            "area_ha", filter=pending_q
+        ),
+    )
+    totals = {k: result[k] or 0 for k in STAT_KEYS}
+    if edges is not None:
+        for key, value in live_stats(edges).items():
+            totals[key] += value
+    return totals
@@ -0,0 +1,155 @@
+from collections import defaultdict
+from datetime import date, timedelta
+
+from django.db.models import Sum
+from rest_framework.exceptions import ValidationError
+
+from api.v1.v1_odk.funcs import parse_date_range
+from api.v1.v1_odk.models import (
+    PlotTimeseriesRollup,
+    TimeseriesEvent,
+)
+from api.v1.v1_odk.utils.stats_rollup import (
+    DAY_MS,
+    rollup_scope,
+    timeseries_rows,
+)
+
+BUCKETS = ("day", "week", "month")
+
+GROUP_BY = ("region", "sub_region", "enumerator")
+
+EPOCH = date(1970, 1, 1)
+
+
+def parse_timeseries_params(params):
+    """Return (bucket, group_by) from query params.
+
+    Raises ValidationError for unknown values.
+    """
+    bucket = params.get("bucket") or "day"
+    if bucket not in BUCKETS:
+        raise ValidationError(
+            {
+                "bucket": (
+                    "Must be one of: "
+                    f"{', '.join(BUCKETS)}."
+                )
+            }
+        )
+    group_by = params.get("group_by") or None
+    if group_by is not None and group_by not in GROUP_BY:
+        raise ValidationError(
+            {
+                "group_by": (
+                    "Must be one of: "
+                    f"{', '.join(GROUP_BY)}."
+                )
+            }
+        )
+    return bucket, group_by
+
+
+def day_window(params):
+    """UTC days touched by start_date/end_date
+    (inclusive). Bounds are None when open."""
+    start, end = parse_date_range(params)
+    first = start // DAY_MS if start is not None else None
+    last = end // DAY_MS if end is not None else None
+    return first, last
+
+
+def bucket_start(day, bucket):
+    """First date of the bucket holding ``day``
+    (UTC days since epoch). Weeks start on
+    Monday."""
+    value = EPOCH + timedelta(days=day)
+    if bucket == "week":
+        return value - timedelta(days=value.weekday())
+    if bucket == "month":
+        return value.replace(day=1)
+    return value
+
+
+def _rollup_rows(params, group_by, first, last):
+    rows = rollup_scope(params, PlotTimeseriesRollup)
+    if rows is None:
+        return None
+    if first is not None:
+        rows = rows.filter(day__gte=first)
+    if last is not None:
+        rows = rows.filter(day__lte=last)
+    dims = ["day", "event"]
+    if group_by:
+        dims.append(group_by)
+    return list(
+        rows.values(*dims)
+        .annotate(
+            plot_count=Sum("plot_count"),
+            total_area=Sum("area_ha"),
+        )
+        .order_by()
+    )
+
+
+def build_timeseries(params, live_qs):
+    """Plot events per bucket (and group).
+
+    Reads PlotTimeseriesRollup when the filters
+    map onto it and otherwise groups ``live_qs``
+    (already filtered like ``stats``, except for
+    the date range) on the fly. The date range
+    selects the UTC days of the events shown.
+    """
+    bucket, group_by = parse_timeseries_params(
+        params
+    )
+    first, last = day_window(params)
+    rows = _rollup_rows(params, group_by, first, last)
+    if rows is None:
+        rows = timeseries_rows(
+            live_qs, first=first, last=last
+        )
+
+    series = defaultdict(
+        lambda: {
+            "collected": 0,
+            "approved": 0,
+            "rejected": 0,
+            "approved_area_ha": 0,
+        }
+    )
+    for row in rows:
+        key = (
+            bucket_start(row["day"], bucket),
+            row[group_by] if group_by else None,
+        )
+        point = series[key]
+        event = row["event"]
+        point[event] += row["plot_count"]
+        if event == TimeseriesEvent.APPROVED:
+            point["approved_area_ha"] += (
+                row["total_area"] or 0
+            )
+
+    results = []
+    for (period, group), point in sorted(
+        series.items(),
+        key=lambda item: (
+            item[0][0],
+            item[0][1] or "",
+        ),
+    ):
+        entry = {"period": period.isoformat()}
+        if group_by:
+            entry["group"] = group
+        entry.update(point)
+        entry["approved_area_ha"] = round(
+            entry["approved_area_ha"], 2
+        )
+        results.append(entry)
+    return {
+        "bucket": bucket,
+        "group_by": group_by,
+        "results": results,
+    }
@@ -0,0 +1,130 @@
+import logging
+
+from django.db import transaction
+from django.db.models import IntegerField, Max
+from django.db.models.functions import Cast, Substr
+
+from api.v1.v1_odk.constants import PREFIX_PLOT_ID
+from api.v1.v1_odk.models import (
+    Farmer,
+    FormMetadata,
+    MainPlot,
+    UidCounter,
+)
+
+logger = logging.getLogger(__name__)
+
+FARMER_SCOPE = "farmer"
+_PLOT_SCOPE_PREFIX = "plot:"
+_PREFIX_LEN = len(PREFIX_PLOT_ID)
+
+
+def plot_scope(form):
+    return f"{_PLOT_SCOPE_PREFIX}{form.pk}"
+
+
+def max_farmer_uid():
+    """Highest numeric farmer UID, or None."""
+    return Farmer.objects.aggregate(
+        max_uid=Max(Cast("uid", IntegerField()))
+    )["max_uid"]
+
+
+def max_plot_uid(form):
+    """Highest numeric PLT UID of ``form``, or
+    None."""
+    return MainPlot.objects.filter(
+        form=form,
+    ).aggregate(
+        max_uid=Max(
+            Cast(
+                Substr("uid", _PREFIX_LEN + 1),
+                IntegerField(),
+            )
+        )
+    )["max_uid"]
+
+
+def _table_max(scope):
+    if scope == FARMER_SCOPE:
+        return max_farmer_uid()
+    form = FormMetadata.objects.get(
+        pk=int(scope[len(_PLOT_SCOPE_PREFIX):])
+    )
+    return max_plot_uid(form)
+
+
+def reseed_counter(scope):
+    """Reset a counter to the current table
+    maximum, e.g. after rows were inserted or
+    deleted outside the allocator."""
+    last = _table_max(scope) or 0
+    UidCounter.objects.update_or_create(
+        scope=scope, defaults={"last_value": last}
+    )
+    logger.info("Reseeded %s to %d", scope, last)
+    return last
+
+
+def allocate_uids(scope, count=1, min_start=1):
+    """Allocate ``count`` consecutive numbers.
+
+    Locks the scope's counter row, so concurrent
+    callers get disjoint blocks without scanning
+    the UID table. A missing counter is seeded
+    from the table maximum. The first number is
+    at least ``min_start``.
+
+    Returns:
+        list[int]
+    """
+    if count < 1:
+        return []
+    with transaction.atomic():
+        counter = (
+            UidCounter.objects.select_for_update()
+            .filter(scope=scope)
+            .first()
+        )
+        if counter is None:
+            UidCounter.objects.get_or_create(
+                scope=scope,
+                defaults={
+                    "last_value": (
+                        _table_max(scope) or 0
+                    )
+                },
+            )
+            counter = (
+                UidCounter.objects.select_for_update()
+                .get(scope=scope)
+            )
+        start = max(
+            counter.last_value + 1, min_start or 1
+        )
+        counter.last_value = start + count - 1
+        counter.save(update_fields=["last_value"])
+    return list(range(start, start + count))
+
+
+def allocate_farmer_uids(count=1, min_start=1):
+    """Farmer UIDs, zero-padded to 5 digits."""
+    return [
+        str(n).zfill(5)
+        for n in allocate_uids(
+            FARMER_SCOPE, count, min_start
+        )
+    ]
+
+
+def allocate_plot_uids(form, count=1):
+    """PLT UIDs of ``form``, honouring
+    form.plot_uid_start."""
+    return [
+        f"{PREFIX_PLOT_ID}{str(n).zfill(5)}"
+        for n in allocate_uids(
+            plot_scope(form),
+            count,
+            form.plot_uid_start or 1,
+        )
+    ]
@@ -3,7 +3,9 @@ import time
 from datetime import datetime
 
 from django.db.models import (
+    BooleanField,
     Exists,
+    ExpressionWrapper,
     F,
     OuterRef,
     Q,
@@ -13,7 +15,6 @@ from django.db.models.fields.json import (
     KeyTextTransform,
 )
 from django.utils import timezone
-from django_q.tasks import async_task
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import (
     OpenApiParameter,
@@ -44,6 +45,7 @@ from api.v1.v1_odk.funcs import (
     check_and_flag_overlaps,
     parse_date_range,
     parse_field_spec,
+    parse_sparse_fields,
     rederive_plots,
     strip_id_prefix,
     sync_form_questions,
@@ -75,12 +77,43 @@ from api.v1.v1_odk.serializers import (
 from api.v1.v1_odk.utils.area_calc import (
     calculate_area_ha,
 )
+from api.v1.v1_odk.utils.enumerator_directory import (
+    enumerator_code,
+    refresh_enumerators,
+)
+from api.v1.v1_odk.utils.export_cache import (
+    bump_data_version,
+)
 from api.v1.v1_odk.utils.farmer_sync import (
+    submission_content_hash,
     update_farmer_for_submission,
 )
+from api.v1.v1_odk.utils.fast_list import (
+    build_submission_rows,
+    serialize_by_pk,
+    submission_values,
+)
+from api.v1.v1_odk.utils.filter_catalog import (
+    invalidate_filter_catalog,
+    refresh_filter_catalog,
+)
+from api.v1.v1_odk.utils.kobo_outbox import (
+    queue_submission_data,
+    queue_validation_status,
+)
 from api.v1.v1_odk.utils.plot_id import (
     create_main_plot_for_submission,
 )
+from api.v1.v1_odk.utils.resolved_labels import (
+    RESOLVED_FIELDS,
+    apply_resolved_labels,
+    build_label_context,
+    compute_resolved_labels,
+)
+from api.v1.v1_odk.utils.stats_rollup import (
+    refresh_plot_stats,
+    refresh_rollups_for,
+)
 from api.v1.v1_odk.utils.warning_rules import (
     evaluate_warnings,
 )
@@ -90,6 +123,7 @@ from utils.kobo_client import (
     KoboUnauthorizedError,
 )
 from utils.polygon import extract_plot_data
+from utils.task_queue import async_task
 
 logger = logging.getLogger(__name__)
 
@@ -134,6 +168,7 @@ class FormMetadataViewSet(viewsets.ModelViewSet):
                 form.asset_uid
             )
             sync_form_questions(form, content)
+            refresh_filter_catalog(form)
         except (
             RequestException,
             KoboUnauthorizedError,
@@ -153,10 +188,23 @@ class FormMetadataViewSet(viewsets.ModelViewSet):
     def perform_update(self, serializer):
         form = self.get_object()
         old = {f: getattr(form, f) for f in MAPPING_FIELDS}
+        old_filters = form.filter_fields
         instance = serializer.save()
         changed = any(getattr(instance, f) != old[f] for f in MAPPING_FIELDS)
         if changed:
             rederive_plots(instance)
+            refresh_plot_stats(instance)
+            bump_data_version(instance)
+            async_task(
+                "api.v1.v1_odk.tasks"
+                ".reresolve_submission_labels",
+                instance.pk,
+            )
+        if instance.filter_fields != old_filters:
+            # Exports only apply listed filters
+            bump_data_version(instance)
+        if changed or instance.filter_fields != old_filters:
+            refresh_filter_catalog(instance)
 
     @extend_schema(
         tags=["ODK"],
@@ -374,6 +422,8 @@ class FormMetadataViewSet(viewsets.ModelViewSet):
                 },
             )
         )
+        # XLSX exports carry the farmer columns
+        bump_data_version(form)
         return Response(
             self._serialize_farmer_mapping(
                 mapping
@@ -465,9 +515,10 @@ class FormMetadataViewSet(viewsets.ModelViewSet):
             "plots_flagged": 0,
         }
 
+        label_ctx = build_label_context(form)
         for item in results:
             sub, is_new = self._upsert_submission(
-                form, item
+                form, item, label_ctx
             )
             if is_new:
                 counts["created"] += 1
@@ -505,6 +556,13 @@ class FormMetadataViewSet(viewsets.ModelViewSet):
             if plot.flagged_for_review:
                 counts["plots_flagged"] += 1
 
+        # Every submission was re-read, so rebuild
+        # the whole stats rollup for the form
+        refresh_plot_stats(form)
+        refresh_filter_catalog(form)
+        refresh_enumerators(form)
+        bump_data_version(form)
+
         # Sync farmer records asynchronously
         async_task(
             "api.v1.v1_odk.utils.farmer_sync"
@@ -522,8 +580,16 @@ class FormMetadataViewSet(viewsets.ModelViewSet):
             }
         )
 
-    def _upsert_submission(self, form, item):
-        """Upsert a single Kobo submission."""
+    def _upsert_submission(
+        self, form, item, label_ctx=None
+    ):
+        """Upsert a single Kobo submission.
+
+        Resolved labels are computed here so list
+        endpoints read them from columns.
+        """
+        if label_ctx is None:
+            label_ctx = build_label_context(form)
         sub_time_str = item.get(
             "_submission_time", ""
         )
@@ -560,6 +626,9 @@ class FormMetadataViewSet(viewsets.ModelViewSet):
                 ),
                 "approval_status": approval,
                 "raw_data": item,
+                "content_hash": (
+                    submission_content_hash(item)
+                ),
                 "system_data": {
                     "_geolocation": item.get(
                         "_geolocation"
@@ -568,6 +637,9 @@ class FormMetadataViewSet(viewsets.ModelViewSet):
                         "_tags", []
                     ),
                 },
+                **compute_resolved_labels(
+                    item, form, label_ctx
+                ),
             },
         )
 
@@ -609,6 +681,10 @@ class FormMetadataViewSet(viewsets.ModelViewSet):
             "max_lat": plot_data["max_lat"],
             "min_lon": plot_data["min_lon"],
             "max_lon": plot_data["max_lon"],
+            "centroid_lat": plot_data["centroid_lat"],
+            "centroid_lon": plot_data["centroid_lon"],
+            "altitude": plot_data["altitude"],
+            "altitude_computed": True,
             "region": plot_data["region"],
             "sub_region": plot_data["sub_region"],
             "area_ha": area,
@@ -713,6 +789,7 @@ class SubmissionViewSet(
     def get_serializer_context(self):
         ctx = super().get_serializer_context()
         if self.action == "list":
+            ctx["fields"] = self._get_sparse_fields()
             asset_uid = (
                 self.request.query_params.get(
                     "asset_uid"
@@ -737,6 +814,47 @@ class SubmissionViewSet(
                 }
         return ctx
 
+    def _get_sparse_fields(self):
+        """Requested ``fields``/``columns`` for the
+        list action, or None for the full row."""
+        if not hasattr(self, "_sparse_fields"):
+            self._sparse_fields = parse_sparse_fields(
+                self.request.query_params,
+                SubmissionListSerializer.Meta.fields,
+            )
+        return self._sparse_fields
+
+    def _apply_sparse_projection(self, qs, fields):
+        """Load only the columns the requested
+        fields need.
+
+        raw_data is always deferred: start/end come
+        from the sort_start/sort_end key extractions
+        and labels from the stored resolved columns.
+        """
+        related = ["form"]
+        deferred = ["raw_data"]
+        if "resolved_data" not in fields:
+            deferred.append("resolved_data")
+        if "reviewed_by" in fields:
+            related.append("updated_by")
+        if "area_ha" in fields:
+            related.append("plot")
+            deferred.append("plot__polygon_wkt")
+        qs = (
+            qs.select_related(*related)
+            .defer(*deferred)
+            .annotate(
+                labels_stored=ExpressionWrapper(
+                    Q(resolved_data__isnull=False),
+                    output_field=BooleanField(),
+                )
+            )
+        )
+        if "main_plot_uid" not in fields:
+            qs = qs.prefetch_related(None)
+        return qs
+
     def _get_form_questions(self, form):
         """Return displayable form questions,
         excluding mapped and system fields."""
@@ -771,9 +889,13 @@ class SubmissionViewSet(
         ]
 
     def list(self, request, *args, **kwargs):
-        response = super().list(
-            request, *args, **kwargs
-        )
+        serializer = self.get_serializer()
+        if "question_names" in serializer.context:
+            response = self._fast_list(serializer)
+        else:
+            response = super().list(
+                request, *args, **kwargs
+            )
         asset_uid = request.query_params.get(
             "asset_uid"
         )
@@ -794,6 +916,28 @@ class SubmissionViewSet(
             response.data["sortable_fields"] = []
         return response
 
+    def _fast_list(self, serializer):
+        """List via ``.values()`` over the stored
+        label columns; same payload as the
+        serializer path."""
+        queryset = self.filter_queryset(
+            self.get_queryset()
+        )
+        rows = submission_values(
+            queryset, serializer.fields
+        )
+        page = self.paginate_queryset(rows)
+        results = build_submission_rows(
+            rows if page is None else page,
+            serializer,
+            lambda pks: serialize_by_pk(
+                queryset, serializer, pks
+            ),
+        )
+        if page is None:
+            return Response(results)
+        return self.get_paginated_response(results)
+
     def get_queryset(self):
         qs = super().get_queryset().prefetch_related(
             "main_plot_submission__main_plot"
@@ -872,6 +1016,12 @@ class SubmissionViewSet(
                 )
             elif asset_uid:
                 qs = self._apply_dynamic_ordering(qs, asset_uid, field, desc)
+        if self.action == "list":
+            fields = self._get_sparse_fields()
+            if fields:
+                qs = self._apply_sparse_projection(
+                    qs, fields
+                )
         return qs
 
     def _apply_dynamic_ordering(self, qs, asset_uid, field, desc):
@@ -931,6 +1081,7 @@ class SubmissionViewSet(
     def perform_update(self, serializer):
         reason_category = serializer.validated_data.get("reason_category")
         reason_text = serializer.validated_data.get("reason_text", "")
+        previous_review = serializer.instance.updated_at
         instance = serializer.save(
             updated_by=self.request.user,
             updated_at=timezone.now(),
@@ -948,6 +1099,15 @@ class SubmissionViewSet(
             if plot:
                 validate_and_check_plot(plot)
 
+        refresh_rollups_for(
+            instance.form, instance, previous_review
+        )
+        bump_data_version(instance.form)
+        refresh_enumerators(
+            instance.form,
+            {enumerator_code(instance.raw_data)},
+        )
+
         # Create RejectionAudit for rejections
         audit = None
         if approval == ApprovalStatusTypes.REJECTED and reason_category:
@@ -970,21 +1130,10 @@ class SubmissionViewSet(
         if not _has_kobo_credentials(user):
             return
 
-        task_kwargs = {}
-        if audit:
-            task_kwargs["hook"] = "api.v1.v1_odk.tasks"\
-                ".on_kobo_sync_complete"
-            task_kwargs["audit_id"] = audit.pk
-
-        async_task(
-            "api.v1.v1_odk.tasks" ".sync_kobo_validation_status",
-            user.kobo_url,
-            user.kobo_username,
-            user.kobo_password,
-            instance.form.asset_uid,
-            [instance.kobo_id],
-            kobo_key,
-            **task_kwargs,
+        # Sent in bulk by flush_kobo_outbox, which
+        # also updates the audit's sync_status
+        queue_validation_status(
+            user, instance, kobo_key, audit
         )
 
     @extend_schema(
@@ -1014,15 +1163,26 @@ class SubmissionViewSet(
         )
 
         raw = submission.raw_data or {}
+        previous_enumerator = enumerator_code(raw)
         raw.update(fields)
+        previous_review = submission.updated_at
         submission.raw_data = raw
+        submission.content_hash = (
+            submission_content_hash(raw)
+        )
         submission.updated_by = request.user
         submission.updated_at = timezone.now()
+        apply_resolved_labels(
+            submission,
+            build_label_context(submission.form),
+        )
         submission.save(
             update_fields=[
                 "raw_data",
+                "content_hash",
                 "updated_by",
                 "updated_at",
+                *RESOLVED_FIELDS,
             ]
         )
 
@@ -1031,6 +1191,18 @@ class SubmissionViewSet(
             self._update_plot_from_edit(
                 plot, submission, fields
             )
+            refresh_rollups_for(
+                submission.form,
+                submission,
+                previous_review,
+            )
+
+        bump_data_version(submission.form)
+        invalidate_filter_catalog(submission.form)
+        refresh_enumerators(
+            submission.form,
+            {previous_enumerator, enumerator_code(raw)},
+        )
 
         self._resync_farmers_if_needed(
             submission, fields
@@ -1130,20 +1302,11 @@ class SubmissionViewSet(
     def _sync_edit_to_kobo(
         self, user, submission, fields
     ):
-        """Queue async task to push field edits
-        to KoboToolbox."""
+        """Queue field edits in the Kobo
+        write-back outbox."""
         if not _has_kobo_credentials(user):
             return
-        async_task(
-            "api.v1.v1_odk.tasks"
-            ".sync_kobo_submission_data",
-            user.kobo_url,
-            user.kobo_username,
-            user.kobo_password,
-            submission.form.asset_uid,
-            submission.kobo_id,
-            fields,
-        )
+        queue_submission_data(user, submission, fields)
 
     @extend_schema(tags=["ODK"])
     @action(detail=False, methods=["get"])
@@ -1226,6 +1389,10 @@ class FieldMappingViewSet(
                 status=(status.HTTP_400_BAD_REQUEST),
             )
 
+        mappings = FieldMapping.objects.filter(form=form)
+        before = set(
+            mappings.values_list("field_id", "form_question_id")
+        )
         errors = {}
         for field_name, q_id in data.items():
             try:
@@ -1255,6 +1422,12 @@ class FieldMappingViewSet(
                 },
             )
 
+        # XLSX exports carry the title deed links
+        if before != set(
+            mappings.values_list("field_id", "form_question_id")
+        ):
+            bump_data_version(form)
+
         if errors:
             return Response(
                 {"errors": errors},
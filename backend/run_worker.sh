@@ -3,4 +3,4 @@ set -e
 pip -q install --upgrade pip && \
 pip -q install --no-cache-dir -r requirements.txt && \
 pip check
-python manage.py qcluster
+exec ./start_qclusters.sh
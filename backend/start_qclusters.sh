@@ -0,0 +1,14 @@
+#!/usr/bin/env bash
+set -e
+
+# One qcluster per named queue (TASK_QUEUES in
+# settings) plus the default queue; exit as soon
+# as any of them stops so the container restarts.
+QUEUES=${TASK_QUEUE_NAMES:-"sync export attachments kobo-writeback notify"}
+
+for queue in $QUEUES; do
+    Q_CLUSTER_NAME="$queue" python manage.py qcluster &
+done
+python manage.py qcluster &
+wait -n
+exit 1
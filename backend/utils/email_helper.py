@@ -4,7 +4,8 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.mail import EmailMultiAlternatives
 from django.template.loader import render_to_string
-from django_q.tasks import async_task
+
+from utils.task_queue import async_task
 
 logger = logging.getLogger(__name__)
 
@@ -151,10 +151,22 @@ class KoboClient:
     ):
         """Update a single submission's data
         via the bulk PATCH endpoint."""
+        return self.update_submissions_data(
+            asset_uid, [submission_id], data
+        )
+
+    def update_submissions_data(
+        self,
+        asset_uid: str,
+        submission_ids: list,
+        data: dict,
+    ):
+        """Set the same ``data`` on several
+        submissions in one bulk PATCH."""
         url = f"{self.base_url}" f"/api/v2/assets/{asset_uid}" f"/data/bulk/"
         payload = {
             "payload": {
-                "submission_ids": [submission_id],
+                "submission_ids": submission_ids,
                 "data": data,
             }
         }
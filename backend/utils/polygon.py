@@ -135,6 +135,40 @@ def compute_bbox(coords):
     }
 
 
+def compute_centroid(coords):
+    """Area centroid of [(lon, lat), ...].
+
+    Returns (lat, lon) rounded to 6 places.
+    """
+    c = ShapelyPolygon(coords).centroid
+    return round(c.y, 6), round(c.x, 6)
+
+
+def average_altitude(geoshape_str):
+    """Mean altitude of the vertices of an ODK
+    geoshape string, rounded to 3 places.
+
+    Returns None when no vertex has one.
+    """
+    if not geoshape_str:
+        return None
+    try:
+        altitudes = []
+        for seg in geoshape_str.strip().split(";"):
+            seg = seg.strip()
+            if not seg:
+                continue
+            parts = WHITESPACE_RE.split(seg)
+            if len(parts) >= 3:
+                altitudes.append(float(parts[2]))
+        if altitudes:
+            avg = sum(altitudes) / len(altitudes)
+            return round(avg, 3)
+    except (ValueError, IndexError):
+        pass
+    return None
+
+
 def _calculate_area_sq_meters(coords):
     """Shoelace formula for area, converted to
     square meters using centroid latitude."""
@@ -386,6 +420,9 @@ def extract_plot_data(raw_data, form):
         "max_lat": None,
         "min_lon": None,
         "max_lon": None,
+        "centroid_lat": None,
+        "centroid_lon": None,
+        "altitude": None,
         "region": region,
         "sub_region": sub_region,
         "plot_name": plot_name,
@@ -404,6 +441,9 @@ def extract_plot_data(raw_data, form):
     )
     result["polygon_source_field"] = source_field
     result["raw_polygon_string"] = polygon_str
+    result["altitude"] = average_altitude(
+        polygon_str
+    )
     if not polygon_str:
         logger.warning(
             "No polygon data found in fields: %s",
@@ -467,5 +507,9 @@ def extract_plot_data(raw_data, form):
     result["max_lat"] = bbox["max_lat"]
     result["min_lon"] = bbox["min_lon"]
     result["max_lon"] = bbox["max_lon"]
+    (
+        result["centroid_lat"],
+        result["centroid_lon"],
+    ) = compute_centroid(coords)
 
     return result
@@ -1,5 +1,6 @@
 import os
 import shutil
+from contextlib import contextmanager
 from pathlib import Path
 
 from django.conf import settings
@@ -24,10 +25,7 @@ def upload(
     """
     if not filename:
         filename = file.split("/")[-1]
-    if folder:
-        rel_path = f"{folder}/{filename}"
-    else:
-        rel_path = filename
+    rel_path = relative_path(folder, filename)
     full = get_path(rel_path)
     Path(full).parent.mkdir(
         parents=True, exist_ok=True
@@ -36,6 +34,42 @@ def upload(
     return rel_path
 
 
+def relative_path(folder: str, filename: str):
+    """Storage path of *filename* in *folder*."""
+    if folder:
+        return f"{folder}/{filename}"
+    return filename
+
+
+@contextmanager
+def open_write(
+    folder: str,
+    filename: str,
+    mode: str = "wb",
+):
+    """Open a storage file for writing in place.
+
+    Data goes to a ``.part`` sibling that is
+    renamed over the final path when the block
+    exits cleanly, so readers never see a
+    half-written file. On error the partial file
+    is removed.
+    """
+    full = get_path(relative_path(folder, filename))
+    Path(full).parent.mkdir(
+        parents=True, exist_ok=True
+    )
+    part = f"{full}.part"
+    try:
+        with open(part, mode) as f:
+            yield f
+        os.replace(part, full)
+    except BaseException:
+        if os.path.exists(part):
+            os.remove(part)
+        raise
+
+
 def delete(path: str):
     """Remove a file from storage.
 
@@ -0,0 +1,81 @@
+import logging
+
+from django.conf import settings
+from django.utils import timezone
+from django_q.brokers import get_broker
+from django_q.conf import Conf
+from django_q.models import OrmQ
+from django_q.tasks import async_task as q_async_task
+
+logger = logging.getLogger(__name__)
+
+
+def default_queue():
+    """Queue of the base Q_CLUSTER, for tasks
+    without a route."""
+    return Conf.PREFIX
+
+
+def queue_for(func):
+    """Queue the dotted task path ``func`` is
+    routed to by TASK_ROUTES."""
+    return settings.TASK_ROUTES.get(func, default_queue())
+
+
+def queue_timeout(queue):
+    """Seconds a task on ``queue`` may run before
+    its worker is killed."""
+    return settings.TASK_QUEUES.get(queue, {}).get(
+        "timeout", Conf.TIMEOUT
+    )
+
+
+def async_task(func, *args, **kwargs):
+    """django_q async_task that puts ``func`` on
+    its TASK_ROUTES queue unless ``cluster`` is
+    given.
+
+    The queue is always explicit: a bare
+    async_task called from a named worker would
+    otherwise land on that worker's own queue.
+    """
+    kwargs.setdefault("cluster", queue_for(func))
+    return q_async_task(func, *args, **kwargs)
+
+
+def queue_stats():
+    """Depth of every queue: tasks waiting,
+    tasks taken by a worker, and how long the
+    oldest waiting task has been queued."""
+    now = timezone.now()
+    queues = {
+        default_queue(): {
+            "workers": Conf.WORKERS,
+            "timeout": Conf.TIMEOUT,
+        },
+        **settings.TASK_QUEUES,
+    }
+    stats = []
+    for name, queue in queues.items():
+        broker = get_broker(name)
+        oldest = (
+            OrmQ.objects.filter(key=name, lock__lte=now)
+            .order_by("lock")
+            .values_list("lock", flat=True)
+            .first()
+        )
+        stats.append(
+            {
+                "name": name,
+                "workers": queue["workers"],
+                "timeout": queue["timeout"],
+                "queued": broker.queue_size(),
+                "running": broker.lock_size(),
+                "oldest_seconds": (
+                    int((now - oldest).total_seconds())
+                    if oldest
+                    else None
+                ),
+            }
+        )
+    return stats
@@ -1,22 +1,99 @@
 import logging
+import threading
+import time
 
 import requests
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
+# Shared by every client in the process so
+# notifications reuse open connections
+session = requests.Session()
+session.mount(
+    "https://", HTTPAdapter(pool_maxsize=4)
+)
+
 
 class TelegramSendError(Exception):
     """Raised when Telegram API returns non-OK."""
 
 
+class TelegramRateLimited(TelegramSendError):
+    """Raised when Telegram keeps answering 429
+    Too Many Requests."""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Allow `burst` sends at once, refilled at
+    `rate` sends per second."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self):
+        """Block until a send is allowed."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.burst,
+                self.tokens
+                + (now - self.updated) * self.rate,
+            )
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate
+        if wait > 0:
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Make the next send wait `seconds`."""
+        with self.lock:
+            self.tokens = min(
+                self.tokens, 1 - seconds * self.rate
+            )
+
+
 class TelegramClient:
     BASE_URL = "https://api.telegram.org/bot{token}"
+    MAX_ATTEMPTS = 3
 
-    def __init__(self, bot_token):
+    # One bucket per (bot, chat), shared by every
+    # client in the process
+    _buckets = {}
+    _buckets_lock = threading.Lock()
+
+    def __init__(
+        self,
+        bot_token,
+        rate_per_minute=20,
+        burst=3,
+        max_retry_wait=30,
+    ):
         self.bot_token = bot_token
         self.base_url = self.BASE_URL.format(
             token=bot_token
         )
+        self.rate = rate_per_minute / 60
+        self.burst = burst
+        self.max_retry_wait = max_retry_wait
+
+    def _bucket(self, chat_id):
+        key = (self.bot_token, str(chat_id))
+        with self._buckets_lock:
+            if key not in self._buckets:
+                self._buckets[key] = TokenBucket(
+                    self.rate, self.burst
+                )
+            return self._buckets[key]
 
     def get_groups(self):
         """Fetch group chats from recent updates.
@@ -25,7 +102,7 @@ class TelegramClient:
         group/supergroup chats the bot has seen.
         Returns list of {id, title, type}.
         """
-        resp = requests.get(
+        resp = session.get(
             f"{self.base_url}/getUpdates",
             timeout=10,
         )
@@ -68,18 +145,44 @@ class TelegramClient:
     ):
         """Send message to a Telegram chat.
 
+        Waits for the chat's rate limit and, on
+        429, for Telegram's retry_after (up to
+        max_retry_wait seconds).
         Returns message_id on success.
         Raises TelegramSendError on failure.
         """
-        resp = requests.post(
-            f"{self.base_url}/sendMessage",
-            json={
-                "chat_id": chat_id,
-                "text": text,
-                "parse_mode": parse_mode,
-            },
-            timeout=10,
-        )
+        bucket = self._bucket(chat_id)
+        for attempt in range(1, self.MAX_ATTEMPTS + 1):
+            bucket.take()
+            resp = session.post(
+                f"{self.base_url}/sendMessage",
+                json={
+                    "chat_id": chat_id,
+                    "text": text,
+                    "parse_mode": parse_mode,
+                },
+                timeout=10,
+            )
+            if resp.status_code != 429:
+                break
+            retry_after = _retry_after(resp)
+            bucket.pause(retry_after)
+            if (
+                attempt == self.MAX_ATTEMPTS
+                or retry_after > self.max_retry_wait
+            ):
+                raise TelegramRateLimited(
+                    f"Telegram rate limit for chat "
+                    f"{chat_id}, retry after "
+                    f"{retry_after}s",
+                    retry_after,
+                )
+            logger.info(
+                "Telegram rate limit for chat %s, "
+                "retrying in %ss",
+                chat_id,
+                retry_after,
+            )
         if not resp.ok:
             raise TelegramSendError(
                 f"Telegram API error "
@@ -89,3 +192,12 @@ class TelegramClient:
         return resp.json()["result"][
             "message_id"
         ]
+
+
+def _retry_after(resp):
+    """Seconds to wait from a 429 response."""
+    try:
+        params = resp.json().get("parameters", {})
+        return int(params.get("retry_after", 1))
+    except (ValueError, AttributeError):
+        return int(resp.headers.get("Retry-After", 1))
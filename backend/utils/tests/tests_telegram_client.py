@@ -4,17 +4,20 @@ from django.test import TestCase
 
 from utils.telegram_client import (
     TelegramClient,
+    TelegramRateLimited,
     TelegramSendError,
+    TokenBucket,
 )
 
 
 class TelegramClientTest(TestCase):
     def setUp(self):
+        TelegramClient._buckets.clear()
         self.tg_client = TelegramClient(
             "test-bot-token"
         )
 
-    @patch("utils.telegram_client.requests")
+    @patch("utils.telegram_client.session")
     def test_send_message_success(self, mock_req):
         mock_resp = MagicMock()
         mock_resp.ok = True
@@ -28,7 +31,7 @@ class TelegramClientTest(TestCase):
         )
         self.assertEqual(msg_id, 42)
 
-    @patch("utils.telegram_client.requests")
+    @patch("utils.telegram_client.session")
     def test_send_message_api_error(
         self, mock_req
     ):
@@ -43,7 +46,7 @@ class TelegramClientTest(TestCase):
                 "-100001", "Hello"
             )
 
-    @patch("utils.telegram_client.requests")
+    @patch("utils.telegram_client.session")
     def test_send_message_network_error(
         self, mock_req
     ):
@@ -62,7 +65,7 @@ class TelegramClientTest(TestCase):
                 "-100001", "Hello"
             )
 
-    @patch("utils.telegram_client.requests")
+    @patch("utils.telegram_client.session")
     def test_send_message_timeout(
         self, mock_req
     ):
@@ -77,7 +80,7 @@ class TelegramClientTest(TestCase):
                 "-100001", "Hello"
             )
 
-    @patch("utils.telegram_client.requests")
+    @patch("utils.telegram_client.session")
     def test_send_message_payload(
         self, mock_req
     ):
@@ -107,7 +110,7 @@ class TelegramClientTest(TestCase):
             payload["parse_mode"], "Markdown"
         )
 
-    @patch("utils.telegram_client.requests")
+    @patch("utils.telegram_client.session")
     def test_send_message_url_format(
         self, mock_req
     ):
@@ -129,7 +132,7 @@ class TelegramClientTest(TestCase):
             "bottest-bot-token/sendMessage",
         )
 
-    @patch("utils.telegram_client.requests")
+    @patch("utils.telegram_client.session")
     def test_get_groups_success(self, mock_req):
         mock_resp = MagicMock()
         mock_resp.ok = True
@@ -169,7 +172,7 @@ class TelegramClientTest(TestCase):
             groups[1]["type"], "group"
         )
 
-    @patch("utils.telegram_client.requests")
+    @patch("utils.telegram_client.session")
     def test_get_groups_api_error(
         self, mock_req
     ):
@@ -182,7 +185,7 @@ class TelegramClientTest(TestCase):
         with self.assertRaises(TelegramSendError):
             self.tg_client.get_groups()
 
-    @patch("utils.telegram_client.requests")
+    @patch("utils.telegram_client.session")
     def test_get_groups_empty_updates(
         self, mock_req
     ):
@@ -196,7 +199,7 @@ class TelegramClientTest(TestCase):
         groups = self.tg_client.get_groups()
         self.assertEqual(groups, [])
 
-    @patch("utils.telegram_client.requests")
+    @patch("utils.telegram_client.session")
     def test_get_groups_skips_private_chats(
         self, mock_req
     ):
@@ -232,7 +235,7 @@ class TelegramClientTest(TestCase):
             groups[0]["id"], "-100111"
         )
 
-    @patch("utils.telegram_client.requests")
+    @patch("utils.telegram_client.session")
     def test_get_groups_deduplicates(
         self, mock_req
     ):
@@ -265,7 +268,7 @@ class TelegramClientTest(TestCase):
         groups = self.tg_client.get_groups()
         self.assertEqual(len(groups), 1)
 
-    @patch("utils.telegram_client.requests")
+    @patch("utils.telegram_client.session")
     def test_get_groups_my_chat_member(
         self, mock_req
     ):
@@ -295,7 +298,7 @@ class TelegramClientTest(TestCase):
             groups[0]["title"], "Via Member"
         )
 
-    @patch("utils.telegram_client.requests")
+    @patch("utils.telegram_client.session")
     def test_get_groups_skips_no_message(
         self, mock_req
     ):
@@ -311,7 +314,7 @@ class TelegramClientTest(TestCase):
         groups = self.tg_client.get_groups()
         self.assertEqual(groups, [])
 
-    @patch("utils.telegram_client.requests")
+    @patch("utils.telegram_client.session")
     def test_get_groups_missing_title_defaults(
         self, mock_req
     ):
@@ -337,7 +340,7 @@ class TelegramClientTest(TestCase):
             groups[0]["title"], "Untitled"
         )
 
-    @patch("utils.telegram_client.requests")
+    @patch("utils.telegram_client.session")
     def test_get_groups_url_format(
         self, mock_req
     ):
@@ -356,3 +359,85 @@ class TelegramClientTest(TestCase):
             "https://api.telegram.org/"
             "bottest-bot-token/getUpdates",
         )
+
+
+def _rate_limited(retry_after):
+    resp = MagicMock()
+    resp.ok = False
+    resp.status_code = 429
+    resp.json.return_value = {
+        "ok": False,
+        "parameters": {"retry_after": retry_after},
+    }
+    return resp
+
+
+@patch("utils.telegram_client.time")
+@patch("utils.telegram_client.session")
+class TelegramRateLimitTest(TestCase):
+    def setUp(self):
+        TelegramClient._buckets.clear()
+        self.tg_client = TelegramClient(
+            "test-bot-token", max_retry_wait=10
+        )
+
+    def test_retries_after_429(
+        self, mock_session, mock_time
+    ):
+        mock_time.monotonic.return_value = 100.0
+        ok = MagicMock()
+        ok.ok = True
+        ok.status_code = 200
+        ok.json.return_value = {
+            "result": {"message_id": 7}
+        }
+        mock_session.post.side_effect = [
+            _rate_limited(5),
+            ok,
+        ]
+        msg_id = self.tg_client.send_message(
+            "-100001", "Hi"
+        )
+        self.assertEqual(msg_id, 7)
+        self.assertEqual(
+            mock_session.post.call_count, 2
+        )
+        # Waited for retry_after
+        mock_time.sleep.assert_called_once_with(5.0)
+
+    def test_long_retry_after_raises(
+        self, mock_session, mock_time
+    ):
+        mock_time.monotonic.return_value = 100.0
+        mock_session.post.return_value = (
+            _rate_limited(60)
+        )
+        with self.assertRaises(
+            TelegramRateLimited
+        ) as ctx:
+            self.tg_client.send_message(
+                "-100001", "Hi"
+            )
+        self.assertEqual(ctx.exception.retry_after, 60)
+        mock_session.post.assert_called_once()
+        mock_time.sleep.assert_not_called()
+
+    def test_token_bucket_spaces_sends(
+        self, mock_session, mock_time
+    ):
+        mock_time.monotonic.return_value = 100.0
+        # 1 send per 3 seconds, burst of 2
+        bucket = TokenBucket(rate=1 / 3, burst=2)
+        bucket.take()
+        bucket.take()
+        mock_time.sleep.assert_not_called()
+        bucket.take()
+        mock_time.sleep.assert_called_once()
+        self.assertAlmostEqual(
+            mock_time.sleep.call_args[0][0], 3.0
+        )
+        # Refilled after a minute
+        mock_time.sleep.reset_mock()
+        mock_time.monotonic.return_value = 160.0
+        bucket.take()
+        mock_time.sleep.assert_not_called()
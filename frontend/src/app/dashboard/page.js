@@ -317,6 +317,15 @@ const DashboardPage = () => {
               <DropdownMenuItem onClick={() => handleExport("geojson")}>
                 GeoJSON (.geojson)
               </DropdownMenuItem>
+              <DropdownMenuItem onClick={() => handleExport("geoparquet")}>
+                GeoParquet (.parquet)
+              </DropdownMenuItem>
+              <DropdownMenuItem onClick={() => handleExport("fgb")}>
+                FlatGeobuf (.fgb)
+              </DropdownMenuItem>
+              <DropdownMenuItem onClick={() => handleExport("kmz")}>
+                Google Earth (.kmz)
+              </DropdownMenuItem>
               <DropdownMenuItem onClick={() => handleExport("xlsx")}>
                 Clean Data (.xlsx)
               </DropdownMenuItem>